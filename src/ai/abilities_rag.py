@@ -20,16 +20,19 @@ from __future__ import annotations
 
 import logging
 import re
-from typing import Any, Dict, List, Optional, Tuple, TypedDict, cast
+from typing import Any, Dict, Iterable, List, Optional, Tuple, TypedDict, cast
 
-from src.ai.rag_system import RAGSystem, get_rag_system
+from src.ai.rag_system import RAGSystem, get_rag_system, prefetch_cache
 from src.integration.drupal_graphql import query_drupal
 
 from src.ai.wiki_scraping import (
     SCRAPING_AVAILABLE as _SCRAPING_AVAILABLE,
-    fetch_first as _fetch_first,
+    PageSource,
+    ParsedPage,
+    as_page,
     fetch_html as _fetch_html,
     page_content,
+    parse_page,
 )
 
 if _SCRAPING_AVAILABLE:
@@ -43,9 +46,10 @@ _LEVEL_HEADING = re.compile(r"^Level\s+(\d+):\s*(.+)$", re.IGNORECASE)
 # Source categories that use the species-style trait layout.
 _TRAIT_SOURCES = frozenset({"species", "subspecies"})
 
-# Cache key suffix so ability parses do not collide with WikiClient section
-# caches stored under the same page URL.
-_CACHE_SUFFIX = "#abilities"
+# Cache key suffix for a page's record of structured extraction results
+# (abilities, class tool segment, background data, feat description), kept
+# apart from the WikiClient section caches stored under the same page URL.
+_CACHE_SUFFIX = "#extracts"
 
 # Cap a single feature description to keep payloads and storage reasonable.
 _MAX_DESCRIPTION = 2000
@@ -142,6 +146,33 @@ def get_abilities(
     return [ability for ability in all_abilities if ability["level"] <= level]
 
 
+def prefetch_abilities(
+    sources: Iterable[Tuple[str, str]], *, rag: Optional[RAGSystem] = None
+) -> None:
+    """Warm the ability cache for several sources in one batched read.
+
+    Call before a run of :func:`get_abilities` calls (e.g. class, species and
+    subspecies for one character) so their cache lookups share one round trip
+    instead of one each.
+
+    Args:
+        sources: ``(source_type, source_name)`` pairs about to be resolved.
+        rag: Optional RAG system; resolved from config when omitted.
+    """
+    rag_system = rag if rag is not None else _safe_rag_system()
+    if rag_system is None or not getattr(rag_system, "enabled", False):
+        return
+    client = getattr(rag_system, "rules_client", None)
+    if client is None:
+        return
+    keys = []
+    for source_type, source_name in sources:
+        urls = page_urls(client.base_url, source_type, source_name)
+        if urls:
+            keys.append(urls[0] + _CACHE_SUFFIX)
+    prefetch_cache(client.cache, keys)
+
+
 def get_subclass_plan(
     class_name: str, subclass_name: str, level: int, *, rag: Optional[RAGSystem] = None
 ) -> List[Ability]:
@@ -171,14 +202,12 @@ def get_subclass_plan(
     class_slug = class_name.strip().lower().replace(" ", "-")
     if class_slug == "":
         return []
-    for sub_slug in _subclass_slugs(subclass_name):
-        html = _fetch_html(client, f"{client.base_url}/{class_slug}:{sub_slug}")
-        if html is None:
-            continue
-        abilities = [a for a in _parse_abilities(html, "subclass") if a["level"] <= level]
-        if abilities:
-            return abilities
-    return []
+    urls = [
+        f"{client.base_url}/{class_slug}:{sub_slug}"
+        for sub_slug in _subclass_slugs(subclass_name)
+    ]
+    abilities = _page_abilities(client, urls, "subclass")
+    return [ability for ability in abilities if ability["level"] <= level]
 
 
 # Prefixes the rules wiki sometimes drops from a subclass page slug. The full
@@ -233,12 +262,21 @@ def get_background(name: str, *, rag: Optional[RAGSystem] = None) -> Optional[Ba
     if client is None or not _SCRAPING_AVAILABLE or getattr(client, "session", None) is None:
         return None
 
-    html = _fetch_first(client, page_urls(client.base_url, "background", name))
-    if html is None:
+    urls = page_urls(client.base_url, "background", name)
+    if not urls:
+        return None
+    record = _page_record(client, urls[0])
+    if isinstance(record.get("background"), dict):
+        return cast(BackgroundData, dict(record["background"]))
+
+    page = _fetch_page(client, urls)
+    if page is None:
         return None
-    data = _parse_background(html)
+    data = _parse_background(page)
     if data is not None and data["feat"]:
         data["feat_description"] = get_feat(data["feat"], rag=rag_system) or ""
+    if data is not None:
+        _store_extracts(client, urls[0], record, {"background": dict(data)})
     return data
 
 
@@ -263,10 +301,18 @@ def get_feat(name: str, *, rag: Optional[RAGSystem] = None) -> Optional[str]:
     base = re.sub(r"\s*\(.*?\)\s*", "", name).strip().lower().replace(" ", "-")
     if base == "":
         return None
-    html = _fetch_html(client, f"{client.base_url}/feat:{base}")
-    if html is None:
+    url = f"{client.base_url}/feat:{base}"
+    record = _page_record(client, url)
+    if isinstance(record.get("feat_description"), str):
+        return str(record["feat_description"])
+
+    page = _fetch_page(client, [url])
+    if page is None:
         return None
-    return _parse_feat_description(html)
+    description = _parse_feat_description(page)
+    if description is not None:
+        _store_extracts(client, url, record, {"feat_description": description})
+    return description
 
 
 def _safe_rag_system() -> Optional[RAGSystem]:
@@ -298,24 +344,89 @@ def _resolve_page(rag: RAGSystem, source_type: str, source_name: str) -> List[Ab
         return []
 
     urls = page_urls(client.base_url, source_type, source_name)
+    return _page_abilities(client, urls, source_type)
+
+
+def _page_abilities(client: Any, urls: List[str], source_type: str) -> List[Ability]:
+    """Resolve the abilities on the first candidate page that lists any.
+
+    Args:
+        client: The rules WikiClient.
+        urls: Candidate page URLs, canonical first; the page record is kept
+            under the first.
+        source_type: Source category determining the layout to expect.
+
+    Returns:
+        All abilities parsed from the page (unfiltered by level).
+    """
     if not urls:
         return []
-
-    cached = client.cache.get(urls[0] + _CACHE_SUFFIX)
-    if cached is not None and isinstance(cached.get("abilities"), list):
-        return [_coerce_ability(item) for item in cached["abilities"] if isinstance(item, dict)]
+    record = _page_record(client, urls[0])
+    if isinstance(record.get("abilities"), list):
+        return [_coerce_ability(item) for item in record["abilities"] if isinstance(item, dict)]
 
     for url in urls:
         html = _fetch_html(client, url)
         if html is None:
             continue
-        abilities = _parse_abilities(html, source_type)
+        page = parse_page(html, url)
+        abilities = _parse_abilities(page, source_type)
         if abilities:
-            client.cache.set(urls[0] + _CACHE_SUFFIX, {"abilities": [dict(a) for a in abilities]})
+            extracts: Dict[str, Any] = {"abilities": [dict(a) for a in abilities]}
+            if source_type == "class":
+                # The class tool grant lives on the same page; keep it alongside.
+                extracts["tool_segment"] = _class_tool_segment(page)
+            _store_extracts(client, urls[0], record, extracts)
             return abilities
     return []
 
 
+def _fetch_page(client: Any, urls: List[str]) -> Optional[ParsedPage]:
+    """Fetch and parse the first candidate URL that resolves.
+
+    Args:
+        client: The rules WikiClient.
+        urls: Ordered candidate page URLs.
+
+    Returns:
+        The shared parse of the page, or None when no candidate resolves.
+    """
+    for url in urls:
+        html = _fetch_html(client, url)
+        if html is not None:
+            return parse_page(html, url)
+    return None
+
+
+def _page_record(client: Any, url: str) -> Dict[str, Any]:
+    """Read a page's cached extraction record.
+
+    Args:
+        client: The rules WikiClient (provides the cache).
+        url: The page's canonical URL.
+
+    Returns:
+        The record (empty when nothing is cached yet).
+    """
+    cached = client.cache.get(url + _CACHE_SUFFIX)
+    return dict(cached) if isinstance(cached, dict) else {}
+
+
+def _store_extracts(
+    client: Any, url: str, record: Dict[str, Any], extracts: Dict[str, Any]
+) -> None:
+    """Merge new extraction results into a page's cache record and store it.
+
+    Args:
+        client: The rules WikiClient (provides the cache).
+        url: The page's canonical URL.
+        record: The record read by :func:`_page_record` (updated in place).
+        extracts: Results to add.
+    """
+    record.update(extracts)
+    client.cache.set(url + _CACHE_SUFFIX, record)
+
+
 def page_urls(base_url: str, source_type: str, source_name: str) -> List[str]:
     """Build the candidate rules-wiki page URLs for a source, best guess first.
 
@@ -334,17 +445,17 @@ def page_urls(base_url: str, source_type: str, source_name: str) -> List[str]:
     return [f"{base_url}/{form.format(slug=slug)}" for form in forms]
 
 
-def _parse_abilities(html: str, source_type: str) -> List[Ability]:
-    """Parse abilities from page HTML for the given source type.
+def _parse_abilities(page: PageSource, source_type: str) -> List[Ability]:
+    """Parse abilities from a page for the given source type.
 
     Args:
-        html: Raw page HTML.
+        page: Raw page HTML or the shared ParsedPage.
         source_type: Source category determining the layout to expect.
 
     Returns:
         De-duplicated abilities parsed from the page.
     """
-    content = page_content(html)
+    content = page_content(page)
     if content is None:
         return []
 
@@ -486,16 +597,16 @@ def _dedupe(abilities: List[Ability]) -> List[Ability]:
     return unique
 
 
-def _parse_background(html: str) -> Optional[BackgroundData]:
-    """Parse the labeled background data from page HTML.
+def _parse_background(page: PageSource) -> Optional[BackgroundData]:
+    """Parse the labeled background data from a page.
 
     Args:
-        html: Raw background page HTML.
+        page: Raw background page HTML or the shared ParsedPage.
 
     Returns:
         Structured background data, or None when the data block is absent.
     """
-    content = page_content(html)
+    content = page_content(page)
     if content is None:
         return None
 
@@ -620,12 +731,8 @@ def get_class_tools(class_name: str, *, rag: Optional[RAGSystem] = None) -> Dict
     if client is None or not _SCRAPING_AVAILABLE or getattr(client, "session", None) is None:
         return result
 
-    html = _fetch_first(client, page_urls(client.base_url, "class", class_name))
-    if html is None:
-        return result
-
-    segment = _class_tool_segment(html)
-    if segment == "" or segment.lower() == "none":
+    segment = _class_tool_grant(client, page_urls(client.base_url, "class", class_name))
+    if segment is None or segment == "" or segment.lower() == "none":
         return result
 
     match = re.match(r"choose\s+(\d+|one|two|three)\s+(.+)", segment, re.IGNORECASE)
@@ -644,6 +751,37 @@ def get_class_tools(class_name: str, *, rag: Optional[RAGSystem] = None) -> Dict
     return result
 
 
+def _class_tool_grant(client: Any, urls: List[str]) -> Optional[str]:
+    """Resolve a class page's tool proficiency text, reading the page record first.
+
+    A miss parses the class page once for both its tool segment and its
+    abilities, so a later :func:`get_abilities` for the class is a cache hit.
+
+    Args:
+        client: The rules WikiClient.
+        urls: Candidate class page URLs, canonical first.
+
+    Returns:
+        The tool segment, or None when no candidate page resolves.
+    """
+    if not urls:
+        return None
+    record = _page_record(client, urls[0])
+    if isinstance(record.get("tool_segment"), str):
+        return str(record["tool_segment"])
+
+    page = _fetch_page(client, urls)
+    if page is None:
+        return None
+    segment = _class_tool_segment(page)
+    extracts: Dict[str, Any] = {"tool_segment": segment}
+    abilities = _parse_abilities(page, "class")
+    if abilities:
+        extracts["abilities"] = [dict(a) for a in abilities]
+    _store_extracts(client, urls[0], record, extracts)
+    return segment
+
+
 def _tool_category_key(label: str) -> Optional[str]:
     """Map a "Choose N <category>" label to a tool_category key, or None.
 
@@ -680,20 +818,17 @@ def get_tools_in_category(category: str) -> List[str]:
     ]
 
 
-def _class_tool_segment(html: str) -> str:
+def _class_tool_segment(page: PageSource) -> str:
     """Extract the "Tool Proficiencies" value from a class page.
 
     Args:
-        html: Raw class page HTML.
+        page: Raw class page HTML or the shared ParsedPage.
 
     Returns:
         The text following "Tool Proficiencies" up to the next proficiency
         label, or the empty string when absent.
     """
-    content = page_content(html)
-    if content is None:
-        return ""
-    text = _clean(content.get_text(" ", strip=True))
+    text = _clean(as_page(page).content_text)
     index = text.find("Tool Proficiencies")
     if index == -1:
         return ""
@@ -705,16 +840,16 @@ def _class_tool_segment(html: str) -> str:
     return segment.strip()
 
 
-def _parse_feat_description(html: str) -> Optional[str]:
+def _parse_feat_description(page: PageSource) -> Optional[str]:
     """Parse a feat page's description, skipping metadata lines.
 
     Args:
-        html: Raw feat page HTML.
+        page: Raw feat page HTML or the shared ParsedPage.
 
     Returns:
         The joined description paragraphs, or None when none are found.
     """
-    content = page_content(html)
+    content = page_content(page)
     if content is None:
         return None
 
@@ -9,8 +9,11 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import (
     Any,
+    Callable,
     Dict,
+    FrozenSet,
     Generator,
+    Iterator,
     List,
     NamedTuple,
     Optional,
@@ -31,11 +34,18 @@ except ImportError:
     pass
 
 try:
-    from src.config.config_loader import load_config
+    from src.config.config_loader import load_config, subscribe_config_changes
     CONFIG_AVAILABLE = True
 except ImportError:
     CONFIG_AVAILABLE = False
 
+from src.ai.request_scheduler import (
+    Priority,
+    SchedulerBusy,
+    default_deadline,
+    get_request_scheduler,
+)
+from src.ai.response_cache import ResponseCache, get_response_cache, response_key
 from src.ai.task_router import ModelRegistry
 
 logger = logging.getLogger(__name__)
@@ -46,6 +56,10 @@ _RETRYABLE_ERROR_TYPES: frozenset = frozenset({
     "APITimeoutError",
 })
 
+# Calls at or below this temperature are near-deterministic and use the
+# response cache (when enabled) unless they pass cache=False.
+_CACHEABLE_TEMPERATURE = 0.3
+
 
 class AIClientProtocol(Protocol):
     """The AI client surface consumers across ``src/`` actually depend on.
@@ -91,6 +105,48 @@ class _RetryConfig(NamedTuple):
     default_max_tokens: int = 1000
 
 
+class _CallPolicy(NamedTuple):
+    """Groups how AIClient calls are admitted and cached."""
+
+    priority: Priority = Priority.INTERACTIVE
+    queue_deadline: Optional[float] = None
+    response_cache: Optional[ResponseCache] = None
+
+
+class _CallSettings(NamedTuple):
+    """Effective parameters of one chat completion call."""
+
+    temperature: float
+    max_tokens: int
+    priority: Priority
+    queue_deadline: Optional[float]
+    use_cache: Optional[bool] = None
+
+
+class _CallOutcome(NamedTuple):
+    """What the call log records about how a call was answered."""
+
+    latency: float
+    token_count: Optional[int] = None
+    cache_tier: Optional[str] = None
+
+
+def _call_policy(config: Dict[str, Any]) -> _CallPolicy:
+    """Pop the scheduling and response cache settings from AIClient config."""
+    response_cache = config.pop("response_cache", None)
+    if response_cache is None:
+        response_cache = os.getenv("AI_RESPONSE_CACHE", "").lower() in ("1", "true", "yes")
+    priority = Priority.parse(config.pop("priority", None))
+    deadline = config.pop("queue_deadline", None)
+    return _CallPolicy(
+        priority=priority,
+        queue_deadline=float(deadline) if deadline is not None else default_deadline(priority),
+        response_cache=(
+            get_response_cache() if response_cache is True else response_cache or None
+        ),
+    )
+
+
 def _build_openai_client(
     api_key: Optional[str],
     base_url: Optional[str],
@@ -136,6 +192,14 @@ class AIClient:
                 - max_retries (int): Attempts on transient errors (default 3).
                 - backoff_strategy (str): "exponential" or "fixed" (default "exponential").
                 - model_chain (List[str]): Ordered fallback models after primary fails.
+                - response_cache (ResponseCache | bool): Cache for repeated
+                  chat completions; True uses the shared on-disk cache.
+                  Defaults to the shared cache when AI_RESPONSE_CACHE is set.
+                - priority (str): Scheduling class for this client's requests,
+                  "interactive" (default) or "batch".
+                - queue_deadline (float): Longest queue wait in seconds before
+                  a request is rejected; defaults per priority class from
+                  AI_INTERACTIVE_DEADLINE / AI_BATCH_DEADLINE.
                 - ai_config: Optional AIConfig object (takes precedence).
         """
         ai_config = config.pop("ai_config", None)
@@ -161,6 +225,7 @@ class AIClient:
         backoff_strategy = str(config.pop("backoff_strategy", "exponential"))
         model_chain = config.pop("model_chain", None)
         log_path_raw = os.getenv("AI_CALL_LOG_PATH", "")
+        self._policy = _call_policy(config)
 
         self._retry = _RetryConfig(
             timeout=timeout,
@@ -206,6 +271,16 @@ class AIClient:
         """Ordered list of fallback models."""
         return list(self._retry.model_chain)
 
+    @property
+    def priority(self) -> Priority:
+        """Scheduling class of this client's requests."""
+        return self._policy.priority
+
+    @property
+    def queue_deadline(self) -> Optional[float]:
+        """Longest queue wait in seconds before a request is rejected."""
+        return self._policy.queue_deadline
+
     @property
     def _is_ollama(self) -> bool:
         """Return True when base_url targets an Ollama instance.
@@ -229,21 +304,29 @@ class AIClient:
         self,
         messages: List[Dict[str, str]],
         response: str,
-        latency: float,
-        token_count: Optional[int],
+        outcome: _CallOutcome,
     ) -> None:
-        """Append one call record to the JSONL log file."""
+        """Append one call record to the JSONL log file.
+
+        Cached calls also record the tier that answered ("memory", "disk" or
+        "miss") and the cache's running hit/miss counters.
+        """
         log_path = self._retry.log_path
         if log_path is None:
             return
         record: Dict[str, Any] = {
             "ts": time.time(),
             "model": self.model,
-            "latency": round(latency, 3),
-            "tokens": token_count,
+            "latency": round(outcome.latency, 3),
+            "tokens": outcome.token_count,
             "messages": messages,
             "response": response,
         }
+        cache = self._policy.response_cache
+        if outcome.cache_tier is not None and cache is not None:
+            record["cache"] = outcome.cache_tier
+            record["cache_hits"] = cache.hits
+            record["cache_misses"] = cache.misses
         try:
             log_path.parent.mkdir(parents=True, exist_ok=True)
             with open(log_path, "a", encoding="utf-8") as fh:
@@ -253,6 +336,46 @@ class AIClient:
 
     # -- Low-level completion helpers --
 
+    def _call_settings(
+        self,
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        kwargs: Dict[str, Any],
+    ) -> _CallSettings:
+        """Resolve one call's parameters against the client defaults.
+
+        Pops the per-call ``priority`` / ``queue_deadline`` / ``cache``
+        overrides from kwargs so they are not forwarded to the API.
+        """
+        priority = Priority.parse(kwargs.pop("priority", self._policy.priority))
+        deadline = kwargs.pop("queue_deadline", None)
+        if deadline is None:
+            deadline = (
+                self._policy.queue_deadline if priority == self._policy.priority
+                else default_deadline(priority)
+            )
+        return _CallSettings(
+            temperature=(
+                temperature if temperature is not None else self._retry.default_temperature
+            ),
+            max_tokens=(
+                max_tokens if max_tokens is not None else self._retry.default_max_tokens
+            ),
+            priority=priority,
+            queue_deadline=deadline,
+            use_cache=kwargs.pop("cache", None),
+        )
+
+    def _queue_slot(self, model: str, settings: _CallSettings) -> Any:
+        """Take a slot on the queue of the server serving ``model``.
+
+        Raises:
+            SchedulerBusy: When the request is not admitted.
+        """
+        return get_request_scheduler().slot(
+            self.base_url, model, settings.priority, settings.queue_deadline
+        )
+
     def _raw_chat(
         self,
         model: str,
@@ -336,34 +459,88 @@ class AIClient:
             **kwargs: Additional parameters. Pass json_mode=True to request
                 structured JSON output. Pass disable_thinking=True to suppress
                 extended reasoning on Ollama "thinking" models (e.g. qwen3), which
-                otherwise leave the ``content`` field empty. All other kwargs are
-                forwarded to the API.
+                otherwise leave the ``content`` field empty. When the client has
+                a response cache, calls at temperature 0.3 or below are served
+                from it; pass cache=True to also cache a higher-temperature call
+                whose answer may be reused, or cache=False to always call the
+                model. priority ("interactive"/"batch") and queue_deadline
+                (seconds) override the client's scheduling for this call. All
+                other kwargs are forwarded to the API.
 
         Returns:
             The assistant's response content as a string.
+
+        Raises:
+            SchedulerBusy: When the model server's queue rejects the request.
         """
         if self.client is None:
             raise RuntimeError(
                 "AI client not available. Install openai package: pip install openai"
             )
-        self._apply_mode_kwargs(kwargs)
+        settings = self._call_settings(temperature, max_tokens, kwargs)
+        model = str(model or self.model)
+        cache = self._policy.response_cache
 
-        effective_temp = (
-            temperature if temperature is not None else self._retry.default_temperature
-        )
-        effective_tokens = (
-            max_tokens if max_tokens is not None else self._retry.default_max_tokens
+        t_start = time.monotonic()
+        cache_key: Optional[str] = None
+        if cache is not None and (
+            settings.use_cache
+            or (settings.use_cache is None and settings.temperature <= _CACHEABLE_TEMPERATURE)
+        ):
+            cache_key = response_key(
+                model, messages, settings.temperature, settings.max_tokens, kwargs
+            )
+            cached, tier = cache.get(cache_key)
+            if cached is not None:
+                self._log_call(
+                    messages, cached, _CallOutcome(time.monotonic() - t_start, cache_tier=tier)
+                )
+                return cached
+
+        self._apply_mode_kwargs(kwargs)
+        result, token_count, answered_by = self._complete_with_fallback(
+            messages, model, settings, **kwargs
         )
+        # The key names the requested model; a fallback's answer must not be
+        # served later as that model's.
+        if cache_key is not None and cache is not None and answered_by == model:
+            cache.put(cache_key, answered_by, result)
+        self._log_call(messages, result, _CallOutcome(
+            time.monotonic() - t_start, token_count,
+            "miss" if cache_key is not None else None,
+        ))
+        return result
+
+    def _complete_with_fallback(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        settings: _CallSettings,
+        **kwargs: Any,
+    ) -> Tuple[str, Optional[int], str]:
+        """Try ``model``, then each model in the fallback chain.
+
+        Every attempt holds a slot on the queue of the server serving that
+        model, so a fallback is admitted like any other request.
 
+        Returns:
+            (content, token_count, model that answered).
+
+        Raises:
+            SchedulerBusy: When a model server's queue rejects the request.
+            RuntimeError: The last failure when every model failed.
+        """
         last_exc: RuntimeError = RuntimeError("No models attempted")
-        t_start = time.monotonic()
-        for attempt_model in [model or self.model] + list(self._retry.model_chain):
+        for attempt_model in [model] + list(self._retry.model_chain):
             try:
-                result, token_count = self._attempt_model(
-                    attempt_model, messages, effective_temp, effective_tokens, **kwargs
-                )
-                self._log_call(messages, result, time.monotonic() - t_start, token_count)
-                return result
+                with self._queue_slot(attempt_model, settings):
+                    result, token_count = self._attempt_model(
+                        attempt_model, messages, settings.temperature,
+                        settings.max_tokens, **kwargs,
+                    )
+                return result, token_count, attempt_model
+            except SchedulerBusy:
+                raise
             except RuntimeError as exc:
                 last_exc = exc
                 if "Invalid API key" in str(exc) or "Bad request" in str(exc):
@@ -411,15 +588,33 @@ class AIClient:
             model: Override default model.
             temperature: Override default temperature.
             max_tokens: Override default max_tokens.
-            **kwargs: Additional parameters passed to the API.
+            **kwargs: Additional parameters passed to the API; priority and
+                queue_deadline override the client's scheduling.
 
         Yields:
             Content delta strings as they arrive from the API.
+
+        Raises:
+            SchedulerBusy: When the model server's queue rejects the request.
         """
         if self.client is None:
             raise RuntimeError(
                 "AI client not available. Install openai package: pip install openai"
             )
+        # The slot is held until the stream is exhausted or closed.
+        settings = self._call_settings(temperature, max_tokens, kwargs)
+        with self._queue_slot(model or self.model, settings):
+            yield from self._stream_chunks(messages, model, temperature, max_tokens, **kwargs)
+
+    def _stream_chunks(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        **kwargs: Any,
+    ) -> Generator[str, None, None]:
+        """Yield content deltas from one streaming API request."""
         try:
             stream = self.client.chat.completions.create(
                 model=model or self.model,
@@ -611,6 +806,16 @@ def _get_default_client() -> AIClient:
     return _make_client()
 
 
+def _on_config_change(changed: FrozenSet[str], _config: Any) -> None:
+    """Rebuild the default client on its next use when the AI settings change."""
+    if "ai" in changed:
+        _get_default_client.cache_clear()
+
+
+if CONFIG_AVAILABLE:
+    subscribe_config_changes(_on_config_change)
+
+
 def build_client_for_character(
     char_config: CharacterAIConfig,
     default_client: Optional[AIClientProtocol] = None,
@@ -668,6 +873,41 @@ def get_client_for_task(
     return _get_default_client()
 
 
+def stream_completion(
+    client: AIClientProtocol,
+    messages: List[Dict[str, str]],
+    temperature: Optional[float] = None,
+    max_tokens: Optional[int] = None,
+) -> Iterator[str]:
+    """Stream a chat completion from any AI client, one text delta at a time.
+
+    Clients exposing ``chat_completion_stream`` (AIClient) stream token
+    deltas; other clients, such as test doubles, yield their whole
+    ``chat_completion`` result as a single delta.
+
+    Args:
+        client: AI client to call.
+        messages: List of message dicts with 'role' and 'content'.
+        temperature: Override default temperature.
+        max_tokens: Override default max_tokens.
+
+    Yields:
+        Non-empty content deltas in generation order.
+
+    Raises:
+        RuntimeError: If the streaming request fails.
+    """
+    stream: Optional[Callable[..., Iterator[str]]] = getattr(
+        client, "chat_completion_stream", None
+    )
+    if stream is not None:
+        yield from stream(messages, temperature=temperature, max_tokens=max_tokens)
+        return
+    text = client.chat_completion(messages, temperature=temperature, max_tokens=max_tokens)
+    if text:
+        yield text
+
+
 def call_ai_for_behavior_block(prompt: str) -> dict:
     """Call the LLM to generate a CharacterBehavior block from a prompt.
 
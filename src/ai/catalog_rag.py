@@ -23,7 +23,15 @@ from typing import Dict, List, Optional, Sequence, TypedDict
 
 from src.ai.abilities_rag import page_urls
 from src.ai.rag_system import RAGSystem, get_rag_system
-from src.ai.wiki_scraping import SCRAPING_AVAILABLE, fetch_html, page_content, page_title
+from src.ai.wiki_scraping import (
+    SCRAPING_AVAILABLE,
+    PageSource,
+    as_page,
+    fetch_first_many,
+    fetch_html,
+    page_content,
+    page_title,
+)
 from src.config.config_loader import load_config
 from src.config.config_types import RulesetConfig
 
@@ -96,11 +104,13 @@ def list_catalog(kind: str, *, rag: Optional[RAGSystem] = None) -> List[CatalogE
     if html is None:
         return []
 
-    entries = []
-    for slug in _index_slugs(html, kind):
-        entry = _entry_from_page(client, kind, slug)
-        if entry is not None:
-            entries.append(entry)
+    slugs = _index_slugs(html, kind)
+    pages = fetch_first_many(client, [page_urls(base_url, kind, slug) for slug in slugs])
+    entries = [
+        _entry_from_html(page, kind, slug)
+        for slug, page in zip(slugs, pages)
+        if page is not None
+    ]
     return sorted(entries, key=lambda entry: entry["name"])
 
 
@@ -118,16 +128,30 @@ def _entry_from_page(client: object, kind: str, slug: str) -> Optional[CatalogEn
     base_url = str(getattr(client, "base_url", ""))
     for url in page_urls(base_url, kind, slug):
         html = fetch_html(client, url)
-        if html is None:
-            continue
-        return CatalogEntry(
-            name=_display_name(_entry_title(html) or slug),
-            kind=kind,
-            source=_parse_sourcebook(html),
-        )
+        if html is not None:
+            return _entry_from_html(html, kind, slug)
     return None
 
 
+def _entry_from_html(html: str, kind: str, slug: str) -> CatalogEntry:
+    """Build one catalogue entry from its fetched wiki page.
+
+    Args:
+        html: Raw entry page HTML.
+        kind: Catalogue kind.
+        slug: The entry's page slug, used when the page has no title.
+
+    Returns:
+        The entry.
+    """
+    page = as_page(html)
+    return CatalogEntry(
+        name=_display_name(_entry_title(page) or slug),
+        kind=kind,
+        source=_parse_sourcebook(page),
+    )
+
+
 def get_sourcebook(kind: str, name: str, *, rag: Optional[RAGSystem] = None) -> str:
     """Resolve the sourcebook that introduced one catalogue entry.
 
@@ -242,16 +266,16 @@ def _index_slugs(html: str, kind: str) -> List[str]:
     return slugs
 
 
-def _parse_sourcebook(html: str) -> str:
+def _parse_sourcebook(page: PageSource) -> str:
     """Read the sourcebook title from a rules page's leading source line.
 
     Args:
-        html: Raw entry page HTML.
+        page: Raw entry page HTML or its ParsedPage.
 
     Returns:
         The sourcebook title, or an empty string when absent.
     """
-    content = page_content(html)
+    content = page_content(page)
     if content is None:
         return ""
     for paragraph in content.find_all("p"):
@@ -261,16 +285,16 @@ def _parse_sourcebook(html: str) -> str:
     return ""
 
 
-def _entry_title(html: str) -> str:
+def _entry_title(page: PageSource) -> str:
     """Read an entry page's own title, dropping the site-name suffix.
 
     Args:
-        html: Raw entry page HTML.
+        page: Raw entry page HTML or its ParsedPage.
 
     Returns:
         The page title (e.g. "Lords' Alliance Vassal"), or an empty string.
     """
-    return page_title(html).split(_TITLE_SEPARATOR)[0].strip()
+    return page_title(page).split(_TITLE_SEPARATOR)[0].strip()
 
 
 def _display_name(raw: str) -> str:
@@ -2,15 +2,49 @@
 
 ComfyUI runs as a host process (like Ollama), never in DDEV, so the sidecar
 reaches it directly. This client drives ComfyUI's workflow API: queue a prompt
-(a workflow in API-JSON form), poll history until the run finishes, then fetch
-the produced image bytes.
+(a workflow in API-JSON form), wait for the run to finish, then fetch the
+produced image bytes.
+
+Completion and sampler progress come from ComfyUI's ``/ws`` event stream when
+the ``websockets`` package (installed with ``uvicorn[standard]``) is present;
+otherwise, or when the socket drops, the client polls ``/history``. All HTTP
+calls share one keep-alive session.
 """
 
+import json
 import time
-from typing import Any, Dict, Optional
+import uuid
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple, Type
 
 import requests
 
+if TYPE_CHECKING:
+    from websockets.sync.client import ClientConnection
+
+# Opens the event stream; stays None without websockets, in which case
+# polling /history still works.
+_ws_connect: Optional[Callable[..., "ClientConnection"]] = None
+# What a failed connect or a dropped stream raises.
+_ws_errors: Tuple[Type[Exception], ...] = (OSError,)
+try:
+    from websockets.exceptions import WebSocketException
+    from websockets.sync.client import connect
+except ImportError:
+    pass
+else:
+    _ws_connect = connect
+    _ws_errors = (OSError, WebSocketException)
+
+# Called with (value, max) as the sampler advances.
+ProgressCallback = Callable[[int, int], None]
+
+# Seconds without a websocket event before /history is checked directly, in
+# case a completion event was missed.
+_WS_IDLE_CHECK = 15.0
+
+# Seconds between /history polls when no event stream is available.
+_POLL_INTERVAL = 1.0
+
 
 class ComfyUIClient:
     """Minimal client for ComfyUI's HTTP workflow API."""
@@ -25,11 +59,14 @@ class ComfyUIClient:
         """
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
+        # Identifies this client's prompts on the event stream.
+        self.client_id = uuid.uuid4().hex
+        self._session = requests.Session()
 
     def is_available(self) -> bool:
         """Return True when the ComfyUI server responds to a stats probe."""
         try:
-            resp = requests.get(f"{self.base_url}/system_stats", timeout=5)
+            resp = self._session.get(f"{self.base_url}/system_stats", timeout=5)
             return resp.status_code == 200
         except requests.RequestException:
             return False
@@ -45,7 +82,7 @@ class ComfyUIClient:
             The stored filename ComfyUI reports, or None on failure.
         """
         try:
-            resp = requests.post(
+            resp = self._session.post(
                 f"{self.base_url}/upload/image",
                 files={"image": (name, data, "image/png")},
                 data={"overwrite": "true"},
@@ -67,7 +104,7 @@ class ComfyUIClient:
             True if ComfyUI accepted the free request, False otherwise.
         """
         try:
-            resp = requests.post(
+            resp = self._session.post(
                 f"{self.base_url}/free",
                 json={"unload_models": True, "free_memory": True},
                 timeout=30,
@@ -76,19 +113,30 @@ class ComfyUIClient:
         except requests.RequestException:
             return False
 
-    def generate(self, workflow: Dict[str, Any]) -> Optional[bytes]:
+    def generate(
+        self, workflow: Dict[str, Any], on_progress: Optional[ProgressCallback] = None
+    ) -> Optional[bytes]:
         """Queue a workflow, wait for it, and return the first output image.
 
         Args:
             workflow: The ComfyUI workflow in API JSON (node-id -> node) form.
+            on_progress: Optional callback receiving (value, max) sampler
+                progress; only called when the event stream is available.
 
         Returns:
             PNG bytes of the first output image, or None on failure/timeout.
         """
-        prompt_id = self._queue(workflow)
-        if prompt_id is None:
-            return None
-        image_ref = self._await_image(prompt_id)
+        # Subscribe before queueing so a fast (fully cached) run cannot finish
+        # before its events are being listened for.
+        socket = self._open_events()
+        try:
+            prompt_id = self._queue(workflow)
+            if prompt_id is None:
+                return None
+            image_ref = self._await_image(prompt_id, socket, on_progress)
+        finally:
+            if socket is not None:
+                socket.close()
         if image_ref is None:
             return None
         return self._view(image_ref)
@@ -96,30 +144,104 @@ class ComfyUIClient:
     def _queue(self, workflow: Dict[str, Any]) -> Optional[str]:
         """Submit a workflow to /prompt, returning the prompt id."""
         try:
-            resp = requests.post(
-                f"{self.base_url}/prompt", json={"prompt": workflow}, timeout=30
+            resp = self._session.post(
+                f"{self.base_url}/prompt",
+                json={"prompt": workflow, "client_id": self.client_id},
+                timeout=30,
             )
             resp.raise_for_status()
             return str(resp.json()["prompt_id"])
         except (requests.RequestException, KeyError, ValueError):
             return None
 
-    def _await_image(self, prompt_id: str) -> Optional[Dict[str, str]]:
-        """Poll /history until the run produces an output image reference."""
+    def _open_events(self) -> Optional["ClientConnection"]:
+        """Connect to the /ws event stream, or None when it is unavailable."""
+        if _ws_connect is None:
+            return None
+        url = self.base_url.replace("http", "ws", 1) + f"/ws?clientId={self.client_id}"
+        try:
+            return _ws_connect(url, open_timeout=5, max_size=None)
+        except _ws_errors:
+            return None
+
+    def _await_image(
+        self,
+        prompt_id: str,
+        socket: Optional["ClientConnection"] = None,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> Optional[Dict[str, str]]:
+        """Wait until the run produces an output image reference.
+
+        Follows the event stream while it is healthy and falls back to polling
+        /history once it is not.
+        """
         deadline = time.monotonic() + self.timeout
+        if socket is not None:
+            outcome = self._follow_events(socket, prompt_id, deadline, on_progress)
+            if outcome is False:
+                return None
+            if outcome is True:
+                history = self._history(prompt_id)
+                return self._first_image(history.get("outputs", {})) if history else None
         while time.monotonic() < deadline:
             history = self._history(prompt_id)
             if history:
                 image = self._first_image(history.get("outputs", {}))
                 if image is not None:
                     return image
-            time.sleep(1.0)
+            time.sleep(_POLL_INTERVAL)
         return None
 
+    def _follow_events(
+        self,
+        socket: "ClientConnection",
+        prompt_id: str,
+        deadline: float,
+        on_progress: Optional[ProgressCallback],
+    ) -> Optional[bool]:
+        """Read the event stream until the prompt finishes.
+
+        Returns:
+            True when the run finished, False when it failed or was
+            interrupted, None when the stream broke or the deadline passed
+            (the caller then polls /history).
+        """
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            try:
+                message = socket.recv(timeout=min(remaining, _WS_IDLE_CHECK))
+            except TimeoutError:
+                history = self._history(prompt_id)
+                if history and self._first_image(history.get("outputs", {})) is not None:
+                    return True
+                continue
+            except _ws_errors:
+                return None
+            if not isinstance(message, str):
+                continue  # Binary frames are latent previews.
+            try:
+                event = json.loads(message)
+            except ValueError:
+                continue
+            data = event.get("data") or {}
+            if data.get("prompt_id") != prompt_id:
+                continue
+            kind = event.get("type")
+            if kind == "progress" and on_progress is not None:
+                on_progress(int(data.get("value", 0)), int(data.get("max", 0)))
+            elif kind == "execution_success" or (
+                kind == "executing" and data.get("node") is None
+            ):
+                return True
+            elif kind in ("execution_error", "execution_interrupted"):
+                return False
+
     def _history(self, prompt_id: str) -> Optional[Dict[str, Any]]:
         """Fetch the history entry for a prompt id, or None if not ready."""
         try:
-            resp = requests.get(f"{self.base_url}/history/{prompt_id}", timeout=10)
+            resp = self._session.get(f"{self.base_url}/history/{prompt_id}", timeout=10)
             resp.raise_for_status()
             entry = resp.json().get(prompt_id)
             return entry if isinstance(entry, dict) else None
@@ -144,7 +266,7 @@ class ComfyUIClient:
     def _view(self, image_ref: Dict[str, str]) -> Optional[bytes]:
         """Fetch the image bytes for an output reference via /view."""
         try:
-            resp = requests.get(f"{self.base_url}/view", params=image_ref, timeout=30)
+            resp = self._session.get(f"{self.base_url}/view", params=image_ref, timeout=30)
             resp.raise_for_status()
             return resp.content
         except requests.RequestException:
@@ -0,0 +1,704 @@
+"""
+Embedded vector store: the MilvusClient API over local NumPy files.
+
+Each collection is a float32 ``.npy`` matrix of unit-length vectors, opened
+memory-mapped, plus a JSON file of primary keys and metadata columns. Search
+is a vectorised cosine top-k; collections whose COLLECTIONS index is IVF are
+partitioned by spherical k-means once they are large enough, and a query
+then scans only the nearest partitions. ``expr`` filters support the Milvus
+forms used by this project: ``field == "text"``, ``field == 3`` and
+``field in [1, 2]``, joined with ``and``.
+
+Writes are held in memory and become durable on commit(), mirroring the
+deferred flushes of MilvusClient. Select it with MILVUS_BACKEND=embedded.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from src.ai.milvus_collections import COLLECTIONS, OUTPUT_FIELDS
+from src.ai.vector_store import CollectionSetMixin
+from src.config.config_loader import load_config
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Sub-directory of paths.milvus_data_dir holding the collection files.
+_STORE_DIR_NAME = "embedded"
+
+# IVF lists need this many vectors each before partitioning pays off; smaller
+# collections (or fewer lists) are scanned flat.
+_MIN_ROWS_PER_LIST = 39
+_KMEANS_ITERATIONS = 10
+# Partitions scanned per query; matches MilvusClient's search nprobe.
+_NPROBE = 16
+# Rows scored per block when assigning vectors to partitions.
+_ASSIGN_BLOCK = 8192
+
+_TERM = re.compile(
+    r'\s*(\w+)\s*(?:==\s*(?:"((?:[^"\\]|\\.)*)"|(-?\d+(?:\.\d+)?))'
+    r"|in\s*\[([^\]]*)\])\s*"
+)
+_AND = re.compile(r"and\b", re.IGNORECASE)
+
+# A compiled filter term: (field, allowed values).
+_Term = Tuple[str, List[Any]]
+
+
+def _parse_expr(expr: str) -> List[_Term]:
+    """Parse a Milvus filter expression into ``(field, values)`` terms.
+
+    Args:
+        expr: Expression such as ``campaign_name == "Main" and chunk_index in [1, 2]``.
+
+    Returns:
+        Terms that must all match; empty for an empty expression.
+
+    Raises:
+        ValueError: When the expression uses unsupported syntax.
+    """
+    terms: List[_Term] = []
+    pos = 0
+    text = expr.strip()
+    while pos < len(text):
+        match = _TERM.match(text, pos)
+        if match is None:
+            raise ValueError(f"Unsupported filter expression: {expr!r}")
+        field, quoted, number, listed = match.groups()
+        if listed is not None:
+            values = json.loads(f"[{listed}]")
+        elif quoted is not None:
+            values = [json.loads(f'"{quoted}"')]
+        else:
+            values = [json.loads(number)]
+        terms.append((field, values))
+        pos = match.end()
+        if pos < len(text):
+            joiner = _AND.match(text, pos)
+            if joiner is None:
+                raise ValueError(f"Unsupported filter expression: {expr!r}")
+            pos = joiner.end()
+    return terms
+
+
+def _normalise(vectors: "np.ndarray") -> "np.ndarray":
+    """Scale rows to unit length so a dot product is the cosine similarity."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32)
+
+
+# Identifies one committed copy of a collection: (inode, mtime) of its
+# metadata file, which every save replaces last.
+_Version = Tuple[int, int]
+
+
+@dataclass(frozen=True)
+class _CollectionLayout:
+    """Where a collection is stored and what its rows hold.
+
+    Attributes:
+        vectors_path: The float32 ``.npy`` matrix of unit vectors
+        meta_path: JSON of primary keys, next id and metadata columns
+        dim: Embedding dimension
+        fields: Metadata columns (every non-vector, non-primary field)
+        ivf_lists: IVF list count from the index definition, 0 for flat
+    """
+
+    vectors_path: Path
+    meta_path: Path
+    dim: int
+    fields: Tuple[str, ...]
+    ivf_lists: int
+
+    @classmethod
+    def for_schema(
+        cls, directory: Path, name: str, schema_def: Dict[str, Any], dim: int
+    ) -> "_CollectionLayout":
+        """Build the layout of a COLLECTIONS entry stored under ``directory``."""
+        index = schema_def.get("index", {})
+        return cls(
+            vectors_path=directory / f"{name}.npy",
+            meta_path=directory / f"{name}.json",
+            dim=dim,
+            fields=tuple(
+                fld["name"]
+                for fld in schema_def["fields"]
+                if fld["dtype"] != "FLOAT_VECTOR" and not fld.get("is_primary")
+            ),
+            ivf_lists=(
+                int(index.get("nlist", 0))
+                if str(index.get("index_type", "")).startswith("IVF")
+                else 0
+            ),
+        )
+
+    def version(self) -> Optional[_Version]:
+        """Return the committed copy's version, or None when there is none."""
+        try:
+            stat = self.meta_path.stat()
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+
+    def read(self) -> Optional["_Rows"]:
+        """Load the committed rows with the vectors memory-mapped.
+
+        Returns:
+            The rows, or None when the files are missing, unreadable, or
+            were written with another embedding dimension.
+        """
+        if not self.meta_path.exists() or not self.vectors_path.exists():
+            return None
+        try:
+            meta = json.loads(self.meta_path.read_text(encoding="utf-8"))
+            vectors = np.load(self.vectors_path, mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        if vectors.ndim != 2 or vectors.shape[1] != self.dim:
+            return None
+        rows = _Rows(self.dim, self.fields)
+        rows.vectors = vectors
+        rows.ids = np.asarray(meta.get("ids", []), dtype=np.int64)
+        rows.next_id = int(meta.get("next_id", 1))
+        columns = meta.get("columns", {})
+        rows.columns = {
+            field: list(columns.get(field, [None] * len(rows.ids)))
+            for field in self.fields
+        }
+        return rows
+
+    def write(self, rows: "_Rows") -> None:
+        """Replace the committed copy with ``rows``, re-opening the vectors mapped."""
+        rows.settle()
+        self.vectors_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_vectors = self.vectors_path.with_suffix(".npy.tmp")
+        tmp_meta = self.meta_path.with_suffix(".json.tmp")
+        with open(tmp_vectors, "wb") as handle:
+            np.save(handle, np.ascontiguousarray(rows.vectors, dtype=np.float32))
+        meta = {"ids": rows.ids.tolist(), "next_id": rows.next_id, "columns": rows.columns}
+        tmp_meta.write_text(json.dumps(meta), encoding="utf-8")
+        # Release the old mapping so the file can be replaced (Windows).
+        rows.vectors = np.empty((0, self.dim), dtype=np.float32)
+        os.replace(tmp_vectors, self.vectors_path)
+        os.replace(tmp_meta, self.meta_path)
+        rows.vectors = np.load(self.vectors_path, mmap_mode="r")
+
+    def remove(self) -> None:
+        """Delete the collection files."""
+        for path in (self.vectors_path, self.meta_path):
+            if path.exists():
+                path.unlink()
+
+
+class _Rows:
+    """Row data: unit vectors, primary keys and metadata columns.
+
+    Inserted vectors are buffered and joined onto the matrix in one
+    concatenation when the rows are next read, so a run of inserts copies
+    the matrix once instead of once per insert.
+
+    Attributes:
+        vectors: Settled vectors, one row per stored row (may be mmapped)
+        ids: Primary keys of the settled vectors
+        pending: Inserted (ids, vectors) blocks not yet settled
+        columns: Metadata values per field, covering pending rows too
+        next_id: Next primary key to hand out
+    """
+
+    def __init__(self, dim: int, fields: Tuple[str, ...]) -> None:
+        self.vectors: "np.ndarray" = np.empty((0, dim), dtype=np.float32)
+        self.ids: "np.ndarray" = np.empty(0, dtype=np.int64)
+        self.pending: List[Tuple["np.ndarray", "np.ndarray"]] = []
+        self.columns: Dict[str, List[Any]] = {field: [] for field in fields}
+        self.next_id = 1
+
+    def count(self) -> int:
+        """Number of rows, pending ones included."""
+        return int(self.ids.shape[0]) + sum(len(ids) for ids, _ in self.pending)
+
+    def append(self, block: "_Insert") -> None:
+        """Buffer an inserted block."""
+        self.pending.append((block.ids, block.vectors))
+        for field, values in self.columns.items():
+            values.extend(row.get(field) for row in block.rows)
+        self.next_id = max(self.next_id, int(block.ids[-1]) + 1)
+
+    def settle(self) -> None:
+        """Join buffered inserts onto the vectors and ids."""
+        if not self.pending:
+            return
+        self.ids = np.concatenate([self.ids] + [ids for ids, _ in self.pending])
+        self.vectors = np.concatenate(
+            [np.asarray(self.vectors)] + [vectors for _, vectors in self.pending]
+        )
+        self.pending = []
+
+    def keep(self, keep: "np.ndarray") -> None:
+        """Drop every row whose ``keep`` flag is False."""
+        self.settle()
+        self.vectors = np.asarray(self.vectors)[keep]
+        self.ids = self.ids[keep]
+        kept = np.flatnonzero(keep)
+        self.columns = {
+            field: [values[i] for i in kept] for field, values in self.columns.items()
+        }
+
+
+class _Insert(NamedTuple):
+    """One insert, kept until commit so it can be replayed."""
+
+    ids: "np.ndarray"
+    vectors: "np.ndarray"
+    rows: List[Dict[str, Any]]
+
+
+# An uncommitted write: an insert, or the filter expression of a delete.
+_Write = Union[_Insert, str]
+
+
+class EmbeddedCollection:
+    """One collection: vectors, primary keys, metadata columns and IVF lists.
+
+    Writes are kept in memory until save(). Another process (e.g. a CLI
+    reindex while the sidecar runs) may commit the same collection in the
+    meantime: with no writes pending here the newer copy is simply re-read,
+    and otherwise save() re-reads it and replays this process's writes on
+    top, so neither side's commit is lost.
+
+    Attributes:
+        name: Fully qualified collection name.
+    """
+
+    def __init__(self, directory: Path, name: str, schema_def: Dict[str, Any], dim: int):
+        """
+        Args:
+            directory: Folder holding the collection files.
+            name: Fully qualified collection name (file stem).
+            schema_def: Entry from COLLECTIONS.
+            dim: Embedding dimension.
+        """
+        self.name = name
+        self._layout = _CollectionLayout.for_schema(directory, name, schema_def, dim)
+        self._rows = _Rows(dim, self._layout.fields)
+        self._unsaved: List[_Write] = []
+        self._needs_write = False
+        self._version: Optional[_Version] = None
+        self._partitions: Optional[Tuple["np.ndarray", List["np.ndarray"]]] = None
+        self._load()
+
+    @property
+    def num_entities(self) -> int:
+        """Number of stored rows."""
+        return self._rows.count()
+
+    def _load(self) -> None:
+        """Read the committed copy; a missing or unusable one is written on save."""
+        self._version = self._layout.version()
+        rows = self._layout.read()
+        self._needs_write = rows is None
+        self._rows = rows if rows is not None else _Rows(self._layout.dim, self._layout.fields)
+        self._partitions = None
+
+    def refresh(self) -> None:
+        """Re-read the collection if another process committed it since."""
+        if not self._unsaved and self._layout.version() != self._version:
+            self._load()
+
+    def save(self) -> None:
+        """Write pending changes; the vectors are re-opened memory-mapped."""
+        if not self._unsaved and not self._needs_write:
+            return
+        if self._layout.version() != self._version:
+            writes = self._unsaved
+            self._load()
+            for write in writes:
+                self._replay(write)
+        self._layout.write(self._rows)
+        self._version = self._layout.version()
+        self._unsaved = []
+        self._needs_write = False
+
+    def _replay(self, write: _Write) -> None:
+        """Apply an uncommitted write again, on a freshly read copy."""
+        if isinstance(write, str):
+            self._remove(write)
+            return
+        self._rows.settle()
+        if np.isin(write.ids, self._rows.ids).any():
+            # The other writer handed out the same keys: take fresh ones.
+            fresh = np.arange(self._rows.next_id, self._rows.next_id + len(write.ids))
+            logger.warning(
+                "%s: primary keys %s were reissued as %s after a concurrent commit",
+                self.name, write.ids.tolist(), fresh.tolist(),
+            )
+            write = write._replace(ids=fresh.astype(np.int64))
+        self._rows.append(write)
+
+    def insert(self, rows: List[Dict[str, Any]]) -> List[int]:
+        """Append rows and return their new primary keys.
+
+        Raises:
+            ValueError: When an embedding does not have the configured dimension.
+        """
+        vectors = np.asarray([row["embedding"] for row in rows], dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape[1] != self._layout.dim:
+            raise ValueError(
+                f"{self.name}: expected {self._layout.dim}-dim embeddings, "
+                f"got shape {vectors.shape}"
+            )
+        start = self._rows.next_id
+        block = _Insert(
+            np.arange(start, start + len(rows), dtype=np.int64), _normalise(vectors), rows
+        )
+        self._rows.append(block)
+        self._unsaved.append(block)
+        self._partitions = None
+        return block.ids.tolist()
+
+    def delete(self, expr: str) -> None:
+        """Remove every row matching a filter expression."""
+        if self._remove(expr):
+            self._unsaved.append(expr)
+
+    def _remove(self, expr: str) -> bool:
+        """Drop the rows matching ``expr``; True when any were dropped."""
+        doomed = self.mask(expr)
+        if doomed is None or not doomed.any():
+            return False
+        self._rows.keep(~doomed)
+        self._partitions = None
+        return True
+
+    def mask(self, expr: str) -> Optional["np.ndarray"]:
+        """Return the rows matching ``expr``, or None for no filter."""
+        terms = _parse_expr(expr) if expr else []
+        if not terms:
+            return None
+        self._rows.settle()
+        result = np.ones(self.num_entities, dtype=bool)
+        for field, values in terms:
+            result &= self._term_mask(field, values)
+        return result
+
+    def _term_mask(self, field: str, values: List[Any]) -> "np.ndarray":
+        """Rows whose ``field`` is one of ``values``."""
+        if field == "id":
+            return np.isin(self._rows.ids, np.asarray(values, dtype=np.int64))
+        if field not in self._rows.columns:
+            raise ValueError(f"{self.name}: unknown filter field {field!r}")
+        allowed = set(values)
+        column = self._rows.columns[field]
+        return np.fromiter((value in allowed for value in column), dtype=bool, count=len(column))
+
+    def search(
+        self, queries: "np.ndarray", top_k: int, mask: Optional["np.ndarray"]
+    ) -> List[List[Tuple[int, float]]]:
+        """Return ``(row, score)`` pairs per query, best first."""
+        if self.num_entities == 0 or top_k <= 0:
+            return [[] for _ in range(len(queries))]
+        partitions = self.partitions()
+        if partitions is None:
+            return self._scan(queries, np.arange(self.num_entities), top_k, mask)
+        centroids, lists = partitions
+        nprobe = min(_NPROBE, len(lists))
+        nearest = np.argsort(-(queries @ centroids.T), axis=1)[:, :nprobe]
+        results = []
+        for query, probes in zip(queries, nearest):
+            rows = np.concatenate([lists[p] for p in probes])
+            results.extend(self._scan(query[None, :], rows, top_k, mask))
+        return results
+
+    def _scan(
+        self,
+        queries: "np.ndarray",
+        rows: "np.ndarray",
+        top_k: int,
+        mask: Optional["np.ndarray"],
+    ) -> List[List[Tuple[int, float]]]:
+        """Exact cosine top-k of ``queries`` over the given rows."""
+        if mask is not None:
+            rows = rows[mask[rows]]
+        if rows.size == 0:
+            return [[] for _ in range(len(queries))]
+        self._rows.settle()
+        scores = queries @ np.asarray(self._rows.vectors[rows]).T
+        k = min(top_k, rows.size)
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        results = []
+        for query_scores, candidates in zip(scores, top):
+            ordered = candidates[np.argsort(-query_scores[candidates])]
+            results.append([(int(rows[i]), float(query_scores[i])) for i in ordered])
+        return results
+
+    def partitions(self) -> Optional[Tuple["np.ndarray", List["np.ndarray"]]]:
+        """Return the IVF centroids and per-list row indices.
+
+        Built once per change, and only for IVF collections with enough rows
+        per list; None means searches scan every row.
+        """
+        nlist = min(self._layout.ivf_lists, self.num_entities // _MIN_ROWS_PER_LIST)
+        if nlist < 2:
+            return None
+        if self._partitions is not None and len(self._partitions[1]) == nlist:
+            return self._partitions
+        self._rows.settle()
+        vectors = np.asarray(self._rows.vectors)
+        rng = np.random.default_rng(0)
+        centroids = vectors[rng.choice(len(vectors), nlist, replace=False)].copy()
+        assign = self._assign(vectors, centroids)
+        for _ in range(_KMEANS_ITERATIONS):
+            for cluster in range(nlist):
+                members = vectors[assign == cluster]
+                if len(members):
+                    centroids[cluster] = members.sum(axis=0)
+            centroids = _normalise(centroids)
+            assign = self._assign(vectors, centroids)
+        lists = [np.flatnonzero(assign == cluster) for cluster in range(nlist)]
+        self._partitions = (centroids, lists)
+        return self._partitions
+
+    @staticmethod
+    def _assign(vectors: "np.ndarray", centroids: "np.ndarray") -> "np.ndarray":
+        """Index of the nearest centroid for every vector, in blocks."""
+        return np.concatenate([
+            np.argmax(vectors[start:start + _ASSIGN_BLOCK] @ centroids.T, axis=1)
+            for start in range(0, len(vectors), _ASSIGN_BLOCK)
+        ])
+
+    def row(self, index: int, fields: List[str]) -> Dict[str, Any]:
+        """Return the requested metadata of one row."""
+        self._rows.settle()
+        row: Dict[str, Any] = {}
+        for field in fields:
+            if field == "id":
+                row[field] = int(self._rows.ids[index])
+            elif field in self._rows.columns:
+                row[field] = self._rows.columns[field][index]
+        return row
+
+    def drop_files(self) -> None:
+        """Delete the collection files."""
+        self._layout.remove()
+
+
+class EmbeddedVectorStore(CollectionSetMixin):
+    """In-process VectorStore over memory-mapped NumPy files.
+
+    Implements the MilvusClient API, so it serves as a drop-in backend for
+    single-machine deployments and as a test double for the retrieval stack.
+
+    Attributes:
+        connected: True once connect() succeeded.
+    """
+
+    def __init__(self, directory: Optional[Path] = None) -> None:
+        """
+        Args:
+            directory: Folder for the collection files. Defaults to
+                ``<paths.milvus_data_dir>/embedded``.
+        """
+        cfg = load_config()
+        self._cfg = cfg.milvus
+        self._directory = Path(
+            directory
+            if directory is not None
+            else cfg.paths.milvus_data_dir / _STORE_DIR_NAME
+        )
+        self.connected: bool = False
+        self._lock = threading.RLock()
+        self._collections: Dict[str, EmbeddedCollection] = {}
+
+    @property
+    def directory(self) -> Path:
+        """Folder holding the collection files."""
+        return self._directory
+
+    def connect(self) -> bool:
+        """Open the store.
+
+        Returns:
+            True on success, False when NumPy is missing or the folder
+            cannot be created.
+        """
+        if not NUMPY_AVAILABLE:
+            return False
+        try:
+            self._directory.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            return False
+        self.connected = True
+        return True
+
+    def disconnect(self) -> None:
+        """Persist pending writes and release the loaded collections."""
+        if not self.connected:
+            return
+        self.commit()
+        with self._lock:
+            self._collections.clear()
+            self.connected = False
+
+    def is_available(self) -> bool:
+        """Return True when the store is open."""
+        return self.is_healthy()
+
+    def is_healthy(self) -> bool:
+        """Return True when the store is open; there is no server to ping."""
+        return self.connected
+
+    def collection_name(self, base: str) -> str:
+        """Return the prefixed collection name (also the file stem)."""
+        return f"{self._cfg.collection_prefix}_{base}"
+
+    def _open(self, base: str, schema_def: Dict[str, Any]) -> EmbeddedCollection:
+        """Load a collection into the handle cache (caller holds the lock)."""
+        collection = EmbeddedCollection(
+            self._directory, self.collection_name(base), schema_def, self._cfg.embedding.dim
+        )
+        self._collections[base] = collection
+        return collection
+
+    def ensure_collection(
+        self, base: str, schema_def: Dict[str, Any]
+    ) -> Optional[EmbeddedCollection]:
+        """Return a collection, creating it when it does not exist yet.
+
+        Args:
+            base: Unqualified collection name.
+            schema_def: Entry from COLLECTIONS.
+
+        Returns:
+            The collection handle, or None when the store is not open.
+        """
+        if not self.connected:
+            return None
+        with self._lock:
+            existing = self.get_collection(base)
+            if existing is not None:
+                return existing
+            return self._open(base, schema_def)
+
+    def drop_collection(self, base: str) -> None:
+        """Drop one collection and its files."""
+        if not self.connected:
+            return
+        with self._lock:
+            collection = self._collections.pop(base, None)
+            if collection is None and base in COLLECTIONS:
+                collection = EmbeddedCollection(
+                    self._directory,
+                    self.collection_name(base),
+                    COLLECTIONS[base],
+                    self._cfg.embedding.dim,
+                )
+            if collection is not None:
+                collection.drop_files()
+
+    def get_collection(self, base: str) -> Optional[EmbeddedCollection]:
+        """Return an existing collection handle, or None.
+
+        Args:
+            base: Unqualified collection name.
+
+        Returns:
+            The loaded collection, or None when the store is closed or the
+            collection was never created.
+        """
+        if not self.connected:
+            return None
+        with self._lock:
+            collection = self._collections.get(base)
+            if collection is not None:
+                collection.refresh()
+                return collection
+            stem = self.collection_name(base)
+            if base not in COLLECTIONS or not (self._directory / f"{stem}.json").exists():
+                return None
+            return self._open(base, COLLECTIONS[base])
+
+    def commit(self) -> None:
+        """Write every collection changed since the last commit."""
+        with self._lock:
+            for collection in self._collections.values():
+                collection.save()
+
+    def insert(self, base: str, rows: List[Dict[str, Any]]) -> int:
+        """Insert rows; returns the number stored, 0 when unavailable."""
+        return len(self.insert_returning_ids(base, rows))
+
+    def insert_returning_ids(self, base: str, rows: List[Dict[str, Any]]) -> List[int]:
+        """Insert rows and return their primary keys in row order."""
+        with self._lock:
+            collection = self.get_collection(base)
+            if collection is None or not rows:
+                return []
+            return collection.insert(rows)
+
+    def search(
+        self,
+        base: str,
+        query_vector: List[float],
+        top_k: int = 5,
+        expr: str = "",
+    ) -> List[Dict[str, Any]]:
+        """Return the top_k cosine matches for one query vector."""
+        return self.search_many(base, [query_vector], top_k=top_k, expr=expr)[0]
+
+    def search_many(
+        self,
+        base: str,
+        query_vectors: List[List[float]],
+        top_k: int = 5,
+        expr: str = "",
+    ) -> List[List[Dict[str, Any]]]:
+        """Search several query vectors at once.
+
+        Returns:
+            One result list per query vector, each hit carrying the
+            collection's OUTPUT_FIELDS and a "score"; lists are empty when
+            the collection is unavailable or the vectors have the wrong
+            dimension.
+        """
+        empty: List[List[Dict[str, Any]]] = [[] for _ in query_vectors]
+        with self._lock:
+            collection = self.get_collection(base)
+            if collection is None or not query_vectors:
+                return empty
+            queries = np.asarray(query_vectors, dtype=np.float32)
+            if queries.ndim != 2 or queries.shape[1] != self._cfg.embedding.dim:
+                return empty
+            fields = OUTPUT_FIELDS.get(base, [])
+            matches = collection.search(_normalise(queries), top_k, collection.mask(expr))
+            return [
+                [dict(collection.row(index, fields), score=score) for index, score in hits]
+                for hits in matches
+            ]
+
+    def delete_by_source(self, base: str, source_field: str, source_value: str) -> None:
+        """Remove all rows whose ``source_field`` equals ``source_value``."""
+        self._delete(base, f"{source_field} == {json.dumps(source_value)}")
+
+    def delete_by_ids(self, base: str, ids: List[int]) -> None:
+        """Remove rows by primary key."""
+        if ids:
+            self._delete(base, f"id in [{', '.join(str(int(pk)) for pk in ids)}]")
+
+    def _delete(self, base: str, expr: str) -> None:
+        """Remove rows matching ``expr`` from one collection."""
+        with self._lock:
+            collection = self.get_collection(base)
+            if collection is not None:
+                collection.delete(expr)
@@ -0,0 +1,116 @@
+"""
+Persistent content-addressed cache for embedding vectors.
+
+Vectors are keyed by (embedding model, sha256 of the chunk text) so an
+unchanged paragraph is never sent to the embedding endpoint twice, even across
+process restarts. Storage is a single SQLite file; vectors are packed as
+float32 bytes, which is the precision Milvus stores them at anyway.
+"""
+
+import hashlib
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.utils.sqlite_cache import SqliteCacheFile
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS embeddings ("
+    " model TEXT NOT NULL,"
+    " text_hash TEXT NOT NULL,"
+    " vector BLOB NOT NULL,"
+    " PRIMARY KEY (model, text_hash))"
+)
+
+# SQLite caps the number of bound parameters per statement; stay well below it.
+_LOOKUP_CHUNK = 500
+
+
+def text_hash(text: str) -> str:
+    """Return the sha256 hex digest used as the cache key for a chunk.
+
+    Args:
+        text: Chunk text exactly as it is sent to the embedding endpoint.
+
+    Returns:
+        64-character hex digest.
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _pack(vector: List[float]) -> bytes:
+    """Pack a vector as float32 bytes."""
+    return array("f", vector).tobytes()
+
+
+def _unpack(blob: bytes) -> List[float]:
+    """Unpack float32 bytes into a list of floats."""
+    values = array("f")
+    values.frombytes(blob)
+    return values.tolist()
+
+
+class EmbeddingCache:
+    """SQLite-backed (model, text hash) -> vector store.
+
+    The connection is opened lazily and shared across threads behind a lock,
+    so one instance can serve a pipeline whose batches run concurrently.
+    All failures degrade to cache misses - a broken cache file must never
+    stop indexing.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        """
+        Args:
+            db_path: Location of the SQLite file; parent dirs are created.
+        """
+        self._db = SqliteCacheFile(db_path, [_SCHEMA])
+
+    def get_many(self, model: str, hashes: Iterable[str]) -> Dict[str, List[float]]:
+        """Look up cached vectors for a set of text hashes.
+
+        Args:
+            model: Embedding model name the vectors were produced with.
+            hashes: Text hashes from text_hash().
+
+        Returns:
+            Mapping of hash -> vector for every hash found in the cache.
+        """
+        wanted = list(dict.fromkeys(hashes))
+        found: Dict[str, List[float]] = {}
+        for start in range(0, len(wanted), _LOOKUP_CHUNK):
+            chunk = wanted[start:start + _LOOKUP_CHUNK]
+            marks = ",".join("?" for _ in chunk)
+            rows = self._db.fetchall(
+                "SELECT text_hash, vector FROM embeddings"
+                f" WHERE model = ? AND text_hash IN ({marks})",
+                [model, *chunk],
+            )
+            for digest, blob in rows:
+                found[digest] = _unpack(blob)
+        return found
+
+    def put_many(self, model: str, entries: Iterable[Tuple[str, List[float]]]) -> None:
+        """Store vectors for text hashes, replacing any existing entries.
+
+        Args:
+            model: Embedding model name the vectors were produced with.
+            entries: (text hash, vector) pairs; empty vectors are skipped.
+        """
+        rows = [(model, digest, _pack(vec)) for digest, vec in entries if vec]
+        if rows:
+            self._db.write(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, vector)"
+                " VALUES (?, ?, ?)",
+                rows,
+            )
+
+    def count(self, model: Optional[str] = None) -> int:
+        """Return the number of cached vectors, optionally for one model."""
+        if model is None:
+            return self._db.count("SELECT COUNT(*) FROM embeddings")
+        return self._db.count("SELECT COUNT(*) FROM embeddings WHERE model = ?", (model,))
+
+    def close(self) -> None:
+        """Close the underlying connection if it was opened."""
+        self._db.close()
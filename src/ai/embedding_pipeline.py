@@ -7,10 +7,12 @@ story content, and wiki pages using the configured AI provider.
 
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
 from src.ai.ai_client import AIClient
+from src.ai.embedding_cache import EmbeddingCache, text_hash
 from src.config.config_loader import load_config
 from src.utils.file_io import read_text_file
 from src.utils.string_utils import truncate_text
@@ -33,22 +35,46 @@ _MAX_CHUNK_CHARS = 1500
 _STORY_CHUNK_TARGET = 800
 # Minimum paragraph length before merging with the next paragraph.
 _MIN_PARAGRAPH_CHARS = 80
+# File name of the persistent vector cache inside the configured cache dir.
+_CACHE_FILE_NAME = "embeddings.sqlite3"
 
 
 class EmbeddingPipeline:
     """Generates embeddings using the configured AI provider.
 
     Delegates to AIClient.embed() for the actual API call so that embeddings
-    share the same base_url and api_key as chat completions.
+    share the same base_url and api_key as chat completions. Chunks are looked
+    up in a persistent EmbeddingCache first; the misses are sent in batches of
+    ``milvus.embedding.batch_size`` with at most ``milvus.embedding.concurrency``
+    requests in flight.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, cache: Optional[EmbeddingCache] = None) -> None:
+        """
+        Args:
+            cache: Vector cache to use. Defaults to a SQLite file inside the
+                configured ``paths.cache_dir``.
+        """
         cfg = load_config()
         self._client: AIClient = AIClient()
-        self._model: str = cfg.milvus.embedding.model
+        # The model actually used: MILVUS_EMBEDDING_MODEL, else the client's
+        # own OPENAI_EMBEDDING_MODEL fallback. Cached vectors are keyed on it.
+        self._model: str = cfg.milvus.embedding.model or self._client.embedding_model
+        self._batch_size: int = max(1, int(cfg.milvus.embedding.batch_size))
+        self._concurrency: int = max(1, int(cfg.milvus.embedding.concurrency))
+        self._cache: EmbeddingCache = (
+            cache
+            if cache is not None
+            else EmbeddingCache(Path(cfg.paths.cache_dir) / _CACHE_FILE_NAME)
+        )
+
+    @property
+    def model(self) -> str:
+        """Embedding model the vectors are generated with."""
+        return self._model
 
     # ------------------------------------------------------------------
-    # Core embedding call
+    # Core embedding calls
     # ------------------------------------------------------------------
 
     def embed_text(self, text: str) -> List[float]:
@@ -60,23 +86,101 @@ class EmbeddingPipeline:
         Returns:
             List of floats representing the embedding, or [] on failure.
         """
-        clean = text.strip()
-        if not clean:
-            return []
+        return self.embed_texts([text])[0]
+
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """Generate embedding vectors for many texts at once.
+
+        Cached vectors are reused; duplicate texts are embedded only once.
+        A failed batch leaves its texts without a vector instead of failing
+        the whole call.
+
+        Args:
+            texts: Plain texts to embed.
+
+        Returns:
+            One vector per input text, in input order; [] for blank input or
+            a failed batch.
+        """
+        digests = [text_hash(text.strip()) if text.strip() else "" for text in texts]
+        vectors = self._cache.get_many(self._model, (d for d in digests if d))
+
+        pending: Dict[str, str] = {}
+        for text, digest in zip(texts, digests):
+            if digest and digest not in vectors:
+                pending.setdefault(digest, text.strip())
+
+        fresh = self._embed_uncached(pending)
+        self._cache.put_many(self._model, fresh.items())
+        vectors.update(fresh)
+        return [vectors.get(digest, []) if digest else [] for digest in digests]
+
+    def _embed_uncached(self, pending: Dict[str, str]) -> Dict[str, List[float]]:
+        """Embed cache misses in bounded, concurrent batches.
+
+        Args:
+            pending: Mapping of text hash -> text still needing a vector.
+
+        Returns:
+            Mapping of text hash -> vector for every successfully embedded text.
+        """
+        items = list(pending.items())
+        batches = [
+            items[start:start + self._batch_size]
+            for start in range(0, len(items), self._batch_size)
+        ]
+        embedded: Dict[str, List[float]] = {}
+        if not batches:
+            return embedded
+        workers = min(self._concurrency, len(batches))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for batch, vectors in zip(batches, pool.map(self._embed_batch, batches)):
+                for (digest, _), vec in zip(batch, vectors):
+                    if vec:
+                        embedded[digest] = vec
+        return embedded
+
+    def _embed_batch(self, batch: List[Tuple[str, str]]) -> List[List[float]]:
+        """Send one batch of texts to the embedding endpoint.
+
+        Args:
+            batch: (text hash, text) pairs.
+
+        Returns:
+            Vectors aligned with the batch, or [] when the request failed.
+        """
         try:
-            return self._client.embed(clean, model=self._model)
+            vectors = self._client.embed([text for _, text in batch], model=self._model)
         except RuntimeError:
             return []
+        return vectors if len(vectors) == len(batch) else []
+
+    def _embed_rows(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Fill the "embedding" key of each row from its chunk_text.
+
+        Rows whose text could not be embedded are dropped. The "embedding"
+        key must already be present so column order matches the schema.
+
+        Args:
+            rows: Row dicts with a "chunk_text" key.
+
+        Returns:
+            The rows that received a vector.
+        """
+        vectors = self.embed_texts([row["chunk_text"] for row in rows])
+        embedded: List[Dict[str, Any]] = []
+        for row, vec in zip(rows, vectors):
+            if vec:
+                row["embedding"] = vec
+                embedded.append(row)
+        return embedded
 
     # ------------------------------------------------------------------
-    # Per-type chunkers
+    # Per-type embedders
     # ------------------------------------------------------------------
 
     def embed_character(self, character_data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Produce one embedding chunk per semantic field of a character.
-
-        The character name is prepended to every chunk so queries that
-        mention the character name surface all their chunks.
+        """Chunk a character with character_chunks() and embed each chunk.
 
         Args:
             character_data: Parsed character JSON dict.
@@ -84,53 +188,10 @@ class EmbeddingPipeline:
         Returns:
             List of row dicts ready for MilvusClient.insert("characters").
         """
-        name = character_data.get("name", "unknown")
-        source = character_data.get("_source_file", "")
-        rows: List[Dict[str, Any]] = []
-
-        # One chunk for the core stat block (class / level / race)
-        stat_parts = [
-            f"Name: {name}",
-            f"Class: {character_data.get('class', '')}",
-            f"Race: {character_data.get('race', '')}",
-            f"Level: {character_data.get('level', '')}",
-        ]
-        stat_text = " | ".join(p for p in stat_parts if p.split(": ", 1)[1])
-        if stat_text:
-            vec = self.embed_text(stat_text)
-            if vec:
-                rows.append({
-                    "character_name": name,
-                    "source_file": source,
-                    "chunk_text": stat_text,
-                    "chunk_type": "stat_block",
-                    "embedding": vec,
-                })
-
-        # One chunk per narrative field
-        for field_key, chunk_type in _CHARACTER_CHUNK_FIELDS:
-            raw = character_data.get(field_key)
-            if not raw:
-                continue
-            if isinstance(raw, list):
-                text = "; ".join(str(item) for item in raw)
-            else:
-                text = str(raw)
-            text = truncate_text(f"{name} - {text}", _MAX_CHUNK_CHARS)
-            vec = self.embed_text(text)
-            if vec:
-                rows.append({
-                    "character_name": name,
-                    "source_file": source,
-                    "chunk_text": text,
-                    "chunk_type": chunk_type,
-                    "embedding": vec,
-                })
-
-        return rows
+        return self._embed_rows(character_chunks(character_data))
 
     def embed_npc(self, npc_data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Produce embedding chunks for an NPC profile.
+        """Chunk an NPC profile with npc_chunks() and embed each chunk.
 
         Args:
             npc_data: Parsed NPC JSON dict.
@@ -138,53 +199,10 @@ class EmbeddingPipeline:
         Returns:
             List of row dicts ready for MilvusClient.insert("npcs").
         """
-        name = npc_data.get("name", "unknown")
-        location = npc_data.get("location", "")
-        source = npc_data.get("_source_file", "")
-        rows: List[Dict[str, Any]] = []
-
-        # Core identity chunk
-        parts = [
-            f"NPC: {name}",
-            f"Race: {npc_data.get('race', '')}",
-            f"Role: {npc_data.get('role', npc_data.get('occupation', ''))}",
-            f"Location: {location}",
-        ]
-        identity = " | ".join(p for p in parts if p.split(": ", 1)[1])
-        if identity:
-            vec = self.embed_text(identity)
-            if vec:
-                rows.append({
-                    "npc_name": name,
-                    "location": location,
-                    "chunk_text": identity,
-                    "embedding": vec,
-                    "source_file": source,
-                })
-
-        # Personality / description chunks
-        for field in ("description", "personality", "background", "notes"):
-            text = npc_data.get(field, "")
-            if not text:
-                continue
-            combined = truncate_text(f"{name}: {text}", _MAX_CHUNK_CHARS)
-            vec = self.embed_text(combined)
-            if vec:
-                rows.append({
-                    "npc_name": name,
-                    "location": location,
-                    "chunk_text": combined,
-                    "embedding": vec,
-                    "source_file": source,
-                })
-
-        return rows
+        return self._embed_rows(npc_chunks(npc_data))
 
     def embed_story_file(self, story_path: str) -> List[Dict[str, Any]]:
-        """Split a story Markdown file into paragraphs and embed each.
-
-        Paragraphs shorter than _MIN_PARAGRAPH_CHARS are merged with the
-        next to avoid very small, low-signal chunks.
+        """Chunk a story file with story_file_chunks() and embed each chunk.
 
         Args:
             story_path: Path to a .md story file.
@@ -192,48 +210,10 @@ class EmbeddingPipeline:
         Returns:
             List of row dicts ready for MilvusClient.insert("story_chunks").
         """
-        path = Path(story_path)
-        campaign_name = path.parent.name
-        story_file = path.name
-
-        raw = read_text_file(story_path)
-        if not raw:
-            return []
-
-        # Split on blank lines, merge very short fragments
-        paragraphs: List[str] = []
-        buffer = ""
-        for para in re.split(r"\n{2,}", raw.strip()):
-            para = para.strip()
-            if not para:
-                continue
-            buffer = (buffer + " " + para).strip() if buffer else para
-            if len(buffer) >= _MIN_PARAGRAPH_CHARS:
-                paragraphs.append(buffer)
-                buffer = ""
-        if buffer:
-            paragraphs.append(buffer)
-
-        rows: List[Dict[str, Any]] = []
-        for idx, para in enumerate(paragraphs):
-            text = truncate_text(para, _MAX_CHUNK_CHARS)
-            vec = self.embed_text(text)
-            if vec:
-                rows.append({
-                    "campaign_name": campaign_name,
-                    "story_file": story_file,
-                    "chunk_index": idx,
-                    "chunk_text": text,
-                    "embedding": vec,
-                })
-
-        return rows
+        return self._embed_rows(story_file_chunks(story_path))
 
     def embed_wiki_page(self, page_text: str, url: str) -> List[Dict[str, Any]]:
-        """Split a wiki page into sentence-level chunks and embed.
-
-        Uses _STORY_CHUNK_TARGET characters as the soft merge target so each
-        chunk carries enough context to be semantically useful.
+        """Chunk a wiki page with wiki_page_chunks() and embed each chunk.
 
         Args:
             page_text: Plain text content of a wiki page.
@@ -242,35 +222,206 @@ class EmbeddingPipeline:
         Returns:
             List of row dicts ready for MilvusClient.insert("wiki_pages").
         """
-        title_match = re.search(r"^#+ (.+)$", page_text, re.MULTILINE)
-        title = title_match.group(1).strip() if title_match else url
-
-        sentences = re.split(r"(?<=[.!?])\s+", page_text.strip())
-        chunks: List[str] = []
-        buffer = ""
-        for sentence in sentences:
-            candidate = (buffer + " " + sentence).strip() if buffer else sentence
-            if len(candidate) >= _STORY_CHUNK_TARGET:
-                if buffer:
-                    chunks.append(buffer)
-                buffer = sentence
-            else:
-                buffer = candidate
-        if buffer:
-            chunks.append(buffer)
-
-        now = int(time.time())
-        rows: List[Dict[str, Any]] = []
-        for chunk in chunks:
-            text = truncate_text(chunk, _MAX_CHUNK_CHARS)
-            vec = self.embed_text(text)
-            if vec:
-                rows.append({
-                    "page_url": url,
-                    "page_title": title,
-                    "chunk_text": text,
-                    "cached_at": now,
-                    "embedding": vec,
-                })
-
-        return rows
+        return self._embed_rows(wiki_page_chunks(page_text, url))
+
+
+# ----------------------------------------------------------------------
+# Per-type chunkers
+#
+# Pure functions shared by EmbeddingPipeline and the lexical index so both
+# retrieval paths see identical chunks. Each row carries an empty
+# "embedding" placeholder in its schema position.
+# ----------------------------------------------------------------------
+
+
+def character_chunks(character_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Produce one chunk per semantic field of a character.
+
+    The character name is prepended to every chunk so queries that
+    mention the character name surface all their chunks.
+
+    Args:
+        character_data: Parsed character JSON dict.
+
+    Returns:
+        List of row dicts with an empty "embedding" placeholder.
+    """
+    name = character_data.get("name", "unknown")
+    source = character_data.get("_source_file", "")
+    rows: List[Dict[str, Any]] = []
+
+    # One chunk for the core stat block (class / level / race)
+    stat_parts = [
+        f"Name: {name}",
+        f"Class: {character_data.get('class', '')}",
+        f"Race: {character_data.get('race', '')}",
+        f"Level: {character_data.get('level', '')}",
+    ]
+    stat_text = " | ".join(p for p in stat_parts if p.split(": ", 1)[1])
+    if stat_text:
+        rows.append({
+            "character_name": name,
+            "source_file": source,
+            "chunk_text": stat_text,
+            "chunk_type": "stat_block",
+            "embedding": [],
+        })
+
+    # One chunk per narrative field
+    for field_key, chunk_type in _CHARACTER_CHUNK_FIELDS:
+        raw = character_data.get(field_key)
+        if not raw:
+            continue
+        if isinstance(raw, list):
+            text = "; ".join(str(item) for item in raw)
+        else:
+            text = str(raw)
+        text = truncate_text(f"{name} - {text}", _MAX_CHUNK_CHARS)
+        rows.append({
+            "character_name": name,
+            "source_file": source,
+            "chunk_text": text,
+            "chunk_type": chunk_type,
+            "embedding": [],
+        })
+
+    return rows
+
+
+def npc_chunks(npc_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Produce chunks for an NPC profile.
+
+    Args:
+        npc_data: Parsed NPC JSON dict.
+
+    Returns:
+        List of row dicts with an empty "embedding" placeholder.
+    """
+    name = npc_data.get("name", "unknown")
+    location = npc_data.get("location", "")
+    source = npc_data.get("_source_file", "")
+    rows: List[Dict[str, Any]] = []
+
+    # Core identity chunk
+    parts = [
+        f"NPC: {name}",
+        f"Race: {npc_data.get('race', '')}",
+        f"Role: {npc_data.get('role', npc_data.get('occupation', ''))}",
+        f"Location: {location}",
+    ]
+    identity = " | ".join(p for p in parts if p.split(": ", 1)[1])
+    if identity:
+        rows.append({
+            "npc_name": name,
+            "location": location,
+            "chunk_text": identity,
+            "embedding": [],
+            "source_file": source,
+        })
+
+    # Personality / description chunks
+    for field in ("description", "personality", "background", "notes"):
+        text = npc_data.get(field, "")
+        if not text:
+            continue
+        combined = truncate_text(f"{name}: {text}", _MAX_CHUNK_CHARS)
+        rows.append({
+            "npc_name": name,
+            "location": location,
+            "chunk_text": combined,
+            "embedding": [],
+            "source_file": source,
+        })
+
+    return rows
+
+
+def story_file_chunks(story_path: str) -> List[Dict[str, Any]]:
+    """Split a story Markdown file into paragraph chunks.
+
+    Paragraphs shorter than _MIN_PARAGRAPH_CHARS are merged with the
+    next to avoid very small, low-signal chunks.
+
+    Args:
+        story_path: Path to a .md story file.
+
+    Returns:
+        List of row dicts with an empty "embedding" placeholder.
+    """
+    path = Path(story_path)
+    campaign_name = path.parent.name
+    story_file = path.name
+
+    raw = read_text_file(story_path)
+    if not raw:
+        return []
+
+    # Split on blank lines, merge very short fragments
+    paragraphs: List[str] = []
+    buffer = ""
+    for para in re.split(r"\n{2,}", raw.strip()):
+        para = para.strip()
+        if not para:
+            continue
+        buffer = (buffer + " " + para).strip() if buffer else para
+        if len(buffer) >= _MIN_PARAGRAPH_CHARS:
+            paragraphs.append(buffer)
+            buffer = ""
+    if buffer:
+        paragraphs.append(buffer)
+
+    rows: List[Dict[str, Any]] = [
+        {
+            "campaign_name": campaign_name,
+            "story_file": story_file,
+            "chunk_index": idx,
+            "chunk_text": truncate_text(para, _MAX_CHUNK_CHARS),
+            "embedding": [],
+        }
+        for idx, para in enumerate(paragraphs)
+    ]
+    return rows
+
+
+def wiki_page_chunks(page_text: str, url: str) -> List[Dict[str, Any]]:
+    """Split a wiki page into sentence-level chunks.
+
+    Uses _STORY_CHUNK_TARGET characters as the soft merge target so each
+    chunk carries enough context to be semantically useful.
+
+    Args:
+        page_text: Plain text content of a wiki page.
+        url: Source URL used as a unique identifier in the collection.
+
+    Returns:
+        List of row dicts with an empty "embedding" placeholder.
+    """
+    title_match = re.search(r"^#+ (.+)$", page_text, re.MULTILINE)
+    title = title_match.group(1).strip() if title_match else url
+
+    sentences = re.split(r"(?<=[.!?])\s+", page_text.strip())
+    chunks: List[str] = []
+    buffer = ""
+    for sentence in sentences:
+        candidate = (buffer + " " + sentence).strip() if buffer else sentence
+        if len(candidate) >= _STORY_CHUNK_TARGET:
+            if buffer:
+                chunks.append(buffer)
+            buffer = sentence
+        else:
+            buffer = candidate
+    if buffer:
+        chunks.append(buffer)
+
+    now = int(time.time())
+    rows: List[Dict[str, Any]] = [
+        {
+            "page_url": url,
+            "page_title": title,
+            "chunk_text": truncate_text(chunk, _MAX_CHUNK_CHARS),
+            "cached_at": now,
+            "embedding": [],
+        }
+        for chunk in chunks
+    ]
+    return rows
@@ -20,8 +20,13 @@ from src.ai.abilities_rag import (
 )
 from src.ai.wiki_scraping import (
     SCRAPING_AVAILABLE as _SCRAPING_AVAILABLE,
+    PageSource,
+    ParsedPage,
+    as_page,
     fetch_html as _fetch_html,
+    fetch_many as _fetch_many,
     page_content,
+    parse_page,
 )
 from src.ai.rag_system import RAGSystem
 
@@ -122,22 +127,23 @@ def get_tool_categories(*, rag: Optional[RAGSystem] = None) -> Dict[str, List[st
     client = getattr(rag_system, "rules_client", None)
     if client is None or not _SCRAPING_AVAILABLE or getattr(client, "session", None) is None:
         return {}
-    html = _fetch_html(client, f"{getattr(client, 'base_url', '')}/equipment:tool")
+    url = f"{getattr(client, 'base_url', '')}/equipment:tool"
+    html = _fetch_html(client, url)
     if html is None:
         return {}
-    return _parse_tool_categories(html)
+    return _parse_tool_categories(parse_page(html, url))
 
 
-def _parse_tool_categories(html: str) -> Dict[str, List[str]]:
+def _parse_tool_categories(page: PageSource) -> Dict[str, List[str]]:
     """Parse the tool page's category tables into a category->names map.
 
     Args:
-        html: Raw tool page HTML.
+        page: Raw tool page HTML or its ParsedPage.
 
     Returns:
         Category key to member tool names.
     """
-    content = page_content(html)
+    content = page_content(page)
     if content is None:
         return {}
     result: Dict[str, List[str]] = {}
@@ -196,15 +202,17 @@ def _equipment_catalog(client: object) -> Dict[str, EquipmentInfo]:
         }
 
     catalog: Dict[str, EquipmentInfo] = {}
-    tool_html = None
-    for slug, item_type in _EQUIPMENT_PAGES.items():
-        html = _fetch_html(client, f"{getattr(client, 'base_url', '')}/equipment:{slug}")
+    tool_page: Optional[ParsedPage] = None
+    base_url = getattr(client, "base_url", "")
+    pages = _fetch_many(client, [f"{base_url}/equipment:{slug}" for slug in _EQUIPMENT_PAGES])
+    for (slug, item_type), html in zip(_EQUIPMENT_PAGES.items(), pages):
         if html is not None:
-            _parse_equipment_page(html, item_type, catalog)
+            page = parse_page(html, f"{base_url}/equipment:{slug}")
+            _parse_equipment_page(page, item_type, catalog)
             if slug == "tool":
-                tool_html = html
-    if tool_html is not None:
-        for name, description in _parse_tool_descriptions(tool_html).items():
+                tool_page = page
+    if tool_page is not None:
+        for name, description in _parse_tool_descriptions(tool_page).items():
             info = EquipmentInfo(description=description, item_type="item")
             _register_equipment(catalog, name, info)
     if cache is not None:
@@ -212,7 +220,7 @@ def _equipment_catalog(client: object) -> Dict[str, EquipmentInfo]:
     return catalog
 
 
-def _parse_tool_descriptions(html: str) -> Dict[str, str]:
+def _parse_tool_descriptions(page: PageSource) -> Dict[str, str]:
     """Parse the tool page's per-tool detail tabs into name -> description.
 
     Artisan and "other" tools have an individual tab; gaming sets and musical
@@ -220,15 +228,16 @@ def _parse_tool_descriptions(html: str) -> Dict[str, str]:
     every member of that category.
 
     Args:
-        html: Raw tool page HTML.
+        page: Raw tool page HTML or its ParsedPage.
 
     Returns:
         A map of specific tool name to its description.
     """
-    content = page_content(html)
+    page = as_page(page)
+    content = page_content(page)
     if content is None:
         return {}
-    categories = _parse_tool_categories(html)
+    categories = _parse_tool_categories(page)
     result: Dict[str, str] = {}
     for navset in content.select("div.yui-navset"):
         labels = [a.get_text(strip=True) for a in navset.select("ul.yui-nav li a")]
@@ -261,16 +270,16 @@ def _expand_tool_label(label: str, categories: Dict[str, List[str]]) -> List[str
 
 
 def _parse_equipment_page(
-    html: str, item_type: str, catalog: Dict[str, EquipmentInfo]
+    page: PageSource, item_type: str, catalog: Dict[str, EquipmentInfo]
 ) -> None:
     """Parse one equipment page's tables into the catalogue, in place.
 
     Args:
-        html: Raw equipment page HTML.
+        page: Raw equipment page HTML or its ParsedPage.
         item_type: The item type all rows on this page receive.
         catalog: Catalogue to populate (mutated in place).
     """
-    content = page_content(html)
+    content = page_content(page)
     if content is None:
         return
     for table in content.find_all("table"):
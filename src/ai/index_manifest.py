@@ -0,0 +1,297 @@
+"""
+Index manifest for incremental Milvus reindexing.
+
+The manifest records, per indexed source file, what was embedded and which
+Milvus rows hold it: mtime, size, content hash and chunk ids, plus the
+embedding model, dimension and schema version the whole index was built with.
+A reindex only re-embeds files whose content changed, deletes the rows of
+files that disappeared, and rebuilds from scratch when the model, dimension
+or schema no longer match.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.ai.embedding_pipeline import EmbeddingPipeline
+from src.ai.milvus_collections import COLLECTIONS, SCHEMA_VERSION
+from src.ai.vector_store import VectorStore
+from src.config.config_loader import load_config
+from src.utils.file_io import load_json_file, save_json_file
+from src.utils.path_utils import get_campaigns_dir, get_characters_dir, get_npcs_dir
+
+MANIFEST_FILE_NAME = "index_manifest.json"
+
+# Outcomes reported by index_file().
+ADDED = "added"
+UPDATED = "updated"
+SKIPPED = "skipped"
+
+
+@dataclass
+class ManifestEntry:
+    """What the index holds for one source file."""
+
+    collection: str
+    mtime: float
+    size: int
+    content_hash: str
+    chunk_ids: List[int] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serialisable dict."""
+        return {
+            "collection": self.collection,
+            "mtime": self.mtime,
+            "size": self.size,
+            "content_hash": self.content_hash,
+            "chunk_ids": self.chunk_ids,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ManifestEntry":
+        """Create from a dict produced by to_dict()."""
+        return cls(
+            collection=str(data.get("collection", "")),
+            mtime=float(data.get("mtime", 0.0)),
+            size=int(data.get("size", 0)),
+            content_hash=str(data.get("content_hash", "")),
+            chunk_ids=[int(pk) for pk in data.get("chunk_ids", [])],
+        )
+
+
+@dataclass
+class IndexManifest:
+    """Index-wide build settings plus one ManifestEntry per source path."""
+
+    embedding_model: str = ""
+    embedding_dim: int = 0
+    schema_version: int = SCHEMA_VERSION
+    files: Dict[str, ManifestEntry] = field(default_factory=dict)
+
+    def is_compatible(self, embedding_model: str, embedding_dim: int) -> bool:
+        """Check whether vectors in this index can be reused as-is.
+
+        Args:
+            embedding_model: Currently configured embedding model.
+            embedding_dim: Currently configured vector dimension.
+
+        Returns:
+            True when model, dimension and schema version all match.
+        """
+        return (
+            self.embedding_model == embedding_model
+            and self.embedding_dim == embedding_dim
+            and self.schema_version == SCHEMA_VERSION
+        )
+
+    def entries_for(self, collection: str) -> Dict[str, ManifestEntry]:
+        """Return the entries belonging to one collection."""
+        return {
+            key: entry for key, entry in self.files.items()
+            if entry.collection == collection
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serialisable dict."""
+        return {
+            "embedding_model": self.embedding_model,
+            "embedding_dim": self.embedding_dim,
+            "schema_version": self.schema_version,
+            "files": {key: entry.to_dict() for key, entry in self.files.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "IndexManifest":
+        """Create from a dict produced by to_dict()."""
+        return cls(
+            embedding_model=str(data.get("embedding_model", "")),
+            embedding_dim=int(data.get("embedding_dim", 0)),
+            schema_version=int(data.get("schema_version", 0)),
+            files={
+                key: ManifestEntry.from_dict(entry)
+                for key, entry in data.get("files", {}).items()
+            },
+        )
+
+
+@dataclass
+class ReindexCounts:
+    """Per-collection file counts for one reindex run."""
+
+    added: int = 0
+    updated: int = 0
+    deleted: int = 0
+    skipped: int = 0
+    chunks: int = 0
+
+    def record(self, outcome: str) -> None:
+        """Increment the counter named by an index_file() outcome."""
+        setattr(self, outcome, getattr(self, outcome) + 1)
+
+
+def default_manifest_path() -> Path:
+    """Return the manifest location inside the configured Milvus data dir."""
+    return load_config().paths.milvus_dir / MANIFEST_FILE_NAME
+
+
+def source_files() -> Dict[str, List[Path]]:
+    """Return the on-disk source files for each file-backed collection."""
+    return {
+        "characters": sorted(Path(get_characters_dir()).glob("*.json")),
+        "npcs": sorted(Path(get_npcs_dir()).glob("*.json")),
+        "story_chunks": sorted(Path(get_campaigns_dir()).glob("**/*.md")),
+    }
+
+
+def load_manifest(path: Path) -> Optional[IndexManifest]:
+    """Load a manifest from disk.
+
+    Args:
+        path: Manifest JSON path.
+
+    Returns:
+        The manifest, or None when missing or unreadable (forcing a rebuild).
+    """
+    try:
+        data = load_json_file(str(path))
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not data:
+        return None
+    try:
+        return IndexManifest.from_dict(data)
+    except (TypeError, ValueError):
+        return None
+
+
+def save_manifest(manifest: IndexManifest, path: Path) -> None:
+    """Write a manifest to disk.
+
+    Args:
+        manifest: Manifest to persist.
+        path: Manifest JSON path; parent dirs are created.
+    """
+    save_json_file(str(path), manifest.to_dict())
+
+
+def _fingerprint(path: Path) -> Tuple[float, int]:
+    """Return (mtime, size) for a file."""
+    stat = path.stat()
+    return stat.st_mtime, stat.st_size
+
+
+def _content_hash(path: Path) -> str:
+    """Return the sha256 hex digest of a file's bytes."""
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _has_field(collection: str, field_name: str) -> bool:
+    """Check whether a collection schema defines a field."""
+    fields = COLLECTIONS.get(collection, {}).get("fields", [])
+    return any(fld["name"] == field_name for fld in fields)
+
+
+def embed_source_file(
+    pipeline: EmbeddingPipeline, collection: str, path: Path
+) -> List[Dict[str, Any]]:
+    """Chunk and embed one source file for its collection.
+
+    Args:
+        pipeline: Embedding pipeline to use.
+        collection: "characters", "npcs" or "story_chunks".
+        path: Source file on disk.
+
+    Returns:
+        Row dicts ready for VectorStore insertion.
+    """
+    if collection == "story_chunks":
+        return pipeline.embed_story_file(str(path))
+    data: Dict[str, Any] = load_json_file(str(path)) or {}
+    data["_source_file"] = str(path)
+    if collection == "characters":
+        return pipeline.embed_character(data)
+    return pipeline.embed_npc(data)
+
+
+def _purge(
+    client: VectorStore, collection: str, key: str, entry: Optional[ManifestEntry]
+) -> None:
+    """Delete the rows currently indexed for one source file.
+
+    Uses the recorded chunk ids; files indexed before the manifest existed
+    fall back to a source_file filter where the schema has that field.
+    """
+    if entry is not None and entry.chunk_ids:
+        client.delete_by_ids(collection, entry.chunk_ids)
+    elif _has_field(collection, "source_file"):
+        client.delete_by_source(collection, "source_file", key)
+
+
+def index_file(
+    client: VectorStore,
+    pipeline: EmbeddingPipeline,
+    manifest: IndexManifest,
+    collection: str,
+    path: Path,
+) -> Tuple[str, int]:
+    """Bring the index up to date for one source file.
+
+    Files whose mtime and size match the manifest are skipped without being
+    read; files whose bytes hash the same are skipped after refreshing the
+    recorded mtime. Otherwise the old rows are deleted and fresh ones inserted.
+    A non-empty file that yields no rows is not recorded, so it is retried.
+
+    Args:
+        client: Connected vector store.
+        pipeline: Embedding pipeline to use.
+        manifest: Manifest to consult and update in place.
+        collection: Target collection name.
+        path: Source file on disk.
+
+    Returns:
+        (outcome, chunks inserted) where outcome is ADDED, UPDATED or SKIPPED.
+    """
+    key = str(path)
+    entry = manifest.files.get(key)
+    mtime, size = _fingerprint(path)
+    if entry is not None and entry.mtime == mtime and entry.size == size:
+        return SKIPPED, 0
+    digest = _content_hash(path)
+    if entry is not None and entry.content_hash == digest:
+        entry.mtime, entry.size = mtime, size
+        return SKIPPED, 0
+
+    _purge(client, collection, key, entry)
+    chunk_ids = client.insert_returning_ids(
+        collection, embed_source_file(pipeline, collection, path)
+    )
+    if not chunk_ids and size > 0:
+        # Nothing was embedded from a non-empty file (e.g. the embedding
+        # server was down): leave it out of the manifest so the next run
+        # retries it instead of skipping it as unchanged.
+        manifest.files.pop(key, None)
+        return (UPDATED if entry is not None else ADDED), 0
+    manifest.files[key] = ManifestEntry(
+        collection=collection,
+        mtime=mtime,
+        size=size,
+        content_hash=digest,
+        chunk_ids=chunk_ids,
+    )
+    return (UPDATED if entry is not None else ADDED), len(chunk_ids)
+
+
+def remove_file(client: VectorStore, manifest: IndexManifest, key: str) -> None:
+    """Delete a vanished source file's rows and forget it.
+
+    Args:
+        client: Connected vector store.
+        manifest: Manifest to update in place.
+        key: Manifest key (the source path string).
+    """
+    entry = manifest.files.pop(key, None)
+    if entry is not None:
+        _purge(client, entry.collection, key, entry)
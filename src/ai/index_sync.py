@@ -3,13 +3,22 @@ Incremental embedding sync triggered on JSON writes.
 
 Call sync_on_save() after saving a character or NPC JSON file to keep
 Milvus embeddings current without modifying the low-level file_io utilities.
+When an index manifest exists the file is synced through it, so the next
+--reindex sees the file as up to date instead of inserting it twice.
 """
 
 from pathlib import Path
 from typing import Any, Dict
 
 from src.ai.embedding_pipeline import EmbeddingPipeline
-from src.ai.milvus_client import MilvusClient
+from src.ai.index_manifest import (
+    default_manifest_path,
+    index_file,
+    load_manifest,
+    save_manifest,
+)
+from src.ai.lexical_index import get_lexical_index
+from src.ai.milvus_client import get_shared_client
 from src.ai.milvus_collections import COLLECTIONS
 from src.config.config_loader import load_config
 from src.utils.terminal_display import print_info
@@ -18,9 +27,11 @@ from src.utils.terminal_display import print_info
 def sync_on_save(file_path: str, data: Dict[str, Any]) -> None:
     """Re-index a JSON file in Milvus after it is saved.
 
+    The lexical index is updated first, even when Milvus is disabled.
     Determines the data type from the parent directory name ("characters"
     or "npcs") and replaces the existing embeddings for that file before
-    inserting fresh ones. Silently returns when Milvus is disabled or
+    inserting fresh ones. Uses the process-wide Milvus client, so repeated
+    saves reuse one connection. Silently returns when Milvus is disabled or
     unreachable.
 
     Args:
@@ -28,31 +39,39 @@ def sync_on_save(file_path: str, data: Dict[str, Any]) -> None:
         data: The data dict that was saved (will have _source_file added).
     """
     cfg = load_config().milvus
+    path = Path(file_path)
+    parent = path.parent.name
+    if parent not in ("characters", "npcs"):
+        return
+
+    lexical = get_lexical_index()
+    if lexical.sync_file(parent, path):
+        lexical.save()
     if not cfg.enabled:
         return
 
-    client = MilvusClient()
-    if not client.connect():
+    client = get_shared_client()
+    if not client.is_healthy():
         return
 
     pipeline = EmbeddingPipeline()
-    path = Path(file_path)
-    parent = path.parent.name
-
     data["_source_file"] = str(path)
+    client.ensure_collection(parent, COLLECTIONS[parent])
 
-    if parent == "characters":
-        client.ensure_collection("characters", COLLECTIONS["characters"])
-        client.delete_by_source("characters", "source_file", str(path))
-        rows = pipeline.embed_character(data)
-        inserted = client.insert("characters", rows)
-        print_info(f"[Milvus] Re-indexed {path.name}: {inserted} chunks")
-
-    elif parent == "npcs":
-        client.ensure_collection("npcs", COLLECTIONS["npcs"])
-        client.delete_by_source("npcs", "source_file", str(path))
-        rows = pipeline.embed_npc(data)
-        inserted = client.insert("npcs", rows)
-        print_info(f"[Milvus] Re-indexed {path.name}: {inserted} chunks")
-
-    client.disconnect()
+    manifest_path = default_manifest_path()
+    manifest = load_manifest(manifest_path)
+    if manifest is not None and manifest.is_compatible(
+        cfg.embedding.model, cfg.embedding.dim
+    ):
+        _, inserted = index_file(client, pipeline, manifest, parent, path)
+        save_manifest(manifest, manifest_path)
+    else:
+        client.delete_by_source(parent, "source_file", str(path))
+        rows = (
+            pipeline.embed_character(data)
+            if parent == "characters"
+            else pipeline.embed_npc(data)
+        )
+        inserted = client.insert(parent, rows)
+    client.commit()
+    print_info(f"[Milvus] Re-indexed {path.name}: {inserted} chunks")
@@ -0,0 +1,560 @@
+"""
+In-process BM25 index over the same chunks Milvus embeds.
+
+Characters, NPCs, story files and fetched wiki pages are split with the
+chunkers from embedding_pipeline, so lexical and vector hits share row shapes
+and can be fused by chunk text. The index keeps the chunk rows per source
+(file path or wiki URL) and persists them in the configured cache dir as a
+JSON snapshot plus an append-only log of the sources changed since it, so a
+save writes only what changed; postings are rebuilt in memory on load. Files
+are re-chunked only when their mtime/size fingerprint changes, so keeping the
+index current costs one stat() per file, at most once per _REFRESH_INTERVAL
+seconds.
+"""
+
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.ai.embedding_pipeline import (
+    character_chunks,
+    npc_chunks,
+    story_file_chunks,
+    wiki_page_chunks,
+)
+from src.ai.index_manifest import source_files
+from src.config.config_loader import load_config
+from src.utils.file_io import load_json_file, write_text_file_atomic
+
+INDEX_FILE_NAME = "lexical_index.json"
+INDEX_VERSION = 1
+
+# Standard Okapi BM25 parameters.
+_BM25_K1 = 1.5
+_BM25_B = 0.75
+
+# Reciprocal-rank fusion constant; 60 is the value from the original paper.
+_RRF_K = 60
+
+# Minimum seconds between on-disk change scans of the shared index.
+_REFRESH_INTERVAL = 30.0
+
+# The log is compacted once it holds more records than this or than the
+# snapshot holds sources, whichever is larger.
+_COMPACT_MIN_RECORDS = 64
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOP_WORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "but", "by", "for", "from",
+    "has", "have", "he", "her", "his", "in", "is", "it", "its", "of", "on",
+    "or", "she", "that", "the", "their", "they", "this", "to", "was", "were",
+    "with",
+})
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase index terms, dropping stop words.
+
+    Args:
+        text: Arbitrary text.
+
+    Returns:
+        Terms in order of appearance.
+    """
+    return [tok for tok in _TOKEN_RE.findall(text.lower()) if tok not in _STOP_WORDS]
+
+
+@dataclass
+class _Source:
+    """Chunks indexed for one source file or URL."""
+
+    fingerprint: str
+    rows: List[Dict[str, Any]]
+    doc_ids: List[int] = field(default_factory=list)
+
+
+@dataclass
+class _Persistence:
+    """Where the index is written and what has not been written yet."""
+
+    path: Optional[Path]
+    # Latest record per (collection, key) changed since the last save.
+    pending: Dict[Tuple[str, str], Dict[str, Any]] = field(default_factory=dict)
+    log_records: int = 0
+    snapshot_sources: int = 0
+    # False until the snapshot on disk is known to be this index's own.
+    snapshot_current: bool = False
+
+
+class _Postings:
+    """Inverted index for one collection."""
+
+    def __init__(self) -> None:
+        self.rows: Dict[int, Dict[str, Any]] = {}
+        self.lengths: Dict[int, int] = {}
+        self.terms: Dict[str, Dict[int, int]] = {}
+        self.total_length = 0
+
+    def add(self, doc_id: int, row: Dict[str, Any]) -> None:
+        """Index one chunk row under doc_id."""
+        counts = Counter(tokenize(str(row.get("chunk_text", ""))))
+        self.rows[doc_id] = row
+        self.lengths[doc_id] = sum(counts.values())
+        self.total_length += self.lengths[doc_id]
+        for term, freq in counts.items():
+            self.terms.setdefault(term, {})[doc_id] = freq
+
+    def remove(self, doc_id: int) -> None:
+        """Drop one chunk row from the index."""
+        row = self.rows.pop(doc_id, None)
+        if row is None:
+            return
+        self.total_length -= self.lengths.pop(doc_id, 0)
+        for term in set(tokenize(str(row.get("chunk_text", "")))):
+            docs = self.terms.get(term)
+            if docs is not None:
+                docs.pop(doc_id, None)
+                if not docs:
+                    del self.terms[term]
+
+    def score(self, terms: Iterable[str]) -> Dict[int, float]:
+        """Return the BM25 score of every document matching any term."""
+        scores: Dict[int, float] = {}
+        count = len(self.rows)
+        if not count:
+            return scores
+        avg_length = self.total_length / count or 1.0
+        for term in terms:
+            docs = self.terms.get(term)
+            if not docs:
+                continue
+            idf = math.log(1.0 + (count - len(docs) + 0.5) / (len(docs) + 0.5))
+            for doc_id, freq in docs.items():
+                norm = 1.0 - _BM25_B + _BM25_B * self.lengths[doc_id] / avg_length
+                weight = idf * freq * (_BM25_K1 + 1.0) / (freq + _BM25_K1 * norm)
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight
+        return scores
+
+
+class LexicalIndex:
+    """BM25 index of chunk rows, grouped by collection and source.
+
+    All methods are thread-safe. Rows are stored without their "embedding"
+    placeholder; search results are copies carrying a BM25 "score".
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        """
+        Args:
+            path: JSON snapshot the index is persisted to; its change log
+                is written alongside. None keeps the index in memory.
+        """
+        self._store = _Persistence(path)
+        self._lock = threading.RLock()
+        self._sources: Dict[str, Dict[str, _Source]] = {}
+        self._postings: Dict[str, _Postings] = {}
+        self._next_id = 0
+        self._refreshed_at: Optional[float] = None
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def fingerprint(self, collection: str, key: str) -> Optional[str]:
+        """Return the fingerprint recorded for a source, or None if unindexed."""
+        with self._lock:
+            source = self._sources.get(collection, {}).get(key)
+            return source.fingerprint if source is not None else None
+
+    def put_source(
+        self,
+        collection: str,
+        key: str,
+        fingerprint: str,
+        rows: List[Dict[str, Any]],
+    ) -> None:
+        """Replace the chunks indexed for one source.
+
+        Args:
+            collection: Collection name, e.g. "characters".
+            key: Source identity (file path or page URL).
+            fingerprint: Opaque change marker compared on the next sync.
+            rows: Chunk rows from the matching embedding_pipeline chunker.
+        """
+        stored = [
+            {name: value for name, value in row.items() if name != "embedding"}
+            for row in rows
+        ]
+        with self._lock:
+            self.remove_source(collection, key)
+            postings = self._postings.setdefault(collection, _Postings())
+            source = _Source(fingerprint=fingerprint, rows=stored)
+            for row in stored:
+                postings.add(self._next_id, row)
+                source.doc_ids.append(self._next_id)
+                self._next_id += 1
+            self._sources.setdefault(collection, {})[key] = source
+            self._store.pending[(collection, key)] = {
+                "collection": collection,
+                "key": key,
+                "fingerprint": fingerprint,
+                "rows": stored,
+            }
+
+    def remove_source(self, collection: str, key: str) -> None:
+        """Forget every chunk indexed for one source."""
+        with self._lock:
+            source = self._sources.get(collection, {}).pop(key, None)
+            if source is None:
+                return
+            postings = self._postings[collection]
+            for doc_id in source.doc_ids:
+                postings.remove(doc_id)
+            self._store.pending[(collection, key)] = {
+                "collection": collection,
+                "key": key,
+                "removed": True,
+            }
+
+    def sync_file(self, collection: str, path: Path) -> bool:
+        """Re-chunk one source file if it changed since it was indexed.
+
+        Args:
+            collection: "characters", "npcs" or "story_chunks".
+            path: Source file on disk.
+
+        Returns:
+            True when the file was (re-)indexed.
+        """
+        try:
+            stat = path.stat()
+        except OSError:
+            return False
+        fingerprint = f"{stat.st_mtime}:{stat.st_size}"
+        if self.fingerprint(collection, str(path)) == fingerprint:
+            return False
+        self.put_source(collection, str(path), fingerprint, file_chunks(collection, path))
+        return True
+
+    def sync_files(self, collection: str, paths: List[Path]) -> bool:
+        """Bring one file-backed collection in line with the files on disk.
+
+        Args:
+            collection: "characters", "npcs" or "story_chunks".
+            paths: Source files currently on disk for the collection.
+
+        Returns:
+            True when anything was added, re-chunked or removed.
+        """
+        changed = False
+        for path in paths:
+            changed = self.sync_file(collection, path) or changed
+        seen = {str(path) for path in paths}
+        with self._lock:
+            stale = [key for key in self._sources.get(collection, {}) if key not in seen]
+            for key in stale:
+                self.remove_source(collection, key)
+        return changed or bool(stale)
+
+    def refresh_files(self, force: bool = False) -> None:
+        """Sync all file-backed collections and persist any changes.
+
+        Scans run at most once per _REFRESH_INTERVAL seconds unless forced.
+
+        Args:
+            force: Scan even when the last scan was recent.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if (
+                not force
+                and self._refreshed_at is not None
+                and now - self._refreshed_at < _REFRESH_INTERVAL
+            ):
+                return
+            self._refreshed_at = now
+            for collection, paths in source_files().items():
+                self.sync_files(collection, paths)
+            self.save()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def search(
+        self,
+        collection: str,
+        query: str,
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Rank a collection's chunks against a query with BM25.
+
+        Args:
+            collection: Collection name.
+            query: Free-text query.
+            top_k: Maximum number of results.
+            filters: Optional exact-match constraints on row fields.
+
+        Returns:
+            Row copies with a "score" key, best first.
+        """
+        terms = set(tokenize(query))
+        with self._lock:
+            postings = self._postings.get(collection)
+            if postings is None or not terms:
+                return []
+            ranked = sorted(
+                postings.score(terms).items(), key=lambda item: item[1], reverse=True
+            )
+            hits: List[Dict[str, Any]] = []
+            for doc_id, score in ranked:
+                row = postings.rows[doc_id]
+                if filters and any(row.get(k) != v for k, v in filters.items()):
+                    continue
+                hits.append({**row, "score": score})
+                if len(hits) >= top_k:
+                    break
+        return hits
+
+    def count(self, collection: str) -> int:
+        """Return the number of chunks indexed for a collection."""
+        with self._lock:
+            postings = self._postings.get(collection)
+            return len(postings.rows) if postings is not None else 0
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self) -> None:
+        """Persist the sources changed since the last save.
+
+        Their records are appended to the change log (one fsync per save);
+        the log is folded into the snapshot once it outgrows it, or at once
+        when the snapshot on disk is missing, outdated or not this index's
+        own. A failed write keeps the changes pending for the next save.
+        """
+        with self._lock:
+            store = self._store
+            if store.path is None or not store.pending:
+                return
+            if not store.snapshot_current:
+                self.compact()
+                return
+            records = list(store.pending.values())
+            try:
+                _append_records(_log_path(store.path), records)
+            except OSError:
+                return
+            store.pending.clear()
+            store.log_records += len(records)
+            if store.log_records > max(_COMPACT_MIN_RECORDS, store.snapshot_sources):
+                self.compact()
+
+    def compact(self) -> None:
+        """Write the whole index as the JSON snapshot and drop the change log."""
+        with self._lock:
+            store = self._store
+            if store.path is None:
+                return
+            data = {
+                "version": INDEX_VERSION,
+                "collections": {
+                    collection: {
+                        key: {"fingerprint": src.fingerprint, "rows": src.rows}
+                        for key, src in sources.items()
+                    }
+                    for collection, sources in self._sources.items()
+                },
+            }
+            try:
+                write_text_file_atomic(
+                    str(store.path), json.dumps(data, ensure_ascii=False)
+                )
+                # A log left behind by a crash here is replayed on load; a
+                # source it rolls back keeps the older fingerprint, so the
+                # next sync re-indexes it.
+                _log_path(store.path).unlink(missing_ok=True)
+            except OSError:
+                return
+            store.pending.clear()
+            store.log_records = 0
+            store.snapshot_sources = sum(len(sources) for sources in self._sources.values())
+            store.snapshot_current = True
+
+    @classmethod
+    def load(cls, path: Path) -> "LexicalIndex":
+        """Load an index from disk, starting empty when missing or outdated.
+
+        The snapshot is read first and the change log replayed over it; a
+        torn final log line from an interrupted save is skipped.
+
+        Args:
+            path: JSON snapshot written by save().
+
+        Returns:
+            The loaded index, bound to path for later saves.
+        """
+        index = cls(path)
+        try:
+            data = load_json_file(str(path)) or {}
+        except (OSError, ValueError):
+            data = {}
+        if data.get("version") != INDEX_VERSION:
+            return index
+        for collection, sources in data.get("collections", {}).items():
+            for key, source in sources.items():
+                index._apply_record({"collection": collection, "key": key, **source})
+        index._store.snapshot_sources = sum(
+            len(sources) for sources in index._sources.values()
+        )
+        index._store.snapshot_current = True
+        for record in _read_records(_log_path(path)):
+            index._apply_record(record)
+            index._store.log_records += 1
+        index._store.pending.clear()
+        return index
+
+    def _apply_record(self, record: Dict[str, Any]) -> None:
+        """Apply one stored source record (a put or a removal)."""
+        collection = str(record.get("collection", ""))
+        key = str(record.get("key", ""))
+        if record.get("removed"):
+            self.remove_source(collection, key)
+        else:
+            self.put_source(
+                collection, key, str(record.get("fingerprint", "")),
+                list(record.get("rows", [])),
+            )
+
+
+def _log_path(path: Path) -> Path:
+    """Return the change log that sits next to the snapshot at ``path``."""
+    return path.with_name(f"{path.stem}.log.jsonl")
+
+
+def _append_records(path: Path, records: List[Dict[str, Any]]) -> None:
+    """Append source records to a change log as JSON lines and fsync it."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(lines)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _read_records(path: Path) -> List[Dict[str, Any]]:
+    """Return the well-formed records of a change log, oldest first."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            lines = f.readlines()
+    except OSError:
+        return []
+    records: List[Dict[str, Any]] = []
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(record, dict):
+            records.append(record)
+    return records
+
+
+def file_chunks(collection: str, path: Path) -> List[Dict[str, Any]]:
+    """Chunk one source file for its collection without embedding it.
+
+    Args:
+        collection: "characters", "npcs" or "story_chunks".
+        path: Source file on disk.
+
+    Returns:
+        Chunk rows, or [] when the file cannot be read.
+    """
+    if collection == "story_chunks":
+        return story_file_chunks(str(path))
+    try:
+        data: Dict[str, Any] = load_json_file(str(path)) or {}
+    except (OSError, ValueError):
+        return []
+    data["_source_file"] = str(path)
+    if collection == "characters":
+        return character_chunks(data)
+    return npc_chunks(data)
+
+
+def index_wiki_page(index: LexicalIndex, page_data: Dict[str, Any]) -> None:
+    """Index a fetched wiki page unless the same fetch is already indexed.
+
+    Args:
+        index: Index to update.
+        page_data: Page dict from WikiClient.fetch_page().
+    """
+    url = str(page_data.get("url", ""))
+    fingerprint = str(page_data.get("fetched_at", ""))
+    if not url or index.fingerprint("wiki_pages", url) == fingerprint:
+        return
+    parts = [f"# {page_data.get('title', url)}"]
+    for section in page_data.get("sections", []):
+        parts.append(f"{section.get('title', '')}\n{section.get('content', '')}")
+    index.put_source(
+        "wiki_pages", url, fingerprint, wiki_page_chunks("\n\n".join(parts), url)
+    )
+    index.save()
+
+
+def fuse_results(
+    result_lists: List[List[Dict[str, Any]]], top_k: int
+) -> List[Dict[str, Any]]:
+    """Merge ranked result lists with reciprocal-rank fusion.
+
+    Results are identified by chunk_text. The first list a chunk appears in
+    supplies its fields (pass vector hits first to keep cosine scores); a
+    "fusion_score" key carries the combined rank score.
+
+    Args:
+        result_lists: Ranked hit lists, best first.
+        top_k: Maximum number of fused results.
+
+    Returns:
+        Fused hits, best first.
+    """
+    fused: Dict[str, Dict[str, Any]] = {}
+    for hits in result_lists:
+        for rank, hit in enumerate(hits):
+            key = str(hit.get("chunk_text", ""))
+            record = fused.setdefault(key, {**hit, "fusion_score": 0.0})
+            record["fusion_score"] += 1.0 / (_RRF_K + rank + 1)
+    ranked = sorted(fused.values(), key=lambda hit: hit["fusion_score"], reverse=True)
+    return ranked[:top_k]
+
+
+def default_index_path() -> Path:
+    """Return the index location inside the configured cache dir."""
+    return Path(load_config().paths.cache_dir) / INDEX_FILE_NAME
+
+
+@lru_cache(maxsize=1)
+def _shared_index() -> LexicalIndex:
+    """Load the process-wide index once."""
+    return LexicalIndex.load(default_index_path())
+
+
+def get_lexical_index() -> LexicalIndex:
+    """Return the process-wide index, synced with the files on disk.
+
+    Returns:
+        Shared LexicalIndex; the disk scan is throttled by refresh_files().
+    """
+    index = _shared_index()
+    index.refresh_files()
+    return index
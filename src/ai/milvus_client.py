@@ -4,12 +4,23 @@ Milvus client and collection management.
 Wraps pymilvus with connection lifecycle, health checks, and collection
 bootstrap. All callers should check is_healthy() before using
 insert/search/delete operations.
+
+Long-lived callers (the sidecar, on-save sync) should share one client via
+get_shared_client(): it keeps the connection open, caches loaded collection
+handles, and batches flushes instead of sealing a segment after every write.
+Both it and create_vector_store() honour ``milvus.backend``, returning the
+embedded NumPy store instead of a server client when it is "embedded".
 """
 
-from typing import Any, Dict, List, Optional, Tuple, Type
+import atexit
+import threading
+import time
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple, Type
 
-from src.ai.milvus_collections import COLLECTIONS
-from src.config.config_loader import load_config
+from src.ai.embedded_vector_store import EmbeddedVectorStore
+from src.ai.milvus_collections import OUTPUT_FIELDS
+from src.ai.vector_store import CollectionSetMixin, VectorStore
+from src.config.config_loader import load_config, subscribe_config_changes
 from src.utils.terminal_display import print_info, print_warning
 
 # Exceptions treated as "Milvus unavailable" (connection refused, server down,
@@ -35,29 +46,113 @@ except ImportError:
     print("  Install with: pip install pymilvus")
     PYMILVUS_AVAILABLE = False
 
-# Default output fields per collection used in search results.
-_OUTPUT_FIELDS: Dict[str, List[str]] = {
-    "characters": ["character_name", "chunk_text", "chunk_type", "source_file"],
-    "npcs": ["npc_name", "location", "chunk_text", "source_file"],
-    "story_chunks": ["campaign_name", "story_file", "chunk_index", "chunk_text"],
-    "wiki_pages": ["page_url", "page_title", "chunk_text", "cached_at"],
-}
+# Seconds a health check result (good or bad) is trusted before pinging again.
+# Bounds both the per-query ping cost and how often a down server is retried.
+_HEALTH_TTL = 30.0
+
+# Deferred flush thresholds: pending writes on a collection are flushed once
+# this many rows accumulate or this many seconds pass since the first one.
+_FLUSH_ROWS = 1000
+_FLUSH_INTERVAL = 10.0
+
+
+class _DeferredFlushes:
+    """Collections with unflushed writes, flushed in batches.
+
+    A collection is flushed once _FLUSH_ROWS writes accumulate on it, or by a
+    background timer _FLUSH_INTERVAL seconds after its first pending write,
+    so the last writes of a burst are sealed without waiting for another
+    write or an explicit commit.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Tuple[Any, int, float]] = {}
+        self._timer: Optional[threading.Timer] = None
 
+    def record(self, base: str, col: Any, rows: int) -> None:
+        """Count a write against its collection and flush past a threshold.
 
-class MilvusClient:
+        Args:
+            base: Unqualified collection name.
+            col: Collection handle that was written to.
+            rows: Number of rows inserted or deleted.
+        """
+        with self._lock:
+            now = time.monotonic()
+            _, count, since = self._pending.get(base, (col, 0, now))
+            count += rows
+            if count < _FLUSH_ROWS and now - since < _FLUSH_INTERVAL:
+                self._pending[base] = (col, count, since)
+                self._schedule(since + _FLUSH_INTERVAL - now)
+                return
+            self._pending.pop(base, None)
+        col.flush()
+
+    def discard(self, base: str) -> None:
+        """Forget pending writes on a collection that is being dropped."""
+        with self._lock:
+            self._pending.pop(base, None)
+
+    def flush_all(self) -> None:
+        """Flush every collection with pending writes."""
+        with self._lock:
+            pending = list(self._pending.values())
+            self._pending.clear()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        for col, _, _ in pending:
+            col.flush()
+
+    def _schedule(self, delay: float) -> None:
+        """Start the flush timer unless one is already running (lock held)."""
+        if self._timer is None:
+            self._timer = threading.Timer(max(0.0, delay), self._flush_due)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush_due(self) -> None:
+        """Timer callback: flush collections whose interval has passed."""
+        with self._lock:
+            self._timer = None
+            now = time.monotonic()
+            due = [
+                base
+                for base, (_, _, since) in self._pending.items()
+                if now - since >= _FLUSH_INTERVAL
+            ]
+            cols = [self._pending.pop(base)[0] for base in due]
+            if self._pending:
+                oldest = min(since for _, _, since in self._pending.values())
+                self._schedule(oldest + _FLUSH_INTERVAL - now)
+        for col in cols:
+            try:
+                col.flush()
+            except _connect_errors:
+                # The rows are already searchable; Milvus seals them later.
+                pass
+
+
+class MilvusClient(CollectionSetMixin):
     """Manages connection to Milvus and ensures collections exist.
 
+    Collection handles are cached per connection and writes are flushed in
+    batches, at the latest _FLUSH_INTERVAL seconds after they were made;
+    commit() and disconnect() flush anything still pending at once.
+
     Attributes:
         connected: True once the connection is confirmed healthy.
     """
 
     def __init__(self) -> None:
-        cfg = load_config().milvus
-        self._host = cfg.host
-        self._port = cfg.port
-        self._prefix = cfg.collection_prefix
-        self._dim = cfg.embedding.dim
+        self._cfg = load_config().milvus
         self.connected: bool = False
+        self._lock = threading.RLock()
+        self._collections: Dict[str, Any] = {}
+        self._flushes = _DeferredFlushes()
+        self._wants_connection = False
+        self._checked_at: Optional[float] = None
 
     def connect(self) -> bool:
         """Open a connection to Milvus.
@@ -67,27 +162,36 @@ class MilvusClient:
         """
         if not PYMILVUS_AVAILABLE:
             return False
-        try:
-            connections.connect(
-                alias="default",
-                host=self._host,
-                port=str(self._port),
-            )
-            self.connected = True
-            return True
-        except _connect_errors:
-            self.connected = False
-            return False
+        with self._lock:
+            self._wants_connection = True
+            self._collections.clear()
+            self._checked_at = time.monotonic()
+            try:
+                connections.connect(
+                    alias="default",
+                    host=self._cfg.host,
+                    port=str(self._cfg.port),
+                )
+                self.connected = True
+                return True
+            except _connect_errors:
+                self.connected = False
+                return False
 
     def disconnect(self) -> None:
-        """Close connection if open."""
+        """Flush pending writes and close the connection if open."""
         if not PYMILVUS_AVAILABLE or not self.connected:
+            self._wants_connection = False
             return
-        try:
-            connections.disconnect("default")
-        except (OSError, RuntimeError):
-            pass
-        self.connected = False
+        self.commit()
+        with self._lock:
+            try:
+                connections.disconnect("default")
+            except (OSError, RuntimeError):
+                pass
+            self._collections.clear()
+            self._wants_connection = False
+            self.connected = False
 
     def is_available(self) -> bool:
         """Check whether Milvus is reachable.
@@ -98,19 +202,42 @@ class MilvusClient:
         return self.is_healthy()
 
     def is_healthy(self) -> bool:
-        """Ping Milvus and return True when reachable.
+        """Return True when Milvus is reachable.
+
+        The result is cached for _HEALTH_TTL seconds so per-query callers do
+        not pay a server round-trip each time. When the cached state has
+        expired a lost connection is re-established, with handles cached
+        against the old connection discarded.
 
         Returns:
             True if the server responds, False otherwise.
         """
-        if not PYMILVUS_AVAILABLE or not self.connected:
+        if not PYMILVUS_AVAILABLE or not self._wants_connection:
             return False
+        with self._lock:
+            now = time.monotonic()
+            if self._checked_at is not None and now - self._checked_at < _HEALTH_TTL:
+                return self.connected
+            self._checked_at = now
+            if self.connected and self._ping():
+                return True
+            self._collections.clear()
+            self.connected = self.connect() and self._ping()
+            return self.connected
+
+    def _ping(self) -> bool:
+        """Ask the server for its version; False when it does not answer."""
         try:
             return bool(utility.get_server_version())
-        except (OSError, RuntimeError):
-            self.connected = False
+        except _connect_errors:
             return False
 
+    def _mark_unhealthy(self) -> None:
+        """Drop cached handles and force a health check on next use."""
+        with self._lock:
+            self._collections.clear()
+            self._checked_at = None
+
     def collection_name(self, base: str) -> str:
         """Return a fully qualified collection name.
 
@@ -120,7 +247,7 @@ class MilvusClient:
         Returns:
             Prefixed name such as "dnd_characters".
         """
-        return f"{self._prefix}_{base}"
+        return f"{self._cfg.collection_prefix}_{base}"
 
     def ensure_collection(
         self, base: str, schema_def: Dict[str, Any]
@@ -136,11 +263,10 @@ class MilvusClient:
         """
         if not self.connected:
             return None
+        existing = self.get_collection(base)
+        if existing is not None:
+            return existing
         name = self.collection_name(base)
-        if utility.has_collection(name):
-            col = Collection(name)
-            col.load()
-            return col
         fields = []
         for fld in schema_def["fields"]:
             dtype = getattr(DataType, fld["dtype"])
@@ -148,7 +274,7 @@ class MilvusClient:
             if fld["dtype"] == "VARCHAR":
                 kwargs["max_length"] = fld["max_length"]
             if fld["dtype"] == "FLOAT_VECTOR":
-                kwargs["dim"] = self._dim
+                kwargs["dim"] = self._cfg.embedding.dim
             fields.append(
                 FieldSchema(
                     name=fld["name"],
@@ -172,33 +298,34 @@ class MilvusClient:
             },
         )
         collection.load()
+        with self._lock:
+            self._collections[base] = collection
         print_info(f"[Milvus] Created collection: {name}")
         return collection
 
-    def create_collections(self) -> None:
-        """Create all standard D&D collections.
-
-        Delegates to ensure_collection for each entry in COLLECTIONS.
-        """
-        for base, schema_def in COLLECTIONS.items():
-            self.ensure_collection(base, schema_def)
-
-    def delete_collections(self) -> None:
-        """Drop all standard D&D collections.
+    def drop_collection(self, base: str) -> None:
+        """Drop a single collection if it exists.
 
-        Used for full re-index or test teardown.
+        Args:
+            base: Unqualified collection name.
         """
         if not self.connected:
             return
-        for base in COLLECTIONS:
-            name = self.collection_name(base)
-            if utility.has_collection(name):
-                utility.drop_collection(name)
-                print_info(f"[Milvus] Dropped collection: {name}")
+        with self._lock:
+            self._collections.pop(base, None)
+        self._flushes.discard(base)
+        name = self.collection_name(base)
+        if utility.has_collection(name):
+            utility.drop_collection(name)
+            print_info(f"[Milvus] Dropped collection: {name}")
 
     def get_collection(self, base: str) -> Optional[Any]:
         """Return a loaded Collection or None when unavailable.
 
+        Handles are cached per collection, so only the first call on a
+        connection pays for has_collection() and load(). A server error
+        while loading returns None and forces a health check on next use.
+
         Args:
             base: Unqualified collection name.
 
@@ -207,12 +334,29 @@ class MilvusClient:
         """
         if not self.connected:
             return None
-        name = self.collection_name(base)
-        if not utility.has_collection(name):
-            return None
-        col = Collection(name)
-        col.load()
-        return col
+        with self._lock:
+            col = self._collections.get(base)
+            if col is not None:
+                return col
+            name = self.collection_name(base)
+            try:
+                if not utility.has_collection(name):
+                    return None
+                col = Collection(name)
+                col.load()
+            except _connect_errors:
+                self._mark_unhealthy()
+                return None
+            self._collections[base] = col
+            return col
+
+    def commit(self) -> None:
+        """Flush every collection with pending inserts or deletes.
+
+        Writes are searchable before they are flushed; flushing seals them
+        into persisted segments. Call this at the end of a batch of writes.
+        """
+        self._flushes.flush_all()
 
     def insert(self, base: str, rows: List[Dict[str, Any]]) -> int:
         """Bulk-insert rows into a collection.
@@ -227,16 +371,47 @@ class MilvusClient:
         Returns:
             Number of rows inserted, 0 on failure.
         """
+        result = self._insert_columns(base, rows)
+        return len(rows) if result is not None else 0
+
+    def insert_returning_ids(self, base: str, rows: List[Dict[str, Any]]) -> List[int]:
+        """Bulk-insert rows and return the primary keys Milvus assigned.
+
+        The index manifest records these ids so a changed file's old chunks
+        can be deleted precisely on the next reindex.
+
+        Args:
+            base: Unqualified collection name.
+            rows: List of dicts whose keys match the collection schema.
+
+        Returns:
+            Auto-generated primary keys in row order, [] on failure.
+        """
+        result = self._insert_columns(base, rows)
+        if result is None:
+            return []
+        return [int(pk) for pk in getattr(result, "primary_keys", [])]
+
+    def _insert_columns(self, base: str, rows: List[Dict[str, Any]]) -> Optional[Any]:
+        """Transpose rows to columns and insert; the flush is deferred.
+
+        Args:
+            base: Unqualified collection name.
+            rows: List of dicts whose keys match the collection schema.
+
+        Returns:
+            The pymilvus MutationResult, or None when nothing was inserted.
+        """
         col = self.get_collection(base)
         if col is None or not rows:
-            return 0
+            return None
         columns: Dict[str, List[Any]] = {k: [] for k in rows[0]}
         for row in rows:
             for key, value in row.items():
                 columns[key].append(value)
-        col.insert(list(columns.values()))
-        col.flush()
-        return len(rows)
+        result = col.insert(list(columns.values()))
+        self._flushes.record(base, col, len(rows))
+        return result
 
     def search(
         self,
@@ -248,7 +423,7 @@ class MilvusClient:
         """Perform a cosine-similarity vector search.
 
         Output fields are determined automatically from the collection name.
-        Use _OUTPUT_FIELDS to see the per-collection field sets.
+        Use OUTPUT_FIELDS to see the per-collection field sets.
 
         Args:
             base: Unqualified collection name.
@@ -259,27 +434,56 @@ class MilvusClient:
         Returns:
             List of result dicts each including a "score" key.
         """
+        return self.search_many(base, [query_vector], top_k=top_k, expr=expr)[0]
+
+    def search_many(
+        self,
+        base: str,
+        query_vectors: List[List[float]],
+        top_k: int = 5,
+        expr: str = "",
+    ) -> List[List[Dict[str, Any]]]:
+        """Search several query vectors in a single request.
+
+        Args:
+            base: Unqualified collection name.
+            query_vectors: Embeddings of the query texts.
+            top_k: Maximum number of results per query.
+            expr: Optional Milvus boolean expression filter applied to all.
+
+        Returns:
+            One result list per query vector, in input order. Lists are empty
+            when the collection is unavailable or the search fails.
+        """
+        empty: List[List[Dict[str, Any]]] = [[] for _ in query_vectors]
         col = self.get_collection(base)
-        if col is None:
-            return []
-        output_fields = _OUTPUT_FIELDS.get(base, [])
+        if col is None or not query_vectors:
+            return empty
+        output_fields = OUTPUT_FIELDS.get(base, [])
         params = {"metric_type": "COSINE", "params": {"nprobe": 16}}
-        results = col.search(
-            data=[query_vector],
-            anns_field="embedding",
-            param=params,
-            limit=top_k,
-            expr=expr or None,
-            output_fields=output_fields,
-        )
-        hits: List[Dict[str, Any]] = []
-        for hit in results[0]:
-            record: Dict[str, Any] = {
-                field: hit.entity.get(field) for field in output_fields
-            }
-            record["score"] = hit.score
-            hits.append(record)
-        return hits
+        try:
+            results = col.search(
+                data=query_vectors,
+                anns_field="embedding",
+                param=params,
+                limit=top_k,
+                expr=expr or None,
+                output_fields=output_fields,
+            )
+        except _connect_errors:
+            self._mark_unhealthy()
+            return empty
+        batches: List[List[Dict[str, Any]]] = []
+        for result in results:
+            hits: List[Dict[str, Any]] = []
+            for hit in result:
+                record: Dict[str, Any] = {
+                    field: hit.entity.get(field) for field in output_fields
+                }
+                record["score"] = hit.score
+                hits.append(record)
+            batches.append(hits)
+        return batches
 
     def delete_by_source(
         self, base: str, source_field: str, source_value: str
@@ -297,4 +501,78 @@ class MilvusClient:
         if col is None:
             return
         col.delete(f'{source_field} == "{source_value}"')
-        col.flush()
+        self._flushes.record(base, col, 1)
+
+    def delete_by_ids(self, base: str, ids: List[int]) -> None:
+        """Remove rows by primary key.
+
+        Args:
+            base: Unqualified collection name.
+            ids: Primary keys previously returned by insert_returning_ids().
+        """
+        if not ids:
+            return
+        col = self.get_collection(base)
+        if col is None:
+            return
+        col.delete(f"id in [{', '.join(str(int(pk)) for pk in ids)}]")
+        self._flushes.record(base, col, len(ids))
+
+
+def create_vector_store() -> VectorStore:
+    """Return a new, unconnected store for the configured backend.
+
+    ``milvus.backend`` (MILVUS_BACKEND) "embedded" selects the NumPy-backed
+    EmbeddedVectorStore; anything else the Milvus server client.
+
+    Returns:
+        A VectorStore; call connect() before use.
+    """
+    if load_config().milvus.backend == "embedded":
+        return EmbeddedVectorStore()
+    return MilvusClient()
+
+
+# Module-level holder for the shared store (see wiki_scraping).
+_shared_holder: List[VectorStore] = []
+_shared_lock = threading.Lock()
+
+
+def get_shared_client() -> VectorStore:
+    """Return the process-wide vector store.
+
+    The store connects on first use when Milvus is enabled and stays
+    connected until reset_shared_client(), which also runs at interpreter
+    exit so pending writes are flushed.
+
+    Returns:
+        Shared VectorStore instance (MilvusClient unless the embedded
+        backend is configured).
+    """
+    with _shared_lock:
+        if not _shared_holder:
+            client = create_vector_store()
+            if load_config().milvus.enabled:
+                client.connect()
+            _shared_holder.append(client)
+        return _shared_holder[0]
+
+
+def reset_shared_client() -> None:
+    """Flush and disconnect the shared store; the next use builds a new one."""
+    with _shared_lock:
+        if _shared_holder:
+            _shared_holder.pop().disconnect()
+
+
+atexit.register(reset_shared_client)
+
+
+@subscribe_config_changes
+def _on_config_change(changed: FrozenSet[str], _config: Any) -> None:
+    """Close and drop the shared client when the Milvus settings change.
+
+    The next get_shared_client() call connects with the new settings.
+    """
+    if "milvus" in changed:
+        reset_shared_client()
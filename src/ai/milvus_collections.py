@@ -4,8 +4,11 @@ Milvus collection definitions for D&D data types.
 This module defines the collection schemas for storing embeddings in Milvus.
 """
 
-from typing import Dict, Any
+from typing import Any, Dict, List
 
+# Bump whenever a collection's fields or chunking change shape. The index
+# manifest records it, and a mismatch forces a full rebuild on the next reindex.
+SCHEMA_VERSION = 1
 
 COLLECTIONS: Dict[str, Dict[str, Any]] = {
     "characters": {
@@ -56,3 +59,11 @@ COLLECTIONS: Dict[str, Dict[str, Any]] = {
         "index": {"metric_type": "COSINE", "index_type": "IVF_FLAT", "nlist": 256},
     },
 }
+
+# Default output fields per collection used in search results.
+OUTPUT_FIELDS: Dict[str, List[str]] = {
+    "characters": ["character_name", "chunk_text", "chunk_type", "source_file"],
+    "npcs": ["npc_name", "location", "chunk_text", "source_file"],
+    "story_chunks": ["campaign_name", "story_file", "chunk_index", "chunk_text"],
+    "wiki_pages": ["page_url", "page_title", "chunk_text", "cached_at"],
+}
@@ -0,0 +1,377 @@
+"""
+Background render queue for ComfyUI portraits.
+
+Submitting a portrait returns a job immediately; one worker thread renders
+jobs in arrival order, grouped by checkpoint, so a party's portraits queued
+together run back to back on one loaded Stable Diffusion model and ComfyUI
+is only asked to ``free()`` once the group is done. Finished images are kept
+in a content-addressed cache keyed by (workflow hash, seed): re-requesting a
+render with the same graph and seed is a file read, and identical jobs
+submitted while one is pending share it.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from src.ai.comfyui_client import ComfyUIClient
+from src.utils.tts_audio_cache import TtsAudioCache
+
+logger = logging.getLogger(__name__)
+
+# Finished jobs remembered for status/result lookups.
+_KEEP_FINISHED = 64
+
+
+def portrait_key(workflow: Dict[str, Any], seed: int) -> str:
+    """Return the cache key for one render.
+
+    Args:
+        workflow: The ComfyUI workflow in API JSON form.
+        seed: The sampler seed patched into the workflow.
+
+    Returns:
+        Hex SHA-256 digest of the canonical workflow JSON and the seed.
+    """
+    workflow_hash = hashlib.sha256(
+        json.dumps(workflow, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+    return hashlib.sha256(f"{workflow_hash}\0{seed}".encode("utf-8")).hexdigest()
+
+
+class JobStatus(Enum):
+    """Lifecycle of a portrait job."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+@dataclass(eq=False)
+class PortraitRender:
+    """What one job renders, and on which server.
+
+    Attributes:
+        client: Client for the ComfyUI server that renders it
+        workflow: The workflow to queue on ComfyUI, in API JSON form
+        checkpoint: SD checkpoint the workflow loads (the batching key)
+        seed: The sampler seed patched into the workflow
+        key: portrait_key() of the render, derived from workflow and seed
+    """
+
+    client: ComfyUIClient
+    workflow: Dict[str, Any]
+    checkpoint: str
+    seed: int
+    key: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        """Derive the cache key from the workflow and seed."""
+        self.key = portrait_key(self.workflow, self.seed)
+
+    @property
+    def group(self) -> Tuple[int, str]:
+        """Batching key: renders on the same server and checkpoint share a load."""
+        return id(self.client), self.checkpoint
+
+
+@dataclass
+class PortraitOutcome:
+    """How a finished job ended.
+
+    Attributes:
+        image: PNG bytes once done
+        error: Failure reason when failed
+        cached: True when the image came from the cache
+        finished: Epoch seconds when the job finished
+    """
+
+    image: Optional[bytes] = None
+    error: str = ""
+    cached: bool = False
+    finished: Optional[float] = None
+
+
+@dataclass(eq=False)
+class PortraitJob:
+    """One portrait render and its outcome.
+
+    Attributes:
+        job_id: Identifier returned to the caller
+        render: What to render and where
+        metadata: Caller data echoed with the result (seed, prompt, alt, ...)
+        status: Current lifecycle state
+        progress: Sampler progress from 0.0 to 1.0
+        outcome: Image or failure once finished
+    """
+
+    job_id: str
+    render: PortraitRender
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    status: JobStatus = JobStatus.QUEUED
+    progress: float = 0.0
+    outcome: PortraitOutcome = field(default_factory=PortraitOutcome)
+    _done: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def is_finished(self) -> bool:
+        """True once the job is done or failed."""
+        return self.status in (JobStatus.DONE, JobStatus.FAILED)
+
+    def advance(self, value: int, total: int) -> None:
+        """Record sampler progress reported by the event stream."""
+        if total > 0:
+            self.progress = min(1.0, value / total)
+
+    def finish(self, image: Optional[bytes], error: str, cached: bool = False) -> None:
+        """Record the job's outcome and wake its waiters.
+
+        Args:
+            image: The rendered PNG, or None when the render failed.
+            error: Failure reason, ignored when an image is given.
+            cached: True when the image came from the cache.
+        """
+        self.outcome = PortraitOutcome(
+            image=image,
+            error="" if image is not None else error,
+            cached=cached,
+            finished=time.time(),
+        )
+        self.status = JobStatus.DONE if image is not None else JobStatus.FAILED
+        if image is not None:
+            self.progress = 1.0
+        self._done.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the job finishes.
+
+        Args:
+            timeout: Seconds to wait; None waits indefinitely.
+
+        Returns:
+            True when the job finished within the timeout.
+        """
+        return self._done.wait(timeout)
+
+
+class _QueueState:
+    """Jobs known to a queue, guarded by the queue's condition lock.
+
+    Attributes:
+        pending: Jobs waiting to render, in arrival order
+        current: Group the worker is rendering, or None between batches
+        jobs: Jobs by id, for status and result lookups
+        active: Unfinished jobs by render key, so repeats share one job
+        counts: "batches", "renders" and "cache_hits" counters
+    """
+
+    def __init__(self) -> None:
+        self.pending: List[PortraitJob] = []
+        self.current: Optional[Tuple[int, str]] = None
+        self.jobs: "OrderedDict[str, PortraitJob]" = OrderedDict()
+        self.active: Dict[str, PortraitJob] = {}
+        self.counts: Counter[str] = Counter()
+
+    def remember(self, job: PortraitJob) -> None:
+        """Track a job, dropping the oldest finished ones over the limit."""
+        self.jobs[job.job_id] = job
+        finished = [jid for jid, known in self.jobs.items() if known.is_finished]
+        for job_id in finished[: max(0, len(finished) - _KEEP_FINISHED)]:
+            del self.jobs[job_id]
+
+    def render_order(self) -> List[PortraitJob]:
+        """Pending jobs in the order the worker will take them."""
+        order: List[PortraitJob] = []
+        remaining = list(self.pending)
+        group = self.current
+        while remaining:
+            if group is None:
+                group = remaining[0].render.group
+            order.extend(job for job in remaining if job.render.group == group)
+            remaining = [job for job in remaining if job.render.group != group]
+            group = None
+        return order
+
+    def take(self, group: Tuple[int, str]) -> Optional[PortraitJob]:
+        """Remove and return the next pending job of a group, if any."""
+        job = next((j for j in self.pending if j.render.group == group), None)
+        if job is None:
+            self.current = None
+            return None
+        self.pending.remove(job)
+        job.status = JobStatus.RUNNING
+        self.counts["renders"] += 1
+        return job
+
+
+class PortraitJobQueue:
+    """Single-worker portrait queue that batches renders per checkpoint."""
+
+    def __init__(
+        self,
+        cache: Optional[TtsAudioCache] = None,
+        prepare: Optional[Callable[[], None]] = None,
+        batch_window: float = 0.5,
+    ) -> None:
+        """
+        Args:
+            cache: Content-addressed image store, or None to disable caching.
+            prepare: Called before each batch starts rendering (e.g. to unload
+                resident Ollama models ahead of the SD checkpoint). It must be
+                best-effort and never raise.
+            batch_window: Seconds to wait for more submissions before an idle
+                worker starts a batch, so requests fired together share it.
+        """
+        self.cache = cache
+        self.prepare = prepare
+        self.batch_window = batch_window
+        self._cond = threading.Condition()
+        self._state = _QueueState()
+        self._worker: Optional[threading.Thread] = None
+
+    def submit(
+        self, render: PortraitRender, metadata: Optional[Dict[str, Any]] = None
+    ) -> PortraitJob:
+        """Queue a render, or answer it from the cache.
+
+        Args:
+            render: What to render and on which server.
+            metadata: Data to keep with the job for the result.
+
+        Returns:
+            The job; already finished on a cache hit, or the pending job of
+            an identical earlier submission.
+        """
+        with self._cond:
+            active = self._state.active.get(render.key)
+            if active is not None:
+                return active
+            job = PortraitJob(
+                job_id=uuid.uuid4().hex, render=render, metadata=dict(metadata or {})
+            )
+            self._state.remember(job)
+        image = self.cache.get(render.key) if self.cache is not None else None
+        with self._cond:
+            if image is not None:
+                self._state.counts["cache_hits"] += 1
+                job.finish(image, "", cached=True)
+                return job
+            self._state.active[render.key] = job
+            self._state.pending.append(job)
+            if self._worker is None or not self._worker.is_alive():
+                self._start_worker()
+            self._cond.notify_all()
+        return job
+
+    def _start_worker(self) -> None:
+        """Start a worker thread (caller holds the condition lock)."""
+        self._worker = threading.Thread(target=self._run, name="portrait-jobs", daemon=True)
+        self._worker.start()
+
+    def get(self, job_id: str) -> Optional[PortraitJob]:
+        """Return a known job by id."""
+        with self._cond:
+            return self._state.jobs.get(job_id)
+
+    def position(self, job: PortraitJob) -> int:
+        """Return how many queued jobs render before this one (0 when not queued)."""
+        with self._cond:
+            order = self._state.render_order()
+            return order.index(job) if job in order else 0
+
+    def _run(self) -> None:
+        """Worker thread: run the loop, handing over to a new worker if it dies.
+
+        The loop only ends when a render raised something unexpected. That
+        job has already been failed by _run_batch(); the rest of the queue is
+        picked up by a fresh worker instead of waiting for the next submit.
+        """
+        try:
+            self._work()
+        finally:
+            with self._cond:
+                self._state.current = None
+                if self._worker is threading.current_thread():
+                    self._worker = None
+                    if self._state.pending:
+                        self._start_worker()
+
+    def _work(self) -> None:
+        """Worker loop: render one checkpoint group at a time."""
+        while True:
+            with self._cond:
+                while not self._state.pending:
+                    self._cond.wait()
+                if self.batch_window > 0:
+                    gather_until = time.monotonic() + self.batch_window
+                    while (remaining := gather_until - time.monotonic()) > 0:
+                        self._cond.wait(remaining)
+                group = self._state.current = self._state.pending[0].render.group
+                self._state.counts["batches"] += 1
+            if self.prepare is not None:
+                self.prepare()
+            self._run_batch(group)
+
+    def _run_batch(self, group: Tuple[int, str]) -> None:
+        """Render queued jobs of one group until none are left, then free."""
+        while True:
+            with self._cond:
+                job = self._state.take(group)
+            if job is None:
+                return
+            image: Optional[bytes] = None
+            error = "Portrait render failed unexpectedly"
+            try:
+                image, error = _render(job)
+                if image is not None and self.cache is not None:
+                    self.cache.put(job.render.key, image)
+                with self._cond:
+                    more = any(j.render.group == group for j in self._state.pending)
+                if not more:
+                    # Unload models once the group is done: this box is CPU-only
+                    # and an SD checkpoint left resident alongside Ollama/DDEV is
+                    # the top OOM risk.
+                    job.render.client.free()
+            finally:
+                # Always settle the job, so waiters wake and a resubmit of the
+                # same render queues a new job instead of joining a dead one.
+                with self._cond:
+                    self._state.active.pop(job.render.key, None)
+                    job.finish(image, error)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return queue depth and batching counters."""
+        with self._cond:
+            return {
+                "queued": len(self._state.pending),
+                "running": sum(
+                    1
+                    for job in self._state.active.values()
+                    if job.status == JobStatus.RUNNING
+                ),
+                "batches": self._state.counts["batches"],
+                "renders": self._state.counts["renders"],
+                "cache_hits": self._state.counts["cache_hits"],
+            }
+
+
+def _render(job: PortraitJob) -> Tuple[Optional[bytes], str]:
+    """Run one render, returning its image or the reason it failed."""
+    try:
+        image = job.render.client.generate(job.render.workflow, on_progress=job.advance)
+    except (requests.RequestException, OSError, ValueError) as exc:
+        logger.exception("Portrait render %s failed", job.job_id)
+        return None, str(exc) or type(exc).__name__
+    if image is None:
+        return None, "ComfyUI generation failed or timed out"
+    return image, ""
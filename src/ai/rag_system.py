@@ -11,11 +11,15 @@ import json
 import logging
 import os
 import re
+import threading
 import time
+from contextlib import contextmanager, nullcontext
 from typing import (
     Any,
     Dict,
     FrozenSet,
+    Iterable,
+    Iterator,
     List,
     Optional,
     Protocol,
@@ -28,7 +32,8 @@ from urllib.parse import quote
 from src.utils.errors import DnDError, display_error
 from src.config.config_loader import load_config
 from src.items.item_registry import ItemRegistry
-from src.integration.drupal_sync import DrupalSync, DrupalSyncError
+from src.integration.drupal_sync import DrupalSync, DrupalSyncError, WikiCacheWrite
+from src.ai.wiki_scraping import HtmlDiskCache, html_cache_for
 
 if TYPE_CHECKING:
     from src.config.config_types import RAGConfig
@@ -43,6 +48,8 @@ _RULES_ENTITY_LIMIT: int = 10
 _RELEVANCE_TITLE_MATCH: float = 2.0
 _RELEVANCE_TITLE_WORD: float = 0.5
 _RELEVANCE_CONTENT_WORD: float = 0.1
+# Prefetched entries not read within this many seconds are discarded.
+_PREFETCH_TTL: float = 60.0
 _RULES_STOP_WORDS: FrozenSet[str] = frozenset({
     "A", "An", "And", "Are", "As", "At", "Be", "But", "By", "Could",
     "For", "From", "Has", "Had", "Have", "Her", "His", "How", "In", "Is",
@@ -52,6 +59,7 @@ _RULES_STOP_WORDS: FrozenSet[str] = frozenset({
 })
 
 try:
+    from src.ai.lexical_index import get_lexical_index, index_wiki_page
     from src.ai.semantic_retriever import SemanticRetriever
     SEMANTIC_RETRIEVER_AVAILABLE = True
 except ImportError:
@@ -111,20 +119,76 @@ class DrupalWikiCache:
         """
         self._sync = drupal_sync
         self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # url hash -> (prefetched at, entry or None for a known miss)
+        self._prefetched: Dict[str, Any] = {}
+        self._local = threading.local()
 
     def _cache_key(self, url: str) -> str:
         return hashlib.md5(url.encode("utf-8")).hexdigest()
 
+    def prefetch(self, urls: Iterable[str]) -> None:
+        """Read many entries in one batched call ahead of the get() calls.
+
+        Each prefetched entry (hit or miss) answers the next get() for its URL
+        without a round trip; entries unread after a minute are discarded.
+        """
+        if self._sync is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._prefetched = {
+                key: value for key, value in self._prefetched.items()
+                if now - value[0] < _PREFETCH_TTL
+            }
+            wanted = [
+                key for key in dict.fromkeys(self._cache_key(url) for url in urls)
+                if key not in self._prefetched
+            ]
+        if not wanted:
+            return
+        try:
+            entries = self._sync.get_wiki_page_cache_many(wanted)
+        except DrupalSyncError as exc:
+            logger.debug("Drupal cache prefetch failed: %s", exc)
+            return
+        with self._lock:
+            for key in wanted:
+                self._prefetched[key] = (now, entries.get(key))
+
+    @contextmanager
+    def write_batch(self) -> Iterator[None]:
+        """Defer this thread's set() calls and write them in one bulk call on exit."""
+        if getattr(self._local, "pending", None) is not None:
+            yield
+            return
+        pending: List[WikiCacheWrite] = []
+        self._local.pending = pending
+        try:
+            yield
+        finally:
+            self._local.pending = None
+            if pending and self._sync is not None:
+                try:
+                    self._sync.set_wiki_page_cache_many(pending)
+                except DrupalSyncError as exc:
+                    logger.warning("Drupal cache bulk set failed: %s", exc)
+
     def get(self, url: str) -> Optional[Dict[str, Any]]:
         """Return cached content for url, or None if missing, expired, or unavailable."""
         if self._sync is None:
             return None
         cache_key = self._cache_key(url)
-        try:
-            page_data = self._sync.get_wiki_page_cache(cache_key)
-        except DrupalSyncError as exc:
-            logger.debug("Drupal cache get failed: %s", exc)
-            page_data = None
+        with self._lock:
+            prefetched = self._prefetched.pop(cache_key, None)
+        if prefetched is not None:
+            page_data = prefetched[1]
+        else:
+            try:
+                page_data = self._sync.get_wiki_page_cache(cache_key)
+            except DrupalSyncError as exc:
+                logger.debug("Drupal cache get failed: %s", exc)
+                page_data = None
         if not page_data:
             return None
         try:
@@ -149,6 +213,12 @@ class DrupalWikiCache:
         if self._sync is None:
             return
         cache_key = self._cache_key(url)
+        with self._lock:
+            self._prefetched.pop(cache_key, None)
+        pending = getattr(self._local, "pending", None)
+        if pending is not None:
+            pending.append((cache_key, url, time.time(), json.dumps(content)))
+            return
         try:
             self._sync.set_wiki_page_cache(
                 url_hash=cache_key,
@@ -164,6 +234,8 @@ class DrupalWikiCache:
         if self._sync is None:
             return
         cache_key = self._cache_key(url)
+        with self._lock:
+            self._prefetched.pop(cache_key, None)
         try:
             self._sync.delete_wiki_page_cache(cache_key)
         except DrupalSyncError as exc:
@@ -185,6 +257,34 @@ class DrupalWikiCache:
         return {"entries": count, "backend": "drupal"}
 
 
+def prefetch_cache(cache: object, urls: Iterable[str]) -> None:
+    """Prefetch cache entries when the cache supports batched reads.
+
+    Caches without a ``prefetch`` method are left alone; their get() calls
+    simply go to the backend one by one.
+
+    Args:
+        cache: A wiki cache (normally a DrupalWikiCache).
+        urls: Cache keys about to be read.
+    """
+    prefetch = getattr(cache, "prefetch", None)
+    if prefetch is not None:
+        prefetch(urls)
+
+
+def write_batch(cache: object) -> Any:
+    """Return the cache's write_batch() context, or a no-op one.
+
+    Args:
+        cache: A wiki cache (normally a DrupalWikiCache).
+
+    Returns:
+        A context manager deferring set() calls into one bulk write.
+    """
+    batch = getattr(cache, "write_batch", None)
+    return batch() if batch is not None else nullcontext()
+
+
 class WikiClient:
     """Fetches and parses wiki pages with caching and optional homebrew item filtering."""
 
@@ -204,6 +304,9 @@ class WikiClient:
         """
         self.base_url = base_url.rstrip("/")
         self.cache = cache or DrupalWikiCache(drupal_sync=None)
+        # Local raw-HTML cache used by the rules-wiki resolvers; pages are
+        # always fetched live while it is None.
+        self.html_cache: Optional[HtmlDiskCache] = None
         self.item_registry = item_registry
         self.max_fetches_per_call = max_fetches_per_call
         self.session = requests.Session() if SCRAPING_AVAILABLE else None
@@ -265,6 +368,14 @@ class WikiClient:
             sections.append(current_section)
         return sections
 
+    def page_url(self, page_title: str) -> str:
+        """Return the wiki URL (and cache key) for a page title."""
+        return f"{self.base_url}/{quote(page_title.replace(' ', '_'))}"
+
+    def prefetch_pages(self, page_titles: Iterable[str]) -> None:
+        """Read the cache entries for several pages in one batched call."""
+        prefetch_cache(self.cache, (self.page_url(title) for title in page_titles))
+
     def fetch_page(
         self, page_title: str, force_refresh: bool = False
     ) -> Optional[Dict]:
@@ -286,11 +397,12 @@ class WikiClient:
         if self.item_registry and self.item_registry.is_custom(page_title):
             logger.debug("Blocked custom item lookup: %s (in custom registry)", page_title)
             return None
-        page_url = f"{self.base_url}/{quote(page_title.replace(' ', '_'))}"
+        page_url = self.page_url(page_title)
         if not force_refresh:
             cached = self.cache.get(page_url)
             if cached:
                 logger.debug("Cache hit: %s", page_title)
+                _index_page(cached)
                 return cached
         page_data = None
         try:
@@ -317,6 +429,7 @@ class WikiClient:
                     "fetched_at": time.time(),
                 }
                 self.cache.set(page_url, page_data)
+                _index_page(page_data)
                 logger.debug("Fetched: %s (%d sections)", title, len(sections))
             else:
                 logger.warning("Could not find content for %s", page_title)
@@ -363,6 +476,12 @@ class WikiClient:
         return results[:max_results]
 
 
+def _index_page(page_data: Dict[str, Any]) -> None:
+    """Add a wiki page to the lexical index so lore retrieval can find it."""
+    if SEMANTIC_RETRIEVER_AVAILABLE:
+        index_wiki_page(get_lexical_index(), page_data)
+
+
 def _extract_entity_candidates(prompt: str, limit: int = 10) -> List[str]:
     """Extract capitalised phrase candidates from a prompt for wiki lookup.
 
@@ -490,9 +609,8 @@ class RAGSystem:
             logger.warning("RAG_WIKI_BASE_URL not set - lore lookups disabled")
 
         if self.rules_base_url:
-            self.rules_client = WikiClient(
-                self.rules_base_url, cache, self.item_registry
-            )
+            self.rules_client = WikiClient(self.rules_base_url, cache, self.item_registry)
+            self.rules_client.html_cache = html_cache_for(cache_ttl)
             logger.debug("RAG Rules Wiki initialized: %s", self.rules_base_url)
         else:
             self.rules_client = None
@@ -504,21 +622,33 @@ class RAGSystem:
                 "Custom item filter: %d items - will NOT lookup on external wikis", custom_count
             )
 
+    def prefetch(self, urls: Iterable[str]) -> None:
+        """Read the wiki cache entries for many URLs in one batched call.
+
+        Both wiki clients share one cache, so either serves the prefetch.
+
+        Args:
+            urls: Cache keys (page URLs, optionally suffixed) about to be read.
+        """
+        client = self.rules_client or self.client
+        if client is not None:
+            prefetch_cache(client.cache, urls)
+
     def get_relevant_context(self, prompt: str, campaign_name: str) -> str:
-        """Return semantically relevant lore context via Milvus when available.
+        """Return relevant lore and story context from hybrid retrieval.
+
+        Works without Milvus: the lexical index alone then supplies results.
 
         Args:
             prompt: Current AI prompt text.
             campaign_name: Active campaign name for story-chunk scoping.
 
         Returns:
-            Formatted context string, or empty string when Milvus is unavailable.
+            Formatted context string, or empty string when nothing matched.
         """
         if not SEMANTIC_RETRIEVER_AVAILABLE:
             return ""
         retriever = SemanticRetriever()
-        if not retriever.is_available():
-            return ""
         lore_chunks = retriever.get_relevant_lore(prompt)
         story_chunks = retriever.get_relevant_story_context(prompt, campaign_name)
         parts: List[str] = []
@@ -576,18 +706,20 @@ class RAGSystem:
         if not self.enabled or not self.client:
             return ""
         pages = pages_to_search[:self.client.max_fetches_per_call]
+        self.client.prefetch_pages(pages)
         parts: List[str] = []
-        for page_title in pages:
-            page_data = self.client.fetch_page(page_title)
-            if not page_data:
-                continue
-            results = self.client.search_sections(page_data, query, max_results)
-            if results:
-                section_text = f"\nFrom {page_data['title']}:\n"
-                for result in results:
-                    section = result["section"]
-                    section_text += f"\n{section['title']}:\n{section['content']}\n"
-                parts.append(section_text)
+        with write_batch(self.client.cache):
+            for page_title in pages:
+                page_data = self.client.fetch_page(page_title)
+                if not page_data:
+                    continue
+                results = self.client.search_sections(page_data, query, max_results)
+                if results:
+                    section_text = f"\nFrom {page_data['title']}:\n"
+                    for result in results:
+                        section = result["section"]
+                        section_text += f"\n{section['title']}:\n{section['content']}\n"
+                    parts.append(section_text)
         if not parts:
             return ""
         context = f"\n\n=== LORE CONTEXT FOR: {query} ===\n"
@@ -775,23 +907,25 @@ class RAGSystem:
         entities = _extract_entity_candidates(prompt, limit=_RULES_ENTITY_LIMIT)
         if not entities:
             return ""
+        self.rules_client.prefetch_pages(entities)
         descriptions: List[str] = []
         budget = _RULES_CONTEXT_BUDGET
-        for entity in entities:
-            if budget <= 0:
-                break
-            try:
-                page_data = self.rules_client.fetch_page(entity)
-                if not page_data or not page_data.get("sections"):
-                    continue
-                intro = page_data["sections"][0].get("content", "").strip()
-                if not intro:
-                    continue
-                snippet = intro[:budget]
-                descriptions.append(f"**{entity}**: {snippet}")
-                budget -= len(snippet)
-            except (AttributeError, KeyError, IndexError) as exc:
-                logger.debug("Rules lookup failed for %r: %s", entity, exc)
+        with write_batch(self.rules_client.cache):
+            for entity in entities:
+                if budget <= 0:
+                    break
+                try:
+                    page_data = self.rules_client.fetch_page(entity)
+                    if not page_data or not page_data.get("sections"):
+                        continue
+                    intro = page_data["sections"][0].get("content", "").strip()
+                    if not intro:
+                        continue
+                    snippet = intro[:budget]
+                    descriptions.append(f"**{entity}**: {snippet}")
+                    budget -= len(snippet)
+                except (AttributeError, KeyError, IndexError) as exc:
+                    logger.debug("Rules lookup failed for %r: %s", entity, exc)
         if not descriptions:
             return ""
         return "\n\nD&D Rules Context (for accurate portrayal):\n" + "\n".join(
@@ -0,0 +1,347 @@
+"""
+In-process admission control for model endpoints.
+
+Local inference servers (one CPU-bound Ollama) handle only a few requests at
+a time, so every AIClient call takes a slot from the queue of the server it
+targets. Each queue bounds concurrency, serves interactive requests before
+batch ones, keeps slots in reserve for interactive work so a long batch job
+cannot starve a quick query, and rejects requests fast when the queue is
+full (429) or the caller's deadline cannot be met (503).
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+from functools import lru_cache
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple, Union
+
+from src.config.config_loader import load_config
+
+
+class Priority(IntEnum):
+    """Scheduling class; lower values are served first."""
+
+    INTERACTIVE = 0
+    BATCH = 1
+
+    @classmethod
+    def parse(cls, value: Union["Priority", str, None]) -> "Priority":
+        """Convert "interactive"/"batch" (or a Priority) to a Priority."""
+        if isinstance(value, Priority):
+            return value
+        if value and str(value).strip().lower() == "batch":
+            return cls.BATCH
+        return cls.INTERACTIVE
+
+
+class SchedulerBusy(RuntimeError):
+    """Raised when a request is not admitted to a model queue.
+
+    A RuntimeError like any other failed completion, so callers that already
+    fall back on AI failures keep working; sidecar endpoints that should
+    report the rejection re-raise it and it becomes an HTTP error.
+
+    Attributes:
+        status_code: 429 when the queue is full, 503 when the deadline
+            cannot be met
+        retry_after: Suggested seconds before retrying
+    """
+
+    def __init__(self, message: str, status_code: int, retry_after: float):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+# Wait/service samples kept per queue for the metrics and wait estimates.
+_SAMPLES = 100
+
+
+@dataclass
+class _QueueStats:
+    """Admission counters and timing samples of one queue.
+
+    Attributes:
+        waits: Recent queue waits in seconds
+        service: Recent slot hold times in seconds
+        admitted: Requests that got a slot
+        rejected: Requests turned away (queue full or deadline)
+        timed_out: Rejections after waiting out the deadline
+    """
+
+    waits: Deque[float] = field(default_factory=lambda: deque(maxlen=_SAMPLES))
+    service: Deque[float] = field(default_factory=lambda: deque(maxlen=_SAMPLES))
+    admitted: int = 0
+    rejected: int = 0
+    timed_out: int = 0
+
+
+class _WaitLine:
+    """Waiting requests ordered by (priority, arrival)."""
+
+    def __init__(self) -> None:
+        self._heap: List[Tuple[int, int]] = []
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def join(self, priority: Priority) -> Tuple[int, int]:
+        """Add a request and return its place in line."""
+        entry = (int(priority), next(self._seq))
+        heapq.heappush(self._heap, entry)
+        return entry
+
+    def is_next(self, entry: Tuple[int, int]) -> bool:
+        """True when ``entry`` is at the head of the line."""
+        return self._heap[0] == entry
+
+    def leave(self, entry: Tuple[int, int]) -> None:
+        """Remove a request from anywhere in the line."""
+        if self._heap and self._heap[0] == entry:
+            heapq.heappop(self._heap)
+            return
+        self._heap.remove(entry)
+        heapq.heapify(self._heap)
+
+    def ahead_of(self, priority: Priority) -> int:
+        """Number of waiters a new request of ``priority`` would queue behind."""
+        return sum(1 for rank, _ in self._heap if rank <= priority)
+
+    def count(self, priority: Priority) -> int:
+        """Number of waiters of one priority class."""
+        return sum(1 for rank, _ in self._heap if rank == priority)
+
+
+class ModelQueue:
+    """Concurrency-limited priority queue for one model server.
+
+    Waiters are ordered by (priority, arrival). The head waiter starts when
+    a slot is free; batch requests may only use ``limit - reserved`` slots.
+    """
+
+    def __init__(self, limit: int = 4, reserved: int = 1, max_queue: int = 64):
+        """
+        Args:
+            limit: Requests in flight at once.
+            reserved: Slots only interactive requests may use (capped at
+                limit - 1 so batch work can always run).
+            max_queue: Waiting requests before new ones are rejected.
+        """
+        self.limit = max(1, limit)
+        self.reserved = max(0, min(reserved, self.limit - 1))
+        self.max_queue = max(0, max_queue)
+        self._cond = threading.Condition()
+        self._waiting = _WaitLine()
+        self._in_flight = {Priority.INTERACTIVE: 0, Priority.BATCH: 0}
+        self._stats = _QueueStats()
+
+    def _can_start(self, priority: Priority) -> bool:
+        in_flight = sum(self._in_flight.values())
+        if in_flight >= self.limit:
+            return False
+        if priority == Priority.BATCH:
+            return self._in_flight[Priority.BATCH] < self.limit - self.reserved
+        return True
+
+    def _estimated_wait(self, ahead: int) -> Optional[float]:
+        """Seconds until a request behind ``ahead`` waiters starts, if known."""
+        service = self._stats.service
+        if not service:
+            return None
+        average = sum(service) / len(service)
+        rounds = -(-(ahead - self.limit + 1) // self.limit)
+        return max(0, rounds) * average
+
+    def _reject(self, message: str, status_code: int, retry_after: float) -> SchedulerBusy:
+        self._stats.rejected += 1
+        return SchedulerBusy(message, status_code, retry_after)
+
+    def acquire(self, priority: Priority, deadline: Optional[float] = None) -> float:
+        """Wait for a slot.
+
+        Args:
+            priority: Scheduling class of the request.
+            deadline: Longest acceptable queue wait in seconds (None waits
+                indefinitely).
+
+        Returns:
+            Seconds spent waiting.
+
+        Raises:
+            SchedulerBusy: 429 when the queue is full; 503 when the wait is
+                expected to exceed, or does exceed, the deadline.
+        """
+        started = time.monotonic()
+        with self._cond:
+            if not self._waiting and self._can_start(priority):
+                return self._start(priority, started)
+            if len(self._waiting) >= self.max_queue:
+                raise self._reject(
+                    f"Model queue full ({len(self._waiting)} waiting)", 429,
+                    self._estimated_wait(len(self._waiting)) or 1.0,
+                )
+            ahead = self._waiting.ahead_of(priority) + sum(self._in_flight.values())
+            estimate = self._estimated_wait(ahead)
+            if deadline is not None and estimate is not None and estimate > deadline:
+                raise self._reject(
+                    f"Estimated queue wait {estimate:.0f}s exceeds {deadline:.0f}s",
+                    503, estimate,
+                )
+
+            entry = self._waiting.join(priority)
+            try:
+                while not (self._waiting.is_next(entry) and self._can_start(priority)):
+                    remaining = None
+                    if deadline is not None:
+                        remaining = deadline - (time.monotonic() - started)
+                        if remaining <= 0:
+                            self._stats.timed_out += 1
+                            raise self._reject(
+                                f"Queue wait exceeded {deadline:.0f}s", 503,
+                                self._estimated_wait(len(self._waiting)) or deadline,
+                            )
+                    self._cond.wait(remaining)
+            except BaseException:
+                self._waiting.leave(entry)
+                self._cond.notify_all()
+                raise
+            self._waiting.leave(entry)
+            waited = self._start(priority, started)
+            # The next waiter may be able to start too (e.g. after a burst of releases).
+            self._cond.notify_all()
+            return waited
+
+    def _start(self, priority: Priority, started: float) -> float:
+        waited = time.monotonic() - started
+        self._in_flight[priority] += 1
+        self._stats.waits.append(waited)
+        self._stats.admitted += 1
+        return waited
+
+    def release(self, priority: Priority, service_seconds: float) -> None:
+        """Return a slot taken by acquire()."""
+        with self._cond:
+            self._in_flight[priority] -= 1
+            self._stats.service.append(service_seconds)
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, priority: Priority, deadline: Optional[float] = None) -> Iterator[float]:
+        """Hold a slot for the duration of the block; yields the wait time."""
+        waited = self.acquire(priority, deadline)
+        started = time.monotonic()
+        try:
+            yield waited
+        finally:
+            self.release(priority, time.monotonic() - started)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return queue depth, in-flight counts and wait-time statistics."""
+        with self._cond:
+            stats = self._stats
+            waits = sorted(stats.waits)
+            queued = {
+                name.lower(): self._waiting.count(member)
+                for name, member in Priority.__members__.items()
+            }
+            return {
+                "limit": self.limit,
+                "reserved_interactive": self.reserved,
+                "in_flight": sum(self._in_flight.values()),
+                "queued": queued,
+                "admitted": stats.admitted,
+                "rejected": stats.rejected,
+                "timed_out": stats.timed_out,
+                "wait_ms_avg": round(1000 * sum(waits) / len(waits), 1) if waits else 0.0,
+                "wait_ms_p95": round(1000 * waits[int(0.95 * (len(waits) - 1))], 1)
+                if waits else 0.0,
+                "service_ms_avg": round(1000 * sum(stats.service) / len(stats.service), 1)
+                if stats.service else 0.0,
+            }
+
+
+class RequestScheduler:
+    """Registry of per-server queues sharing one set of limits."""
+
+    def __init__(self, limit: int = 4, reserved: int = 1, max_queue: int = 64):
+        self.limit = limit
+        self.reserved = reserved
+        self.max_queue = max_queue
+        self._lock = threading.Lock()
+        self._queues: Dict[str, ModelQueue] = {}
+
+    @staticmethod
+    def key(base_url: Optional[str], model: str) -> str:
+        """Queue key: the server URL, or the model for hosted APIs.
+
+        Models on one local server share its CPU, so they share a queue; the
+        OpenAI-compatible ``/v1`` suffix is dropped so native Ollama calls
+        land on the same queue.
+        """
+        url = (base_url or "").rstrip("/")
+        if url.endswith("/v1"):
+            url = url[:-3]
+        return url or f"model:{model}"
+
+    def queue(self, base_url: Optional[str], model: str) -> ModelQueue:
+        """Return (creating on first use) the queue for a server."""
+        key = self.key(base_url, model)
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue is None:
+                queue = self._queues[key] = ModelQueue(
+                    self.limit, self.reserved, self.max_queue
+                )
+            return queue
+
+    def slot(
+        self,
+        base_url: Optional[str],
+        model: str,
+        priority: Union[Priority, str, None] = None,
+        deadline: Optional[float] = None,
+    ) -> Any:
+        """Context manager holding a slot on a server's queue."""
+        return self.queue(base_url, model).slot(Priority.parse(priority), deadline)
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Return metrics for every queue, keyed by server."""
+        with self._lock:
+            queues = dict(self._queues)
+        return {key: queue.metrics() for key, queue in sorted(queues.items())}
+
+
+def default_deadline(priority: Union[Priority, str, None]) -> Optional[float]:
+    """Return the configured queue deadline for a priority class.
+
+    AI_INTERACTIVE_DEADLINE (default 30) and AI_BATCH_DEADLINE (default 0)
+    are in seconds; 0 means no deadline.
+    """
+    scheduler = load_config().performance.scheduler
+    if Priority.parse(priority) == Priority.BATCH:
+        seconds = scheduler.batch_deadline
+    else:
+        seconds = scheduler.interactive_deadline
+    return seconds if seconds > 0 else None
+
+
+@lru_cache(maxsize=1)
+def get_request_scheduler() -> RequestScheduler:
+    """Return the process-wide scheduler.
+
+    Sized by AI_MAX_CONCURRENT (requests in flight per server, default 4),
+    AI_INTERACTIVE_RESERVED (slots batch work may not use, default 1) and
+    AI_QUEUE_MAX (waiting requests per server before 429, default 64).
+    """
+    scheduler = load_config().performance.scheduler
+    return RequestScheduler(
+        limit=scheduler.max_concurrent,
+        reserved=scheduler.interactive_reserved,
+        max_queue=scheduler.queue_max,
+    )
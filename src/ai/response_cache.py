@@ -0,0 +1,292 @@
+"""
+Two-tier cache of chat completion responses.
+
+Responses are keyed by the sha256 of (model, normalised messages,
+temperature, max_tokens, mode kwargs), so a repeated deterministic request -
+the same search query, or an analysis pipeline re-run over unchanged chunks -
+is answered without another round of local inference. Recent responses live
+in an in-memory LRU; everything is also kept in a SQLite file with a TTL and
+a byte budget, evicting least-recently-used rows first.
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from src.config.config_loader import load_config
+from src.utils.sqlite_cache import SqliteCacheFile
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS responses ("
+    " key TEXT PRIMARY KEY,"
+    " model TEXT NOT NULL,"
+    " response TEXT NOT NULL,"
+    " size INTEGER NOT NULL,"
+    " created REAL NOT NULL,"
+    " accessed REAL NOT NULL)"
+)
+_INDEX = "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)"
+
+# File name of the disk tier inside the configured cache dir.
+_CACHE_FILE_NAME = "ai_responses.sqlite3"
+
+
+def response_key(
+    model: str,
+    messages: List[Dict[str, str]],
+    temperature: float,
+    max_tokens: int,
+    options: Optional[Mapping[str, Any]] = None,
+) -> str:
+    """Return the cache key for one chat completion request.
+
+    Message content is stripped of surrounding whitespace and option keys
+    are sorted, so requests that differ only in formatting share a key.
+
+    Args:
+        model: Model the request is sent to.
+        messages: Chat messages with 'role' and 'content'.
+        temperature: Effective sampling temperature.
+        max_tokens: Effective completion budget.
+        options: Mode kwargs (json_mode, disable_thinking, num_ctx, ...).
+
+    Returns:
+        64-character hex digest.
+    """
+    material = json.dumps(
+        {
+            "model": model,
+            "messages": [
+                [str(msg.get("role", "")), str(msg.get("content", "")).strip()]
+                for msg in messages
+            ],
+            "temperature": round(float(temperature), 4),
+            "max_tokens": int(max_tokens),
+            "options": dict(options or {}),
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class _MemoryTier:
+    """Most recently used responses with their creation time."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        """Return (response, created) and mark it recently used."""
+        cached = self._entries.get(key)
+        if cached is not None:
+            self._entries.move_to_end(key)
+        return cached
+
+    def put(self, key: str, response: str, created: float) -> None:
+        """Put a response at the front, dropping the oldest over the limit."""
+        self._entries[key] = (response, created)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.limit:
+            self._entries.popitem(last=False)
+
+    def discard(self, key: str) -> None:
+        """Forget one response."""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Forget every response."""
+        self._entries.clear()
+
+
+class ResponseCache:
+    """In-memory LRU in front of a SQLite response store.
+
+    Shared across threads behind a lock. Disk failures degrade to misses so
+    a broken cache file never blocks a model call; a ``db_path`` of None
+    keeps the cache memory-only.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[Path],
+        memory_entries: int = 256,
+        ttl_seconds: float = 7 * 24 * 3600,
+        max_bytes: int = 64 * 1024 * 1024,
+    ) -> None:
+        """
+        Args:
+            db_path: Location of the SQLite file (parent dirs are created),
+                or None for a memory-only cache.
+            memory_entries: Responses kept in the in-memory tier.
+            ttl_seconds: Age after which a response is no longer served;
+                0 disables expiry.
+            max_bytes: Size budget of the disk tier.
+        """
+        self._db = SqliteCacheFile(db_path, [_SCHEMA, _INDEX])
+        self._memory = _MemoryTier(memory_entries)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._disk_bytes: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - created > self.ttl_seconds
+
+    def get(self, key: str) -> Tuple[Optional[str], str]:
+        """Look up a response.
+
+        Args:
+            key: Key from response_key().
+
+        Returns:
+            (response, tier) where tier is "memory", "disk" or "miss"; the
+            response is None on a miss.
+        """
+        now = time.time()
+        with self._db.lock:
+            cached = self._memory.get(key)
+            if cached is not None and not self._expired(cached[1], now):
+                self.hits += 1
+                return cached[0], "memory"
+            self._memory.discard(key)
+            row = self._disk_get(key, now)
+            if row is None:
+                self.misses += 1
+                return None, "miss"
+            self._memory.put(key, row[0], row[1])
+            self.hits += 1
+            return row[0], "disk"
+
+    def _disk_get(self, key: str, now: float) -> Optional[Tuple[str, float]]:
+        """Read a live row from the disk tier, dropping it when expired."""
+        row = self._db.fetchone(
+            "SELECT response, created, size FROM responses WHERE key = ?", (key,)
+        )
+        if row is None:
+            return None
+        if self._expired(row[1], now):
+            if self._db.write("DELETE FROM responses WHERE key = ?", [(key,)]):
+                if self._disk_bytes is not None:
+                    self._disk_bytes -= row[2]
+            return None
+        self._db.write("UPDATE responses SET accessed = ? WHERE key = ?", [(now, key)])
+        return row[0], row[1]
+
+    def put(self, key: str, model: str, response: str) -> None:
+        """Store a response; empty responses (failed calls) are skipped.
+
+        Args:
+            key: Key from response_key().
+            model: Model that produced the response.
+            response: Completion text.
+        """
+        if not response:
+            return
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._db.lock:
+            self._memory.put(key, response, now)
+            conn = self._db.connection()
+            if conn is None or size > self.max_bytes:
+                return
+            try:
+                total = self._total_bytes(conn)
+                old = conn.execute(
+                    "SELECT size FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses"
+                    " (key, model, response, size, created, accessed)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, model, response, size, now, now),
+                )
+                total += size - (old[0] if old else 0)
+                self._disk_bytes = self._evict(conn, total, now)
+                conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                self._disk_bytes = None
+
+    def _total_bytes(self, conn: sqlite3.Connection) -> int:
+        """Return the disk tier size, summing the table once per process."""
+        if self._disk_bytes is None:
+            row = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+            self._disk_bytes = int(row[0])
+        return self._disk_bytes
+
+    def _evict(self, conn: sqlite3.Connection, total: int, now: float) -> int:
+        """Drop expired rows, then least-recently-used rows over the budget.
+
+        Returns:
+            The disk tier size after eviction.
+        """
+        if self.ttl_seconds > 0:
+            cutoff = now - self.ttl_seconds
+            row = conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM responses WHERE created < ?",
+                (cutoff,),
+            ).fetchone()
+            if row[0]:
+                conn.execute("DELETE FROM responses WHERE created < ?", (cutoff,))
+                total -= int(row[0])
+        if total <= self.max_bytes:
+            return total
+        freed = 0
+        doomed = []
+        for key, size in conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed"
+        ):
+            if total - freed <= self.max_bytes:
+                break
+            doomed.append((key,))
+            freed += size
+        conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+        return total - freed
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and tier sizes."""
+        with self._db.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "memory_entries": len(self._memory),
+                "disk_bytes": self._disk_bytes or 0,
+            }
+
+    def clear(self) -> None:
+        """Drop every cached response from both tiers."""
+        with self._db.lock:
+            self._memory.clear()
+            self._db.write("DELETE FROM responses", [()])
+            self._disk_bytes = 0
+
+    def close(self) -> None:
+        """Close the underlying connection if it was opened."""
+        self._db.close()
+
+
+@lru_cache(maxsize=1)
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide cache inside the configured ``paths.cache_dir``.
+
+    Sized by the ``performance.response_cache`` settings (AI_RESPONSE_CACHE_*).
+    """
+    config = load_config()
+    sizing = config.performance.response_cache
+    return ResponseCache(
+        Path(config.paths.cache_dir) / _CACHE_FILE_NAME,
+        memory_entries=sizing.memory_entries,
+        ttl_seconds=sizing.ttl_seconds,
+        max_bytes=int(sizing.max_mb * 1024 * 1024),
+    )
@@ -1,38 +1,34 @@
 """
-Semantic retrieval layer backed by Milvus with JSON fallback.
+Semantic retrieval layer: Milvus vector search fused with a BM25 index.
 
 This module provides semantic search capabilities for retrieving contextually
-relevant data for AI prompt construction. When Milvus is unavailable the class
-falls back to keyword search using existing helpers.
+relevant data for AI prompt construction. Every query runs against the
+in-process lexical index; when Milvus is reachable its vector hits are fused
+with the lexical ones by reciprocal rank, otherwise the lexical hits alone are
+returned, so retrieval keeps working offline.
 """
 
-import json
-import os
-from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from src.ai.embedding_pipeline import EmbeddingPipeline
-from src.ai.milvus_client import MilvusClient
+from src.ai.lexical_index import fuse_results, get_lexical_index
+from src.ai.milvus_client import get_shared_client
 from src.config.config_loader import load_config
-from src.utils.character_profile_utils import load_character_profile
-from src.utils.npc_lookup_helper import load_relevant_npcs_for_prompt
-from src.utils.path_utils import get_characters_dir
 
 
 class SemanticRetriever:
     """Retrieves contextually relevant data for AI prompt construction.
 
-    Falls back to keyword-based retrieval when Milvus is unavailable.
+    Falls back to lexical-only retrieval when Milvus is unavailable.
     """
 
     def __init__(self) -> None:
         cfg = load_config().milvus
-        self._top_k = cfg.top_k
-        self._threshold = cfg.similarity_threshold
-        self._client = MilvusClient()
+        self._top_k = cfg.search.top_k
+        self._threshold = cfg.search.similarity_threshold
+        self._client = get_shared_client()
         self._pipeline = EmbeddingPipeline()
-        if cfg.enabled:
-            self._client.connect()
+        self._lexical = get_lexical_index()
 
     @property
     def _available(self) -> bool:
@@ -58,19 +54,16 @@ class SemanticRetriever:
 
         Returns:
             List of result dicts with keys: character_name, chunk_text,
-            chunk_type, source_file, score.
+            chunk_type, source_file, score, fusion_score.
         """
-        if not self._available:
-            return self._fallback_characters(query)
-        vec = self._pipeline.embed_text(query)
-        if not vec:
-            return []
-        hits = self._client.search(
-            "characters",
-            vec,
-            top_k=top_k or self._top_k,
+        limit = top_k or self._top_k
+        return fuse_results(
+            [
+                self._vector_search("characters", query, limit),
+                self._lexical.search("characters", query, limit),
+            ],
+            limit,
         )
-        return self._filter_by_threshold(hits)
 
     def get_relevant_npcs(
         self,
@@ -81,7 +74,8 @@ class SemanticRetriever:
         """Return NPCs relevant to the current scene.
 
         When a location is supplied it is appended to the query before
-        embedding so nearby location embeddings are boosted naturally.
+        embedding so nearby location embeddings are boosted naturally, and
+        both searches are restricted to NPCs at that location.
 
         Args:
             query: Scene description or prompt excerpt.
@@ -90,22 +84,19 @@ class SemanticRetriever:
 
         Returns:
             List of result dicts with keys: npc_name, location,
-            chunk_text, source_file, score.
+            chunk_text, source_file, score, fusion_score.
         """
-        if not self._available:
-            return self._fallback_npcs(query, location)
+        limit = top_k or self._top_k
         combined = f"{query} location: {location}" if location else query
-        vec = self._pipeline.embed_text(combined)
-        if not vec:
-            return []
         expr = f'location == "{location}"' if location else ""
-        hits = self._client.search(
-            "npcs",
-            vec,
-            top_k=top_k or self._top_k,
-            expr=expr,
+        filters = {"location": location} if location else None
+        return fuse_results(
+            [
+                self._vector_search("npcs", combined, limit, expr),
+                self._lexical.search("npcs", combined, limit, filters),
+            ],
+            limit,
         )
-        return self._filter_by_threshold(hits)
 
     def get_relevant_story_context(
         self,
@@ -125,20 +116,20 @@ class SemanticRetriever:
 
         Returns:
             List of result dicts with keys: campaign_name, story_file,
-            chunk_index, chunk_text, score.
+            chunk_index, chunk_text, score, fusion_score.
         """
-        if not self._available:
-            return []
-        vec = self._pipeline.embed_text(query)
-        if not vec:
-            return []
-        hits = self._client.search(
-            "story_chunks",
-            vec,
-            top_k=top_k or self._top_k,
-            expr=f'campaign_name == "{campaign_name}"',
+        limit = top_k or self._top_k
+        return fuse_results(
+            [
+                self._vector_search(
+                    "story_chunks", query, limit, f'campaign_name == "{campaign_name}"'
+                ),
+                self._lexical.search(
+                    "story_chunks", query, limit, {"campaign_name": campaign_name}
+                ),
+            ],
+            limit,
         )
-        return self._filter_by_threshold(hits)
 
     def get_relevant_lore(
         self, query: str, top_k: Optional[int] = None
@@ -151,19 +142,16 @@ class SemanticRetriever:
 
         Returns:
             List of result dicts with keys: page_url, page_title,
-            chunk_text, cached_at, score.
+            chunk_text, cached_at, score, fusion_score.
         """
-        if not self._available:
-            return []
-        vec = self._pipeline.embed_text(query)
-        if not vec:
-            return []
-        hits = self._client.search(
-            "wiki_pages",
-            vec,
-            top_k=top_k or self._top_k,
+        limit = top_k or self._top_k
+        return fuse_results(
+            [
+                self._vector_search("wiki_pages", query, limit),
+                self._lexical.search("wiki_pages", query, limit),
+            ],
+            limit,
         )
-        return self._filter_by_threshold(hits)
 
     # ------------------------------------------------------------------
     # Helpers
@@ -182,59 +170,25 @@ class SemanticRetriever:
         """
         return [h for h in hits if h.get("score", 0) >= self._threshold]
 
-    def _fallback_characters(self, query: str) -> List[Dict[str, Any]]:
-        """Keyword fallback: score all character files by word overlap.
-
-        Args:
-            query: Search query.
-
-        Returns:
-            Top-k character dicts scored by keyword overlap.
-        """
-        results: List[Dict[str, Any]] = []
-        chars_dir = Path(get_characters_dir())
-        query_words = set(query.lower().split())
-        for json_file in chars_dir.glob("*.json"):
-            try:
-                profile = load_character_profile(json_file.stem)
-                if not profile:
-                    continue
-                text = json.dumps(profile).lower()
-                score = sum(1 for w in query_words if w in text) / max(len(query_words), 1)
-                if score > 0:
-                    results.append({
-                        "character_name": profile.get("name", json_file.stem),
-                        "chunk_text": profile.get("background", ""),
-                        "chunk_type": "fallback",
-                        "source_file": str(json_file),
-                        "score": score,
-                    })
-            except (OSError, ValueError):
-                continue
-        results.sort(key=lambda r: r["score"], reverse=True)
-        return results[: self._top_k]
-
-    def _fallback_npcs(
-        self, query: str, location: Optional[str]
+    def _vector_search(
+        self, collection: str, query: str, top_k: int, expr: str = ""
     ) -> List[Dict[str, Any]]:
-        """Delegate to existing npc_lookup_helper keyword matching.
+        """Embed a query and search one Milvus collection.
 
         Args:
-            query: Scene description or prompt excerpt.
-            location: Optional location filter appended to the query.
+            collection: Unqualified collection name.
+            query: Text to embed.
+            top_k: Maximum number of results.
+            expr: Optional Milvus boolean expression filter.
 
         Returns:
-            Matched NPC dicts wrapped in the standard result schema.
+            Hits meeting the similarity threshold, or [] when Milvus is
+            unavailable or the query could not be embedded.
         """
-        effective_query = f"{query} location:{location}" if location else query
-        loaded = load_relevant_npcs_for_prompt(effective_query, os.getcwd())
-        return [
-            {
-                "npc_name": n.get("name", ""),
-                "location": n.get("location", ""),
-                "chunk_text": n.get("description", ""),
-                "source_file": "",
-                "score": 0.5,
-            }
-            for n in loaded
-        ]
+        if not self._available:
+            return []
+        vec = self._pipeline.embed_text(query)
+        if not vec:
+            return []
+        hits = self._client.search(collection, vec, top_k=top_k, expr=expr)
+        return self._filter_by_threshold(hits)
@@ -0,0 +1,139 @@
+"""
+Vector store interface shared by the Milvus and embedded backends.
+
+MilvusClient talks to a Milvus server; EmbeddedVectorStore keeps the same
+collections in local NumPy files. Callers (index sync, reindex, semantic
+retrieval) depend on this protocol and get an implementation from
+create_vector_store() or get_shared_client() in milvus_client.
+"""
+
+from typing import Any, Dict, List, Optional, Protocol, runtime_checkable
+
+from src.ai.milvus_collections import COLLECTIONS
+
+
+@runtime_checkable
+class VectorStore(Protocol):
+    """Collection-oriented vector store with Milvus semantics.
+
+    Collections are addressed by their unqualified name (e.g. "characters")
+    and defined by the COLLECTIONS entries in milvus_collections. ``expr``
+    filters use the Milvus boolean expression syntax.
+
+    Attributes:
+        connected: True once the store is ready for reads and writes.
+    """
+
+    connected: bool
+
+    def connect(self) -> bool:
+        """Open the store; False when it is unavailable."""
+        raise NotImplementedError
+
+    def disconnect(self) -> None:
+        """Persist pending writes and close the store."""
+        raise NotImplementedError
+
+    def is_available(self) -> bool:
+        """Return True when the store can serve requests."""
+        raise NotImplementedError
+
+    def is_healthy(self) -> bool:
+        """Return True when the store can serve requests."""
+        raise NotImplementedError
+
+    def collection_name(self, base: str) -> str:
+        """Return the prefixed name of a collection."""
+        raise NotImplementedError
+
+    def ensure_collection(self, base: str, schema_def: Dict[str, Any]) -> Optional[Any]:
+        """Create a collection if missing and return its handle, or None."""
+        raise NotImplementedError
+
+    def create_collections(self) -> None:
+        """Create every collection in COLLECTIONS."""
+        raise NotImplementedError
+
+    def delete_collections(self) -> None:
+        """Drop every collection in COLLECTIONS."""
+        raise NotImplementedError
+
+    def drop_collection(self, base: str) -> None:
+        """Drop one collection if it exists."""
+        raise NotImplementedError
+
+    def get_collection(self, base: str) -> Optional[Any]:
+        """Return a collection handle (with ``num_entities``), or None."""
+        raise NotImplementedError
+
+    def commit(self) -> None:
+        """Persist writes made since the last commit."""
+        raise NotImplementedError
+
+    def insert(self, base: str, rows: List[Dict[str, Any]]) -> int:
+        """Insert rows and return how many were stored."""
+        raise NotImplementedError
+
+    def insert_returning_ids(self, base: str, rows: List[Dict[str, Any]]) -> List[int]:
+        """Insert rows and return their primary keys in row order."""
+        raise NotImplementedError
+
+    def search(
+        self,
+        base: str,
+        query_vector: List[float],
+        top_k: int = 5,
+        expr: str = "",
+    ) -> List[Dict[str, Any]]:
+        """Return the top_k cosine matches, each with a "score" key."""
+        raise NotImplementedError
+
+    def search_many(
+        self,
+        base: str,
+        query_vectors: List[List[float]],
+        top_k: int = 5,
+        expr: str = "",
+    ) -> List[List[Dict[str, Any]]]:
+        """Return one result list per query vector, in input order."""
+        raise NotImplementedError
+
+    def delete_by_source(self, base: str, source_field: str, source_value: str) -> None:
+        """Remove rows whose ``source_field`` equals ``source_value``."""
+        raise NotImplementedError
+
+    def delete_by_ids(self, base: str, ids: List[int]) -> None:
+        """Remove rows by primary key."""
+        raise NotImplementedError
+
+
+class CollectionSetMixin:
+    """Mixin creating and dropping the standard collections one by one.
+
+    Shared by MilvusClient and EmbeddedVectorStore, which only differ in how
+    a single collection is created or dropped.
+    """
+
+    def ensure_collection(self, base: str, schema_def: Dict[str, Any]) -> Optional[Any]:
+        """Must be implemented by the store."""
+        raise NotImplementedError("Store must implement ensure_collection()")
+
+    def drop_collection(self, base: str) -> None:
+        """Must be implemented by the store."""
+        raise NotImplementedError("Store must implement drop_collection()")
+
+    def create_collections(self) -> None:
+        """Create all standard D&D collections.
+
+        Delegates to ensure_collection for each entry in COLLECTIONS.
+        """
+        for base, schema_def in COLLECTIONS.items():
+            self.ensure_collection(base, schema_def)
+
+    def delete_collections(self) -> None:
+        """Drop all standard D&D collections.
+
+        Used for full re-index or test teardown.
+        """
+        for base in COLLECTIONS:
+            self.drop_collection(base)
@@ -5,12 +5,35 @@ import that must not break the app when the scraping extras are absent, the
 ``#page-content`` element a Wikidot page wraps its body in, and a page fetch
 that degrades to None instead of raising. They live here so the resolvers in
 this package share one implementation rather than each carrying a copy.
+
+Each document is parsed once into a :class:`ParsedPage` (with lxml when it is
+installed) that every extractor shares; :func:`parse_page` keeps recent parses
+in a small LRU. Page fetches go through one process-wide :class:`WikiFetcher`:
+a bounded worker pool that paces requests per host, coalesces duplicate
+in-flight URLs, and, when the client carries an :class:`HtmlDiskCache`, serves
+fresh pages from disk and revalidates stale ones with ETag / Last-Modified.
 """
 
 from __future__ import annotations
 
+import functools
+import hashlib
+import importlib.util
+import json
 import logging
-from typing import List, Optional, cast
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import (
+    Any, Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple, Union, cast,
+)
+from urllib.parse import urlsplit
+
+from src.config.config_loader import load_config, subscribe_config_changes
 
 try:
     from bs4 import BeautifulSoup
@@ -19,17 +42,405 @@ try:
 except ImportError:
     SCRAPING_AVAILABLE = False
 
+# BeautifulSoup parser: lxml when installed, else the stdlib parser.
+_PARSER = "lxml" if importlib.util.find_spec("lxml") is not None else "html.parser"
+
 logger = logging.getLogger(__name__)
 
 # How long to wait on a single rules-wiki page before giving up.
 _TIMEOUT = 10
 
+# Pages that answered 404 are remembered this long (capped by the cache TTL),
+# so candidate-URL probing does not repeat its misses on every call.
+_MISSING_TTL = 3600
+
+# Sub-directory of paths.cache_dir holding cached page HTML.
+HTML_CACHE_DIR_NAME = "wiki_html"
+
+# Parsed pages kept in memory; a level-20 multiclass build touches a few dozen.
+_PARSED_PAGE_LIMIT = 64
+
+
+@dataclass
+class CachedPage:
+    """One cached page fetch.
+
+    Attributes:
+        url: The page URL.
+        html: Page body, or None when the page was missing (404).
+        etag: ETag validator from the response, if any.
+        last_modified: Last-Modified validator from the response, if any.
+        fetched_at: Unix time the page was last fetched or revalidated.
+    """
+
+    url: str
+    html: Optional[str]
+    etag: str = ""
+    last_modified: str = ""
+    fetched_at: float = 0.0
+
+
+class HtmlDiskCache:
+    """Local on-disk cache of fetched wiki HTML, one JSON file per URL.
+
+    Independent of the Drupal wiki cache, so repeated resolver calls stay off
+    the network even when Drupal is not configured.
+    """
+
+    def __init__(self, directory: Path, ttl_seconds: int):
+        """
+        Args:
+            directory: Folder for the cache files (created on first write).
+            ttl_seconds: Age after which a page is revalidated.
+        """
+        self.directory = Path(directory)
+        self.ttl_seconds = ttl_seconds
+
+    def _path(self, url: str) -> Path:
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+        return self.directory / f"{digest}.json"
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """Return the cached fetch of a URL, fresh or stale, or None."""
+        try:
+            data = json.loads(self._path(url).read_text(encoding="utf-8"))
+            page = CachedPage(**data)
+        except (OSError, ValueError, TypeError):
+            return None
+        return page if page.url == url else None
+
+    def is_fresh(self, page: CachedPage) -> bool:
+        """Return True when a cached page can be served without a request."""
+        ttl = self.ttl_seconds if page.html is not None else min(self.ttl_seconds, _MISSING_TTL)
+        return time.time() - page.fetched_at < ttl
+
+    def put(self, page: CachedPage) -> None:
+        """Store a page fetch, stamping it with the current time."""
+        page.fetched_at = time.time()
+        path = self._path(page.url)
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(asdict(page)), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError as exc:
+            logger.debug("Wiki HTML cache write failed for %s: %s", page.url, exc)
+
+
+class WikiFetcher:
+    """Process-wide rules-wiki page fetch scheduler.
+
+    Requests run on a bounded worker pool, start at most once per
+    ``min_interval`` seconds for each host, and share one request when the same
+    URL is already in flight.
+    """
+
+    def __init__(self, workers: int = 8, min_interval: float = 0.1):
+        """
+        Args:
+            workers: Maximum concurrent requests.
+            min_interval: Minimum seconds between request starts to one host.
+        """
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(1, workers), thread_name_prefix="wiki-fetch"
+        )
+        self._min_interval = max(0.0, min_interval)
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, "Future[Optional[str]]"] = {}
+        self._host_next: Dict[str, float] = {}
+
+    def fetch(self, client: object, url: str) -> Optional[str]:
+        """Fetch one page (joining an in-flight fetch of the same URL).
+
+        Args:
+            client: A WikiClient (provides a requests session and html_cache).
+            url: Absolute page URL.
+
+        Returns:
+            The page HTML, or None when it cannot be fetched.
+        """
+        return self._submit(client, url).result()
+
+    def fetch_many(self, client: object, urls: Sequence[str]) -> List[Optional[str]]:
+        """Fetch several pages concurrently.
+
+        Args:
+            client: A WikiClient (provides a requests session and html_cache).
+            urls: Absolute page URLs; duplicates are fetched once.
+
+        Returns:
+            The HTML (or None) of each URL, in input order.
+        """
+        futures = [self._submit(client, url) for url in urls]
+        return [future.result() for future in futures]
+
+    def shutdown(self) -> None:
+        """Stop the worker pool once queued fetches finish."""
+        self._pool.shutdown(wait=False)
+
+    def _submit(self, client: object, url: str) -> "Future[Optional[str]]":
+        """Return the URL's in-flight future, queueing a load when there is none.
+
+        The future is the pool's own, so it is always settled: an unexpected
+        error in the load reaches every waiter instead of leaving them blocked.
+        """
+        with self._lock:
+            future = self._inflight.get(url)
+            if future is not None:
+                return future
+            future = self._pool.submit(self._load, client, url)
+            self._inflight[url] = future
+        future.add_done_callback(functools.partial(self._release, url))
+        return future
+
+    def _release(self, url: str, future: "Future[Optional[str]]") -> None:
+        """Free the in-flight slot once its load has finished."""
+        with self._lock:
+            if self._inflight.get(url) is future:
+                del self._inflight[url]
+
+    def _load(self, client: object, url: str) -> Optional[str]:
+        """Serve a URL from the disk cache or the network."""
+        cache: Optional[HtmlDiskCache] = getattr(client, "html_cache", None)
+        cached = cache.get(url) if cache is not None else None
+        if cached is not None and cache is not None and cache.is_fresh(cached):
+            return cached.html
+
+        session = getattr(client, "session", None)
+        if session is None:
+            return None if cached is None else cached.html
+        headers = _validators(cached)
+        self._pace(url)
+        try:
+            if headers:
+                response = session.get(url, timeout=_TIMEOUT, headers=headers)
+            else:
+                response = session.get(url, timeout=_TIMEOUT)
+            if getattr(response, "status_code", 200) == 304 and cached is not None:
+                if cache is not None:
+                    cache.put(cached)
+                return cached.html
+            response.raise_for_status()
+        except OSError as exc:
+            logger.debug("Wiki page fetch failed for %s: %s", url, exc)
+            status = getattr(getattr(exc, "response", None), "status_code", None)
+            if status == 404 and cache is not None:
+                cache.put(CachedPage(url=url, html=None))
+                return None
+            # Serve a stale copy rather than nothing while the wiki is unreachable.
+            return None if cached is None else cached.html
+
+        html = str(response.text)
+        if cache is not None:
+            response_headers: Any = getattr(response, "headers", None) or {}
+            cache.put(CachedPage(
+                url=url,
+                html=html,
+                etag=str(response_headers.get("ETag", "")),
+                last_modified=str(response_headers.get("Last-Modified", "")),
+            ))
+        return html
+
+    def _pace(self, url: str) -> None:
+        """Sleep until this host's next request slot."""
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._host_next.get(host, 0.0))
+            self._host_next[host] = start + self._min_interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def _validators(cached: Optional[CachedPage]) -> Dict[str, str]:
+    """Conditional-request headers for a stale cached page."""
+    if cached is None or cached.html is None:
+        return {}
+    headers = {}
+    if cached.etag:
+        headers["If-None-Match"] = cached.etag
+    if cached.last_modified:
+        headers["If-Modified-Since"] = cached.last_modified
+    return headers
+
+
+# Module-level holder for the shared fetcher (see spell_registry).
+_fetcher_holder: List[WikiFetcher] = []
+_fetcher_lock = threading.Lock()
+
+
+def get_wiki_fetcher() -> WikiFetcher:
+    """Return the shared fetcher, sized from the RAG settings."""
+    with _fetcher_lock:
+        if not _fetcher_holder:
+            rag = load_config().rag
+            _fetcher_holder.append(
+                WikiFetcher(workers=rag.fetch.workers, min_interval=rag.fetch.interval)
+            )
+        return _fetcher_holder[0]
+
+
+def reset_wiki_fetcher() -> None:
+    """Shut down the shared fetcher; the next use builds a new one."""
+    with _fetcher_lock:
+        if _fetcher_holder:
+            _fetcher_holder.pop().shutdown()
+
+
+@subscribe_config_changes
+def _on_config_change(changed: FrozenSet[str], _config: Any) -> None:
+    """Rebuild the shared fetcher on its next use when the RAG settings change."""
+    if "rag" in changed:
+        reset_wiki_fetcher()
+
+
+def html_cache_for(cache_ttl: int) -> Optional[HtmlDiskCache]:
+    """Build the on-disk HTML cache inside the configured ``paths.cache_dir``.
+
+    Args:
+        cache_ttl: Seconds a page is served without revalidation.
+
+    Returns:
+        The cache, or None when the configuration cannot be read.
+    """
+    try:
+        cache_dir = Path(load_config().paths.cache_dir)
+    except (OSError, ValueError) as exc:
+        logger.debug("Wiki HTML cache unavailable: %s", exc)
+        return None
+    return HtmlDiskCache(cache_dir / HTML_CACHE_DIR_NAME, cache_ttl)
 
-def page_content(html: str) -> Optional["Tag"]:
-    """Extract the ``#page-content`` element a Wikidot page wraps its body in.
+
+class ParsedPage:
+    """One wiki page parsed once and shared by every extractor.
+
+    The BeautifulSoup tree, the ``#page-content`` element, the title and the
+    content text are built on first use; :meth:`extract` memoises structured
+    results (abilities, tool segments, ...) so repeated resolver calls on the
+    same page reuse them.
+
+    Attributes:
+        url: The page URL, or an empty string when unknown.
+        html: Raw page HTML.
+    """
+
+    def __init__(self, html: str, url: str = ""):
+        """
+        Args:
+            html: Raw page HTML.
+            url: The page URL (optional).
+        """
+        self.url = url
+        self.html = html
+        self._lock = threading.RLock()
+        self._soup: Optional["BeautifulSoup"] = None
+        self._extracts: Dict[str, Any] = {}
+
+    @property
+    def soup(self) -> Optional["BeautifulSoup"]:
+        """The parsed document, or None when scraping is unavailable."""
+        if not SCRAPING_AVAILABLE:
+            return None
+        with self._lock:
+            if self._soup is None:
+                self._soup = BeautifulSoup(self.html, _PARSER)
+            return self._soup
+
+    @property
+    def content(self) -> Optional["Tag"]:
+        """The ``#page-content`` element, or None when absent."""
+        return cast(Optional["Tag"], self.extract("content", self._find_content))
+
+    @property
+    def title(self) -> str:
+        """The HTML title text, or an empty string."""
+        return cast(str, self.extract("title", self._find_title))
+
+    @property
+    def content_text(self) -> str:
+        """All text inside ``#page-content``, space-joined."""
+        return cast(str, self.extract("content_text", self._read_content_text))
+
+    def extract(self, key: str, build: Callable[[], Any]) -> Any:
+        """Return a memoised extraction result, building it on first use.
+
+        Args:
+            key: Name of the extraction (unique per page).
+            build: Computes the result from this page.
+
+        Returns:
+            The cached or freshly built result.
+        """
+        with self._lock:
+            if key not in self._extracts:
+                self._extracts[key] = build()
+            return self._extracts[key]
+
+    def _find_content(self) -> Optional["Tag"]:
+        soup = self.soup
+        found = soup.find("div", id="page-content") if soup is not None else None
+        return cast("Tag", found) if isinstance(found, Tag) else None
+
+    def _find_title(self) -> str:
+        soup = self.soup
+        title = soup.title if soup is not None else None
+        return "" if title is None else title.get_text(strip=True)
+
+    def _read_content_text(self) -> str:
+        content = self.content
+        return "" if content is None else content.get_text(" ", strip=True)
+
+
+# A page's HTML, or the page already parsed.
+PageSource = Union[str, ParsedPage]
+
+_PAGES: "OrderedDict[Tuple[str, str], ParsedPage]" = OrderedDict()
+_PAGES_LOCK = threading.Lock()
+
+
+def parse_page(html: str, url: str = "") -> ParsedPage:
+    """Return the shared parse of a page, parsing it on first sight.
+
+    Pages are held in a small LRU keyed by URL plus a hash of the HTML, so a
+    re-fetched page with new content is parsed afresh.
 
     Args:
         html: Raw page HTML.
+        url: The page URL (optional).
+
+    Returns:
+        The parsed page.
+    """
+    key = (url, hashlib.sha1(html.encode("utf-8")).hexdigest())
+    with _PAGES_LOCK:
+        page = _PAGES.get(key)
+        if page is not None:
+            _PAGES.move_to_end(key)
+            return page
+        page = ParsedPage(html, url)
+        _PAGES[key] = page
+        while len(_PAGES) > _PARSED_PAGE_LIMIT:
+            _PAGES.popitem(last=False)
+        return page
+
+
+def as_page(source: PageSource) -> ParsedPage:
+    """Coerce raw HTML or a parsed page into a ParsedPage.
+
+    Args:
+        source: Raw page HTML or a ParsedPage.
+
+    Returns:
+        The parsed page.
+    """
+    return source if isinstance(source, ParsedPage) else parse_page(source)
+
+
+def page_content(source: PageSource) -> Optional["Tag"]:
+    """Extract the ``#page-content`` element a Wikidot page wraps its body in.
+
+    Args:
+        source: Raw page HTML or a ParsedPage.
 
     Returns:
         The content element, or None when scraping is unavailable or the page
@@ -37,17 +448,14 @@ def page_content(html: str) -> Optional["Tag"]:
     """
     if not SCRAPING_AVAILABLE:
         return None
-    found = BeautifulSoup(html, "html.parser").find("div", id="page-content")
-    if not isinstance(found, Tag):
-        return None
-    return cast("Tag", found)
+    return as_page(source).content
 
 
-def page_title(html: str) -> str:
+def page_title(source: PageSource) -> str:
     """Read a page's HTML title.
 
     Args:
-        html: Raw page HTML.
+        source: Raw page HTML or a ParsedPage.
 
     Returns:
         The title text, or an empty string when scraping is unavailable or the
@@ -55,8 +463,7 @@ def page_title(html: str) -> str:
     """
     if not SCRAPING_AVAILABLE:
         return ""
-    title = BeautifulSoup(html, "html.parser").title
-    return "" if title is None else title.get_text(strip=True)
+    return as_page(source).title
 
 
 def fetch_html(client: object, url: str) -> Optional[str]:
@@ -69,16 +476,24 @@ def fetch_html(client: object, url: str) -> Optional[str]:
     Returns:
         The raw HTML body, or None when the request fails.
     """
-    session = getattr(client, "session", None)
-    if session is None:
-        return None
-    try:
-        response = session.get(url, timeout=_TIMEOUT)
-        response.raise_for_status()
-    except OSError as exc:
-        logger.debug("Wiki page fetch failed for %s: %s", url, exc)
+    if getattr(client, "session", None) is None:
         return None
-    return str(response.text)
+    return get_wiki_fetcher().fetch(client, url)
+
+
+def fetch_many(client: object, urls: Sequence[str]) -> List[Optional[str]]:
+    """Fetch several pages concurrently, returning None for each failure.
+
+    Args:
+        client: A WikiClient (provides a requests session).
+        urls: Absolute page URLs.
+
+    Returns:
+        The raw HTML body (or None) of each URL, in input order.
+    """
+    if getattr(client, "session", None) is None:
+        return [None for _ in urls]
+    return get_wiki_fetcher().fetch_many(client, urls)
 
 
 def fetch_first(client: object, urls: List[str]) -> Optional[str]:
@@ -96,3 +511,32 @@ def fetch_first(client: object, urls: List[str]) -> Optional[str]:
         if html is not None:
             return html
     return None
+
+
+def fetch_first_many(client: object, candidates: Sequence[List[str]]) -> List[Optional[str]]:
+    """Resolve many candidate lists at once, like fetch_first for each.
+
+    Every list's first candidate is fetched in one concurrent round; lists that
+    missed move on to their next candidate in the following round.
+
+    Args:
+        client: A WikiClient (provides a requests session).
+        candidates: Ordered candidate page URLs per item.
+
+    Returns:
+        The first successfully fetched HTML of each list, or None, in input order.
+    """
+    results: List[Optional[str]] = [None] * len(candidates)
+    pending = [index for index, urls in enumerate(candidates) if urls]
+    depth = 0
+    while pending:
+        pages = fetch_many(client, [candidates[index][depth] for index in pending])
+        depth += 1
+        still_pending = []
+        for index, html in zip(pending, pages):
+            if html is not None:
+                results[index] = html
+            elif depth < len(candidates[index]):
+                still_pending.append(index)
+        pending = still_pending
+    return results
@@ -7,6 +7,12 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
+from src.character_arc.arc_cache import (
+    ChunkAnalysisCache,
+    get_chunk_analysis_cache,
+    prompt_hash,
+)
+from src.character_arc.arc_fanout import extract_arc_facts, map_concurrent, model_slots
 from src.character_arc.arc_criteria import (
     ArcCriteria,
     ArcDimension,
@@ -33,6 +39,10 @@ _SYNTHESIS_MAX_TOKENS = int(os.getenv("ARC_SYNTHESIS_MAX_TOKENS", "8000"))
 # rather than the model only seeing the opening stories before truncation. Later
 # party members and late-arc turning points are lost if this is front-loaded.
 _NARRATIVE_BUDGET_CHARS = int(os.getenv("ARC_NARRATIVE_CHARS", "16000"))
+# Bump when the chunk prompt or the shape of its result changes, so cached
+# chunk analyses from the old prompt are no longer reused.
+CHUNK_PROMPT_VERSION = 1
+_CHUNK_SYSTEM_PROMPT = "You are a narrative analyst. Return only valid JSON."
 
 
 @dataclass
@@ -54,6 +64,7 @@ class ArcAnalyzer:
         ai_client: Optional[Any] = None,
         criteria: Optional[ArcCriteria] = None,
         pronouns: str = "",
+        chunk_cache: Optional[ChunkAnalysisCache] = None,
     ):
         """Initialize the arc analyzer.
 
@@ -62,10 +73,13 @@ class ArcAnalyzer:
             criteria: Arc analysis criteria (uses defaults if omitted).
             pronouns: The character's pronouns (e.g. "she/her"), included in AI
                 prompts so the model does not guess the character's gender.
+            chunk_cache: Optional persistent cache of chunk analyses; without
+                it every chunk is sent to the model.
         """
         self.ai_client = ai_client
         self.criteria = criteria or ArcCriteria()
         self.pronouns = pronouns.strip()
+        self.chunk_cache = chunk_cache
 
     def _pronoun_hint(self, character_name: str) -> str:
         """A prompt clause pinning the character's pronouns, or empty."""
@@ -129,15 +143,22 @@ class ArcAnalyzer:
             ]
             # A large budget plus disabled thinking keeps qwen3 from leaving the
             # content empty; the JSON object is then parsed out of the reply.
-            response = self.ai_client.chat_completion(
-                messages, max_tokens=_SYNTHESIS_MAX_TOKENS, disable_thinking=True
-            )
+            # The same prompts recur across re-runs, so the reply is cacheable.
+            with model_slots():
+                response = self.ai_client.chat_completion(
+                    messages, max_tokens=_SYNTHESIS_MAX_TOKENS, disable_thinking=True,
+                    cache=True,
+                )
             return self._parse_ai_response(response)
         except (RuntimeError, OSError, ValueError):
             return {}
 
     def analyze_chunk(self, chunk: str, character_name: str) -> Dict[str, Any]:
-        """Analyze one story chunk (small, memory-safe model call)."""
+        """Analyze one story chunk (small, memory-safe model call).
+
+        With a chunk cache, a chunk already analysed by the same model with
+        the same prompt is answered from the cache.
+        """
         prompt = (
             f"Analyze this excerpt for character development of "
             f"{character_name}.{self._pronoun_hint(character_name)}\n\n"
@@ -170,8 +191,13 @@ class ArcAnalyzer:
             "4. Emotional or psychological changes\n"
             "5. Goals pursued or progressed"
         )
-        return self._ai_json(
-            "You are a narrative analyst. Return only valid JSON.", prompt
+        if self.chunk_cache is None or self.ai_client is None:
+            return self._ai_json(_CHUNK_SYSTEM_PROMPT, prompt)
+        return self.chunk_cache.get_or_compute(
+            str(getattr(self.ai_client, "model", "")),
+            CHUNK_PROMPT_VERSION,
+            prompt_hash(_CHUNK_SYSTEM_PROMPT, prompt),
+            lambda: self._ai_json(_CHUNK_SYSTEM_PROMPT, prompt),
         )
 
     def _ai_analyze_story(
@@ -182,14 +208,17 @@ class ArcAnalyzer:
         """Analyze a full story by chunking it and merging per-chunk results.
 
         Long stories are split into small chunks so each model call has a small,
-        memory-safe context; the per-chunk analyses are then merged into one.
+        memory-safe context; chunks are analysed concurrently (ARC_CONCURRENCY)
+        and the per-chunk analyses are then merged into one.
         """
         chunks = _chunk_text(story_content, _CHUNK_CHARS)[:_MAX_CHUNKS]
         if not chunks:
             return {"metrics": {}, "observations": [], "key_events": [], "summary": ""}
         if len(chunks) == 1:
             return self.analyze_chunk(chunks[0], character_name)
-        partials = [self.analyze_chunk(chunk, character_name) for chunk in chunks]
+        partials = map_concurrent(
+            lambda chunk: self.analyze_chunk(chunk, character_name), chunks
+        )
         return _merge_chunk_analyses(partials)
 
     def analyze_relationships(
@@ -296,9 +325,10 @@ class ArcAnalyzer:
             # Local qwen3 models always "think" (~2k tokens) even with
             # disable_thinking; the budget must outlast the reasoning or the
             # answer is truncated to empty. Keep it generous.
-            summary = self.ai_client.chat_completion(
-                messages, max_tokens=_SYNTHESIS_MAX_TOKENS, disable_thinking=True
-            ).strip()
+            with model_slots():
+                summary = self.ai_client.chat_completion(
+                    messages, max_tokens=_SYNTHESIS_MAX_TOKENS, disable_thinking=True
+                ).strip()
             return summary or f"{character_name}'s arc spans the campaign."
         except (RuntimeError, OSError, ValueError):
             return f"{character_name}'s arc spans the campaign."
@@ -407,11 +437,14 @@ class ArcAnalyzer:
     def analyze_arc_progression(
         self,
         arc: CharacterArc,
+        include_summary: bool = True,
     ) -> Dict[str, Any]:
         """Analyze the overall progression of a character arc.
 
         Args:
             arc: CharacterArc to analyze.
+            include_summary: Generate the summary (a model call when AI is
+                configured); when False the summary is left empty.
 
         Returns:
             Dict with direction, stage, summary, and dimension_analyses.
@@ -431,7 +464,9 @@ class ArcAnalyzer:
 
         overall_direction = self._determine_overall_direction(dimension_analyses)
         arc_stage = self._determine_arc_stage(arc)
-        summary = self._generate_arc_summary(arc, dimension_analyses)
+        summary = (
+            self._generate_arc_summary(arc, dimension_analyses) if include_summary else ""
+        )
 
         return {
             "direction": overall_direction,
@@ -605,9 +640,10 @@ class ArcAnalyzer:
             messages = [
                 self.ai_client.create_user_message(prompt),
             ]
-            return self.ai_client.chat_completion(
-                messages, max_tokens=1200, disable_thinking=True
-            )
+            with model_slots():
+                return self.ai_client.chat_completion(
+                    messages, max_tokens=1200, disable_thinking=True
+                )
         except (RuntimeError, OSError, ValueError):
             return f"{arc.character_name}'s arc spans {len(arc.data_points)} stories."
 
@@ -747,21 +783,6 @@ def _build_metric_series(arc: CharacterArc) -> Dict[str, Dict[str, Any]]:
     return metrics
 
 
-def _enrich_metric_obs(
-    analyzer: ArcAnalyzer,
-    character_name: str,
-    metrics: Dict[str, Dict[str, Any]],
-    narrative: str,
-) -> None:
-    """Replace templated metric notes with model-written, event-grounded ones.
-
-    Mutates ``metrics`` in place; a missing or malformed reply leaves the
-    templated note untouched.
-    """
-    for key, obs in analyzer.narrate_metrics(character_name, metrics, narrative).items():
-        metrics[key]["obs"] = obs
-
-
 def analyze_story_datapoint(
     analyzer: ArcAnalyzer,
     content: str,
@@ -855,8 +876,10 @@ def aggregate_arc(
 ) -> Dict[str, Any]:
     """Aggregate per-story data points into a full character arc.
 
-    Runs the progression (direction/stage/summary), builds the metric series,
-    and extracts relationships and goals from the distilled per-story summaries.
+    Runs the progression (direction/stage), builds the metric series, and
+    extracts relationships and goals from the distilled per-story summaries.
+    The metric, relationship and goal calls are independent and run
+    concurrently; the arc narration, which needs their results, runs last.
 
     Args:
         data_points: The stored per-story :class:`ArcDataPoint` list.
@@ -874,12 +897,13 @@ def aggregate_arc(
     for data_point in data_points:
         arc.add_data_point(data_point)
 
-    progression = analyzer.analyze_arc_progression(arc)
+    # The progression summary is superseded by narrate_arc below; skip its call.
+    progression = analyzer.analyze_arc_progression(arc, include_summary=False)
     narrative = _narrative_from_points(data_points)
     metrics = _build_metric_series(arc)
-    _enrich_metric_obs(analyzer, character_name, metrics, narrative)
-    relationships = analyzer.analyze_relationships(narrative, character_name)
-    goals = analyzer.analyze_goals(narrative, character_name)
+    relationships, goals = extract_arc_facts(
+        analyzer, character_name, metrics, narrative
+    )
     summary = analyzer.narrate_arc(
         character_name, narrative, facts_block(metrics, relationships, goals)
     )
@@ -905,7 +929,10 @@ def analyze_character_arc(
 ) -> Dict[str, Any]:
     """Analyze a full character arc from ordered story texts (single-shot).
 
-    Convenience wrapper that runs every story then aggregates. Prefer the
+    Convenience wrapper that runs every story then aggregates. Stories are
+    analysed concurrently (ARC_CONCURRENCY), and with AI the shared chunk
+    cache means chunks analysed on an earlier run are not sent to the model
+    again, so a rerun after new sessions only analyses the new text. Prefer the
     two-step ``analyze_story_datapoint`` + ``aggregate_arc`` path for many
     stories so each request stays a single model call.
 
@@ -922,22 +949,26 @@ def analyze_character_arc(
         A dict with direction, stage, summary, stories_analyzed, updated_at,
         metrics, relationships, and goals.
     """
-    analyzer = ArcAnalyzer(ai_client=ai_client, pronouns=pronouns)
-    data_points: List[ArcDataPoint] = []
-    for story in stories:
-        content = str(story.get("content", ""))
-        if not content.strip():
-            continue
+    analyzer = ArcAnalyzer(
+        ai_client=ai_client,
+        pronouns=pronouns,
+        chunk_cache=get_chunk_analysis_cache() if ai_client is not None else None,
+    )
+
+    def _analyze(story: Dict[str, Any]) -> ArcDataPoint:
         number = story.get("story_number")
-        data_points.append(
-            analyze_story_datapoint(
-                analyzer,
-                content,
-                character_name,
-                title=str(story.get("title", "")),
-                story_number=number if isinstance(number, int) else None,
-            )
+        return analyze_story_datapoint(
+            analyzer,
+            str(story.get("content", "")),
+            character_name,
+            title=str(story.get("title", "")),
+            story_number=number if isinstance(number, int) else None,
         )
+
+    data_points = map_concurrent(
+        _analyze,
+        [story for story in stories if str(story.get("content", "")).strip()],
+    )
     return aggregate_arc(
         data_points, character_name, campaign_name, ai_client, pronouns=pronouns
     )
@@ -0,0 +1,130 @@
+"""Persistent cache of per-chunk character arc analyses.
+
+Chunk analyses are keyed by (model, prompt version, sha256 of the full
+prompt). The prompt embeds the chunk text, character name and pronouns, so
+re-running arc analysis after new sessions only sends the new text to the
+model. Storage is a single SQLite file of JSON results.
+"""
+
+import hashlib
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from src.config.config_loader import load_config
+from src.utils.sqlite_cache import SqliteCacheFile
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS chunk_analyses ("
+    " model TEXT NOT NULL,"
+    " prompt_version INTEGER NOT NULL,"
+    " prompt_hash TEXT NOT NULL,"
+    " result TEXT NOT NULL,"
+    " PRIMARY KEY (model, prompt_version, prompt_hash))"
+)
+
+# File name of the cache inside the configured cache dir.
+_CACHE_FILE_NAME = "arc_chunks.sqlite3"
+
+
+def prompt_hash(*parts: str) -> str:
+    """Return the sha256 hex digest identifying a prompt.
+
+    Args:
+        parts: Prompt pieces (e.g. system and user message) in order.
+
+    Returns:
+        64-character hex digest.
+    """
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+class ChunkAnalysisCache:
+    """SQLite-backed (model, prompt version, prompt hash) -> analysis store.
+
+    Shared across threads behind a lock; all failures degrade to cache misses
+    so a broken cache file never stops an analysis.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        """
+        Args:
+            db_path: Location of the SQLite file; parent dirs are created.
+        """
+        self._db = SqliteCacheFile(db_path, [_SCHEMA])
+
+    def get(self, model: str, version: int, digest: str) -> Optional[Dict[str, Any]]:
+        """Return a cached analysis, or None on a miss.
+
+        Args:
+            model: Model that produced the analysis.
+            version: Prompt version the analysis was produced with.
+            digest: Prompt hash from prompt_hash().
+        """
+        row = self._db.fetchone(
+            "SELECT result FROM chunk_analyses"
+            " WHERE model = ? AND prompt_version = ? AND prompt_hash = ?",
+            (model, version, digest),
+        )
+        if row is None:
+            return None
+        try:
+            result = json.loads(row[0])
+        except ValueError:
+            return None
+        return result if isinstance(result, dict) else None
+
+    def put(self, model: str, version: int, digest: str, result: Dict[str, Any]) -> None:
+        """Store an analysis; empty results (failed calls) are skipped.
+
+        Args:
+            model: Model that produced the analysis.
+            version: Prompt version the analysis was produced with.
+            digest: Prompt hash from prompt_hash().
+            result: Parsed analysis dict.
+        """
+        if not result:
+            return
+        self._db.write(
+            "INSERT OR REPLACE INTO chunk_analyses"
+            " (model, prompt_version, prompt_hash, result) VALUES (?, ?, ?, ?)",
+            [(model, version, digest, json.dumps(result))],
+        )
+
+    def get_or_compute(
+        self,
+        model: str,
+        version: int,
+        digest: str,
+        compute: Callable[[], Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Return the cached analysis, or compute, store and return it.
+
+        Args:
+            model: Model that produces the analysis.
+            version: Prompt version the analysis is produced with.
+            digest: Prompt hash from prompt_hash().
+            compute: Runs the analysis on a miss; an empty result is returned
+                but not stored.
+        """
+        cached = self.get(model, version, digest)
+        if cached is not None:
+            return cached
+        result = compute()
+        self.put(model, version, digest, result)
+        return result
+
+    def count(self) -> int:
+        """Return the number of cached analyses."""
+        return self._db.count("SELECT COUNT(*) FROM chunk_analyses")
+
+    def close(self) -> None:
+        """Close the underlying connection if it was opened."""
+        self._db.close()
+
+
+@lru_cache(maxsize=1)
+def get_chunk_analysis_cache() -> ChunkAnalysisCache:
+    """Return the process-wide cache inside the configured ``paths.cache_dir``."""
+    return ChunkAnalysisCache(Path(load_config().paths.cache_dir) / _CACHE_FILE_NAME)
@@ -0,0 +1,89 @@
+"""Concurrent fan-out of character arc model calls.
+
+Chunks within a story and stories within ``analyze_character_arc`` fan out
+over thread pools of ARC_CONCURRENCY workers, and the independent aggregate
+calls (metric notes, relationships, goals) run together. One process-wide
+semaphore keeps nested fan-out (stories x chunks) within the same number of
+in-flight model calls.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    TYPE_CHECKING, Any, Callable, Dict, FrozenSet, List, Tuple, TypeVar,
+)
+
+from src.config.config_loader import load_config, subscribe_config_changes
+
+if TYPE_CHECKING:
+    from src.character_arc.arc_analyzer import ArcAnalyzer
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+# Module-level holder for the shared model-call semaphore (see spell_registry).
+_slots_holder: List[threading.BoundedSemaphore] = []
+_slots_lock = threading.Lock()
+
+
+def _arc_concurrency() -> int:
+    """Model calls allowed in flight at once across all arc work.
+
+    Set ARC_CONCURRENCY to 1 for a model server that only serves one
+    request at a time.
+    """
+    return max(1, load_config().performance.arc_concurrency)
+
+
+def model_slots() -> threading.BoundedSemaphore:
+    """Return the process-wide semaphore bounding in-flight model calls."""
+    with _slots_lock:
+        if not _slots_holder:
+            _slots_holder.append(threading.BoundedSemaphore(_arc_concurrency()))
+        return _slots_holder[0]
+
+
+@subscribe_config_changes
+def _on_config_change(changed: FrozenSet[str], _config: Any) -> None:
+    """Size a new semaphore on next use when the performance limits change.
+
+    Calls already holding a slot release it on the semaphore they acquired.
+    """
+    if "performance" in changed:
+        with _slots_lock:
+            _slots_holder.clear()
+
+
+def map_concurrent(func: Callable[[_T], _R], items: List[_T]) -> List[_R]:
+    """Apply ``func`` to every item on a bounded thread pool, keeping order."""
+    workers = min(_arc_concurrency(), len(items))
+    if workers <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(func, items))
+
+
+def extract_arc_facts(
+    analyzer: "ArcAnalyzer",
+    character_name: str,
+    metrics: Dict[str, Dict[str, Any]],
+    narrative: str,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Run the independent aggregate calls concurrently.
+
+    Writes model-written, event-grounded notes into ``metrics`` in place (a
+    missing or malformed reply leaves the templated note) and extracts the
+    relationships and goals.
+
+    Returns:
+        (relationships, goals).
+    """
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        notes = pool.submit(analyzer.narrate_metrics, character_name, metrics, narrative)
+        relationships = pool.submit(
+            analyzer.analyze_relationships, narrative, character_name
+        )
+        goals = pool.submit(analyzer.analyze_goals, narrative, character_name)
+        for key, obs in notes.result().items():
+            metrics[key]["obs"] = obs
+        return relationships.result(), goals.result()
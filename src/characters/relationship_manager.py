@@ -1,32 +1,167 @@
-"""Relationship management and synchronization."""
+"""Relationship management and synchronization.
 
-from typing import Dict, List, Optional, Set, Tuple
+The graph keeps adjacency indexes over its edge list, so per-character and
+per-pair lookups touch only the matching edges, and answers neighbourhood,
+strongest-path and component queries for sub-graph rendering. The manager
+caches parsed character/NPC files by mtime, which gives it a name -> file
+index and a reusable graph that are only rebuilt for files that changed.
+"""
+
+import heapq
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from src.characters.relationship import Relationship
 from src.characters.relationship_types import get_inverse
 from src.utils.file_io import load_json_file, save_json_file
 from src.utils.path_utils import get_characters_dir, get_npcs_dir
 
+Edge = Tuple[str, str, Relationship]
+
 
 @dataclass
 class RelationshipGraph:
-    """Graph representation of all relationships."""
+    """Graph representation of all relationships.
+
+    ``edges`` stays the canonical list; add edges through add_edge() so the
+    adjacency indexes stay in step.
+    """
     nodes: Set[str]  # All character/NPC names
-    edges: List[Tuple[str, str, Relationship]]  # (source, target, relationship)
+    edges: List[Edge]  # (source, target, relationship)
+    _outgoing: Dict[str, Dict[str, List[int]]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _incoming: Dict[str, Dict[str, List[int]]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        """Index the initial edge list."""
+        for index, (source, target, _) in enumerate(self.edges):
+            self._index_edge(index, source, target)
+
+    def _index_edge(self, index: int, source: str, target: str) -> None:
+        self._outgoing.setdefault(source, {}).setdefault(target, []).append(index)
+        self._incoming.setdefault(target, {}).setdefault(source, []).append(index)
+
+    def add_edge(self, source: str, target: str, rel: Relationship) -> None:
+        """Append an edge, adding its endpoints to the node set."""
+        self.nodes.update((source, target))
+        self.edges.append((source, target, rel))
+        self._index_edge(len(self.edges) - 1, source, target)
 
     def get_relationships_for(self, name: str) -> List[Relationship]:
         """Get all relationships for a specific character."""
-        return [r for s, t, r in self.edges if name in (s, t)]
+        return [self.edges[i][2] for i in self._incident_indexes(name)]
 
     def get_connection_strength(self, name1: str, name2: str) -> Optional[int]:
         """Get the strength of connection between two characters."""
-        for source, target, rel in self.edges:
-            if (source == name1 and target == name2) or \
-               (source == name2 and target == name1):
-                return rel.strength
-        return None
+        rels = self.relationships_between(name1, name2)
+        return rels[0].strength if rels else None
+
+    def relationships_between(self, name1: str, name2: str) -> List[Relationship]:
+        """Get the relationships linking two characters, in either direction."""
+        indexes = set(self._outgoing.get(name1, {}).get(name2, []))
+        indexes.update(self._outgoing.get(name2, {}).get(name1, []))
+        return [self.edges[i][2] for i in sorted(indexes)]
+
+    def has_edge(self, source: str, target: str) -> bool:
+        """Check whether source has a relationship towards target."""
+        return target in self._outgoing.get(source, {})
+
+    def neighbors(self, name: str) -> Set[str]:
+        """Get every node directly linked to name, in either direction."""
+        return set(self._outgoing.get(name, {})) | set(self._incoming.get(name, {}))
+
+    def neighbors_within(self, center: str, depth: int = 2) -> Set[str]:
+        """Get all nodes within depth hops of center (center included)."""
+        connected = {center}
+        frontier = {center}
+        for _ in range(depth):
+            frontier = {
+                other for node in frontier for other in self.neighbors(node)
+            } - connected
+            if not frontier:
+                break
+            connected |= frontier
+        return connected
+
+    def edges_among(self, nodes: Iterable[str]) -> List[Edge]:
+        """Get the edges whose endpoints are both in nodes, in edge order."""
+        wanted = set(nodes)
+        indexes = {
+            index
+            for source in wanted
+            for target, found in self._outgoing.get(source, {}).items()
+            if target in wanted
+            for index in found
+        }
+        return [self.edges[i] for i in sorted(indexes)]
+
+    def subgraph(self, nodes: Iterable[str]) -> "RelationshipGraph":
+        """Build the graph induced by a set of nodes."""
+        wanted = set(nodes)
+        return RelationshipGraph(nodes=wanted, edges=self.edges_among(wanted))
+
+    def connected_components(self) -> List[Set[str]]:
+        """Group nodes linked by any chain of relationships, largest first."""
+        remaining = set(self.nodes)
+        components = []
+        while remaining:
+            start = remaining.pop()
+            component = {start}
+            stack = [start]
+            while stack:
+                for other in self.neighbors(stack.pop()):
+                    if other not in component:
+                        component.add(other)
+                        stack.append(other)
+            remaining -= component
+            components.append(component)
+        return sorted(components, key=lambda comp: (-len(comp), min(comp)))
+
+    def strongest_path(self, source: str, target: str) -> Optional[List[str]]:
+        """Find the path whose weakest link is strongest (fewest hops on ties).
+
+        Edges are followed in either direction; a pair linked by several
+        relationships uses the strongest one.
+
+        Returns:
+            Node names from source to target, or None when they are unlinked.
+        """
+        if source not in self.nodes or target not in self.nodes:
+            return None
+        best: Dict[str, Tuple[int, int]] = {source: (11, 0)}
+        previous: Dict[str, str] = {}
+        queue = [(-11, 0, source)]
+        while queue:
+            neg_width, hops, node = heapq.heappop(queue)
+            if node == target:
+                break
+            if best.get(node, (0, 0)) != (-neg_width, hops):
+                continue
+            for other in self.neighbors(node):
+                link = max(rel.strength for rel in self.relationships_between(node, other))
+                width = min(-neg_width, link)
+                candidate = (width, hops + 1)
+                current = best.get(other)
+                if current is None or (candidate[0], -candidate[1]) > (current[0], -current[1]):
+                    best[other] = candidate
+                    previous[other] = node
+                    heapq.heappush(queue, (-width, hops + 1, other))
+        if target not in best:
+            return None
+        path = [target]
+        while path[-1] != source:
+            path.append(previous[path[-1]])
+        return path[::-1]
+
+    def _incident_indexes(self, name: str) -> List[int]:
+        """Indexes of the edges touching name, in edge order."""
+        indexes = {i for found in self._outgoing.get(name, {}).values() for i in found}
+        indexes.update(i for found in self._incoming.get(name, {}).values() for i in found)
+        return sorted(indexes)
 
 
 class RelationshipManager:
@@ -39,51 +174,73 @@ class RelationshipManager:
     ):
         self.characters_dir = Path(characters_dir or get_characters_dir())
         self.npcs_dir = Path(npcs_dir or get_npcs_dir())
-
-    def build_relationship_graph(self) -> RelationshipGraph:
-        """Build a complete relationship graph from all sources."""
-        nodes: Set[str] = set()
-        edges: List[Tuple[str, str, Relationship]] = []
-
-        # Load character relationships
-        for char_file in self.characters_dir.glob("*.json"):
-            if ".example" in char_file.name:
+        # path -> ((mtime_ns, size), name, relationships) for each loaded file.
+        self._files: Dict[Path, Tuple[Tuple[int, int], str, List[Relationship]]] = {}
+        self._name_index: Dict[str, Path] = {}
+        self._graph: Optional[RelationshipGraph] = None
+
+    def _entity_files(self) -> List[Path]:
+        """List character files, then NPC files, skipping examples."""
+        return [
+            path
+            for directory in (self.characters_dir, self.npcs_dir)
+            for path in directory.glob("*.json")
+            if ".example" not in path.name
+        ]
+
+    def _refresh(self) -> None:
+        """Reload files whose mtime or size changed and rebuild derived indexes."""
+        changed = False
+        current = self._entity_files()
+        for path in set(self._files) - set(current):
+            del self._files[path]
+            changed = True
+        for path in current:
+            try:
+                stat = path.stat()
+            except OSError:
                 continue
-
-            data = load_json_file(str(char_file))
-            if not data:
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            cached = self._files.get(path)
+            if cached is not None and cached[0] == stamp:
                 continue
-            char_name = data.get("name")
-            if not char_name:
+            data = load_json_file(str(path))
+            if not isinstance(data, dict):
+                data = {}
+            name = data.get("name")
+            relationships = self._parse_relationships(data) if name else []
+            self._files[path] = (stamp, str(name or ""), relationships)
+            changed = True
+
+        if not changed and self._graph is not None:
+            return
+        self._name_index = {}
+        nodes: Set[str] = set()
+        edges: List[Edge] = []
+        for path in current:
+            entry = self._files.get(path)
+            if entry is None or not entry[1]:
                 continue
-
-            nodes.add(char_name)
-
-            for rel in self._parse_relationships(data):
-                edges.append((char_name, rel.target_name, rel))
+            name = entry[1]
+            self._name_index.setdefault(name, path)
+            nodes.add(name)
+            for rel in entry[2]:
+                edges.append((name, rel.target_name, rel))
                 nodes.add(rel.target_name)
+        self._graph = RelationshipGraph(nodes=nodes, edges=edges)
 
-        # Load NPC relationships
-        for npc_file in self.npcs_dir.glob("*.json"):
-            if ".example" in npc_file.name:
-                continue
-
-            data = load_json_file(str(npc_file))
-            if not data:
-                continue
-            npc_name = data.get("name")
-            if not npc_name:
-                continue
-
-            nodes.add(npc_name)
-
-            for rel in self._parse_relationships(data):
-                edges.append((npc_name, rel.target_name, rel))
-                nodes.add(rel.target_name)
+    def build_relationship_graph(self) -> RelationshipGraph:
+        """Build a complete relationship graph from all sources.
 
-        return RelationshipGraph(nodes=nodes, edges=edges)
+        The graph is cached and rebuilt only when a character or NPC file has
+        been added, removed or modified; treat it as read-only.
+        """
+        self._refresh()
+        assert self._graph is not None
+        return self._graph
 
-    def _parse_relationships(self, data: Dict) -> List[Relationship]:
+    @staticmethod
+    def _parse_relationships(data: Dict) -> List[Relationship]:
         """Parse relationships from character/NPC data."""
         relationships: List[Relationship] = []
         rel_data = data.get("relationships", {})
@@ -117,9 +274,7 @@ class RelationshipManager:
 
         # Check for missing inverse relationships
         for source, target, rel in graph.edges:
-            target_rels = [r for s, t, r in graph.edges if s == target and t == source]
-
-            if not target_rels:
+            if not graph.has_edge(source=target, target=source):
                 expected_type = get_inverse(rel.relationship_type)
                 warnings.append(
                     f"{source} -> {target}: {rel.relationship_type.value}, "
@@ -148,7 +303,7 @@ class RelationshipManager:
         created = 0
 
         for target_name, rel_value in relationships.items():
-            target_file = self._find_character_file(target_name)
+            target_file = self._name_index.get(target_name)
             if not target_file:
                 continue
 
@@ -179,19 +334,6 @@ class RelationshipManager:
         return created
 
     def _find_character_file(self, name: str) -> Optional[Path]:
-        """Find a character or NPC file by name."""
-        for char_file in self.characters_dir.glob("*.json"):
-            if ".example" in char_file.name:
-                continue
-            data = load_json_file(str(char_file))
-            if data and data.get("name") == name:
-                return char_file
-
-        for npc_file in self.npcs_dir.glob("*.json"):
-            if ".example" in npc_file.name:
-                continue
-            data = load_json_file(str(npc_file))
-            if data and data.get("name") == name:
-                return npc_file
-
-        return None
+        """Find a character or NPC file by name (characters take precedence)."""
+        self._refresh()
+        return self._name_index.get(name)
@@ -84,9 +84,7 @@ class RelationshipVisualizer:
         lines = []
         seen_edges: Set[tuple] = set()
 
-        for source, target, rel in graph.edges:
-            if source not in nodes or target not in nodes:
-                continue
+        for source, target, rel in graph.edges_among(nodes):
             if rel.strength < min_strength:
                 continue
             if include_types and rel.relationship_type not in include_types:
@@ -133,9 +131,7 @@ class RelationshipVisualizer:
         lines = ['flowchart LR']
 
         seen: Set[tuple] = set()
-        for source, target, rel in graph.edges:
-            if source not in nodes or target not in nodes:
-                continue
+        for source, target, rel in graph.edges_among(nodes):
             if rel.strength < min_strength:
                 continue
 
@@ -171,24 +167,7 @@ class RelationshipVisualizer:
         depth: int = 2
     ) -> Set[str]:
         """Get all nodes connected to center within depth hops."""
-        connected = {center}
-        frontier = {center}
-
-        for _ in range(depth):
-            new_frontier = set()
-            for node in frontier:
-                for source, target, _ in graph.edges:
-                    if source == node and target not in connected:
-                        new_frontier.add(target)
-                        connected.add(target)
-                    elif target == node and source not in connected:
-                        new_frontier.add(source)
-                        connected.add(source)
-            frontier = new_frontier
-            if not frontier:
-                break
-
-        return connected
+        return graph.neighbors_within(center, depth)
 
     @staticmethod
     def safe_id(name: str) -> str:
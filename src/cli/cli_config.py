@@ -5,6 +5,7 @@ Provides interactive configuration management through the CLI.
 Allows users to view, edit, and save configuration settings.
 """
 
+import copy
 from pathlib import Path
 from typing import Optional
 
@@ -29,7 +30,8 @@ class ConfigCLI:
         """Ensure config is loaded."""
         if self.config is None:
             try:
-                self.config = load_config(self.config_path)
+                # load_config() returns a shared snapshot; edit a copy.
+                self.config = copy.deepcopy(load_config(self.config_path))
             except (OSError, ImportError):
                 self.config = DnDConfig()
                 self.config.config_file_path = self.config_path
@@ -58,8 +60,8 @@ class ConfigCLI:
         print(f"  Rules Base URL: {config.rag.rules_base_url or '(not set)'}")
         print(f"  Cache TTL: {config.rag.cache_ttl} seconds")
         print(f"  Max Cache Size: {config.rag.max_cache_size}")
-        print(f"  Search Depth: {config.rag.search_depth}")
-        print(f"  Min Relevance: {config.rag.min_relevance}")
+        print(f"  Search Depth: {config.rag.search.depth}")
+        print(f"  Min Relevance: {config.rag.search.min_relevance}")
         print("  Cache Backend: drupal")
         print(f"  Cache Dir: {config.paths.cache_dir}")
 
@@ -203,10 +205,10 @@ class ConfigCLI:
                 display_error(error)
 
         # Search Depth
-        new_depth = input(f"Search Depth [{config.rag.search_depth}]: ").strip()
+        new_depth = input(f"Search Depth [{config.rag.search.depth}]: ").strip()
         if new_depth:
             try:
-                config.rag.search_depth = int(new_depth)
+                config.rag.search.depth = int(new_depth)
             except ValueError:
                 error = UserInputError(
                     message="Invalid search depth value",
@@ -9,6 +9,7 @@ from src.timeline.event_extractor import EventExtractor
 from src.timeline.timeline_display import TimelineDisplay
 from src.timeline.timeline_store import TimelineStore
 from src.utils.cli_utils import print_section_header
+from src.utils.path_utils import get_game_data_path
 from src.stories.story_manager_types import StoryManagerLike
 
 
@@ -39,7 +40,7 @@ class TimelineCLIManager:
             print(f"Campaign: {self.campaign_name}")
             print("-" * 30)
             print("1. View campaign timeline")
-            print("2. Extract events from story file")
+            print("2. Extract events from story files")
             print("3. View character timeline")
             print("4. Export timeline to markdown")
             print("5. Manage calendar date")
@@ -63,25 +64,33 @@ class TimelineCLIManager:
                 print("Invalid choice.")
 
     def _extract_from_story(self, store: TimelineStore) -> None:
-        """Extract and store events from a story file."""
-        story_file = input("\nPath to story file: ").strip()
-        if not story_file or not os.path.exists(story_file):
+        """Extract and store events from one story file, or every changed one."""
+        story_file = input(
+            "\nPath to story file (blank for all changed campaign stories): "
+        ).strip()
+        extractor = EventExtractor()
+        if not story_file:
+            campaign_dir = os.path.join(
+                get_game_data_path(self.workspace_path), "campaigns", self.campaign_name
+            )
+            events = extractor.extract_from_campaign(
+                campaign_dir, campaign_name=self.campaign_name
+            )
+        elif not os.path.exists(story_file):
             print("[ERROR] Story file not found.")
             return
-
-        extractor = EventExtractor()
-        events = extractor.extract_from_file(
-            story_file,
-            campaign_name=self.campaign_name,
-            story_file=os.path.basename(story_file),
-        )
+        else:
+            events = extractor.extract_from_file(
+                story_file,
+                campaign_name=self.campaign_name,
+                story_file=os.path.basename(story_file),
+            )
 
         if not events:
-            print("[INFO] No events detected in this story.")
+            print("[INFO] No new events detected.")
             return
 
-        for event in events:
-            store.add_event(event)
+        store.add_events(events)
 
         print(f"[OK] Extracted and saved {len(events)} event(s).")
 
@@ -211,7 +211,12 @@ def main():
     parser.add_argument(
         "--reindex",
         action="store_true",
-        help="Rebuild Milvus collections from all game_data files, then exit.",
+        help="Update Milvus collections for added, changed or removed game_data files, then exit.",
+    )
+    parser.add_argument(
+        "--full-reindex",
+        action="store_true",
+        help="Rebuild Milvus collections from all game_data files from scratch, then exit.",
     )
     parser.add_argument(
         "--milvus-status",
@@ -232,8 +237,8 @@ def main():
             print(f"[WARNING] Unknown model profile: '{args.model}'. Using default.")
 
     # Milvus utility commands exit immediately after running
-    if args.reindex:
-        run_reindex()
+    if args.reindex or args.full_reindex:
+        run_reindex(full=args.full_reindex)
         return
     if args.milvus_status:
         run_milvus_status()
@@ -2,78 +2,181 @@
 CLI commands for Milvus index management.
 
 Provides run_reindex() and run_milvus_status() which are invoked by the
---reindex and --milvus-status flags in dnd_consultant.py.
+--reindex, --full-reindex and --milvus-status flags in dnd_consultant.py.
 """
 
 from pathlib import Path
-from typing import Any, Dict
+from typing import Dict, List, NamedTuple
 
+from src.ai.embedded_vector_store import EmbeddedVectorStore
 from src.ai.embedding_pipeline import EmbeddingPipeline
-from src.ai.milvus_client import MilvusClient
+from src.ai.index_manifest import (
+    SKIPPED,
+    IndexManifest,
+    ReindexCounts,
+    default_manifest_path,
+    index_file,
+    load_manifest,
+    remove_file,
+    save_manifest,
+    source_files,
+)
+from src.ai.milvus_client import create_vector_store
 from src.ai.milvus_collections import COLLECTIONS
+from src.ai.vector_store import VectorStore
 from src.config.config_loader import load_config
-from src.utils.file_io import load_json_file
-from src.utils.path_utils import get_characters_dir, get_npcs_dir
 from src.utils.terminal_display import print_error, print_info, print_warning
 
+# Collections rebuilt from files on disk; wiki_pages is filled at lookup time.
+_FILE_COLLECTIONS = ("characters", "npcs", "story_chunks")
 
-def run_reindex() -> None:
-    """Rebuild all Milvus collections from game_data files on disk.
 
-    Reads every character JSON, NPC JSON, and story Markdown file and
-    replaces their existing embeddings with freshly generated ones.
-    Exits early with a warning when Milvus is disabled or unreachable.
-    """
-    cfg = load_config().milvus
-    if not cfg.enabled:
-        print_warning("Milvus is disabled (MILVUS_ENABLED=false). Nothing to index.")
-        return
+class _ReindexRun(NamedTuple):
+    """What one reindex run writes to: the store and the manifest on disk."""
 
-    client = MilvusClient()
-    if not client.connect():
-        print_error("Could not connect to Milvus. Check MILVUS_HOST / MILVUS_PORT.")
-        return
+    client: VectorStore
+    pipeline: EmbeddingPipeline
+    manifest: IndexManifest
+    manifest_path: Path
 
-    pipeline = EmbeddingPipeline()
 
-    # Ensure all collections exist
+def _start_manifest(client: VectorStore, full: bool, model: str) -> IndexManifest:
+    """Load the manifest, dropping collections whose vectors cannot be reused.
+
+    A model, dimension or schema change invalidates every collection. A
+    missing manifest or an explicit full rebuild only clears the file-backed
+    collections, whose contents are then re-embedded from disk.
+
+    Args:
+        client: Connected vector store.
+        full: Force a rebuild of the file-backed collections.
+        model: Embedding model the pipeline actually uses.
+
+    Returns:
+        The manifest to update during this run.
+    """
+    dim = load_config().milvus.embedding.dim
+    manifest = load_manifest(default_manifest_path())
+
+    if manifest is not None and not manifest.is_compatible(model, dim):
+        print_warning(
+            "[Milvus] Embedding model, dimension or schema changed - rebuilding all collections."
+        )
+        client.delete_collections()
+        manifest = None
+    elif manifest is None or full:
+        for base in _FILE_COLLECTIONS:
+            client.drop_collection(base)
+        manifest = None
+
+    if manifest is None:
+        manifest = IndexManifest(embedding_model=model, embedding_dim=dim)
     for name, schema in COLLECTIONS.items():
         client.ensure_collection(name, schema)
+    return manifest
+
+
+def _reindex_collection(
+    run: _ReindexRun, collection: str, paths: List[Path]
+) -> ReindexCounts:
+    """Sync one collection with its source files.
 
-    total = 0
+    The manifest is saved after every file whose rows changed, so an
+    interrupted run resumes where it stopped: story_chunks rows have no
+    source field to purge by, and rows missing from the manifest would be
+    inserted again as duplicates.
 
-    # Index characters
-    for json_file in Path(get_characters_dir()).glob("*.json"):
-        data: Dict[str, Any] = load_json_file(str(json_file)) or {}
-        data["_source_file"] = str(json_file)
-        client.delete_by_source("characters", "source_file", str(json_file))
-        total += client.insert("characters", pipeline.embed_character(data))
+    Args:
+        run: Store, pipeline and manifest of this reindex run.
+        collection: Collection name.
+        paths: Source files currently on disk for the collection.
+
+    Returns:
+        Counts of added, updated, deleted and skipped files.
+    """
+    counts = ReindexCounts()
+    for path in paths:
+        outcome, chunks = index_file(
+            run.client, run.pipeline, run.manifest, collection, path
+        )
+        counts.record(outcome)
+        counts.chunks += chunks
+        if outcome != SKIPPED:
+            save_manifest(run.manifest, run.manifest_path)
+    seen = {str(path) for path in paths}
+    for key in run.manifest.entries_for(collection):
+        if key not in seen:
+            remove_file(run.client, run.manifest, key)
+            save_manifest(run.manifest, run.manifest_path)
+            counts.deleted += 1
+    return counts
+
+
+def run_reindex(full: bool = False) -> Dict[str, ReindexCounts]:
+    """Bring the Milvus collections up to date with game_data files on disk.
+
+    Only files that were added or changed since the last run are re-embedded;
+    rows for deleted files are removed. Everything is rebuilt when there is
+    no manifest yet, when ``full`` is set, or when the embedding model,
+    dimension or schema version changed. Exits early with a warning when
+    Milvus is disabled or unreachable.
+
+    Args:
+        full: Rebuild every file-backed collection from scratch.
+
+    Returns:
+        Per-collection counts of added, updated, deleted and skipped files.
+    """
+    report: Dict[str, ReindexCounts] = {}
+    cfg = load_config().milvus
+    if not cfg.enabled:
+        print_warning("Milvus is disabled (MILVUS_ENABLED=false). Nothing to index.")
+        return report
 
-    # Index NPCs
-    for json_file in Path(get_npcs_dir()).glob("*.json"):
-        data = load_json_file(str(json_file)) or {}
-        data["_source_file"] = str(json_file)
-        client.delete_by_source("npcs", "source_file", str(json_file))
-        total += client.insert("npcs", pipeline.embed_npc(data))
+    client = create_vector_store()
+    if not client.connect():
+        print_error("Could not connect to Milvus. Check MILVUS_HOST / MILVUS_PORT.")
+        return report
 
-    # Index story files
-    for story_file in Path("game_data/campaigns").glob("**/*.md"):
-        rows = pipeline.embed_story_file(str(story_file))
-        total += client.insert("story_chunks", rows)
+    pipeline = EmbeddingPipeline()
+    run = _ReindexRun(
+        client,
+        pipeline,
+        _start_manifest(client, full, pipeline.model),
+        default_manifest_path(),
+    )
+    # Record the (possibly reset) build settings before any rows are written.
+    save_manifest(run.manifest, run.manifest_path)
+
+    for collection, paths in source_files().items():
+        counts = _reindex_collection(run, collection, paths)
+        # Also persists mtime refreshes of files skipped by content hash.
+        save_manifest(run.manifest, run.manifest_path)
+        report[collection] = counts
+        print_info(
+            f"[Milvus] {collection}: {counts.added} added, {counts.updated} updated, "
+            f"{counts.deleted} deleted, {counts.skipped} skipped "
+            f"({counts.chunks} chunks inserted)"
+        )
 
     client.disconnect()
+    total = sum(counts.chunks for counts in report.values())
     print_info(f"[Milvus] Reindex complete. {total} total chunks inserted.")
+    return report
 
 
 def run_milvus_status() -> None:
     """Print Milvus connection health and per-collection entity counts."""
     cfg = load_config().milvus
-    client = MilvusClient()
+    client = create_vector_store()
     if not client.connect() or not client.is_healthy():
         print_warning("Milvus is not reachable.")
         return
 
-    print_info(f"Milvus connected at {cfg.host}:{cfg.port}")
+    if isinstance(client, EmbeddedVectorStore):
+        print_info(f"Embedded vector store at {client.directory}")
+    else:
+        print_info(f"Milvus connected at {cfg.host}:{cfg.port}")
     for base in COLLECTIONS:
         col = client.get_collection(base)
         count = col.num_entities if col is not None else 0
@@ -6,26 +6,37 @@ Loads configuration from multiple sources with precedence:
 2. Environment variables
 3. config.json file
 4. Default values (lowest)
+
+load_config() returns a process-wide snapshot that is rebuilt only when the
+config file's mtime/size or the environment changes. Callers that need to
+edit a config must copy it first (copy.deepcopy). Long-lived caches register
+with subscribe_config_changes() to rebuild when their sections change.
 """
 
+import dataclasses
 import json
 import os
+import threading
 from pathlib import Path
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
 
 from src.config.config_types import (
     AIConfig,
     DisplayConfig,
     DnDConfig,
     DrupalConfig,
+    DrupalHttpConfig,
     MilvusConfig,
     MilvusEmbeddingConfig,
+    MilvusSearchConfig,
     ModelProfile,
     ModelRegistryConfig,
     PathConfig,
     RAGConfig,
+    RAGSearchConfig,
     RulesetConfig,
     SidecarConfig,
+    WikiFetchConfig,
 )
 from src.utils.errors import display_error, FileSystemError
 
@@ -33,18 +44,33 @@ from src.utils.errors import display_error, FileSystemError
 # Default config file location
 DEFAULT_CONFIG_FILE = Path("game_data/config.json")
 
+# Receives the names of the changed sections and the new config.
+ConfigListener = Callable[[FrozenSet[str], DnDConfig], None]
+
+# (file mtime_ns, file size, environment fingerprint); file fields are None
+# when the config file is absent. A stale snapshot carries None as its stamp.
+_Stamp = Tuple[Optional[int], Optional[int], int]
+
+_SNAPSHOT_LOCK = threading.Lock()
+_SNAPSHOTS: Dict[Tuple[str, str], Tuple[Optional[_Stamp], DnDConfig]] = {}
+_LISTENERS: List[ConfigListener] = []
+
 
 def load_config(
     config_path: Optional[Path] = None,
     env_prefix: str = "",
 ) -> DnDConfig:
-    """Load configuration from all sources.
+    """Return the configuration merged from all sources.
 
     Precedence (highest to lowest):
     1. Environment variables
     2. config.json file
     3. Default values
 
+    The result is a shared snapshot, rebuilt only when the config file or
+    the environment changes; treat it as read-only and copy it before
+    editing.
+
     Args:
         config_path: Optional path to config file
         env_prefix: Optional prefix for environment variables
@@ -52,11 +78,117 @@ def load_config(
     Returns:
         DnDConfig with merged settings
     """
+    path = config_path or DEFAULT_CONFIG_FILE
+    key = (str(path), env_prefix)
+    stamp = _snapshot_stamp(path)
+    with _SNAPSHOT_LOCK:
+        cached = _SNAPSHOTS.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+    return _rebuild(path, env_prefix, stamp)
+
+
+def reload_config(
+    config_path: Optional[Path] = None,
+    env_prefix: str = "",
+) -> DnDConfig:
+    """Rebuild the configuration snapshot even if nothing appears changed.
+
+    Args:
+        config_path: Optional path to config file
+        env_prefix: Optional prefix for environment variables
+
+    Returns:
+        The freshly built DnDConfig
+    """
+    path = config_path or DEFAULT_CONFIG_FILE
+    return _rebuild(path, env_prefix, _snapshot_stamp(path))
+
+
+def subscribe_config_changes(listener: ConfigListener) -> ConfigListener:
+    """Register a callback run whenever a rebuilt snapshot differs.
+
+    The listener receives the names of the changed sections ("ai", "rag",
+    "display", "paths" and the service sections such as "milvus",
+    "model_registry" or "comfyui") and the new config. Usable as a
+    decorator.
+
+    Args:
+        listener: Callback to register
+
+    Returns:
+        The listener, unchanged
+    """
+    with _SNAPSHOT_LOCK:
+        if listener not in _LISTENERS:
+            _LISTENERS.append(listener)
+    return listener
+
+
+def unsubscribe_config_changes(listener: ConfigListener) -> None:
+    """Remove a callback registered with subscribe_config_changes()."""
+    with _SNAPSHOT_LOCK:
+        if listener in _LISTENERS:
+            _LISTENERS.remove(listener)
+
+
+def _snapshot_stamp(config_path: Path) -> _Stamp:
+    """Return what a snapshot of ``config_path`` is valid for."""
+    env = hash(frozenset(os.environ.items()))
+    try:
+        stat = config_path.stat()
+    except OSError:
+        return (None, None, env)
+    return (stat.st_mtime_ns, stat.st_size, env)
+
+
+def _rebuild(config_path: Path, env_prefix: str, stamp: _Stamp) -> DnDConfig:
+    """Build a snapshot, store it, and notify listeners of changed sections."""
+    config = _build_config(config_path, env_prefix)
+    key = (str(config_path), env_prefix)
+    with _SNAPSHOT_LOCK:
+        previous = _SNAPSHOTS.get(key)
+        _SNAPSHOTS[key] = (stamp, config)
+        listeners = list(_LISTENERS)
+    if previous is None or not listeners:
+        return config
+    changed = _changed_sections(previous[1], config)
+    if changed:
+        for listener in listeners:
+            listener(changed, config)
+    return config
+
+
+def _changed_sections(old: DnDConfig, new: DnDConfig) -> FrozenSet[str]:
+    """Return the names of the top-level and service sections that differ."""
+    changed = {
+        name
+        for name in ("ai", "rag", "display", "paths")
+        if getattr(old, name) != getattr(new, name)
+    }
+    changed.update(
+        field.name
+        for field in dataclasses.fields(new.services)
+        if getattr(old.services, field.name) != getattr(new.services, field.name)
+    )
+    return frozenset(changed)
+
+
+def _invalidate(config_path: Path) -> None:
+    """Mark every snapshot of ``config_path`` stale, keeping it for diffing."""
+    with _SNAPSHOT_LOCK:
+        for key, (_, config) in list(_SNAPSHOTS.items()):
+            if key[0] == str(config_path):
+                _SNAPSHOTS[key] = (None, config)
+
+
+def _build_config(config_path: Path, env_prefix: str) -> DnDConfig:
+    """Build a DnDConfig from defaults, the config file and the environment."""
     # Start with defaults
     config = DnDConfig()
 
     # Load from config file
-    file_config = _load_config_file(config_path or DEFAULT_CONFIG_FILE)
+    file_config = _load_config_file(config_path)
     if file_config:
         config = _merge_config(config, file_config)
 
@@ -64,7 +196,7 @@ def load_config(
     config = _apply_env_overrides(config, env_prefix)
 
     # Store config file path
-    config.config_file_path = config_path or DEFAULT_CONFIG_FILE
+    config.config_file_path = config_path
 
     return config
 
@@ -121,8 +253,14 @@ def _merge_config(base: DnDConfig, override: Dict[str, Any]) -> DnDConfig:
             rules_base_url=rag_data.get("rules_base_url", base.rag.rules_base_url),
             cache_ttl=rag_data.get("cache_ttl", base.rag.cache_ttl),
             max_cache_size=rag_data.get("max_cache_size", base.rag.max_cache_size),
-            search_depth=rag_data.get("search_depth", base.rag.search_depth),
-            min_relevance=rag_data.get("min_relevance", base.rag.min_relevance),
+            search=RAGSearchConfig(
+                depth=rag_data.get("search_depth", base.rag.search.depth),
+                min_relevance=rag_data.get("min_relevance", base.rag.search.min_relevance),
+            ),
+            fetch=WikiFetchConfig(
+                workers=rag_data.get("fetch_workers", base.rag.fetch.workers),
+                interval=rag_data.get("fetch_interval", base.rag.fetch.interval),
+            ),
         )
 
     # Ruleset config
@@ -156,6 +294,7 @@ def _merge_config(base: DnDConfig, override: Dict[str, Any]) -> DnDConfig:
         milvus_data = override["milvus"]
         base.milvus = MilvusConfig(
             enabled=milvus_data.get("enabled", base.milvus.enabled),
+            backend=milvus_data.get("backend", base.milvus.backend),
             host=milvus_data.get("host", base.milvus.host),
             port=milvus_data.get("port", base.milvus.port),
             collection_prefix=milvus_data.get(
@@ -166,10 +305,18 @@ def _merge_config(base: DnDConfig, override: Dict[str, Any]) -> DnDConfig:
                     "embedding_model", base.milvus.embedding.model
                 ),
                 dim=milvus_data.get("embedding_dim", base.milvus.embedding.dim),
+                batch_size=milvus_data.get(
+                    "embedding_batch_size", base.milvus.embedding.batch_size
+                ),
+                concurrency=milvus_data.get(
+                    "embedding_concurrency", base.milvus.embedding.concurrency
+                ),
             ),
-            top_k=milvus_data.get("top_k", base.milvus.top_k),
-            similarity_threshold=milvus_data.get(
-                "similarity_threshold", base.milvus.similarity_threshold
+            search=MilvusSearchConfig(
+                top_k=milvus_data.get("top_k", base.milvus.search.top_k),
+                similarity_threshold=milvus_data.get(
+                    "similarity_threshold", base.milvus.search.similarity_threshold
+                ),
             ),
         )
 
@@ -183,6 +330,10 @@ def _merge_config(base: DnDConfig, override: Dict[str, Any]) -> DnDConfig:
             gatsby_webhook_url=drupal_data.get(
                 "gatsby_webhook_url", base.drupal.gatsby_webhook_url
             ),
+            http=DrupalHttpConfig(
+                pool_size=drupal_data.get("pool_size", base.drupal.http.pool_size),
+                batch_size=drupal_data.get("batch_size", base.drupal.http.batch_size),
+            ),
         )
 
     # Model registry config
@@ -272,12 +423,15 @@ def _apply_env_model_profiles(
         )
 
 
-def _apply_env_drupal_overrides(config: DnDConfig, get_env: Any) -> None:
+def _apply_env_drupal_overrides(
+    config: DnDConfig, get_env: Any, get_env_int: Any
+) -> None:
     """Apply Drupal integration overrides from environment variables.
 
     Args:
         config: DnDConfig to update in-place.
         get_env: Callable to read a string env var.
+        get_env_int: Callable to read an int env var with default.
     """
     drupal_base_url = get_env("DRUPAL_BASE_URL")
     if drupal_base_url:
@@ -303,6 +457,10 @@ def _apply_env_drupal_overrides(config: DnDConfig, get_env: Any) -> None:
     if ca_bundle:
         config.drupal.ca_bundle = ca_bundle
 
+    http = config.drupal.http
+    http.pool_size = get_env_int("DRUPAL_POOL_SIZE", http.pool_size)
+    http.batch_size = get_env_int("DRUPAL_BATCH_SIZE", http.batch_size)
+
 
 def _apply_env_milvus_overrides(
     config: DnDConfig,
@@ -322,6 +480,10 @@ def _apply_env_milvus_overrides(
     """
     config.milvus.enabled = get_env_bool("MILVUS_ENABLED", config.milvus.enabled)
 
+    milvus_backend = get_env("MILVUS_BACKEND")
+    if milvus_backend:
+        config.milvus.backend = milvus_backend.strip().lower()
+
     milvus_host = get_env("MILVUS_HOST")
     if milvus_host:
         config.milvus.host = milvus_host
@@ -339,9 +501,17 @@ def _apply_env_milvus_overrides(
     config.milvus.embedding.dim = get_env_int(
         "MILVUS_EMBEDDING_DIM", config.milvus.embedding.dim
     )
-    config.milvus.top_k = get_env_int("MILVUS_TOP_K", config.milvus.top_k)
-    config.milvus.similarity_threshold = get_env_float(
-        "MILVUS_SIMILARITY_THRESHOLD", config.milvus.similarity_threshold
+    config.milvus.embedding.batch_size = get_env_int(
+        "MILVUS_EMBEDDING_BATCH_SIZE", config.milvus.embedding.batch_size
+    )
+    config.milvus.embedding.concurrency = get_env_int(
+        "MILVUS_EMBEDDING_CONCURRENCY", config.milvus.embedding.concurrency
+    )
+    config.milvus.search.top_k = get_env_int(
+        "MILVUS_TOP_K", config.milvus.search.top_k
+    )
+    config.milvus.search.similarity_threshold = get_env_float(
+        "MILVUS_SIMILARITY_THRESHOLD", config.milvus.search.similarity_threshold
     )
 
 
@@ -430,6 +600,47 @@ def _apply_env_comfyui_overrides(
         config.comfyui.ollama_url = f"http://{ollama_host}:{ollama_port}"
 
 
+def _apply_env_performance_overrides(
+    config: DnDConfig, get_env_int: Any, get_env_float: Any
+) -> None:
+    """Apply concurrency, queue, and cache limits from environment variables.
+
+    Args:
+        config: DnDConfig to update in-place.
+        get_env_int: Callable to read an int env var with default.
+        get_env_float: Callable to read a float env var with default.
+    """
+    tts = config.performance.tts
+    tts.worker_pool_mb = get_env_int("PIPER_WORKER_POOL_MB", tts.worker_pool_mb)
+    tts.audio_cache_mb = get_env_int("TTS_AUDIO_CACHE_MB", tts.audio_cache_mb)
+    config.performance.consistency_concurrency = get_env_int(
+        "CONSISTENCY_CONCURRENCY", config.performance.consistency_concurrency
+    )
+    config.performance.arc_concurrency = get_env_int(
+        "ARC_CONCURRENCY", config.performance.arc_concurrency
+    )
+
+    cache = config.performance.response_cache
+    cache.memory_entries = get_env_int("AI_RESPONSE_CACHE_ENTRIES", cache.memory_entries)
+    cache.ttl_seconds = get_env_float("AI_RESPONSE_CACHE_TTL", cache.ttl_seconds)
+    cache.max_mb = get_env_float("AI_RESPONSE_CACHE_MB", cache.max_mb)
+
+    scheduler = config.performance.scheduler
+    scheduler.max_concurrent = get_env_int("AI_MAX_CONCURRENT", scheduler.max_concurrent)
+    scheduler.interactive_reserved = get_env_int(
+        "AI_INTERACTIVE_RESERVED", scheduler.interactive_reserved
+    )
+    scheduler.queue_max = get_env_int("AI_QUEUE_MAX", scheduler.queue_max)
+    scheduler.interactive_deadline = get_env_float(
+        "AI_INTERACTIVE_DEADLINE", scheduler.interactive_deadline
+    )
+    scheduler.batch_deadline = get_env_float("AI_BATCH_DEADLINE", scheduler.batch_deadline)
+
+    portrait = config.performance.portrait
+    portrait.cache_mb = get_env_int("PORTRAIT_CACHE_MB", portrait.cache_mb)
+    portrait.batch_window = get_env_float("COMFYUI_BATCH_WINDOW", portrait.batch_window)
+
+
 def _apply_env_overrides(config: DnDConfig, prefix: str = "") -> DnDConfig:
     """Apply environment variable overrides.
 
@@ -504,8 +715,12 @@ def _apply_env_overrides(config: DnDConfig, prefix: str = "") -> DnDConfig:
 
     config.rag.cache_ttl = get_env_int("RAG_CACHE_TTL", config.rag.cache_ttl)
     config.rag.max_cache_size = get_env_int("RAG_MAX_CACHE_SIZE", config.rag.max_cache_size)
-    config.rag.search_depth = get_env_int("RAG_SEARCH_DEPTH", config.rag.search_depth)
-    config.rag.min_relevance = get_env_float("RAG_MIN_RELEVANCE", config.rag.min_relevance)
+    config.rag.search.depth = get_env_int("RAG_SEARCH_DEPTH", config.rag.search.depth)
+    config.rag.search.min_relevance = get_env_float(
+        "RAG_MIN_RELEVANCE", config.rag.search.min_relevance
+    )
+    config.rag.fetch.workers = get_env_int("RAG_FETCH_WORKERS", config.rag.fetch.workers)
+    config.rag.fetch.interval = get_env_float("RAG_FETCH_INTERVAL", config.rag.fetch.interval)
 
     sourcebooks = get_env("RAG_SOURCEBOOKS")
     if sourcebooks:
@@ -518,11 +733,12 @@ def _apply_env_overrides(config: DnDConfig, prefix: str = "") -> DnDConfig:
         config.paths.cache_dir = Path(cache_dir)
 
     _apply_env_milvus_overrides(config, get_env, get_env_bool, get_env_int, get_env_float)
-    _apply_env_drupal_overrides(config, get_env)
+    _apply_env_drupal_overrides(config, get_env, get_env_int)
     _apply_env_sidecar_overrides(config, get_env, get_env_bool, get_env_float, get_env_int)
     _apply_env_comfyui_overrides(
         config, get_env, get_env_bool, get_env_float, get_env_int
     )
+    _apply_env_performance_overrides(config, get_env_int, get_env_float)
 
     return config
 
@@ -559,8 +775,10 @@ def save_config(config: DnDConfig, path: Optional[Path] = None) -> bool:
             "rules_base_url": config.rag.rules_base_url,
             "cache_ttl": config.rag.cache_ttl,
             "max_cache_size": config.rag.max_cache_size,
-            "search_depth": config.rag.search_depth,
-            "min_relevance": config.rag.min_relevance,
+            "search_depth": config.rag.search.depth,
+            "min_relevance": config.rag.search.min_relevance,
+            "fetch_workers": config.rag.fetch.workers,
+            "fetch_interval": config.rag.fetch.interval,
         },
         "ruleset": {
             "sourcebooks": config.ruleset.sourcebooks,
@@ -579,13 +797,16 @@ def save_config(config: DnDConfig, path: Optional[Path] = None) -> bool:
         },
         "milvus": {
             "enabled": config.milvus.enabled,
+            "backend": config.milvus.backend,
             "host": config.milvus.host,
             "port": config.milvus.port,
             "collection_prefix": config.milvus.collection_prefix,
             "embedding_model": config.milvus.embedding.model,
             "embedding_dim": config.milvus.embedding.dim,
-            "top_k": config.milvus.top_k,
-            "similarity_threshold": config.milvus.similarity_threshold,
+            "embedding_batch_size": config.milvus.embedding.batch_size,
+            "embedding_concurrency": config.milvus.embedding.concurrency,
+            "top_k": config.milvus.search.top_k,
+            "similarity_threshold": config.milvus.search.similarity_threshold,
         },
     }
 
@@ -593,6 +814,7 @@ def save_config(config: DnDConfig, path: Optional[Path] = None) -> bool:
         with open(save_path, "w", encoding="utf-8") as file:
             json.dump(config_dict, file, indent=2)
 
+        _invalidate(save_path)
         config.mark_clean()
         return True
 
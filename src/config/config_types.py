@@ -95,6 +95,22 @@ class AIConfig:
         return base_config
 
 
+@dataclass
+class RAGSearchConfig:
+    """How far wiki searches follow links and which results they keep."""
+
+    depth: int = 3
+    min_relevance: float = 0.5
+
+
+@dataclass
+class WikiFetchConfig:
+    """Concurrency of the shared rules-wiki page fetcher."""
+
+    workers: int = 8  # concurrent rules-wiki page fetches
+    interval: float = 0.1  # seconds between requests to one host
+
+
 @dataclass
 class RAGConfig:
     """RAG (Retrieval-Augmented Generation) configuration."""
@@ -104,8 +120,8 @@ class RAGConfig:
     rules_base_url: str = ""
     cache_ttl: int = 604800  # 7 days in seconds
     max_cache_size: int = 100
-    search_depth: int = 3
-    min_relevance: float = 0.5
+    search: RAGSearchConfig = field(default_factory=RAGSearchConfig)
+    fetch: WikiFetchConfig = field(default_factory=WikiFetchConfig)
 
     def is_configured(self) -> bool:
         """Check if RAG is properly configured."""
@@ -165,10 +181,24 @@ class DisplayConfig:
 
 @dataclass
 class MilvusEmbeddingConfig:
-    """Embedding model settings for Milvus semantic retrieval."""
+    """Embedding model settings for Milvus semantic retrieval.
+
+    ``batch_size`` is the number of chunks sent per embeddings request and
+    ``concurrency`` the number of batch requests allowed in flight at once.
+    """
 
     model: str = ""
     dim: int = 1536
+    batch_size: int = 32
+    concurrency: int = 4
+
+
+@dataclass
+class MilvusSearchConfig:
+    """How many semantic matches are returned and how close they must be."""
+
+    top_k: int = 5
+    similarity_threshold: float = 0.7
 
 
 @dataclass
@@ -178,15 +208,18 @@ class MilvusConfig:
     Host and port carry no defaults, for the same reason as SidecarConfig:
     MILVUS_HOST / MILVUS_PORT are authoritative, and guessing an address hides a
     misconfiguration behind a connection error to the wrong place.
+
+    ``backend`` selects the vector store: "milvus" (the server) or
+    "embedded" (NumPy files under ``paths.milvus_data_dir``, no service).
     """
 
     enabled: bool = False
     host: str = ""
     port: int = 0
     collection_prefix: str = "dnd"
+    backend: str = "milvus"
     embedding: MilvusEmbeddingConfig = field(default_factory=MilvusEmbeddingConfig)
-    top_k: int = 5
-    similarity_threshold: float = 0.7
+    search: MilvusSearchConfig = field(default_factory=MilvusSearchConfig)
 
 
 @dataclass
@@ -254,6 +287,19 @@ class SpotlightConfig:
     max_npcs_in_prompt: int = 3
 
 
+@dataclass
+class DrupalHttpConfig:
+    """How the shared HTTP session talks to Drupal.
+
+    ``pool_size`` is the number of keep-alive connections held open and
+    ``batch_size`` the most wiki-cache entries folded into one aliased
+    GraphQL document.
+    """
+
+    pool_size: int = 10
+    batch_size: int = 25
+
+
 @dataclass
 class DrupalConfig:
     """Drupal CMS integration configuration."""
@@ -269,6 +315,7 @@ class DrupalConfig:
     # mkcert root CA for local ddev; empty uses the default trust store. TLS is
     # always verified.
     ca_bundle: str = ""
+    http: DrupalHttpConfig = field(default_factory=DrupalHttpConfig)
 
 
 @dataclass
@@ -364,17 +411,95 @@ class ComfyUIConfig:
         return self.enabled and bool(self.get_base_url())
 
 
+@dataclass
+class TTSPerformanceConfig:
+    """Memory budgets for /tts/speak, in megabytes.
+
+    ``worker_pool_mb`` bounds the warm Piper voice workers; ``audio_cache_mb``
+    bounds the on-disk clip cache (0 disables caching).
+    """
+
+    worker_pool_mb: int = 512
+    audio_cache_mb: int = 256
+
+
+@dataclass
+class ResponseCacheConfig:
+    """Sizing of the opt-in AI response cache.
+
+    ``memory_entries`` bounds the in-memory LRU tier; ``ttl_seconds`` and
+    ``max_mb`` bound the SQLite tier.
+    """
+
+    memory_entries: int = 256
+    ttl_seconds: float = 604800.0  # 7 days
+    max_mb: float = 64.0
+
+
+@dataclass
+class SchedulerConfig:
+    """Per-server admission control for model requests.
+
+    ``max_concurrent`` requests run at once per server, ``interactive_reserved``
+    of those slots are kept from batch work, and ``queue_max`` requests may
+    wait before new ones are rejected. Deadlines are in seconds; 0 means none.
+    """
+
+    max_concurrent: int = 4
+    interactive_reserved: int = 1
+    queue_max: int = 64
+    interactive_deadline: float = 30.0
+    batch_deadline: float = 0.0
+
+
+@dataclass
+class PortraitPerformanceConfig:
+    """Portrait render queue limits.
+
+    ``cache_mb`` bounds the on-disk cache of rendered portraits;
+    ``batch_window`` is how many seconds an idle queue waits for more
+    portraits so a party requested together shares one checkpoint load.
+    """
+
+    cache_mb: int = 256
+    batch_window: float = 0.5
+
+
+@dataclass
+class PerformanceConfig:
+    """Concurrency, queue, and cache limits for in-process work.
+
+    Set from environment variables only. A value that does not parse keeps the
+    default rather than failing at import.
+    """
+
+    tts: TTSPerformanceConfig = field(default_factory=TTSPerformanceConfig)
+    consistency_concurrency: int = 4  # story files analysed at once
+    arc_concurrency: int = 4  # character arc model calls in flight
+    response_cache: ResponseCacheConfig = field(default_factory=ResponseCacheConfig)
+    scheduler: SchedulerConfig = field(default_factory=SchedulerConfig)
+    portrait: PortraitPerformanceConfig = field(default_factory=PortraitPerformanceConfig)
+
+
+@dataclass
+class ContentConfig:
+    """Grouped campaign content configuration (ruleset books, spotlighting)."""
+
+    ruleset: RulesetConfig = field(default_factory=RulesetConfig)
+    spotlight: SpotlightConfig = field(default_factory=SpotlightConfig)
+
+
 @dataclass
 class ServiceConfig:
-    """Grouped service configuration (model registry, vector database, spotlighting)."""
+    """Grouped service configuration (model registry, vector database, integrations)."""
 
     model_registry: ModelRegistryConfig = field(default_factory=ModelRegistryConfig)
     milvus: MilvusConfig = field(default_factory=MilvusConfig)
-    spotlight: SpotlightConfig = field(default_factory=SpotlightConfig)
+    content: ContentConfig = field(default_factory=ContentConfig)
     drupal: DrupalConfig = field(default_factory=DrupalConfig)
     sidecar: SidecarConfig = field(default_factory=SidecarConfig)
     comfyui: ComfyUIConfig = field(default_factory=ComfyUIConfig)
-    ruleset: RulesetConfig = field(default_factory=RulesetConfig)
+    performance: PerformanceConfig = field(default_factory=PerformanceConfig)
 
 
 @dataclass
@@ -418,22 +543,22 @@ class DnDConfig:
     @property
     def ruleset(self) -> RulesetConfig:
         """Return the ruleset content config."""
-        return self.services.ruleset
+        return self.services.content.ruleset
 
     @ruleset.setter
     def ruleset(self, value: RulesetConfig) -> None:
         """Replace the ruleset content config."""
-        self.services.ruleset = value
+        self.services.content.ruleset = value
 
     @property
     def spotlight(self) -> "SpotlightConfig":
         """Return the spotlight config."""
-        return self.services.spotlight
+        return self.services.content.spotlight
 
     @spotlight.setter
     def spotlight(self, value: "SpotlightConfig") -> None:
         """Replace the spotlight config."""
-        self.services.spotlight = value
+        self.services.content.spotlight = value
 
     @property
     def drupal(self) -> "DrupalConfig":
@@ -465,6 +590,16 @@ class DnDConfig:
         """Replace the ComfyUI portrait service config."""
         self.services.comfyui = value
 
+    @property
+    def performance(self) -> PerformanceConfig:
+        """Return the concurrency, queue, and cache limits."""
+        return self.services.performance
+
+    @performance.setter
+    def performance(self, value: PerformanceConfig) -> None:
+        """Replace the concurrency, queue, and cache limits."""
+        self.services.performance = value
+
     def is_dirty(self) -> bool:
         """Check if configuration has unsaved changes."""
         return self._dirty
@@ -1,554 +1,624 @@
-"""
-Dungeon Master Consultant - Provides narrative suggestions based on user prompts.
-Integrates with character and NPC agents for coherent storytelling.
-Enhanced with RAG (Retrieval-Augmented Generation) for campaign wiki integration.
-"""
-
-import re
-from typing import Any, Dict, List, Optional, TYPE_CHECKING
-from pathlib import Path
-from src.calendar.date_tracker import DateTracker
-from src.characters.consultants.consultant_core import CharacterConsultant
-from src.npcs.npc_agents import NPCAgent, create_npc_agents
-from src.stories.character_loader import load_all_character_consultants
-from src.ai.availability import RAG_AVAILABLE, get_rag_system
-from src.ai.prompt_templates import LANGUAGE_INSTRUCTION
-
-if TYPE_CHECKING:
-    from src.characters.character_sheet import NPCProfile
-
-
-
-class DMConsultant:
-    """AI consultant that provides DM narrative suggestions based on user prompts."""
-
-    def __init__(
-        self,
-        workspace_path: Optional[str] = None,
-        ai_client: Any = None,
-        lazy_load: bool = True,
-    ):
-        self.workspace_path = Path(workspace_path) if workspace_path else Path.cwd()
-        self.ai_client = ai_client
-
-        self._character_consultants = None
-        self._npc_agents = None
-        self.narrative_style = "immersive"  # immersive, cinematic, descriptive
-        self.active_campaign: str = ""
-
-        # Initialize RAG system for wiki integration
-        self.rag_system = get_rag_system() if RAG_AVAILABLE else None
-
-        # Load immediately if lazy_load is False
-        if not lazy_load:
-            self._ensure_characters_loaded()
-            self._ensure_npcs_loaded()
-
-    @property
-    def character_consultants(self) -> Dict[str, CharacterConsultant]:
-        """Lazy-load character consultants on first access."""
-        self._ensure_characters_loaded()
-        return self._character_consultants or {}
-
-    @property
-    def npc_agents(self) -> Dict[str, NPCAgent]:
-        """Lazy-load NPC agents on first access."""
-        self._ensure_npcs_loaded()
-        return self._npc_agents or {}
-
-    def _ensure_characters_loaded(self):
-        """Load character consultants if not already loaded."""
-        if self._character_consultants is None:
-            self._character_consultants = self._load_character_consultants()
-
-    def _ensure_npcs_loaded(self):
-        """Load NPC agents if not already loaded."""
-        if self._npc_agents is None:
-            self._npc_agents = self._load_npc_agents()
-
-    def _load_character_consultants(self) -> Dict[str, CharacterConsultant]:
-        """Load all character consultants from the game_data/characters folder."""
-        characters_dir = str(self.workspace_path / "game_data" / "characters")
-        return load_all_character_consultants(
-            characters_dir, ai_client=self.ai_client, verbose=False
-        )
-
-    def _load_npc_agents(self) -> Dict[str, NPCAgent]:
-        """Load all NPC agents from the game_data/npcs folder."""
-        agents = {}
-        npcs_dir = self.workspace_path / "game_data" / "npcs"
-        if npcs_dir.exists():
-            npc_agent_list = create_npc_agents(npcs_dir, ai_client=self.ai_client)
-            for agent in npc_agent_list:
-                agents[agent.profile.name] = agent
-        return agents
-
-    def suggest_narrative(
-        self,
-        user_prompt: str,
-        characters_present: Optional[List[str]] = None,
-        npcs_present: Optional[List[str]] = None,
-    ) -> Dict[str, Any]:
-        """Generate narrative suggestions based on user prompt and present characters/NPCs."""
-        characters_present = characters_present or []
-        npcs_present = npcs_present or []
-
-        # Get character insights for present characters
-        character_insights = {}
-        for char_name in characters_present:
-            if char_name in self.character_consultants:
-                consultant = self.character_consultants[char_name]
-                reaction = consultant.suggest_reaction(user_prompt, {})
-                suggested_approach = reaction.get(
-                    "suggested_approach", "Act according to character nature"
-                )
-                class_reaction = reaction.get("class_reaction", "")
-                personality = reaction.get("personality_modifier", "")
-                character_insights[char_name] = {
-                    "likely_reaction": suggested_approach,
-                    "reasoning": f"Class: {class_reaction}. Personality: {personality}",
-                    "class_expertise": class_reaction,
-                    "dialogue": reaction.get("dialogue_suggestion", ""),
-                }
-
-        # Get NPC insights for present NPCs
-        npc_insights = {}
-        for npc_name in npcs_present:
-            if npc_name in self.npc_agents:
-                agent = self.npc_agents[npc_name]
-                npc_insights[npc_name] = {
-                    "personality": agent.profile.personality,
-                    "role": agent.profile.role,
-                    "relationships": agent.profile.relationships,
-                    "likely_behavior": self._suggest_npc_behavior(
-                        agent.profile, user_prompt
-                    ),
-                }
-
-        # Generate narrative suggestions
-        narrative_suggestions = self._generate_narrative_suggestions(
-            user_prompt, character_insights, npc_insights
-        )
-
-        return {
-            "user_prompt": user_prompt,
-            "character_insights": character_insights,
-            "npc_insights": npc_insights,
-            "narrative_suggestions": narrative_suggestions,
-            "consistency_notes": self._check_consistency(
-                characters_present, npcs_present, user_prompt
-            ),
-        }
-
-    def _suggest_npc_behavior(self, npc_profile: "NPCProfile", _situation: str) -> str:
-        """Suggest how an NPC would behave in the given situation."""
-        personality = npc_profile.personality.lower()
-
-        if "friendly" in personality:
-            return "Would likely be helpful and accommodating"
-        if "hostile" in personality or "aggressive" in personality:
-            return "Would likely be confrontational or suspicious"
-        if "mysterious" in personality:
-            return "Would speak in riddles or reveal information cryptically"
-        if "merchant" in npc_profile.role.lower():
-            return "Would try to turn the situation into a business opportunity"
-        return "Would react cautiously but politely"
-
-    def _generate_narrative_suggestions(
-        self, prompt: str, char_insights: Dict, npc_insights: Dict
-    ) -> List[str]:
-        """Generate multiple narrative direction suggestions."""
-        suggestions = []
-
-        # Base narrative suggestion
-        suggestions.append(
-            f"Setting the scene: {self._create_scene_description(prompt)}"
-        )
-
-        # Character-driven suggestions
-        if char_insights:
-            char_names = list(char_insights.keys())
-            suggestions.append(
-                f"Character focus: Highlight {char_names[0]}'s expertise in this situation"
-            )
-
-        # NPC-driven suggestions
-        if npc_insights:
-            npc_names = list(npc_insights.keys())
-            suggestions.append(
-                f"NPC interaction: {npc_names[0]} could provide crucial "
-                "information or complications"
-            )
-
-        # Tension/conflict suggestions
-        suggestions.append("Add tension: Introduce a time constraint or moral dilemma")
-        suggestions.append(
-            "Character development: Create an opportunity for character growth"
-        )
-
-        return suggestions
-
-    def _create_scene_description(self, prompt: str) -> str:
-        """Create a brief scene description based on the prompt."""
-        if "tavern" in prompt.lower():
-            return "The warm glow of the hearth casts dancing shadows across weathered faces"
-        if "dungeon" in prompt.lower():
-            return "Ancient stone walls echo with the party's footsteps and distant dripping"
-        if "forest" in prompt.lower():
-            return (
-                "Dappled sunlight filters through the canopy as leaves rustle overhead"
-            )
-        if "town" in prompt.lower():
-            return (
-                "Bustling streets filled with merchants, guards, and curious onlookers"
-            )
-        return (
-            "The party finds themselves in a situation requiring careful consideration"
-        )
-
-    def _check_consistency(
-        self, characters: List[str], npcs: List[str], _situation: str
-    ) -> List[str]:
-        """Check for potential consistency issues with character/NPC behavior."""
-        notes = []
-
-        # Check character consistency
-        for char_name in characters:
-            if char_name in self.character_consultants:
-                consultant = self.character_consultants[char_name]
-                # Add consistency check based on established personality
-                if hasattr(consultant.profile, "personality_summary"):
-                    notes.append(
-                        f"{char_name}: Remember their {consultant.profile.personality_summary}"
-                    )
-
-        # Check NPC relationships
-        for npc_name in npcs:
-            if npc_name in self.npc_agents:
-                agent = self.npc_agents[npc_name]
-                for char_name in characters:
-                    if char_name in agent.profile.relationships:
-                        relationship = agent.profile.relationships[char_name]
-                        notes.append(f"{npc_name} and {char_name}: {relationship}")
-
-        return notes
-
-    def get_available_npcs(self) -> List[str]:
-        """Get list of available NPC names."""
-        return list(self.npc_agents.keys())
-
-    def get_available_characters(self) -> List[str]:
-        """Get list of available character names."""
-        return list(self.character_consultants.keys())
-
-    def suggest_npc_interaction(self, npc_name: str, situation: str) -> Dict[str, Any]:
-        """Get specific suggestions for how an NPC would react in a situation."""
-        if npc_name not in self.npc_agents:
-            return {"error": f"NPC '{npc_name}' not found"}
-
-        agent = self.npc_agents[npc_name]
-        suggested_behavior = self._suggest_npc_behavior(agent.profile, situation)
-
-        return {
-            "npc_name": npc_name,
-            "personality": agent.profile.personality,
-            "role": agent.profile.role,
-            "suggested_behavior": suggested_behavior,
-            "relationships": agent.profile.relationships,
-            "situation": situation,
-        }
-
-    def _build_character_context(self, characters_present: List[str]) -> List[str]:
-        """Build context strings about present characters."""
-        character_context = []
-        for char_name in characters_present:
-            if char_name in self.character_consultants:
-                consultant = self.character_consultants[char_name]
-                profile = consultant.profile
-                char_info = (
-                    f"- {profile.name} ({profile.character_class.value}): "
-                    f"{profile.personality_summary[:100]}"
-                )
-                character_context.append(char_info)
-        return character_context
-
-    def build_npc_context(self, npcs_present: List[str]) -> List[str]:
-        """Build context strings about present NPCs.
-
-        For major NPCs (BBEGs and key antagonists) includes encounter tactics
-        and defeat conditions in addition to the standard personality summary.
-        """
-        npc_context = []
-        for npc_name in npcs_present:
-            if npc_name not in self.npc_agents:
-                continue
-            agent = self.npc_agents[npc_name]
-            npc_info = (
-                f"- {agent.profile.name} ({agent.profile.role}): "
-                f"{agent.profile.personality}"
-            )
-            if agent.profile.is_major_profile():
-                status = agent.get_status()
-                tactics = status.get("encounter_tactics", [])
-                defeat = status.get("defeat_conditions", [])
-                if tactics:
-                    npc_info += f"\n  Tactics: {'; '.join(tactics[:2])}"
-                if defeat:
-                    npc_info += f"\n  Vulnerabilities: {defeat[0]}"
-            npc_context.append(npc_info)
-        return npc_context
-
-    def get_available_major_npcs(self) -> List[str]:
-        """Get names of all loaded major NPCs (profile_type='major')."""
-        return [
-            name
-            for name, agent in self.npc_agents.items()
-            if agent.profile.is_major_profile()
-        ]
-
-    def _build_rag_context(self, story_prompt: str) -> str:
-        """Gather RAG wiki and major NPC context for a story prompt.
-
-        Args:
-            story_prompt: The story situation to search context for.
-
-        Returns:
-            Combined RAG context string, or empty string if RAG is unavailable.
-        """
-        rag_context = ""
-        if self.rag_system and self.rag_system.enabled:
-            potential_locations = self._extract_locations_from_prompt(story_prompt)
-            if potential_locations:
-                print(f" RAG: Searching wiki for: {', '.join(potential_locations)}")
-                rag_context = self.rag_system.get_context_for_query(
-                    story_prompt, potential_locations, max_results=2
-                )
-        if self.rag_system:
-            major_statuses = [
-                agent.get_status()
-                for agent in self.npc_agents.values()
-                if agent.profile.is_major_profile()
-            ]
-            if major_statuses:
-                major_npc_context = self.rag_system.get_major_npc_context_for_prompt(
-                    story_prompt, major_statuses
-                )
-                if major_npc_context:
-                    rag_context = (rag_context + "\n\n" + major_npc_context).strip()
-        return rag_context
-
-    def _build_date_context(self) -> str:
-        """Return a formatted in-world date context string for the active campaign.
-
-        Returns:
-            Formatted context string, or empty string if unavailable or no campaign set.
-        """
-        if not self.active_campaign:
-            return ""
-        try:
-            tracker = DateTracker(
-                self.active_campaign, workspace_path=str(self.workspace_path)
-            )
-            return tracker.get_date_context_for_prompt()
-        except (FileNotFoundError, OSError, KeyError, ValueError):
-            return ""
-
-    def _build_narrative_system_prompt(self, style: str) -> str:
-        """Build the system prompt for AI narrative generation.
-
-        Args:
-            style: Narrative style name (immersive, cinematic, descriptive).
-
-        Returns:
-            System prompt string.
-        """
-        return (
-            f"You are an expert D&D Dungeon Master creating\n"
-            f"engaging narrative content.\n"
-            f"Style: {style} - Write in an {style} style that draws readers into the story.\n"
-            "Format: Use markdown with ## headers for scenes, write in past tense, keep\n"
-            "paragraphs to 2-3 sentences.\n"
-            "Line length: Keep lines to approximately 70-80 characters for readability.\n"
-            "\n"
-            "Create vivid, engaging narrative that:\n"
-            "- Shows character personalities through actions and dialogue\n"
-            "- Includes environmental descriptions\n"
-            "- Advances the plot naturally\n"
-            "- Maintains appropriate pacing\n"
-            "- Uses proper D&D terminology\n"
-            "- Respects established lore from the campaign setting (see lore context\n"
-            "  if provided)\n"
-            "\n"
-            f"{LANGUAGE_INSTRUCTION}"
-        )
-
-    def _build_narrative_user_prompt(
-        self,
-        story_prompt: str,
-        context: Dict[str, Any],
-    ) -> str:
-        """Build the user prompt for AI narrative generation.
-
-        Args:
-            story_prompt: The story situation to narrate.
-            context: Dict with keys character_context (List[str]), npc_context (List[str]),
-                rag_context (str), and date_context (str).
-
-        Returns:
-            User prompt string.
-        """
-        char_block = (
-            chr(10).join(context.get("character_context") or [])
-            or "No specific characters mentioned"
-        )
-        npc_block = (
-            chr(10).join(context.get("npc_context") or [])
-            or "No specific NPCs mentioned"
-        )
-        date_context = context.get("date_context", "")
-        rag_context = context.get("rag_context", "")
-        date_block = f"In-world date context:\n{date_context}\n" if date_context else ""
-        lore_note = (
-            "IMPORTANT: Use the lore context provided above to ensure accuracy "
-            "and enrich the narrative."
-            if rag_context else ""
-        )
-        return (
-            f"Create D&D narrative content for this story situation:\n\n"
-            f"{story_prompt}\n\n"
-            f"Characters present:\n{char_block}\n\n"
-            f"NPCs present:\n{npc_block}\n"
-            f"{date_block}{rag_context}\n"
-            "Generate a complete narrative scene with:\n"
-            "1. An opening that sets the scene\n"
-            "2. Character interactions and dialogue\n"
-            "3. Plot developments\n"
-            "4. A natural transition or hook for continuation\n\n"
-            f"Keep the narrative between 300-500 words.\n{lore_note}"
-        )
-
-    def generate_narrative_content(
-        self,
-        story_prompt: str,
-        characters_present: Optional[List[str]] = None,
-        npcs_present: Optional[List[str]] = None,
-        style: str = "immersive",
-    ) -> str:
-        """Generate narrative content using AI based on story prompt and characters/NPCs.
-
-        Set ``self.active_campaign`` before calling to include in-world date context.
-
-        Args:
-            story_prompt: The story situation/prompt to generate narrative for.
-            characters_present: List of character names present in the scene.
-            npcs_present: List of NPC names present in the scene.
-            style: Narrative style (immersive, cinematic, descriptive).
-
-        Returns:
-            Generated narrative content as markdown text.
-        """
-        characters_present = characters_present or []
-        npcs_present = npcs_present or []
-
-        if not self.ai_client:
-            return self._generate_fallback_narrative(
-                story_prompt, characters_present, npcs_present
-            )
-
-        character_context = self._build_character_context(characters_present)
-        npc_context = self.build_npc_context(npcs_present)
-        rag_context = self._build_rag_context(story_prompt)
-        date_context = self._build_date_context()
-
-        system_prompt = self._build_narrative_system_prompt(style)
-        user_prompt = self._build_narrative_user_prompt(story_prompt, {
-            "character_context": character_context,
-            "npc_context": npc_context,
-            "rag_context": rag_context,
-            "date_context": date_context,
-        })
-
-        try:
-            narrative = self.ai_client.chat_completion(
-                messages=[
-                    self.ai_client.create_system_message(system_prompt),
-                    self.ai_client.create_user_message(user_prompt),
-                ],
-                temperature=0.8,
-                max_tokens=2000,
-            )
-
-            return (
-                narrative
-                if narrative
-                else self._generate_fallback_narrative(
-                    story_prompt, characters_present, npcs_present
-                )
-            )
-
-        except (ConnectionError, TimeoutError, ValueError, KeyError) as e:
-            print(f"[WARNING] AI narrative generation failed: {e}")
-            return self._generate_fallback_narrative(
-                story_prompt, characters_present, npcs_present
-            )
-
-    def _generate_fallback_narrative(
-        self, story_prompt: str, characters: List[str], npcs: List[str]
-    ) -> str:
-        """Generate basic narrative when AI is unavailable."""
-        narrative = "## The Story Begins\n\n"
-        narrative += f"{story_prompt}\n\n"
-
-        if characters:
-            narrative += "## The Adventurers\n\n"
-            narrative += f"Present for this adventure: {', '.join(characters)}\n\n"
-
-        if npcs:
-            narrative += "## Key NPCs\n\n"
-            narrative += f"Important figures in this scene: {', '.join(npcs)}\n\n"
-
-        narrative += "## What Happens Next\n\n"
-        narrative += "*[Narrative content would be generated here with AI enabled]*\n"
-
-        return narrative
-
-    def _extract_locations_from_prompt(self, prompt: str) -> List[str]:
-        """
-        Extract potential location names from prompt for RAG lookup.
-        Uses simple heuristics: capitalized words/phrases that might be locations.
-        """
-        # Look for capitalized phrases (potential proper nouns/locations)
-        # Pattern: words starting with capital letter, possibly multi-word
-        pattern = r"\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\b"
-        matches = re.findall(pattern, prompt)
-
-        # Filter out common words that aren't locations
-        common_words = {
-            "The",
-            "A",
-            "An",
-            "They",
-            "He",
-            "She",
-            "It",
-            "We",
-            "You",
-            "What",
-            "Where",
-            "When",
-            "Why",
-            "How",
-            "Which",
-            "Who",
-        }
-        locations = [m for m in matches if m not in common_words and len(m) > 2]
-
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_locations = []
-        for loc in locations:
-            if loc not in seen:
-                seen.add(loc)
-                unique_locations.append(loc)
-
-        return unique_locations[:5]  # Limit to 5 most likely locations
+"""
+Dungeon Master Consultant - Provides narrative suggestions based on user prompts.
+Integrates with character and NPC agents for coherent storytelling.
+Enhanced with RAG (Retrieval-Augmented Generation) for campaign wiki integration.
+"""
+
+import re
+from typing import Any, Dict, Iterator, List, Optional, TYPE_CHECKING
+from pathlib import Path
+from src.calendar.date_tracker import DateTracker
+from src.characters.consultants.consultant_core import CharacterConsultant
+from src.npcs.npc_agents import NPCAgent
+from src.npcs.npc_catalog import get_npc_catalog
+from src.stories.character_loader import load_all_character_consultants
+from src.ai.ai_client import stream_completion
+from src.ai.availability import RAG_AVAILABLE, get_rag_system
+from src.ai.prompt_templates import LANGUAGE_INSTRUCTION
+
+if TYPE_CHECKING:
+    from src.characters.character_sheet import NPCProfile
+
+
+
+class DMConsultant:
+    """AI consultant that provides DM narrative suggestions based on user prompts."""
+
+    def __init__(
+        self,
+        workspace_path: Optional[str] = None,
+        ai_client: Any = None,
+        lazy_load: bool = True,
+    ):
+        self.workspace_path = Path(workspace_path) if workspace_path else Path.cwd()
+        self.ai_client = ai_client
+
+        self._character_consultants = None
+        self._npc_agents = None
+        self.narrative_style = "immersive"  # immersive, cinematic, descriptive
+        self.active_campaign: str = ""
+
+        # Initialize RAG system for wiki integration
+        self.rag_system = get_rag_system() if RAG_AVAILABLE else None
+
+        # Load immediately if lazy_load is False
+        if not lazy_load:
+            self._ensure_characters_loaded()
+            self._ensure_npcs_loaded()
+
+    @property
+    def character_consultants(self) -> Dict[str, CharacterConsultant]:
+        """Lazy-load character consultants on first access."""
+        self._ensure_characters_loaded()
+        return self._character_consultants or {}
+
+    @property
+    def npc_agents(self) -> Dict[str, NPCAgent]:
+        """Lazy-load NPC agents on first access."""
+        self._ensure_npcs_loaded()
+        return self._npc_agents or {}
+
+    def _ensure_characters_loaded(self):
+        """Load character consultants if not already loaded."""
+        if self._character_consultants is None:
+            self._character_consultants = self._load_character_consultants()
+
+    def _ensure_npcs_loaded(self):
+        """Load NPC agents if not already loaded."""
+        if self._npc_agents is None:
+            self._npc_agents = self._load_npc_agents()
+
+    def _load_character_consultants(self) -> Dict[str, CharacterConsultant]:
+        """Load all character consultants from the game_data/characters folder."""
+        characters_dir = str(self.workspace_path / "game_data" / "characters")
+        return load_all_character_consultants(
+            characters_dir, ai_client=self.ai_client, verbose=False
+        )
+
+    def _load_npc_agents(self) -> Dict[str, NPCAgent]:
+        """Load all NPC agents from the game_data/npcs folder."""
+        agents = {}
+        npcs_dir = self.workspace_path / "game_data" / "npcs"
+        if npcs_dir.exists():
+            for entry in get_npc_catalog(npcs_dir).entries():
+                agents[entry.name] = NPCAgent(entry.profile, ai_client=self.ai_client)
+        return agents
+
+    def suggest_narrative(
+        self,
+        user_prompt: str,
+        characters_present: Optional[List[str]] = None,
+        npcs_present: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """Generate narrative suggestions based on user prompt and present characters/NPCs."""
+        characters_present = characters_present or []
+        npcs_present = npcs_present or []
+
+        # Get character insights for present characters
+        character_insights = {}
+        for char_name in characters_present:
+            if char_name in self.character_consultants:
+                consultant = self.character_consultants[char_name]
+                reaction = consultant.suggest_reaction(user_prompt, {})
+                suggested_approach = reaction.get(
+                    "suggested_approach", "Act according to character nature"
+                )
+                class_reaction = reaction.get("class_reaction", "")
+                personality = reaction.get("personality_modifier", "")
+                character_insights[char_name] = {
+                    "likely_reaction": suggested_approach,
+                    "reasoning": f"Class: {class_reaction}. Personality: {personality}",
+                    "class_expertise": class_reaction,
+                    "dialogue": reaction.get("dialogue_suggestion", ""),
+                }
+
+        # Get NPC insights for present NPCs
+        npc_insights = {}
+        for npc_name in npcs_present:
+            if npc_name in self.npc_agents:
+                agent = self.npc_agents[npc_name]
+                npc_insights[npc_name] = {
+                    "personality": agent.profile.personality,
+                    "role": agent.profile.role,
+                    "relationships": agent.profile.relationships,
+                    "likely_behavior": self._suggest_npc_behavior(
+                        agent.profile, user_prompt
+                    ),
+                }
+
+        # Generate narrative suggestions
+        narrative_suggestions = self._generate_narrative_suggestions(
+            user_prompt, character_insights, npc_insights
+        )
+
+        return {
+            "user_prompt": user_prompt,
+            "character_insights": character_insights,
+            "npc_insights": npc_insights,
+            "narrative_suggestions": narrative_suggestions,
+            "consistency_notes": self._check_consistency(
+                characters_present, npcs_present, user_prompt
+            ),
+        }
+
+    def _suggest_npc_behavior(self, npc_profile: "NPCProfile", _situation: str) -> str:
+        """Suggest how an NPC would behave in the given situation."""
+        personality = npc_profile.personality.lower()
+
+        if "friendly" in personality:
+            return "Would likely be helpful and accommodating"
+        if "hostile" in personality or "aggressive" in personality:
+            return "Would likely be confrontational or suspicious"
+        if "mysterious" in personality:
+            return "Would speak in riddles or reveal information cryptically"
+        if "merchant" in npc_profile.role.lower():
+            return "Would try to turn the situation into a business opportunity"
+        return "Would react cautiously but politely"
+
+    def _generate_narrative_suggestions(
+        self, prompt: str, char_insights: Dict, npc_insights: Dict
+    ) -> List[str]:
+        """Generate multiple narrative direction suggestions."""
+        suggestions = []
+
+        # Base narrative suggestion
+        suggestions.append(
+            f"Setting the scene: {self._create_scene_description(prompt)}"
+        )
+
+        # Character-driven suggestions
+        if char_insights:
+            char_names = list(char_insights.keys())
+            suggestions.append(
+                f"Character focus: Highlight {char_names[0]}'s expertise in this situation"
+            )
+
+        # NPC-driven suggestions
+        if npc_insights:
+            npc_names = list(npc_insights.keys())
+            suggestions.append(
+                f"NPC interaction: {npc_names[0]} could provide crucial "
+                "information or complications"
+            )
+
+        # Tension/conflict suggestions
+        suggestions.append("Add tension: Introduce a time constraint or moral dilemma")
+        suggestions.append(
+            "Character development: Create an opportunity for character growth"
+        )
+
+        return suggestions
+
+    def _create_scene_description(self, prompt: str) -> str:
+        """Create a brief scene description based on the prompt."""
+        if "tavern" in prompt.lower():
+            return "The warm glow of the hearth casts dancing shadows across weathered faces"
+        if "dungeon" in prompt.lower():
+            return "Ancient stone walls echo with the party's footsteps and distant dripping"
+        if "forest" in prompt.lower():
+            return (
+                "Dappled sunlight filters through the canopy as leaves rustle overhead"
+            )
+        if "town" in prompt.lower():
+            return (
+                "Bustling streets filled with merchants, guards, and curious onlookers"
+            )
+        return (
+            "The party finds themselves in a situation requiring careful consideration"
+        )
+
+    def _check_consistency(
+        self, characters: List[str], npcs: List[str], _situation: str
+    ) -> List[str]:
+        """Check for potential consistency issues with character/NPC behavior."""
+        notes = []
+
+        # Check character consistency
+        for char_name in characters:
+            if char_name in self.character_consultants:
+                consultant = self.character_consultants[char_name]
+                # Add consistency check based on established personality
+                if hasattr(consultant.profile, "personality_summary"):
+                    notes.append(
+                        f"{char_name}: Remember their {consultant.profile.personality_summary}"
+                    )
+
+        # Check NPC relationships
+        for npc_name in npcs:
+            if npc_name in self.npc_agents:
+                agent = self.npc_agents[npc_name]
+                for char_name in characters:
+                    if char_name in agent.profile.relationships:
+                        relationship = agent.profile.relationships[char_name]
+                        notes.append(f"{npc_name} and {char_name}: {relationship}")
+
+        return notes
+
+    def get_available_npcs(self) -> List[str]:
+        """Get list of available NPC names."""
+        return list(self.npc_agents.keys())
+
+    def get_available_characters(self) -> List[str]:
+        """Get list of available character names."""
+        return list(self.character_consultants.keys())
+
+    def suggest_npc_interaction(self, npc_name: str, situation: str) -> Dict[str, Any]:
+        """Get specific suggestions for how an NPC would react in a situation."""
+        if npc_name not in self.npc_agents:
+            return {"error": f"NPC '{npc_name}' not found"}
+
+        agent = self.npc_agents[npc_name]
+        suggested_behavior = self._suggest_npc_behavior(agent.profile, situation)
+
+        return {
+            "npc_name": npc_name,
+            "personality": agent.profile.personality,
+            "role": agent.profile.role,
+            "suggested_behavior": suggested_behavior,
+            "relationships": agent.profile.relationships,
+            "situation": situation,
+        }
+
+    def _build_character_context(self, characters_present: List[str]) -> List[str]:
+        """Build context strings about present characters."""
+        character_context = []
+        for char_name in characters_present:
+            if char_name in self.character_consultants:
+                consultant = self.character_consultants[char_name]
+                profile = consultant.profile
+                char_info = (
+                    f"- {profile.name} ({profile.character_class.value}): "
+                    f"{profile.personality_summary[:100]}"
+                )
+                character_context.append(char_info)
+        return character_context
+
+    def build_npc_context(self, npcs_present: List[str]) -> List[str]:
+        """Build context strings about present NPCs.
+
+        For major NPCs (BBEGs and key antagonists) includes encounter tactics
+        and defeat conditions in addition to the standard personality summary.
+        """
+        npc_context = []
+        for npc_name in npcs_present:
+            if npc_name not in self.npc_agents:
+                continue
+            agent = self.npc_agents[npc_name]
+            npc_info = (
+                f"- {agent.profile.name} ({agent.profile.role}): "
+                f"{agent.profile.personality}"
+            )
+            if agent.profile.is_major_profile():
+                status = agent.get_status()
+                tactics = status.get("encounter_tactics", [])
+                defeat = status.get("defeat_conditions", [])
+                if tactics:
+                    npc_info += f"\n  Tactics: {'; '.join(tactics[:2])}"
+                if defeat:
+                    npc_info += f"\n  Vulnerabilities: {defeat[0]}"
+            npc_context.append(npc_info)
+        return npc_context
+
+    def get_available_major_npcs(self) -> List[str]:
+        """Get names of all loaded major NPCs (profile_type='major')."""
+        return [
+            name
+            for name, agent in self.npc_agents.items()
+            if agent.profile.is_major_profile()
+        ]
+
+    def _build_rag_context(self, story_prompt: str) -> str:
+        """Gather RAG wiki and major NPC context for a story prompt.
+
+        Args:
+            story_prompt: The story situation to search context for.
+
+        Returns:
+            Combined RAG context string, or empty string if RAG is unavailable.
+        """
+        rag_context = ""
+        if self.rag_system and self.rag_system.enabled:
+            potential_locations = self._extract_locations_from_prompt(story_prompt)
+            if potential_locations:
+                print(f" RAG: Searching wiki for: {', '.join(potential_locations)}")
+                rag_context = self.rag_system.get_context_for_query(
+                    story_prompt, potential_locations, max_results=2
+                )
+        npcs_dir = self.workspace_path / "game_data" / "npcs"
+        if self.rag_system and npcs_dir.exists():
+            major_statuses = [
+                dict(entry.status)
+                for entry in get_npc_catalog(npcs_dir).find(profile_type="major")
+                if entry.profile.is_major_profile()
+            ]
+            if major_statuses:
+                major_npc_context = self.rag_system.get_major_npc_context_for_prompt(
+                    story_prompt, major_statuses
+                )
+                if major_npc_context:
+                    rag_context = (rag_context + "\n\n" + major_npc_context).strip()
+        return rag_context
+
+    def _build_date_context(self) -> str:
+        """Return a formatted in-world date context string for the active campaign.
+
+        Returns:
+            Formatted context string, or empty string if unavailable or no campaign set.
+        """
+        if not self.active_campaign:
+            return ""
+        try:
+            tracker = DateTracker(
+                self.active_campaign, workspace_path=str(self.workspace_path)
+            )
+            return tracker.get_date_context_for_prompt()
+        except (FileNotFoundError, OSError, KeyError, ValueError):
+            return ""
+
+    def _build_narrative_system_prompt(self, style: str) -> str:
+        """Build the system prompt for AI narrative generation.
+
+        Args:
+            style: Narrative style name (immersive, cinematic, descriptive).
+
+        Returns:
+            System prompt string.
+        """
+        return (
+            f"You are an expert D&D Dungeon Master creating\n"
+            f"engaging narrative content.\n"
+            f"Style: {style} - Write in an {style} style that draws readers into the story.\n"
+            "Format: Use markdown with ## headers for scenes, write in past tense, keep\n"
+            "paragraphs to 2-3 sentences.\n"
+            "Line length: Keep lines to approximately 70-80 characters for readability.\n"
+            "\n"
+            "Create vivid, engaging narrative that:\n"
+            "- Shows character personalities through actions and dialogue\n"
+            "- Includes environmental descriptions\n"
+            "- Advances the plot naturally\n"
+            "- Maintains appropriate pacing\n"
+            "- Uses proper D&D terminology\n"
+            "- Respects established lore from the campaign setting (see lore context\n"
+            "  if provided)\n"
+            "\n"
+            f"{LANGUAGE_INSTRUCTION}"
+        )
+
+    def _build_narrative_user_prompt(
+        self,
+        story_prompt: str,
+        context: Dict[str, Any],
+    ) -> str:
+        """Build the user prompt for AI narrative generation.
+
+        Args:
+            story_prompt: The story situation to narrate.
+            context: Dict with keys character_context (List[str]), npc_context (List[str]),
+                rag_context (str), and date_context (str).
+
+        Returns:
+            User prompt string.
+        """
+        char_block = (
+            chr(10).join(context.get("character_context") or [])
+            or "No specific characters mentioned"
+        )
+        npc_block = (
+            chr(10).join(context.get("npc_context") or [])
+            or "No specific NPCs mentioned"
+        )
+        date_context = context.get("date_context", "")
+        rag_context = context.get("rag_context", "")
+        date_block = f"In-world date context:\n{date_context}\n" if date_context else ""
+        lore_note = (
+            "IMPORTANT: Use the lore context provided above to ensure accuracy "
+            "and enrich the narrative."
+            if rag_context else ""
+        )
+        return (
+            f"Create D&D narrative content for this story situation:\n\n"
+            f"{story_prompt}\n\n"
+            f"Characters present:\n{char_block}\n\n"
+            f"NPCs present:\n{npc_block}\n"
+            f"{date_block}{rag_context}\n"
+            "Generate a complete narrative scene with:\n"
+            "1. An opening that sets the scene\n"
+            "2. Character interactions and dialogue\n"
+            "3. Plot developments\n"
+            "4. A natural transition or hook for continuation\n\n"
+            f"Keep the narrative between 300-500 words.\n{lore_note}"
+        )
+
+    def generate_narrative_content(
+        self,
+        story_prompt: str,
+        characters_present: Optional[List[str]] = None,
+        npcs_present: Optional[List[str]] = None,
+        style: str = "immersive",
+    ) -> str:
+        """Generate narrative content using AI based on story prompt and characters/NPCs.
+
+        Set ``self.active_campaign`` before calling to include in-world date context.
+
+        Args:
+            story_prompt: The story situation/prompt to generate narrative for.
+            characters_present: List of character names present in the scene.
+            npcs_present: List of NPC names present in the scene.
+            style: Narrative style (immersive, cinematic, descriptive).
+
+        Returns:
+            Generated narrative content as markdown text.
+        """
+        characters_present = characters_present or []
+        npcs_present = npcs_present or []
+
+        if not self.ai_client:
+            return self._generate_fallback_narrative(
+                story_prompt, characters_present, npcs_present
+            )
+
+        try:
+            narrative = self.ai_client.chat_completion(
+                messages=self._build_narrative_messages(
+                    story_prompt, characters_present, npcs_present, style
+                ),
+                temperature=0.8,
+                max_tokens=2000,
+            )
+
+            return (
+                narrative
+                if narrative
+                else self._generate_fallback_narrative(
+                    story_prompt, characters_present, npcs_present
+                )
+            )
+
+        except (ConnectionError, TimeoutError, ValueError, KeyError) as e:
+            print(f"[WARNING] AI narrative generation failed: {e}")
+            return self._generate_fallback_narrative(
+                story_prompt, characters_present, npcs_present
+            )
+
+    def stream_narrative_content(
+        self,
+        story_prompt: str,
+        characters_present: Optional[List[str]] = None,
+        npcs_present: Optional[List[str]] = None,
+        style: str = "immersive",
+    ) -> Iterator[str]:
+        """Stream narrative content as the model generates it.
+
+        Streaming counterpart of generate_narrative_content(): same prompts,
+        but text deltas are yielded as they arrive so callers can show or
+        save output from the first token. The fallback narrative is yielded
+        in one piece when AI is unavailable or fails before producing text;
+        a failure mid-stream ends the stream after the text produced so far.
+
+        Args:
+            story_prompt: The story situation/prompt to generate narrative for.
+            characters_present: List of character names present in the scene.
+            npcs_present: List of NPC names present in the scene.
+            style: Narrative style (immersive, cinematic, descriptive).
+
+        Yields:
+            Narrative markdown text deltas.
+        """
+        characters_present = characters_present or []
+        npcs_present = npcs_present or []
+
+        if not self.ai_client:
+            yield self._generate_fallback_narrative(
+                story_prompt, characters_present, npcs_present
+            )
+            return
+
+        produced = False
+        try:
+            messages = self._build_narrative_messages(
+                story_prompt, characters_present, npcs_present, style
+            )
+            for delta in stream_completion(
+                self.ai_client, messages, temperature=0.8, max_tokens=2000
+            ):
+                produced = True
+                yield delta
+        except (RuntimeError, ConnectionError, TimeoutError, ValueError, KeyError) as e:
+            print(f"[WARNING] AI narrative streaming failed: {e}")
+
+        if not produced:
+            yield self._generate_fallback_narrative(
+                story_prompt, characters_present, npcs_present
+            )
+
+    def _build_narrative_messages(
+        self,
+        story_prompt: str,
+        characters_present: List[str],
+        npcs_present: List[str],
+        style: str,
+    ) -> List[Dict[str, str]]:
+        """Build the system and user messages for narrative generation.
+
+        Args:
+            story_prompt: The story situation/prompt to generate narrative for.
+            characters_present: Character names present in the scene.
+            npcs_present: NPC names present in the scene.
+            style: Narrative style name.
+
+        Returns:
+            Chat messages for the AI client.
+        """
+        user_prompt = self._build_narrative_user_prompt(story_prompt, {
+            "character_context": self._build_character_context(characters_present),
+            "npc_context": self.build_npc_context(npcs_present),
+            "rag_context": self._build_rag_context(story_prompt),
+            "date_context": self._build_date_context(),
+        })
+        return [
+            self.ai_client.create_system_message(
+                self._build_narrative_system_prompt(style)
+            ),
+            self.ai_client.create_user_message(user_prompt),
+        ]
+
+    def _generate_fallback_narrative(
+        self, story_prompt: str, characters: List[str], npcs: List[str]
+    ) -> str:
+        """Generate basic narrative when AI is unavailable."""
+        narrative = "## The Story Begins\n\n"
+        narrative += f"{story_prompt}\n\n"
+
+        if characters:
+            narrative += "## The Adventurers\n\n"
+            narrative += f"Present for this adventure: {', '.join(characters)}\n\n"
+
+        if npcs:
+            narrative += "## Key NPCs\n\n"
+            narrative += f"Important figures in this scene: {', '.join(npcs)}\n\n"
+
+        narrative += "## What Happens Next\n\n"
+        narrative += "*[Narrative content would be generated here with AI enabled]*\n"
+
+        return narrative
+
+    def _extract_locations_from_prompt(self, prompt: str) -> List[str]:
+        """
+        Extract potential location names from prompt for RAG lookup.
+        Uses simple heuristics: capitalized words/phrases that might be locations.
+        """
+        # Look for capitalized phrases (potential proper nouns/locations)
+        # Pattern: words starting with capital letter, possibly multi-word
+        pattern = r"\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\b"
+        matches = re.findall(pattern, prompt)
+
+        # Filter out common words that aren't locations
+        common_words = {
+            "The",
+            "A",
+            "An",
+            "They",
+            "He",
+            "She",
+            "It",
+            "We",
+            "You",
+            "What",
+            "Where",
+            "When",
+            "Why",
+            "How",
+            "Which",
+            "Who",
+        }
+        locations = [m for m in matches if m not in common_words and len(m) > 2]
+
+        # Remove duplicates while preserving order
+        seen = set()
+        unique_locations = []
+        for loc in locations:
+            if loc not in seen:
+                seen.add(loc)
+                unique_locations.append(loc)
+
+        return unique_locations[:5]  # Limit to 5 most likely locations
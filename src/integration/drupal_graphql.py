@@ -9,6 +9,10 @@ Every entry point takes an optional ``config``. Callers holding their own
 :class:`DrupalConfig` pass it through so the connection they were built with is
 the one actually used; omitting it falls back to the loaded configuration.
 
+All requests share one keep-alive :class:`requests.Session` per pool size
+(``DrupalConfig.http.pool_size``), so repeated calls reuse the TCP/TLS connection
+instead of opening a new one each time.
+
 The project standardises on GraphQL for all Drupal access; JSON:API is disabled
 server-side (``jsonapi_extras`` sets ``default_disabled: true``).
 """
@@ -16,9 +20,11 @@ server-side (``jsonapi_extras`` sets ``default_disabled: true``).
 from __future__ import annotations
 
 import logging
+from functools import lru_cache
 from typing import Any, Dict, Optional, Union
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from src.config.config_loader import load_config
 from src.config.config_types import DrupalConfig
@@ -61,6 +67,58 @@ def graphql_endpoint(config: Optional[DrupalConfig] = None) -> Optional[str]:
     return f"{base_url}/graphql" if base_url else None
 
 
+@lru_cache(maxsize=4)
+def _session(pool_size: int) -> requests.Session:
+    """Return the shared keep-alive session for a connection pool size.
+
+    Args:
+        pool_size: Connections kept open per host.
+
+    Returns:
+        A session whose HTTP(S) adapters pool up to ``pool_size`` connections.
+    """
+    size = max(1, pool_size)
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=size, pool_maxsize=size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _post(
+    drupal: DrupalConfig,
+    endpoint: str,
+    document: str,
+    variables: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """POST a GraphQL document over the shared session and decode the payload.
+
+    Args:
+        drupal: The Drupal configuration (token, CA bundle, pool size).
+        endpoint: The GraphQL endpoint URL.
+        document: The query or mutation string.
+        variables: Optional variables.
+
+    Returns:
+        The decoded JSON payload.
+
+    Raises:
+        OSError: On transport failure or a non-2xx status.
+        ValueError: When the body is not JSON.
+    """
+    verify: Union[bool, str] = drupal.ca_bundle if drupal.ca_bundle else True
+    response = _session(drupal.http.pool_size).post(
+        endpoint,
+        json={"query": document, "variables": variables or {}},
+        headers=_build_headers(drupal),
+        timeout=_TIMEOUT,
+        verify=verify,
+    )
+    response.raise_for_status()
+    payload = response.json()
+    return payload if isinstance(payload, dict) else {}
+
+
 def _build_headers(drupal: DrupalConfig) -> Dict[str, str]:
     """Return the request headers for a GraphQL call.
 
@@ -98,18 +156,8 @@ def query_drupal(
     endpoint = graphql_endpoint(drupal)
     if endpoint is None:
         return {}
-    verify: Union[bool, str] = drupal.ca_bundle if drupal.ca_bundle else True
-    headers = _build_headers(drupal)
     try:
-        response = requests.post(
-            endpoint,
-            json={"query": query, "variables": variables or {}},
-            headers=headers,
-            timeout=_TIMEOUT,
-            verify=verify,
-        )
-        response.raise_for_status()
-        payload = response.json()
+        payload = _post(drupal, endpoint, query, variables)
     except (OSError, ValueError) as exc:
         logger.debug("Drupal GraphQL query failed: %s", exc)
         return {}
@@ -163,18 +211,8 @@ def mutate_drupal(
     endpoint = graphql_endpoint(drupal)
     if endpoint is None:
         raise DrupalGraphQLError("DRUPAL_BASE_URL is not configured")
-    verify: Union[bool, str] = drupal.ca_bundle if drupal.ca_bundle else True
-    headers = _build_headers(drupal)
     try:
-        response = requests.post(
-            endpoint,
-            json={"query": mutation, "variables": variables or {}},
-            headers=headers,
-            timeout=_TIMEOUT,
-            verify=verify,
-        )
-        response.raise_for_status()
-        payload = response.json()
+        payload = _post(drupal, endpoint, mutation, variables)
     except (OSError, ValueError) as exc:
         raise DrupalGraphQLError(f"Drupal GraphQL mutation failed: {exc}") from exc
 
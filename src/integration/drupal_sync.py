@@ -13,10 +13,14 @@ The ``wikiCacheEntry`` / ``wikiCacheCount`` queries and the
 ``setWikiCacheEntry`` / ``deleteWikiCacheEntry`` mutations are provided by the
 ``dnd_content`` Drupal module. They are hand-written resolvers rather than
 graphql_compose exposure, so Gatsby never sources these nodes.
+
+Bulk reads and writes fold many entries into one document by aliasing the
+same field (``e0: wikiCacheEntry(...) e1: wikiCacheEntry(...)``), so the
+existing resolvers serve them without a dedicated bulk API.
 """
 
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from src.config.config_types import DrupalConfig
 from src.integration.drupal_graphql import (
@@ -64,6 +68,52 @@ mutation DeleteWikiCacheEntry($urlHash: String!) {
 """
 
 
+# One pending write: (url_hash, url, fetched_at, content_json).
+WikiCacheWrite = Tuple[str, str, float, str]
+
+
+def _batched(items: Sequence[Any], size: int) -> Iterable[Sequence[Any]]:
+    """Yield consecutive slices of at most ``size`` items."""
+    step = max(1, size)
+    for start in range(0, len(items), step):
+        yield items[start:start + step]
+
+
+def _batch_get_query(count: int) -> str:
+    """Build an aliased query reading ``count`` entries (``$h0``..``$hN``)."""
+    params = ", ".join(f"$h{i}: String!" for i in range(count))
+    fields = "\n".join(
+        f"  e{i}: wikiCacheEntry(urlHash: $h{i}) {{ {_ENTRY_FIELDS} }}"
+        for i in range(count)
+    )
+    return f"query WikiCacheEntries({params}) {{\n{fields}\n}}\n"
+
+
+def _batch_set_mutation(count: int) -> str:
+    """Build an aliased mutation upserting ``count`` entries."""
+    params = ", ".join(
+        f"$h{i}: String!, $u{i}: String!, $f{i}: Float!, $c{i}: String!"
+        for i in range(count)
+    )
+    fields = "\n".join(
+        f"  e{i}: setWikiCacheEntry(urlHash: $h{i}, url: $u{i}, "
+        f"fetchedAt: $f{i}, content: $c{i}) {{ url }}"
+        for i in range(count)
+    )
+    return f"mutation SetWikiCacheEntries({params}) {{\n{fields}\n}}\n"
+
+
+def _map_entry(entry: Any) -> Optional[Dict[str, Any]]:
+    """Map a GraphQL entry onto the field_* keys, or None for a miss."""
+    if not isinstance(entry, dict):
+        return None
+    return {
+        "field_wiki_url": entry.get("url", ""),
+        "field_wiki_fetched_at": entry.get("fetchedAt", 0),
+        "field_wiki_content": entry.get("content", ""),
+    }
+
+
 class DrupalSyncError(Exception):
     """Raised when a Drupal wiki cache call fails."""
 
@@ -99,14 +149,31 @@ class DrupalSync:
             ``field_wiki_content`` keys, or None when nothing is cached.
         """
         data = query_drupal(_GET_QUERY, {"urlHash": url_hash}, self._config)
-        entry = data.get("wikiCacheEntry")
-        if not isinstance(entry, dict):
-            return None
-        return {
-            "field_wiki_url": entry.get("url", ""),
-            "field_wiki_fetched_at": entry.get("fetchedAt", 0),
-            "field_wiki_content": entry.get("content", ""),
-        }
+        return _map_entry(data.get("wikiCacheEntry"))
+
+    def get_wiki_page_cache_many(
+        self, url_hashes: Iterable[str]
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Fetch many cached wiki pages in as few round trips as possible.
+
+        Hashes are read ``config.http.batch_size`` at a time through one aliased
+        query each. As with :meth:`get_wiki_page_cache`, a miss and an
+        unreachable Drupal both map to None.
+
+        Args:
+            url_hashes: MD5 hashes of the original URLs.
+
+        Returns:
+            Each distinct hash mapped to its entry (``field_*`` keys) or None.
+        """
+        unique: List[str] = list(dict.fromkeys(url_hashes))
+        result: Dict[str, Optional[Dict[str, Any]]] = {}
+        for batch in _batched(unique, self._config.http.batch_size):
+            variables = {f"h{i}": url_hash for i, url_hash in enumerate(batch)}
+            data = query_drupal(_batch_get_query(len(batch)), variables, self._config)
+            for i, url_hash in enumerate(batch):
+                result[url_hash] = _map_entry(data.get(f"e{i}"))
+        return result
 
     def set_wiki_page_cache(
         self,
@@ -145,6 +212,41 @@ class DrupalSync:
             raise DrupalSyncError(f"setWikiCacheEntry returned no entry: {data}")
         return str(entry.get("url", ""))
 
+    def set_wiki_page_cache_many(self, entries: Sequence[WikiCacheWrite]) -> None:
+        """Create or replace many wiki page cache entries.
+
+        Entries are written ``config.http.batch_size`` at a time through one
+        aliased mutation each.
+
+        Args:
+            entries: ``(url_hash, url, fetched_at, content_json)`` tuples.
+
+        Raises:
+            DrupalSyncError: On transport failure, a GraphQL error, or when an
+                entry in a batch was not stored. Earlier batches stay written.
+        """
+        for batch in _batched(list(entries), self._config.http.batch_size):
+            variables: Dict[str, Any] = {}
+            for i, (url_hash, url, fetched_at, content_json) in enumerate(batch):
+                variables[f"h{i}"] = url_hash
+                variables[f"u{i}"] = url
+                variables[f"f{i}"] = float(fetched_at)
+                variables[f"c{i}"] = content_json
+            try:
+                data = mutate_drupal(
+                    _batch_set_mutation(len(batch)), variables, self._config
+                )
+            except DrupalGraphQLError as exc:
+                raise DrupalSyncError(f"Wiki cache bulk write failed: {exc}") from exc
+            missing = [
+                entry[0] for i, entry in enumerate(batch)
+                if not isinstance(data.get(f"e{i}"), dict)
+            ]
+            if missing:
+                raise DrupalSyncError(
+                    f"setWikiCacheEntry returned no entry for: {', '.join(missing)}"
+                )
+
     def delete_wiki_page_cache(self, url_hash: str) -> None:
         """Delete a wiki page cache entry by its URL hash.
 
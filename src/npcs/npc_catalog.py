@@ -0,0 +1,219 @@
+"""
+Resident NPC catalog with inverted indexes for prompt-time lookup.
+
+Loads every NPC profile in an NPC directory once per process, reloads only
+files whose mtime or size changed, and keeps token indexes on location
+(notes), role, name and profile type so lookups intersect posting sets
+instead of scanning every profile.
+"""
+
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from src.characters.character_sheet import NPCProfile
+from src.npcs.npc_agents import NPCAgent, load_npc_from_json
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Indexed fields, in the order find() intersects them.
+INDEXED_FIELDS = ("location", "role", "name", "profile_type")
+
+
+def tokenize(text: str) -> Tuple[str, ...]:
+    """Split text into lowercase word tokens."""
+    return tuple(_TOKEN_RE.findall(text.lower()))
+
+
+def _contains_phrase(tokens: Tuple[str, ...], phrase: Tuple[str, ...]) -> bool:
+    """Check whether phrase occurs as a contiguous run of tokens."""
+    width = len(phrase)
+    return any(tokens[i:i + width] == phrase for i in range(len(tokens) - width + 1))
+
+
+@dataclass
+class CatalogEntry:
+    """One loaded NPC profile with its cached status and index tokens.
+
+    Attributes:
+        path: Source JSON file
+        profile: Parsed NPC profile (shared; treat as read-only)
+        status: NPCAgent.get_status() snapshot of the profile
+        tokens: Token tuple per indexed field
+    """
+
+    path: Path
+    profile: NPCProfile
+    status: Dict[str, Any]
+    tokens: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+
+    @property
+    def name(self) -> str:
+        """NPC name."""
+        return self.profile.name
+
+    @classmethod
+    def load(cls, path: Path) -> "CatalogEntry":
+        """Parse an NPC file and tokenise its indexed fields."""
+        profile = load_npc_from_json(path)
+        status = NPCAgent(profile).get_status()
+        tokens = {
+            "location": tokenize(str(status.get("notes") or "")),
+            "role": tokenize(str(status.get("role") or "")),
+            "name": tokenize(f"{profile.name} {profile.nickname or ''}"),
+            "profile_type": tokenize(str(status.get("profile_type") or "")),
+        }
+        return cls(path=path, profile=profile, status=status, tokens=tokens)
+
+
+class NPCCatalog:
+    """Process-wide, mtime-invalidated index of the NPC profiles in one directory.
+
+    Every query first re-stats the directory; unchanged files are served from
+    memory and the indexes are rebuilt only when a file was added, removed
+    or modified. Example files (".example" in the name) are skipped.
+    """
+
+    def __init__(self, npcs_dir: Path):
+        self.npcs_dir = Path(npcs_dir)
+        self._lock = threading.RLock()
+        self._stamps: Dict[Path, Tuple[int, int]] = {}
+        self._files: Dict[Path, CatalogEntry] = {}
+        self._entries: List[CatalogEntry] = []
+        self._by_name: Dict[str, CatalogEntry] = {}
+        self._postings: Dict[str, Dict[str, Set[int]]] = {}
+
+    def refresh(self) -> bool:
+        """Reload changed NPC files.
+
+        Returns:
+            True when the catalog contents changed
+        """
+        with self._lock:
+            current: Dict[Path, Tuple[int, int]] = {}
+            if self.npcs_dir.is_dir():
+                for path in sorted(self.npcs_dir.glob("*.json")):
+                    if ".example" in path.name:
+                        continue
+                    try:
+                        stat = path.stat()
+                    except OSError:
+                        continue
+                    current[path] = (stat.st_mtime_ns, stat.st_size)
+            if current == self._stamps:
+                return False
+
+            files = {}
+            for path, stamp in current.items():
+                cached = self._files.get(path)
+                if cached is not None and self._stamps.get(path) == stamp:
+                    files[path] = cached
+                else:
+                    files[path] = CatalogEntry.load(path)
+            self._stamps = current
+            self._files = files
+            self._rebuild_indexes()
+            return True
+
+    def _rebuild_indexes(self) -> None:
+        """Rebuild the ordered entry list, name map and token postings."""
+        self._entries = list(self._files.values())
+        self._by_name = {}
+        self._postings = {name: {} for name in INDEXED_FIELDS}
+        for position, entry in enumerate(self._entries):
+            self._by_name.setdefault(entry.name, entry)
+            for field_name in INDEXED_FIELDS:
+                postings = self._postings[field_name]
+                for token in entry.tokens.get(field_name, ()):
+                    postings.setdefault(token, set()).add(position)
+
+    def entries(self) -> List[CatalogEntry]:
+        """Return every loaded NPC, ordered by file name."""
+        with self._lock:
+            self.refresh()
+            return list(self._entries)
+
+    def get(self, name: str) -> Optional[CatalogEntry]:
+        """Look up an NPC by exact name."""
+        with self._lock:
+            self.refresh()
+            return self._by_name.get(name)
+
+    def find(
+        self,
+        location: Optional[str] = None,
+        role: Optional[str] = None,
+        name: Optional[str] = None,
+        profile_type: Optional[str] = None,
+    ) -> List[CatalogEntry]:
+        """Find NPCs matching every given criterion.
+
+        Each criterion is a phrase that must appear as whole words in the
+        field (location is matched against the NPC notes).
+
+        Args:
+            location: Place phrase to find in the notes
+            role: Role phrase, e.g. "guard captain"
+            name: Name or nickname phrase
+            profile_type: "simplified", "full" or "major"
+
+        Returns:
+            Matching entries ordered by file name
+        """
+        criteria = {
+            "location": location,
+            "role": role,
+            "name": name,
+            "profile_type": profile_type,
+        }
+        with self._lock:
+            self.refresh()
+            selected: Optional[Set[int]] = None
+            for field_name, value in criteria.items():
+                if value is None:
+                    continue
+                phrase = tokenize(value)
+                if not phrase:
+                    return []
+                postings = self._postings.get(field_name, {})
+                hits = set.intersection(*(postings.get(token, set()) for token in phrase))
+                if len(phrase) > 1:
+                    hits = {
+                        position for position in hits
+                        if _contains_phrase(self._entries[position].tokens[field_name], phrase)
+                    }
+                selected = hits if selected is None else selected & hits
+                if not selected:
+                    return []
+            if selected is None:
+                return list(self._entries)
+            return [self._entries[position] for position in sorted(selected)]
+
+
+_catalogs: Dict[str, NPCCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_npc_catalog(npcs_dir: Path) -> NPCCatalog:
+    """Get the shared catalog for an NPC directory.
+
+    Args:
+        npcs_dir: Directory holding NPC JSON files
+
+    Returns:
+        The process-wide NPCCatalog for that directory
+    """
+    key = str(Path(npcs_dir).resolve())
+    with _catalogs_lock:
+        catalog = _catalogs.get(key)
+        if catalog is None:
+            catalog = _catalogs[key] = NPCCatalog(Path(npcs_dir))
+        return catalog
+
+
+def reset_npc_catalogs() -> None:
+    """Drop every shared catalog (used in tests)."""
+    with _catalogs_lock:
+        _catalogs.clear()
@@ -2,12 +2,15 @@
 
 Handles saving, loading, and querying session notes across all sessions
 in a campaign.  Provides context extraction for AI story generation.
+Campaign-wide queries are answered from a SessionRollup kept next to the
+notes, so they do not re-parse every notes file.
 """
 
 import os
 from typing import Any, Dict, List, Optional
 
-from src.sessions.session_notes import NotePriority, PlotStatus, SessionNotes
+from src.sessions.session_notes import SessionNotes
+from src.sessions.session_rollup import SessionRollup, is_notes_file
 from src.utils.file_io import ensure_directory, load_json_file, save_json_file
 from src.utils.path_utils import get_game_data_path
 from src.utils.string_utils import get_session_date
@@ -39,6 +42,12 @@ class SessionNotesManager:
             get_game_data_path(workspace_path), "campaigns", campaign_name
         )
         self.notes_dir = os.path.join(self.campaign_dir, "session_notes")
+        self._rollup = SessionRollup(self.notes_dir)
+
+    def _current_rollup(self) -> SessionRollup:
+        """Return the rollup after picking up notes changed on disk."""
+        self._rollup.refresh()
+        return self._rollup
 
     def _ensure_notes_dir(self) -> None:
         """Create the notes directory if it does not exist."""
@@ -75,9 +84,11 @@ class SessionNotesManager:
             Path to the saved JSON file.
         """
         self._ensure_notes_dir()
+        self._rollup.refresh()
         filename = f"notes_{notes.session_date}_{notes.session_id}.json"
         filepath = os.path.join(self.notes_dir, filename)
         save_json_file(filepath, notes.to_dict())
+        self._rollup.record(filepath, notes)
         return filepath
 
     def load_session_notes(self, session_id: str) -> Optional[SessionNotes]:
@@ -118,7 +129,7 @@ class SessionNotesManager:
             return notes_list
 
         for filename in os.listdir(self.notes_dir):
-            if not (filename.startswith("notes_") and filename.endswith(".json")):
+            if not is_notes_file(filename):
                 continue
             filepath = os.path.join(self.notes_dir, filename)
             data = load_json_file(filepath)
@@ -130,14 +141,20 @@ class SessionNotesManager:
     def get_recent_notes(self, count: int = 3) -> List[SessionNotes]:
         """Return the most recent session notes.
 
+        Only the notes files of those sessions are parsed.
+
         Args:
             count: Number of most-recent sessions to return.
 
         Returns:
             List of the most recent SessionNotes instances.
         """
-        all_notes = self.get_all_session_notes()
-        return all_notes[-count:] if all_notes else []
+        recent: List[SessionNotes] = []
+        for filename in self._current_rollup().recent_files(count):
+            data = load_json_file(os.path.join(self.notes_dir, filename))
+            if data:
+                recent.append(SessionNotes.from_dict(data))
+        return recent
 
     def get_active_plot_threads(self) -> List[Dict[str, Any]]:
         """Collect all active (unresolved) plot threads across all sessions.
@@ -145,21 +162,7 @@ class SessionNotesManager:
         Returns:
             List of dicts with keys: name, description, introduced, notes.
         """
-        threads: Dict[str, Dict[str, Any]] = {}
-
-        for notes in self.get_all_session_notes():
-            for thread in notes.plot_threads:
-                if thread.status == PlotStatus.ACTIVE:
-                    threads[thread.name] = {
-                        "name": thread.name,
-                        "description": thread.description,
-                        "introduced": thread.introduced_session,
-                        "notes": thread.notes,
-                    }
-                elif thread.status == PlotStatus.RESOLVED:
-                    threads.pop(thread.name, None)
-
-        return list(threads.values())
+        return self._current_rollup().active_threads()
 
     def get_npc_introductions(self) -> List[Dict[str, Any]]:
         """Return all NPCs introduced across sessions (first occurrence only).
@@ -168,21 +171,7 @@ class SessionNotesManager:
             List of dicts with keys: name, role, location, first_impression,
             relationship, introduced_session.
         """
-        npcs: Dict[str, Dict[str, Any]] = {}
-
-        for notes in self.get_all_session_notes():
-            for npc in notes.npc_introductions:
-                if npc.name not in npcs:
-                    npcs[npc.name] = {
-                        "name": npc.name,
-                        "role": npc.role,
-                        "location": npc.location,
-                        "first_impression": npc.first_impression,
-                        "relationship": npc.relationship_to_party,
-                        "introduced_session": notes.session_id,
-                    }
-
-        return list(npcs.values())
+        return self._current_rollup().npc_introductions()
 
     def get_campaign_timeline(self) -> List[Dict[str, Any]]:
         """Build a chronological list of all recorded events.
@@ -190,24 +179,7 @@ class SessionNotesManager:
         Returns:
             List of event dicts sorted by date then session ID.
         """
-        timeline: List[Dict[str, Any]] = []
-
-        for notes in self.get_all_session_notes():
-            for event in notes.events:
-                timeline.append(
-                    {
-                        "date": notes.session_date,
-                        "session_id": notes.session_id,
-                        "title": event.title,
-                        "description": event.description,
-                        "characters": event.characters_involved,
-                        "npcs": event.npcs_involved,
-                        "location": event.location,
-                        "priority": event.priority.value,
-                    }
-                )
-
-        return sorted(timeline, key=lambda e: (e["date"], e["session_id"]))
+        return self._current_rollup().timeline()
 
     def get_context_for_story_generation(self) -> Dict[str, Any]:
         """Build a context dict suitable for injecting into story AI prompts.
@@ -223,35 +195,22 @@ class SessionNotesManager:
               - recent_npcs: last 5 introduced NPCs
               - pending_decisions: decisions without known consequences
         """
-        recent = self.get_recent_notes(3)
-
-        events: List[Dict[str, Any]] = []
-        for notes in recent:
-            for event in notes.events:
-                if event.priority in (NotePriority.CRITICAL, NotePriority.IMPORTANT):
-                    events.append(
-                        {
-                            "session": notes.session_id,
-                            "title": event.title,
-                            "description": event.description,
-                        }
-                    )
+        rollup = self._current_rollup()
+        recent = rollup.recent_summaries(3)
 
+        events: List[Dict[str, Any]] = [
+            dict(event) for summary in recent for event in summary["important_events"]
+        ]
         pending_decisions: List[Dict[str, Any]] = [
-            {
-                "decision": dec.decision,
-                "made_by": dec.made_by,
-                "consequences": dec.consequences,
-            }
-            for notes in recent
-            for dec in notes.player_decisions
-            if dec.consequences is None
+            dict(decision)
+            for summary in recent
+            for decision in summary["pending_decisions"]
         ]
 
         return {
             "recent_events": events[-10:],
-            "active_plots": self.get_active_plot_threads(),
-            "recent_npcs": self.get_npc_introductions()[-5:],
+            "active_plots": rollup.active_threads(),
+            "recent_npcs": rollup.npc_introductions()[-5:],
             "pending_decisions": pending_decisions,
         }
 
@@ -0,0 +1,303 @@
+"""Materialised campaign rollup over a campaign's session notes.
+
+Keeps, per notes file, a compact summary (plot thread updates, NPC
+introductions, events, important events and pending decisions) plus the
+campaign-wide aggregates folded from them: active plot threads, first NPC
+introductions and the chronological event index. The rollup is persisted
+next to the notes, updated in place when the manager saves notes, and on
+refresh only notes files whose mtime or size changed are parsed again.
+"""
+
+import json
+import os
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+from src.sessions.session_notes import NotePriority, PlotStatus, SessionNotes
+from src.utils.file_io import load_json_file, write_text_file_atomic
+
+ROLLUP_FILE_NAME = "rollup.json"
+
+# Bump when the summary layout changes so stale rollups are rebuilt.
+_ROLLUP_VERSION = 1
+
+
+def is_notes_file(filename: str) -> bool:
+    """Check whether a file name is a session notes file."""
+    return filename.startswith("notes_") and filename.endswith(".json")
+
+
+def summarize_session(notes: SessionNotes) -> Dict[str, Any]:
+    """Reduce session notes to what the campaign rollup needs.
+
+    Args:
+        notes: Parsed session notes.
+
+    Returns:
+        JSON-serialisable summary dict.
+    """
+    return {
+        "session_date": notes.session_date,
+        "session_id": notes.session_id,
+        "threads": [
+            {
+                "name": thread.name,
+                "status": thread.status.value,
+                "description": thread.description,
+                "introduced": thread.introduced_session,
+                "notes": thread.notes,
+            }
+            for thread in notes.plot_threads
+        ],
+        "npcs": [
+            {
+                "name": npc.name,
+                "role": npc.role,
+                "location": npc.location,
+                "first_impression": npc.first_impression,
+                "relationship": npc.relationship_to_party,
+                "introduced_session": notes.session_id,
+            }
+            for npc in notes.npc_introductions
+        ],
+        "events": [
+            {
+                "date": notes.session_date,
+                "session_id": notes.session_id,
+                "title": event.title,
+                "description": event.description,
+                "characters": event.characters_involved,
+                "npcs": event.npcs_involved,
+                "location": event.location,
+                "priority": event.priority.value,
+            }
+            for event in notes.events
+        ],
+        "important_events": [
+            {
+                "session": notes.session_id,
+                "title": event.title,
+                "description": event.description,
+            }
+            for event in notes.events
+            if event.priority in (NotePriority.CRITICAL, NotePriority.IMPORTANT)
+        ],
+        "pending_decisions": [
+            {
+                "decision": dec.decision,
+                "made_by": dec.made_by,
+                "consequences": dec.consequences,
+            }
+            for dec in notes.player_decisions
+            if dec.consequences is None
+        ],
+    }
+
+
+def _sort_key(filename: str, summary: Dict[str, Any]) -> Tuple[str, str, str]:
+    """Chronological order of sessions: date, then session ID."""
+    return summary["session_date"], summary["session_id"], filename
+
+
+class _Aggregates(NamedTuple):
+    """Campaign-wide views folded from the session summaries.
+
+    Attributes:
+        threads: Unresolved plot threads by name, in first-activation order
+        npcs: First introduction of every NPC by name
+        timeline: Every event in session order
+    """
+
+    threads: Dict[str, Dict[str, Any]]
+    npcs: Dict[str, Dict[str, Any]]
+    timeline: List[Dict[str, Any]]
+
+    def fold(self, summary: Dict[str, Any]) -> None:
+        """Apply one session, in chronological order, to the aggregates."""
+        for thread in summary["threads"]:
+            if thread["status"] == PlotStatus.ACTIVE.value:
+                self.threads[thread["name"]] = {
+                    key: thread[key] for key in ("name", "description", "introduced", "notes")
+                }
+            elif thread["status"] == PlotStatus.RESOLVED.value:
+                self.threads.pop(thread["name"], None)
+        for npc in summary["npcs"]:
+            self.npcs.setdefault(npc["name"], npc)
+        self.timeline.extend(summary["events"])
+
+
+class SessionRollup:
+    """Incrementally maintained campaign-wide view of the session notes.
+
+    Sessions added after the latest known one are folded into the
+    aggregates directly; any other change refolds the stored summaries,
+    which never requires re-reading unchanged notes files.
+    """
+
+    def __init__(self, notes_dir: str) -> None:
+        """
+        Args:
+            notes_dir: Directory holding the ``notes_*.json`` files.
+        """
+        self.notes_dir = notes_dir
+        self.rollup_path = os.path.join(notes_dir, ROLLUP_FILE_NAME)
+        self._stamps: Dict[str, Tuple[int, int]] = {}
+        self._summaries: Dict[str, Dict[str, Any]] = {}
+        self._order: List[str] = []
+        self._aggregates = _Aggregates({}, {}, [])
+        self._loaded = False
+
+    def _load(self) -> None:
+        """Read the persisted rollup once; a missing or stale file is ignored."""
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            data = load_json_file(self.rollup_path) or {}
+        except (OSError, ValueError):
+            data = {}
+        if data.get("version") != _ROLLUP_VERSION:
+            return
+        for filename, entry in data.get("sessions", {}).items():
+            self._stamps[filename] = (int(entry["stamp"][0]), int(entry["stamp"][1]))
+            self._summaries[filename] = entry["summary"]
+        self._order = sorted(
+            self._summaries, key=lambda name: _sort_key(name, self._summaries[name])
+        )
+        self._aggregates = _Aggregates(
+            {t["name"]: t for t in data.get("active_threads", [])},
+            {n["name"]: n for n in data.get("npcs", [])},
+            data.get("timeline", []),
+        )
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        """Return (mtime_ns, size) for every notes file on disk."""
+        stamps: Dict[str, Tuple[int, int]] = {}
+        if not os.path.isdir(self.notes_dir):
+            return stamps
+        with os.scandir(self.notes_dir) as entries:
+            for entry in entries:
+                if not is_notes_file(entry.name):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                stamps[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        return stamps
+
+    def refresh(self) -> bool:
+        """Bring the rollup up to date with the notes files on disk.
+
+        Returns:
+            True when any session was added, changed or removed.
+        """
+        self._load()
+        current = self._scan()
+        removed = [name for name in self._stamps if name not in current]
+        changed: Dict[str, Dict[str, Any]] = {}
+        for filename, stamp in current.items():
+            if self._stamps.get(filename) == stamp:
+                continue
+            data = load_json_file(os.path.join(self.notes_dir, filename))
+            summary = summarize_session(SessionNotes.from_dict(data)) if data else None
+            changed[filename] = {"stamp": stamp, "summary": summary}
+        if not removed and not changed:
+            return False
+        self._apply(changed, removed)
+        return True
+
+    def record(self, filepath: str, notes: SessionNotes) -> None:
+        """Fold in notes just written by the manager without re-reading them.
+
+        Args:
+            filepath: Path of the saved notes file.
+            notes: The notes that were saved.
+        """
+        self._load()
+        stat = os.stat(filepath)
+        self._apply(
+            {
+                os.path.basename(filepath): {
+                    "stamp": (stat.st_mtime_ns, stat.st_size),
+                    "summary": summarize_session(notes),
+                }
+            },
+            [],
+        )
+
+    def _apply(self, changed: Dict[str, Dict[str, Any]], removed: List[str]) -> None:
+        """Update summaries and aggregates, then persist the rollup."""
+        last_key = (
+            _sort_key(self._order[-1], self._summaries[self._order[-1]])
+            if self._order else None
+        )
+        appended: List[str] = []
+        refold = bool(removed)
+        for filename in removed:
+            self._stamps.pop(filename, None)
+            self._summaries.pop(filename, None)
+        for filename, entry in changed.items():
+            self._stamps[filename] = entry["stamp"]
+            if entry["summary"] is None:
+                # Empty notes files count as present but contribute nothing.
+                if self._summaries.pop(filename, None) is not None:
+                    refold = True
+                continue
+            if filename in self._summaries:
+                refold = True
+            self._summaries[filename] = entry["summary"]
+            appended.append(filename)
+
+        if not refold and last_key is not None:
+            refold = any(
+                _sort_key(name, self._summaries[name]) <= last_key for name in appended
+            )
+        self._order = sorted(
+            self._summaries, key=lambda name: _sort_key(name, self._summaries[name])
+        )
+        if refold:
+            self._aggregates = _Aggregates({}, {}, [])
+            appended = self._order
+        else:
+            appended = sorted(
+                appended, key=lambda name: _sort_key(name, self._summaries[name])
+            )
+        for filename in appended:
+            self._aggregates.fold(self._summaries[filename])
+        self._save()
+
+    def _save(self) -> None:
+        """Persist the rollup next to the notes."""
+        if not os.path.isdir(self.notes_dir):
+            return
+        data = {
+            "version": _ROLLUP_VERSION,
+            "sessions": {
+                filename: {"stamp": list(self._stamps[filename]), "summary": summary}
+                for filename, summary in self._summaries.items()
+            },
+            "active_threads": list(self._aggregates.threads.values()),
+            "npcs": list(self._aggregates.npcs.values()),
+            "timeline": self._aggregates.timeline,
+        }
+        write_text_file_atomic(self.rollup_path, json.dumps(data, ensure_ascii=False))
+
+    def recent_files(self, count: int) -> List[str]:
+        """Return the notes file names of the latest sessions, oldest first."""
+        return self._order[-count:] if count > 0 else []
+
+    def recent_summaries(self, count: int) -> List[Dict[str, Any]]:
+        """Return the summaries of the latest sessions, oldest first."""
+        return [self._summaries[name] for name in self.recent_files(count)]
+
+    def active_threads(self) -> List[Dict[str, Any]]:
+        """Return unresolved plot threads in first-activation order."""
+        return [dict(thread) for thread in self._aggregates.threads.values()]
+
+    def npc_introductions(self) -> List[Dict[str, Any]]:
+        """Return the first introduction of every NPC."""
+        return [dict(npc) for npc in self._aggregates.npcs.values()]
+
+    def timeline(self) -> List[Dict[str, Any]]:
+        """Return every event in session order."""
+        return [dict(event) for event in self._aggregates.timeline]
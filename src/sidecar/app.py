@@ -1,32 +1,25 @@
 """FastAPI application for the D&D search query parser sidecar."""
 
-import base64
-import hashlib
 import logging
 import os
-import random
 from contextlib import asynccontextmanager
 from functools import lru_cache
-from typing import Any, AsyncGenerator, Dict, Optional
+from typing import Any, AsyncGenerator, Dict, FrozenSet, Optional
 
 from fastapi import APIRouter, FastAPI, HTTPException, Request
 from fastapi.responses import JSONResponse
 
-from src.ai.abilities_rag import Ability, get_abilities, get_background
-from src.ai.ai_client import AIClient
-from src.ai.comfyui_client import ComfyUIClient
-from src.ai.comfyui_workflows import (
-    IdentityReference,
-    IpAdapterParams,
-    RenderSettings,
-    Txt2ImgParams,
-    ipadapter_workflow,
-    txt2img_workflow,
+from src.ai.abilities_rag import (
+    Ability,
+    get_abilities,
+    get_background,
+    prefetch_abilities,
 )
+from src.ai.ai_client import AIClient
 from src.ai.equipment_rag import get_equipment_descriptions
 from src.ai.image_describe import describe_image, fetch_image_bytes
-from src.ai.ollama_admin import unload_ollama_models
 from src.ai.portrait_prompt import build_portrait_prompt
+from src.ai.request_scheduler import SchedulerBusy, get_request_scheduler
 from src.character_arc.arc_analyzer import (
     ArcAnalyzer,
     aggregate_arc,
@@ -34,6 +27,7 @@ from src.character_arc.arc_analyzer import (
     analyze_story_datapoint,
     facts_block,
 )
+from src.character_arc.arc_cache import get_chunk_analysis_cache
 from src.character_arc.arc_data import ArcDataPoint
 from src.characters.character_template import (
     TemplateOptions,
@@ -42,8 +36,7 @@ from src.characters.character_template import (
     load_template,
 )
 from src.characters.class_plan import get_class_plan
-from src.config.config_loader import load_config
-from src.config.config_types import ComfyUIConfig
+from src.config.config_loader import load_config, subscribe_config_changes
 from src.sidecar.models import (
     ArcAggregateRequest,
     ArcAnalysisRequest,
@@ -65,8 +58,6 @@ from src.sidecar.models import (
     ParseQueryRequest,
     ParseQueryResponse,
     DescribeImageRequest,
-    PortraitRequest,
-    PortraitResponse,
     PromptRequest,
     PromptResponse,
     ResolveBackgroundRequest,
@@ -78,18 +69,24 @@ from src.sidecar.models import (
     SpotlightResponse,
 )
 from src.sidecar.query_parser import parse_query
-from src.sidecar.tts_routes import router as tts_router
+from src.sidecar.portrait_routes import (
+    queue_metrics as portrait_queue_metrics,
+    router as portrait_router,
+)
+from src.sidecar.story_routes import router as story_router
+from src.sidecar.tts_routes import router as tts_router, warm_up as warm_up_tts
 from src.stories.spotlight_engine import SpotlightEngine
 
 logger = logging.getLogger(__name__)
 
 _HEALTH_PATH = "/health"
 
-
 @asynccontextmanager
 async def _lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
     """FastAPI lifespan context — log startup and flush resources on shutdown."""
     logger.info("Sidecar starting")
+    if not warm_up_tts():
+        logger.info("Piper TTS not available; /tts/speak will return 503")
     yield
     logger.info("Sidecar shutting down")
 
@@ -157,6 +154,7 @@ def _build_arc_client(profile_name: str) -> AIClient | None:
     # Local CPU inference of a large model takes minutes per call; the default
     # 30s AIClient timeout would abort every arc call. Allow a generous, tunable
     # timeout (ARC_AI_TIMEOUT seconds) so synthesis actually completes.
+    # Arc work is batch priority so it queues behind interactive requests.
     return AIClient(
         api_key=os.getenv("OLLAMA_API_KEY", "") or config.ai.api_key,
         base_url=profile.base_url,
@@ -164,6 +162,7 @@ def _build_arc_client(profile_name: str) -> AIClient | None:
         default_temperature=profile.temperature,
         default_max_tokens=max(profile.max_tokens, 2000),
         timeout=float(os.getenv("ARC_AI_TIMEOUT", "1800")),
+        priority="batch",
     )
 
 
@@ -189,43 +188,22 @@ def _get_arc_aggregate_client() -> AIClient | None:
     return _build_arc_client(profile) or _get_arc_ai_client()
 
 
-@lru_cache(maxsize=1)
-def _get_comfyui_client() -> ComfyUIClient | None:
-    """Build the ComfyUI portrait client, or None when it is not configured.
-
-    ComfyUI runs on the host (never in DDEV). Returns None when the feature is
-    disabled or no base URL resolves, so the endpoint can answer 503 rather
-    than raise.
-
-    Returns:
-        A configured ComfyUIClient, or None when unavailable.
-    """
-    comfyui = load_config().comfyui
-    if not comfyui.is_configured():
-        return None
-    return ComfyUIClient(comfyui.get_base_url(), timeout=comfyui.timeout)
-
-
-def _portrait_alt(profile: dict[str, Any]) -> str:
-    """Build alt text for a generated portrait.
-
-    Drupal's media image field sets ``alt_field_required: true``, so this must
-    never return an empty string.
+@subscribe_config_changes
+def _on_config_change(changed: FrozenSet[str], _config: Any) -> None:
+    """Drop cached clients whose config sections changed; rebuilt on next use."""
+    if changed & {"ai", "model_registry"}:
+        _get_arc_ai_client.cache_clear()
+        _get_arc_aggregate_client.cache_clear()
 
-    Args:
-        profile: The character profile used to build the portrait.
 
-    Returns:
-        Human-readable alt text describing the portrait.
-    """
-    name = str(profile.get("name") or "").strip() or "Character"
-    descriptor = " ".join(
-        str(profile.get(key) or "").strip()
-        for key in ("lineage", "species", "character_class")
-    ).split()
-    if descriptor:
-        return f"Portrait of {name}, a {' '.join(descriptor)}"
-    return f"Portrait of {name}"
+@app.exception_handler(SchedulerBusy)
+async def _scheduler_busy_handler(_request: Request, exc: SchedulerBusy) -> JSONResponse:
+    """Return 429/503 with Retry-After when the model queue rejects a request."""
+    return JSONResponse(
+        status_code=exc.status_code,
+        content=ErrorResponse(error="ModelBusy", detail=str(exc)).model_dump(),
+        headers={"Retry-After": str(max(1, round(exc.retry_after)))},
+    )
 
 
 @app.exception_handler(Exception)
@@ -245,13 +223,19 @@ async def _unhandled_exception_handler(
 
 @app.get(_HEALTH_PATH, response_model=HealthResponse)
 def health() -> HealthResponse:
-    """Return service health and AI configuration status.
+    """Return service health, AI configuration status and model queue metrics.
 
     Returns:
-        HealthResponse indicating service status and AI availability.
+        HealthResponse indicating service status and AI availability, with
+        per-server queue depth, in-flight and wait-time figures.
     """
     config = load_config()
-    return HealthResponse(status="ok", ai_configured=config.ai.is_configured())
+    return HealthResponse(
+        status="ok",
+        ai_configured=config.ai.is_configured(),
+        model_queues=get_request_scheduler().metrics(),
+        portrait_jobs=portrait_queue_metrics(),
+    )
 
 
 @_search_router.post("/parse-query", response_model=ParseQueryResponse)
@@ -374,6 +358,10 @@ def skill_plan_endpoint(req: SkillPlanRequest) -> SkillPlanResponse:
         equipment choices, and the subclass choice.
     """
     class_plan = get_class_plan(req.class_name, req.level)
+    sources = [("species", req.race)]
+    if req.subspecies:
+        sources.append(("subspecies", req.subspecies))
+    prefetch_abilities(sources)
     abilities = list(get_abilities("species", req.race, req.level))
     if req.subspecies:
         abilities.extend(get_abilities("subspecies", req.subspecies, req.level))
@@ -505,7 +493,11 @@ def character_arc_story_endpoint(req: ArcStoryRequest) -> ArcDataPointModel:
         The story's ArcDataPointModel, to be collected and posted to
         ``/character/arc/aggregate``.
     """
-    analyzer = ArcAnalyzer(ai_client=_get_arc_ai_client(), pronouns=req.pronouns)
+    analyzer = ArcAnalyzer(
+        ai_client=_get_arc_ai_client(),
+        pronouns=req.pronouns,
+        chunk_cache=get_chunk_analysis_cache(),
+    )
     data_point = analyze_story_datapoint(
         analyzer,
         req.content,
@@ -594,6 +586,10 @@ def _resolve_abilities(req: BuildCharacterRequest) -> list[Ability]:
         De-duplicated abilities up to the requested level. Empty when RAG is
         unavailable (the character is still created without ability terms).
     """
+    sources = [("class", req.class_name), ("species", req.race)]
+    if req.subspecies:
+        sources.append(("subspecies", req.subspecies))
+    prefetch_abilities(sources)
     resolved: list[Ability] = []
     resolved.extend(get_abilities("class", req.class_name, req.level))
     resolved.extend(get_abilities("species", req.race, req.level))
@@ -610,180 +606,6 @@ def _resolve_abilities(req: BuildCharacterRequest) -> list[Ability]:
     return unique
 
 
-def _identity_reference(
-    client: ComfyUIClient, comfyui: ComfyUIConfig, req: PortraitRequest
-) -> Optional[IdentityReference]:
-    """Upload the portrait whose likeness a render should preserve.
-
-    Every failure here returns None rather than raising: losing the likeness is
-    a worse render, not a failed one, so an unfetchable reference degrades to
-    text-to-image with a logged reason instead of denying the operator a
-    portrait. The endpoint reports which path it took via ``used_reference``.
-
-    Args:
-        client: The ComfyUI client to upload the reference through.
-        comfyui: The ComfyUI configuration (checked for IPAdapter assets).
-        req: The portrait request, carrying the reference URL and weight.
-
-    Returns:
-        An IdentityReference naming the uploaded image, or None when identity
-        conditioning is unconfigured, unwanted, or unavailable.
-    """
-    if not req.reference_image_url:
-        return None
-    if not comfyui.assets.supports_identity():
-        logger.info(
-            "Reference portrait supplied but IPAdapter is not configured "
-            "(set COMFYUI_IPADAPTER_MODEL and COMFYUI_CLIP_VISION); "
-            "generating text-to-image instead"
-        )
-        return None
-
-    # Same CA bundle rationale as /describe-image: the local Drupal serves file
-    # URLs over HTTPS with a locally-generated certificate.
-    image_bytes = fetch_image_bytes(
-        req.reference_image_url, ca_bundle=load_config().drupal.ca_bundle
-    )
-    if image_bytes is None:
-        logger.warning(
-            "Could not fetch the reference portrait %s; generating text-to-image",
-            req.reference_image_url,
-        )
-        return None
-
-    # Name the upload after its content so re-rendering the same character
-    # reuses one file instead of piling up copies, while a genuinely different
-    # reference always lands under a new name - ComfyUI keys LoadImage on the
-    # filename, so reusing one for changed bytes can serve the old image.
-    digest = hashlib.sha256(image_bytes).hexdigest()[:16]
-    name = client.upload_image(f"identity_{digest}.png", image_bytes)
-    if name is None:
-        logger.warning("Could not upload the reference portrait; generating text-to-image")
-        return None
-
-    identity = IdentityReference(
-        image=name,
-        ipadapter_model=comfyui.assets.ipadapter_model,
-        clip_vision=comfyui.assets.clip_vision,
-    )
-    if req.identity_weight is not None:
-        identity.weight = req.identity_weight
-
-    return identity
-
-
-@_character_router.post("/portrait", response_model=PortraitResponse)
-def character_portrait_endpoint(req: PortraitRequest) -> PortraitResponse:
-    """Generate a character portrait with local ComfyUI, returned as base64 PNG.
-
-    Text-to-image by default. When the request carries a reference portrait and
-    the IPAdapter models are configured, the render is conditioned on that image
-    so it stays recognisably the same character. Models are unloaded afterwards
-    so the SD checkpoint does not stay resident alongside other local AI
-    services.
-
-    Args:
-        req: PortraitRequest with the character profile, optional seed/size, and
-            an optional reference portrait to keep the likeness of.
-
-    Returns:
-        PortraitResponse with the base64 PNG, the seed used, prompt, alt text,
-        and whether the reference was actually applied.
-
-    Raises:
-        HTTPException: 503 when ComfyUI is disabled, unconfigured, or
-            unreachable; 500 when generation fails or times out.
-    """
-    comfyui = load_config().comfyui
-    if not comfyui.enabled:
-        raise HTTPException(
-            status_code=503,
-            detail="ComfyUI portrait generation is disabled (set COMFYUI_ENABLED=true)",
-        )
-
-    client = _get_comfyui_client()
-    if client is None:
-        raise HTTPException(
-            status_code=503,
-            detail="ComfyUI has no reachable base URL (set COMFYUI_HOST/COMFYUI_PORT)",
-        )
-    if not comfyui.assets.checkpoint:
-        raise HTTPException(
-            status_code=503,
-            detail="No Stable Diffusion checkpoint configured (set COMFYUI_CHECKPOINT)",
-        )
-    if not client.is_available():
-        raise HTTPException(
-            status_code=503, detail="ComfyUI is not reachable on the host"
-        )
-
-    # Prompt-driven: an explicit (edited/stored) prompt wins; otherwise it is
-    # built from the profile. Building anyway is cheap and yields the negative
-    # default when only the positive is overridden.
-    built_positive, built_negative = build_portrait_prompt(req.profile)
-    positive = req.positive.strip() if req.positive and req.positive.strip() else built_positive
-    negative = req.negative.strip() if req.negative and req.negative.strip() else built_negative
-    seed = req.seed if req.seed is not None else random.randrange(2**31)
-
-    render = RenderSettings()
-    if req.width is not None:
-        render.width = req.width
-    if req.height is not None:
-        render.height = req.height
-
-    identity = _identity_reference(client, comfyui, req)
-    if identity is not None:
-        workflow = ipadapter_workflow(
-            IpAdapterParams(
-                checkpoint=comfyui.assets.checkpoint,
-                positive=positive,
-                negative=negative,
-                seed=seed,
-                identity=identity,
-                render=render,
-            )
-        )
-    else:
-        workflow = txt2img_workflow(
-            Txt2ImgParams(
-                checkpoint=comfyui.assets.checkpoint,
-                positive=positive,
-                negative=negative,
-                seed=seed,
-                render=render,
-            )
-        )
-
-    # Free any resident Ollama model before the SD checkpoint loads: two large
-    # models resident on this CPU-only box is the top OOM risk. Best-effort - a
-    # portrait still generates if Ollama is unreachable. The daemon stays up and
-    # lazily reloads on the next request, so nothing is restarted afterwards.
-    if comfyui.ollama_url:
-        freed = unload_ollama_models(comfyui.ollama_url)
-        if freed:
-            logger.info("Unloaded %d Ollama model(s) before portrait generation", freed)
-
-    try:
-        png = client.generate(workflow)
-    finally:
-        # Unload models between runs: this box is CPU-only and an SD checkpoint
-        # left resident alongside Ollama/DDEV is the top OOM risk.
-        client.free()
-
-    if png is None:
-        raise HTTPException(
-            status_code=500, detail="ComfyUI generation failed or timed out"
-        )
-
-    return PortraitResponse(
-        image_base64=base64.b64encode(png).decode("ascii"),
-        seed=seed,
-        prompt=positive,
-        alt=_portrait_alt(req.profile),
-        used_reference=identity is not None,
-    )
-
-
 def _enhance_positive(positive: str) -> Optional[str]:
     """Expand a template prompt into a richer one via the fast model.
 
@@ -808,7 +630,10 @@ def _enhance_positive(positive: str) -> Optional[str]:
         client.create_user_message(positive),
     ]
     try:
-        result = client.chat_completion(messages, disable_thinking=True)
+        # Interactive: the operator is waiting on this prompt.
+        result = client.chat_completion(
+            messages, disable_thinking=True, priority="interactive"
+        )
     except (RuntimeError, OSError, ValueError):
         return None
     cleaned = " ".join(result.split())
@@ -887,13 +712,15 @@ def describe_image_endpoint(req: DescribeImageRequest) -> PromptResponse:
     # CPU vision inference (esp. cold model load) is slow; reuse the generous
     # ComfyUI timeout rather than the helper's short default. Prime with known
     # species facts so fantasy features (horns, fur, pointed ears) read right.
-    description = describe_image(
-        comfyui.ollama_url,
-        model,
-        image_bytes,
-        context=_describe_context(req.profile),
-        timeout=comfyui.timeout,
-    )
+    # The vision call goes straight to Ollama, so it queues like AIClient calls.
+    with get_request_scheduler().slot(comfyui.ollama_url, model, "interactive"):
+        description = describe_image(
+            comfyui.ollama_url,
+            model,
+            image_bytes,
+            context=_describe_context(req.profile),
+            timeout=comfyui.timeout,
+        )
     if not description:
         raise HTTPException(
             status_code=500, detail="The vision model returned no description"
@@ -905,4 +732,6 @@ def describe_image_endpoint(req: DescribeImageRequest) -> PromptResponse:
 app.include_router(_search_router)
 app.include_router(_eval_router)
 app.include_router(_character_router)
+app.include_router(portrait_router)
 app.include_router(tts_router)
+app.include_router(story_router)
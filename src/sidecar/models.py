@@ -1,6 +1,6 @@
 """Pydantic request and response models for the query parser sidecar."""
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -44,6 +44,11 @@ class HealthResponse(BaseModel):
 
     status: str
     ai_configured: bool
+    # Per model server: limit, in_flight, queued by priority, admitted,
+    # rejected, timed_out and wait/service time statistics.
+    model_queues: Dict[str, Dict[str, Any]] = Field(default_factory=dict)
+    # Portrait render queue: queued/running jobs, batches, renders, cache hits.
+    portrait_jobs: Dict[str, Any] = Field(default_factory=dict)
 
 
 class SpotlightRequest(BaseModel):
@@ -245,6 +250,20 @@ class TtsSegmentResponse(BaseModel):
     segments: List[TtsSegmentOut]
 
 
+class NarrativeStreamRequest(BaseModel):
+    """Request to stream a story narrative or combat scene as it is generated."""
+
+    prompt: str
+    # "narrative" (DM scene narration) or "combat" (combat prose).
+    mode: Literal["narrative", "combat"] = "narrative"
+    characters_present: List[str] = Field(default_factory=list)
+    npcs_present: List[str] = Field(default_factory=list)
+    # Narrative: immersive/cinematic/descriptive. Combat: cinematic/gritty/heroic/tactical.
+    style: str = ""
+    # Story so far, for combat continuity.
+    story_context: str = ""
+
+
 class PortraitRequest(BaseModel):
     """Request to generate a character portrait via local ComfyUI.
 
@@ -308,6 +327,26 @@ class PortraitResponse(BaseModel):
     used_reference: bool = False
 
 
+class PortraitJobResponse(BaseModel):
+    """State of a queued portrait render.
+
+    Returned when a job is submitted and when it is polled; the image itself
+    is fetched from the job's result endpoint once ``status`` is "done".
+    """
+
+    job_id: str
+    # "queued", "running", "done" or "failed".
+    status: str
+    # Sampler progress from 0.0 to 1.0, reported by ComfyUI's event stream.
+    # Stays at 0.0 until done when the sidecar has to poll instead.
+    progress: float = 0.0
+    # Renders that run before this one (same-checkpoint jobs go first).
+    queue_position: int = 0
+    # True when the image was served from the portrait cache.
+    cached: bool = False
+    error: str = ""
+
+
 class PromptRequest(BaseModel):
     """Request to build (and optionally AI-enhance) a portrait prompt."""
 
@@ -0,0 +1,415 @@
+"""ComfyUI portrait routes for the FastAPI sidecar.
+
+Exposes ``/character/portrait`` (render and wait) and the
+``/character/portrait/jobs`` endpoints (queue a render, poll its progress,
+fetch the image). Renders go through one shared PortraitJobQueue, which
+batches portraits per checkpoint and caches finished images on disk.
+"""
+
+import base64
+import hashlib
+import logging
+import random
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Optional
+
+from fastapi import APIRouter, HTTPException
+
+from src.ai.comfyui_client import ComfyUIClient
+from src.ai.comfyui_workflows import (
+    IdentityReference,
+    IpAdapterParams,
+    RenderSettings,
+    Txt2ImgParams,
+    ipadapter_workflow,
+    txt2img_workflow,
+)
+from src.ai.image_describe import fetch_image_bytes
+from src.ai.ollama_admin import unload_ollama_models
+from src.ai.portrait_jobs import JobStatus, PortraitJob, PortraitJobQueue, PortraitRender
+from src.ai.portrait_prompt import build_portrait_prompt
+from src.config.config_loader import load_config, subscribe_config_changes
+from src.config.config_types import ComfyUIConfig
+from src.sidecar.models import PortraitJobResponse, PortraitRequest, PortraitResponse
+from src.utils.tts_audio_cache import TtsAudioCache
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/character", tags=["character"])
+
+
+@lru_cache(maxsize=1)
+def _get_comfyui_client() -> ComfyUIClient | None:
+    """Build the ComfyUI portrait client, or None when it is not configured.
+
+    ComfyUI runs on the host (never in DDEV). Returns None when the feature is
+    disabled or no base URL resolves, so the endpoint can answer 503 rather
+    than raise.
+
+    Returns:
+        A configured ComfyUIClient, or None when unavailable.
+    """
+    comfyui = load_config().comfyui
+    if not comfyui.is_configured():
+        return None
+    return ComfyUIClient(comfyui.get_base_url(), timeout=comfyui.timeout)
+
+
+def _unload_ollama_for_portraits() -> None:
+    """Free resident Ollama models before a portrait batch loads its checkpoint.
+
+    Two large models resident on this CPU-only box is the top OOM risk.
+    Best-effort - portraits still generate if Ollama is unreachable. The daemon
+    stays up and lazily reloads on the next request, so nothing is restarted
+    afterwards.
+    """
+    ollama_url = load_config().comfyui.ollama_url
+    if ollama_url:
+        freed = unload_ollama_models(ollama_url)
+        if freed:
+            logger.info("Unloaded %d Ollama model(s) before portrait generation", freed)
+
+
+@lru_cache(maxsize=1)
+def _get_portrait_jobs() -> PortraitJobQueue:
+    """Return the shared portrait render queue.
+
+    Rendered images are cached under ``paths.cache_dir/portraits`` within
+    the ``performance.portrait`` budget (PORTRAIT_CACHE_MB); its batch window
+    (COMFYUI_BATCH_WINDOW) sets how long an idle queue gathers submissions
+    into one batch.
+
+    Returns:
+        The process-wide PortraitJobQueue.
+    """
+    config = load_config()
+    portrait = config.performance.portrait
+    cache = TtsAudioCache(
+        config.paths.cache_dir / "portraits",
+        portrait.cache_mb * 1024 * 1024,
+        suffix=".png",
+    )
+    return PortraitJobQueue(
+        cache=cache,
+        prepare=_unload_ollama_for_portraits,
+        batch_window=portrait.batch_window,
+    )
+
+
+def queue_metrics() -> Dict[str, Any]:
+    """Return the portrait render queue's depth and batching counters."""
+    return _get_portrait_jobs().metrics()
+
+
+@subscribe_config_changes
+def _on_config_change(changed: FrozenSet[str], _config: Any) -> None:
+    """Drop the cached ComfyUI client when its config changes; rebuilt on next use."""
+    if "comfyui" in changed:
+        _get_comfyui_client.cache_clear()
+
+
+def _portrait_alt(profile: dict[str, Any]) -> str:
+    """Build alt text for a generated portrait.
+
+    Drupal's media image field sets ``alt_field_required: true``, so this must
+    never return an empty string.
+
+    Args:
+        profile: The character profile used to build the portrait.
+
+    Returns:
+        Human-readable alt text describing the portrait.
+    """
+    name = str(profile.get("name") or "").strip() or "Character"
+    descriptor = " ".join(
+        str(profile.get(key) or "").strip()
+        for key in ("lineage", "species", "character_class")
+    ).split()
+    if descriptor:
+        return f"Portrait of {name}, a {' '.join(descriptor)}"
+    return f"Portrait of {name}"
+
+
+def _identity_reference(
+    client: ComfyUIClient, comfyui: ComfyUIConfig, req: PortraitRequest
+) -> Optional[IdentityReference]:
+    """Upload the portrait whose likeness a render should preserve.
+
+    Every failure here returns None rather than raising: losing the likeness is
+    a worse render, not a failed one, so an unfetchable reference degrades to
+    text-to-image with a logged reason instead of denying the operator a
+    portrait. The endpoint reports which path it took via ``used_reference``.
+
+    Args:
+        client: The ComfyUI client to upload the reference through.
+        comfyui: The ComfyUI configuration (checked for IPAdapter assets).
+        req: The portrait request, carrying the reference URL and weight.
+
+    Returns:
+        An IdentityReference naming the uploaded image, or None when identity
+        conditioning is unconfigured, unwanted, or unavailable.
+    """
+    if not req.reference_image_url:
+        return None
+    if not comfyui.assets.supports_identity():
+        logger.info(
+            "Reference portrait supplied but IPAdapter is not configured "
+            "(set COMFYUI_IPADAPTER_MODEL and COMFYUI_CLIP_VISION); "
+            "generating text-to-image instead"
+        )
+        return None
+
+    # Same CA bundle rationale as /describe-image: the local Drupal serves file
+    # URLs over HTTPS with a locally-generated certificate.
+    image_bytes = fetch_image_bytes(
+        req.reference_image_url, ca_bundle=load_config().drupal.ca_bundle
+    )
+    if image_bytes is None:
+        logger.warning(
+            "Could not fetch the reference portrait %s; generating text-to-image",
+            req.reference_image_url,
+        )
+        return None
+
+    # Name the upload after its content so re-rendering the same character
+    # reuses one file instead of piling up copies, while a genuinely different
+    # reference always lands under a new name - ComfyUI keys LoadImage on the
+    # filename, so reusing one for changed bytes can serve the old image.
+    digest = hashlib.sha256(image_bytes).hexdigest()[:16]
+    name = client.upload_image(f"identity_{digest}.png", image_bytes)
+    if name is None:
+        logger.warning("Could not upload the reference portrait; generating text-to-image")
+        return None
+
+    identity = IdentityReference(
+        image=name,
+        ipadapter_model=comfyui.assets.ipadapter_model,
+        clip_vision=comfyui.assets.clip_vision,
+    )
+    if req.identity_weight is not None:
+        identity.weight = req.identity_weight
+
+    return identity
+
+
+def _submit_portrait(req: PortraitRequest) -> PortraitJob:
+    """Validate the ComfyUI setup, build the workflow, and queue the render.
+
+    Args:
+        req: PortraitRequest with the character profile, optional seed/size, and
+            an optional reference portrait to keep the likeness of.
+
+    Returns:
+        The queued job (already finished when served from the cache).
+
+    Raises:
+        HTTPException: 503 when ComfyUI is disabled, unconfigured, or
+            unreachable.
+    """
+    comfyui = load_config().comfyui
+    if not comfyui.enabled:
+        raise HTTPException(
+            status_code=503,
+            detail="ComfyUI portrait generation is disabled (set COMFYUI_ENABLED=true)",
+        )
+
+    client = _get_comfyui_client()
+    if client is None:
+        raise HTTPException(
+            status_code=503,
+            detail="ComfyUI has no reachable base URL (set COMFYUI_HOST/COMFYUI_PORT)",
+        )
+    if not comfyui.assets.checkpoint:
+        raise HTTPException(
+            status_code=503,
+            detail="No Stable Diffusion checkpoint configured (set COMFYUI_CHECKPOINT)",
+        )
+    if not client.is_available():
+        raise HTTPException(
+            status_code=503, detail="ComfyUI is not reachable on the host"
+        )
+
+    # Prompt-driven: an explicit (edited/stored) prompt wins; otherwise it is
+    # built from the profile. Building anyway is cheap and yields the negative
+    # default when only the positive is overridden.
+    built_positive, built_negative = build_portrait_prompt(req.profile)
+    positive = req.positive.strip() if req.positive and req.positive.strip() else built_positive
+    negative = req.negative.strip() if req.negative and req.negative.strip() else built_negative
+    seed = req.seed if req.seed is not None else random.randrange(2**31)
+
+    render = RenderSettings()
+    if req.width is not None:
+        render.width = req.width
+    if req.height is not None:
+        render.height = req.height
+
+    identity = _identity_reference(client, comfyui, req)
+    if identity is not None:
+        workflow = ipadapter_workflow(
+            IpAdapterParams(
+                checkpoint=comfyui.assets.checkpoint,
+                positive=positive,
+                negative=negative,
+                seed=seed,
+                identity=identity,
+                render=render,
+            )
+        )
+    else:
+        workflow = txt2img_workflow(
+            Txt2ImgParams(
+                checkpoint=comfyui.assets.checkpoint,
+                positive=positive,
+                negative=negative,
+                seed=seed,
+                render=render,
+            )
+        )
+
+    # The queue unloads Ollama before each batch and frees ComfyUI's models
+    # after the last render of the batch, not after every image.
+    return _get_portrait_jobs().submit(
+        PortraitRender(client, workflow, comfyui.assets.checkpoint, seed),
+        metadata={
+            "seed": seed,
+            "prompt": positive,
+            "alt": _portrait_alt(req.profile),
+            "used_reference": identity is not None,
+        },
+    )
+
+
+def _portrait_job_response(job: PortraitJob) -> PortraitJobResponse:
+    """Describe a job's state for the jobs endpoints."""
+    return PortraitJobResponse(
+        job_id=job.job_id,
+        status=job.status.value,
+        progress=job.progress,
+        queue_position=_get_portrait_jobs().position(job),
+        cached=job.outcome.cached,
+        error=job.outcome.error,
+    )
+
+
+def _portrait_result(job: PortraitJob) -> PortraitResponse:
+    """Build the portrait payload of a finished job.
+
+    Raises:
+        HTTPException: 500 when the render failed.
+    """
+    image = job.outcome.image
+    if job.status != JobStatus.DONE or image is None:
+        raise HTTPException(
+            status_code=500, detail="ComfyUI generation failed or timed out"
+        )
+    return PortraitResponse(
+        image_base64=base64.b64encode(image).decode("ascii"),
+        seed=job.metadata["seed"],
+        prompt=job.metadata["prompt"],
+        alt=job.metadata["alt"],
+        used_reference=job.metadata["used_reference"],
+    )
+
+
+@router.post("/portrait", response_model=PortraitResponse)
+def character_portrait_endpoint(req: PortraitRequest) -> PortraitResponse:
+    """Generate a character portrait with local ComfyUI, returned as base64 PNG.
+
+    Text-to-image by default. When the request carries a reference portrait and
+    the IPAdapter models are configured, the render is conditioned on that image
+    so it stays recognisably the same character. The render goes through the
+    portrait queue and this call waits for it; use ``/portrait/jobs`` to submit
+    without holding a worker thread for the whole render.
+
+    Args:
+        req: PortraitRequest with the character profile, optional seed/size, and
+            an optional reference portrait to keep the likeness of.
+
+    Returns:
+        PortraitResponse with the base64 PNG, the seed used, prompt, alt text,
+        and whether the reference was actually applied.
+
+    Raises:
+        HTTPException: 503 when ComfyUI is disabled, unconfigured, or
+            unreachable; 500 when generation fails or times out; 504 when
+            the job has not finished within the render timeout.
+    """
+    job = _submit_portrait(req)
+    # Each render is bounded by the ComfyUI client timeout, so allow one
+    # timeout for this job and one for every job queued ahead of it.
+    ahead = _get_portrait_jobs().position(job)
+    if not job.wait(load_config().comfyui.timeout * (ahead + 1)):
+        raise HTTPException(
+            status_code=504,
+            detail=f"Portrait still rendering; poll /character/portrait/jobs/{job.job_id}",
+        )
+    return _portrait_result(job)
+
+
+@router.post("/portrait/jobs", response_model=PortraitJobResponse)
+def character_portrait_submit_endpoint(req: PortraitRequest) -> PortraitJobResponse:
+    """Queue a character portrait render and return its job id immediately.
+
+    Portraits submitted together (e.g. a whole party) render back to back on
+    one loaded checkpoint. Poll ``/portrait/jobs/{job_id}`` for progress and
+    fetch the image from ``/portrait/jobs/{job_id}/result``.
+
+    Args:
+        req: PortraitRequest, as for ``/portrait``.
+
+    Returns:
+        PortraitJobResponse with the job id and its initial state.
+
+    Raises:
+        HTTPException: 503 when ComfyUI is disabled, unconfigured, or
+            unreachable.
+    """
+    return _portrait_job_response(_submit_portrait(req))
+
+
+def _known_portrait_job(job_id: str) -> PortraitJob:
+    """Look up a portrait job, answering 404 for unknown or expired ids."""
+    job = _get_portrait_jobs().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown portrait job {job_id}")
+    return job
+
+
+@router.get("/portrait/jobs/{job_id}", response_model=PortraitJobResponse)
+def character_portrait_job_endpoint(job_id: str) -> PortraitJobResponse:
+    """Report a portrait job's status, progress, and queue position.
+
+    Args:
+        job_id: Id returned by ``/portrait/jobs``.
+
+    Returns:
+        PortraitJobResponse for the job.
+
+    Raises:
+        HTTPException: 404 for an unknown job id.
+    """
+    return _portrait_job_response(_known_portrait_job(job_id))
+
+
+@router.get(
+    "/portrait/jobs/{job_id}/result", response_model=PortraitResponse
+)
+def character_portrait_result_endpoint(job_id: str) -> PortraitResponse:
+    """Return the finished portrait of a job.
+
+    Args:
+        job_id: Id returned by ``/portrait/jobs``.
+
+    Returns:
+        PortraitResponse, as returned by ``/portrait``.
+
+    Raises:
+        HTTPException: 404 for an unknown job id, 409 while the job is still
+            queued or running, 500 when the render failed.
+    """
+    job = _known_portrait_job(job_id)
+    if not job.is_finished:
+        raise HTTPException(
+            status_code=409, detail=f"Portrait job {job_id} is {job.status.value}"
+        )
+    return _portrait_result(job)
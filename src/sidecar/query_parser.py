@@ -5,6 +5,7 @@ import logging
 from typing import Any, Dict, List, Optional
 
 from src.ai.ai_client import AIClient, get_client_for_task
+from src.ai.request_scheduler import SchedulerBusy
 from src.config.config_loader import load_config
 from src.sidecar.models import ParseQueryResponse
 
@@ -114,6 +115,9 @@ def parse_query(query: str) -> ParseQueryResponse:
         raw = client.chat_completion(
             messages, temperature=0.1, max_tokens=150, json_mode=True
         )
+    except SchedulerBusy:
+        # Rejected by the model queue: report it rather than a silent fallback.
+        raise
     except RuntimeError as exc:
         _LOG.warning("AI client error during query parsing: %s", exc)
         return _fallback(query)
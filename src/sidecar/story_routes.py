@@ -0,0 +1,126 @@
+"""Streaming story generation routes for the FastAPI sidecar.
+
+Exposes ``/story/narrate/stream``, which streams a DM scene narrative or a
+combat scene as Server-Sent Events while the model generates it, so the
+frontend can show text from the first token instead of waiting minutes for
+a full local-model completion.
+"""
+
+import json
+import logging
+import time
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterator, Optional
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+
+from src.ai.ai_client import AIClient, get_client_for_task
+from src.combat.narrator_ai import AIEnhancedNarrator
+from src.config.config_loader import subscribe_config_changes
+from src.dm.dungeon_master import DMConsultant
+from src.sidecar.models import NarrativeStreamRequest
+
+_LOG = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/story", tags=["story"])
+
+
+@lru_cache(maxsize=1)
+def _get_story_client() -> Optional[AIClient]:
+    """Return the story-generation client, or None when AI is not configured."""
+    try:
+        return get_client_for_task("story_generation")
+    except (ValueError, RuntimeError, ImportError) as exc:
+        _LOG.warning("Story generation client unavailable: %s", exc)
+        return None
+
+
+@subscribe_config_changes
+def _on_config_change(changed: FrozenSet[str], _config: Any) -> None:
+    """Drop the cached client when the AI settings change; rebuilt on next use."""
+    if changed & {"ai", "model_registry"}:
+        _get_story_client.cache_clear()
+
+
+def _sse(event: str, data: Dict[str, Any]) -> bytes:
+    """Encode one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode("utf-8")
+
+
+def _narration_deltas(req: NarrativeStreamRequest, client: AIClient) -> Iterator[str]:
+    """Pick the streaming generator for the requested mode."""
+    if req.mode == "combat":
+        return AIEnhancedNarrator({}, client).stream_combat_from_prompt(
+            req.prompt, req.story_context, req.style or "cinematic"
+        )
+    return DMConsultant(ai_client=client).stream_narrative_content(
+        req.prompt,
+        characters_present=req.characters_present,
+        npcs_present=req.npcs_present,
+        style=req.style or "immersive",
+    )
+
+
+def _stream_events(deltas: Iterator[str], started: float) -> Iterator[bytes]:
+    """Relay text deltas as ``delta`` events, then a ``done`` summary.
+
+    A generation error after the stream has started is reported as an
+    ``error`` event, since the HTTP status has already been sent.
+    """
+    first_token_ms: Optional[float] = None
+    chars = 0
+    try:
+        for delta in deltas:
+            if not delta:
+                continue
+            if first_token_ms is None:
+                first_token_ms = (time.perf_counter() - started) * 1000
+            chars += len(delta)
+            yield _sse("delta", {"text": delta})
+    except (RuntimeError, ConnectionError, TimeoutError, ValueError) as exc:
+        _LOG.warning("story/narrate/stream failed: %s", exc)
+        yield _sse("error", {"detail": str(exc)})
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    _LOG.info(
+        "story/narrate/stream: %d chars, first token %s ms, total %.0f ms",
+        chars, "n/a" if first_token_ms is None else f"{first_token_ms:.0f}", elapsed_ms,
+    )
+    yield _sse("done", {
+        "chars": chars,
+        "time_to_first_token_ms": first_token_ms,
+        "elapsed_ms": elapsed_ms,
+    })
+
+
+@router.post("/narrate/stream")
+def narrate_stream_endpoint(req: NarrativeStreamRequest) -> StreamingResponse:
+    """Stream a scene narrative or combat scene as Server-Sent Events.
+
+    Each ``delta`` event carries ``{"text": ...}`` with the next chunk of
+    model output; the final ``done`` event reports ``chars``,
+    ``time_to_first_token_ms`` and ``elapsed_ms``. Narrative mode falls back
+    to the offline narrative when the model fails before producing text;
+    combat mode then ends with no deltas.
+
+    Args:
+        req: Prompt, mode, scene participants, style and optional context.
+
+    Returns:
+        A streaming ``text/event-stream`` response.
+
+    Raises:
+        HTTPException: 400 for an empty prompt, 503 when no AI client is
+            configured.
+    """
+    started = time.perf_counter()
+    if not req.prompt.strip():
+        raise HTTPException(status_code=400, detail="prompt must not be empty")
+    client = _get_story_client()
+    if client is None:
+        raise HTTPException(status_code=503, detail="AI client is not configured")
+    return StreamingResponse(
+        _stream_events(_narration_deltas(req, client), started),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,18 +1,31 @@
 """Piper TTS routes for the FastAPI sidecar.
 
-Exposes ``/tts/speak`` (synthesise one clip) and ``/tts/segment`` (split story
-text into multi-voice segments for sequential browser playback).
+Exposes ``/tts/speak`` (synthesise one clip), ``/tts/segment`` (split story
+text into multi-voice segments for sequential browser playback) and
+``/tts/render`` (segment and synthesise a whole story in one NDJSON stream).
+
+``/tts/speak`` answers repeated (voice, speed, pitch, text) requests from an
+on-disk audio cache and synthesises misses through the shared client's warm
+Piper workers.
 """
 
+import atexit
+import base64
+import io
+import json
+import logging
 import os
 import shutil
 import subprocess
 import sys
-import tempfile
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
-from typing import Dict, Optional
+from typing import Dict, Iterator, Optional
 
 from fastapi import APIRouter, HTTPException, Response
+from fastapi.responses import StreamingResponse
 
 from src.sidecar.models import (
     TtsRequest,
@@ -21,7 +34,8 @@ from src.sidecar.models import (
     TtsSegmentResponse,
     TtsVoiceEntry,
 )
-from src.utils.dialogue_detector import get_speaker_voice_map
+from src.config.config_loader import load_config
+from src.utils.dialogue_detector import assign_voice_entries
 from src.utils.dialogue_detector import segment_story_for_tts
 from src.utils.piper_tts_client import (
     PiperTTSClient,
@@ -29,48 +43,83 @@ from src.utils.piper_tts_client import (
     get_narrator_speed,
     get_narrator_voice_id,
 )
+from src.utils.tts_audio_cache import TtsAudioCache, clip_key
+
+_LOG = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/tts", tags=["tts"])
 
+# Segments synthesised at once by /tts/render.
+_RENDER_WORKERS = os.cpu_count() or 2
+
 
 @lru_cache(maxsize=1)
 def _get_piper() -> PiperTTSClient:
     """Return a cached Piper client, resolving the binary next to the venv."""
     candidate = os.path.join(os.path.dirname(sys.executable), "piper")
     executable = candidate if os.path.exists(candidate) else "piper"
-    return PiperTTSClient(executable_path=executable)
+    client = PiperTTSClient(
+        executable_path=executable,
+        worker_pool_mb=load_config().performance.tts.worker_pool_mb,
+    )
+    atexit.register(client.close)
+    return client
+
+
+@lru_cache(maxsize=1)
+def _get_audio_cache() -> TtsAudioCache:
+    """Return the shared clip cache under the configured cache directory."""
+    config = load_config()
+    directory = config.paths.cache_dir / "tts"
+    return TtsAudioCache(directory, config.performance.tts.audio_cache_mb * 1024 * 1024)
+
+
+def warm_up() -> bool:
+    """Resolve Piper availability and voices once, ahead of the first request.
+
+    Returns:
+        True when Piper is available.
+    """
+    piper = _get_piper()
+    if not piper.is_available():
+        return False
+    piper.list_available_voices()
+    return True
 
 
 def _apply_pitch(wav: bytes, semitones: float) -> bytes:
     """Pitch-shift WAV audio by semitones using sox (Piper has no pitch control).
 
-    Returns the input unchanged when the shift is negligible or sox is missing.
+    Audio is piped through sox as WAV in and raw samples out, then re-wrapped
+    with the input's format so the header carries real lengths.
+
+    Returns the input unchanged when the shift is negligible, sox is missing,
+    or the audio cannot be processed.
     """
     if abs(semitones) < 0.1 or shutil.which("sox") is None:
         return wav
-    in_path = out_path = ""
     try:
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as handle:
-            handle.write(wav)
-            in_path = handle.name
-        out_path = f"{in_path}.pitch.wav"
+        with wave.Wave_read(io.BytesIO(wav)) as source:
+            params = source.getparams()
         result = subprocess.run(
-            ["sox", in_path, out_path, "pitch", str(semitones * 100)],
-            capture_output=True, timeout=30, check=False,
+            [
+                "sox", "-t", "wav", "-", "-t", "raw",
+                "-e", "signed-integer", "-b", str(params.sampwidth * 8), "-",
+                "pitch", str(semitones * 100),
+            ],
+            input=wav, capture_output=True, timeout=30, check=False,
         )
-        if result.returncode != 0 or not os.path.exists(out_path):
+        if result.returncode != 0 or not result.stdout:
             return wav
-        with open(out_path, "rb") as handle:
-            return handle.read() or wav
-    except (OSError, subprocess.TimeoutExpired):
+        shifted = io.BytesIO()
+        with wave.Wave_write(shifted) as target:
+            target.setnchannels(params.nchannels)
+            target.setsampwidth(params.sampwidth)
+            target.setframerate(params.framerate)
+            target.writeframes(result.stdout)
+        return shifted.getvalue()
+    except (OSError, EOFError, wave.Error, subprocess.TimeoutExpired):
         return wav
-    finally:
-        for path in (in_path, out_path):
-            if path and os.path.exists(path):
-                try:
-                    os.unlink(path)
-                except OSError:
-                    pass
 
 
 def _normalize_voice_entry(value: TtsVoiceEntry | str) -> TtsVoiceEntry:
@@ -87,52 +136,51 @@ def _normalize_voice_entry(value: TtsVoiceEntry | str) -> TtsVoiceEntry:
     return value
 
 
-def _flatten_voice_ids(
-    character_voices: Dict[str, TtsVoiceEntry | str],
-) -> Dict[str, str]:
-    """Map character names to Piper voice ids only.
-
-    Args:
-        character_voices: Name -> voice entry or bare voice id.
-
-    Returns:
-        Name -> voice_id mapping for dialogue_detector voice assignment.
-    """
-    return {
-        name: _normalize_voice_entry(entry).voice_id
-        for name, entry in character_voices.items()
-    }
+def _resolve_voice(piper: PiperTTSClient, voice_id: str) -> str:
+    """Return the requested voice, or an installed fallback when it is missing."""
+    voice = voice_id.strip() or get_narrator_voice_id()
+    if not piper.is_voice_available(voice):
+        for fallback in (get_narrator_voice_id(), "en_US-joe-medium"):
+            if piper.is_voice_available(fallback):
+                return fallback
+    return voice
 
 
-def _lookup_voice_entry(
-    speaker: str,
-    character_voices: Dict[str, TtsVoiceEntry],
-) -> Optional[TtsVoiceEntry]:
-    """Find a voice entry for a speaker with fuzzy name matching.
+def _render_clip(
+    piper: PiperTTSClient, voice_id: str, text: str, speed: float, pitch: float
+) -> Optional[bytes]:
+    """Return WAV audio for one clip, from the audio cache or freshly synthesised.
 
     Args:
-        speaker: Detected speaker name from dialogue segmentation.
-        character_voices: Normalised name -> TtsVoiceEntry map.
+        piper: Available Piper client.
+        voice_id: Requested voice; falls back per _resolve_voice().
+        text: Non-empty text to speak.
+        speed: Speech speed multiplier.
+        pitch: Pitch shift in semitones.
 
     Returns:
-        Matching entry, or None when no character matches.
+        WAV bytes, or None when synthesis failed.
     """
-    if speaker in character_voices:
-        return character_voices[speaker]
-    speaker_lower = speaker.lower()
-    for name, entry in character_voices.items():
-        if name.lower() == speaker_lower:
-            return entry
-    for name, entry in character_voices.items():
-        if speaker_lower in name.lower() or name.lower() in speaker_lower:
-            return entry
-    return None
+    voice = _resolve_voice(piper, voice_id)
+    cache = _get_audio_cache()
+    key = clip_key(voice, speed, pitch, text)
+    audio = cache.get(key)
+    if audio is None:
+        audio = piper.synthesize(text, voice, speed=speed)
+        if audio is None:
+            return None
+        audio = _apply_pitch(audio, pitch)
+        cache.put(key, audio)
+    return audio
 
 
 @router.post("/speak")
 def tts_speak_endpoint(req: TtsRequest) -> Response:
     """Synthesise speech from text with a Piper voice, returning WAV audio.
 
+    Clips already rendered with the same voice, speed, pitch and text are
+    served from the audio cache without touching Piper.
+
     Args:
         req: TtsRequest with the text, optional voice id, and speed.
 
@@ -149,29 +197,21 @@ def tts_speak_endpoint(req: TtsRequest) -> Response:
     piper = _get_piper()
     if not piper.is_available():
         raise HTTPException(status_code=503, detail="Piper TTS is not installed")
-    voice = req.voice_id.strip() or get_narrator_voice_id()
-    if not piper.is_voice_available(voice):
-        for fallback in (get_narrator_voice_id(), "en_US-joe-medium"):
-            if piper.is_voice_available(fallback):
-                voice = fallback
-                break
-    audio = piper.synthesize(text, voice, speed=req.speed)
+    audio = _render_clip(piper, req.voice_id, text, req.speed, req.pitch)
     if audio is None:
         raise HTTPException(status_code=500, detail="Speech synthesis failed")
-    audio = _apply_pitch(audio, req.pitch)
     return Response(content=audio, media_type="audio/wav")
 
 
 def _build_segment_outputs(
-    mapped: list,
-    normalised: Dict[str, TtsVoiceEntry],
+    assigned: list,
     narrator_voice: str,
 ) -> list[TtsSegmentOut]:
     """Attach voice id / speed / pitch to detected speech segments.
 
     Args:
-        mapped: Segments with voice ids already assigned.
-        normalised: Character name -> voice entry map.
+        assigned: (segment, voice entry or None) pairs from
+            assign_voice_entries().
         narrator_voice: Fallback Piper voice id for narration.
 
     Returns:
@@ -180,20 +220,16 @@ def _build_segment_outputs(
     narrator_speed = get_narrator_speed()
     narrator_pitch = get_narrator_pitch()
     outputs: list[TtsSegmentOut] = []
-    for segment in mapped:
-        speaker = segment.speaker
-        speed = narrator_speed
-        pitch = narrator_pitch
-        if speaker.lower() != "narrator" and not segment.is_action:
-            entry = _lookup_voice_entry(speaker, normalised)
-            if entry is not None:
-                speed = entry.speed
-                pitch = entry.pitch
+    for segment, entry in assigned:
+        if entry is None:
+            voice_id, speed, pitch = narrator_voice, narrator_speed, narrator_pitch
+        else:
+            voice_id, speed, pitch = entry.voice_id or narrator_voice, entry.speed, entry.pitch
         outputs.append(
             TtsSegmentOut(
                 text=segment.text,
-                speaker=speaker,
-                voice_id=segment.voice_id or narrator_voice,
+                speaker=segment.speaker,
+                voice_id=voice_id,
                 speed=speed,
                 pitch=pitch,
             )
@@ -201,19 +237,14 @@ def _build_segment_outputs(
     return outputs
 
 
-@router.post("/segment", response_model=TtsSegmentResponse)
-def tts_segment_endpoint(req: TtsSegmentRequest) -> TtsSegmentResponse:
-    """Split story text into multi-voice TTS segments without synthesising.
-
-    Reuses the CLI dialogue detector so character dialogue gets the matching
-    Piper voice id (plus optional speed/pitch), while narration uses the
-    default narrator voice.
+def _plan_segments(req: TtsSegmentRequest) -> list[TtsSegmentOut]:
+    """Segment story text and assign each segment its voice, speed and pitch.
 
     Args:
         req: Story text, character voice map, and known names.
 
     Returns:
-        Ordered segments ready for sequential ``/tts/speak`` calls.
+        Ordered segments.
 
     Raises:
         HTTPException: 400 when text is empty.
@@ -232,11 +263,114 @@ def tts_segment_endpoint(req: TtsSegmentRequest) -> TtsSegmentResponse:
         known_characters=req.known_characters or None,
         known_npcs=req.known_npcs or None,
     )
-    mapped = get_speaker_voice_map(
-        raw_segments,
-        _flatten_voice_ids(req.character_voices),
-        narrator_voice,
+    return _build_segment_outputs(
+        assign_voice_entries(raw_segments, normalised), narrator_voice
     )
-    return TtsSegmentResponse(
-        segments=_build_segment_outputs(mapped, normalised, narrator_voice)
+
+
+@router.post("/segment", response_model=TtsSegmentResponse)
+def tts_segment_endpoint(req: TtsSegmentRequest) -> TtsSegmentResponse:
+    """Split story text into multi-voice TTS segments without synthesising.
+
+    Reuses the CLI dialogue detector so character dialogue gets the matching
+    Piper voice id (plus optional speed/pitch), while narration uses the
+    default narrator voice.
+
+    Args:
+        req: Story text, character voice map, and known names.
+
+    Returns:
+        Ordered segments ready for sequential ``/tts/speak`` calls.
+
+    Raises:
+        HTTPException: 400 when text is empty.
+    """
+    return TtsSegmentResponse(segments=_plan_segments(req))
+
+
+def _stream_render(
+    piper: PiperTTSClient, segments: list[TtsSegmentOut], started: float
+) -> Iterator[bytes]:
+    """Synthesise segments concurrently and yield NDJSON lines in story order.
+
+    Each segment line carries base64 WAV audio (null when synthesis failed,
+    with an ``error`` when it raised); a final summary line reports segment
+    count and time-to-first-audio. Pending synthesis is cancelled if the
+    client disconnects.
+    """
+    first_audio_ms: Optional[float] = None
+    failed = 0
+    executor = ThreadPoolExecutor(max_workers=max(1, min(_RENDER_WORKERS, len(segments))))
+    try:
+        futures = [
+            executor.submit(
+                _render_clip, piper, seg.voice_id, seg.text, seg.speed, seg.pitch
+            )
+            for seg in segments
+        ]
+        for index, (seg, future) in enumerate(zip(segments, futures)):
+            line = seg.model_dump()
+            line["index"] = index
+            try:
+                audio = future.result()
+            except (OSError, ValueError, subprocess.SubprocessError) as exc:
+                _LOG.warning("tts/render: segment %d failed: %s", index, exc)
+                line["error"] = str(exc) or type(exc).__name__
+                audio = None
+            if audio is None:
+                failed += 1
+            elif first_audio_ms is None:
+                first_audio_ms = (time.perf_counter() - started) * 1000
+            line["audio"] = base64.b64encode(audio).decode("ascii") if audio else None
+            yield json.dumps(line).encode("utf-8") + b"\n"
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    _LOG.info(
+        "tts/render: %d segments (%d failed), first audio %s ms, total %.0f ms",
+        len(segments), failed,
+        "n/a" if first_audio_ms is None else f"{first_audio_ms:.0f}", elapsed_ms,
+    )
+    summary = {
+        "done": True,
+        "segments": len(segments),
+        "failed": failed,
+        "time_to_first_audio_ms": first_audio_ms,
+        "elapsed_ms": elapsed_ms,
+    }
+    yield json.dumps(summary).encode("utf-8") + b"\n"
+
+
+@router.post("/render")
+def tts_render_endpoint(req: TtsSegmentRequest) -> StreamingResponse:
+    """Segment and synthesise a whole story in one streamed response.
+
+    Takes the same body as ``/tts/segment``. Segments are synthesised
+    concurrently (bounded by CPU count; each voice's warm worker serves its
+    own clips) and streamed back as NDJSON in story order, so playback can
+    start as soon as the first segment is ready. Each line is a segment
+    (``text``, ``speaker``, ``voice_id``, ``speed``, ``pitch``, ``index`` and
+    base64 WAV ``audio``); the last line is ``{"done": true, ...}`` with
+    ``time_to_first_audio_ms``.
+
+    NDJSON rather than one continuous WAV because voices differ in sample
+    rate and a failed segment should not corrupt the rest of the stream.
+
+    Args:
+        req: Story text, character voice map, and known names.
+
+    Returns:
+        A streaming ``application/x-ndjson`` response.
+
+    Raises:
+        HTTPException: 400 for empty text, 503 when Piper is unavailable.
+    """
+    started = time.perf_counter()
+    segments = _plan_segments(req)
+    piper = _get_piper()
+    if not piper.is_available():
+        raise HTTPException(status_code=503, detail="Piper TTS is not installed")
+    return StreamingResponse(
+        _stream_render(piper, segments, started),
+        media_type="application/x-ndjson",
     )
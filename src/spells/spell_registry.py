@@ -184,8 +184,18 @@ class SpellRegistry:
         self._by_level: Dict[int, List[str]] = {}
         self._by_class: Dict[str, List[str]] = {}
         self._by_tag: Dict[str, List[str]] = {}
+        self._version = 0
         self._load_registry()
 
+    @property
+    def version(self) -> int:
+        """Counter bumped whenever spells are added or removed.
+
+        Returns:
+            The current registry version; callers cache derived data on it.
+        """
+        return self._version
+
     @property
     def registry_path(self) -> Path:
         """Path to the custom_spells.json registry file.
@@ -240,6 +250,7 @@ class SpellRegistry:
             spell: The spell to index.
         """
         self._spells[spell.name.lower()] = spell
+        self._version += 1
 
         for alias in spell.get_all_names():
             self._aliases[alias.lower()] = spell.name
@@ -287,6 +298,7 @@ class SpellRegistry:
             return False
 
         spell = self._spells.pop(name_lower)
+        self._version += 1
 
         for alias in spell.get_all_names():
             self._aliases.pop(alias.lower(), None)
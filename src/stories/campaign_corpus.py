@@ -0,0 +1,228 @@
+"""Pre-parsed, mtime-cached campaign text for the Spotlighting System.
+
+A CampaignCorpus reads each story file of a campaign once and keeps it until
+the file's mtime or size changes. Every document carries a lazily built name
+index: the first offset of each entity name, located once per file and
+name via name_matcher and then answered from the index on later requests.
+Extracted sections and regex flags are memoised per document too, so the
+spotlight collectors share one parse of the campaign across requests.
+"""
+
+import os
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from src.utils.character_profile_utils import find_character_file
+from src.utils.file_io import load_json_file, read_text_file
+from src.utils.name_matcher import first_positions
+from src.utils.story_file_helpers import list_story_files
+
+
+def extract_section(content: str, section_title: str) -> str:
+    """Extract the body of a markdown section by heading title.
+
+    Reads from the heading up to the next same-level heading or end of file.
+
+    Args:
+        content: Full markdown file content.
+        section_title: Exact section heading text (without leading # symbols).
+
+    Returns:
+        Section body text stripped of surrounding whitespace, or empty string.
+    """
+    pattern = re.compile(
+        rf"##\s+{re.escape(section_title)}\s*\n(.*?)(?=\n##|\Z)",
+        re.DOTALL | re.IGNORECASE,
+    )
+    match = pattern.search(content)
+    return match.group(1).strip() if match else ""
+
+
+class IndexedText:
+    """Text plus a cache of where entity names first occur in it."""
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self._lock = threading.Lock()
+        self._positions: Dict[str, int] = {}
+        self._indexed: Set[str] = set()
+
+    def first_positions(self, names: Iterable[str]) -> Dict[str, int]:
+        """Return the first offset of each name that occurs in the text.
+
+        Names not seen before are located together in one
+        name_matcher.first_positions() call; names already indexed cost a
+        dict lookup.
+
+        Args:
+            names: Case-sensitive entity names.
+
+        Returns:
+            Mapping of name -> first offset for the names present.
+        """
+        wanted = {name for name in names if name}
+        with self._lock:
+            missing = wanted - self._indexed
+            if missing:
+                found = first_positions(self.text, frozenset(missing))
+                self._positions.update(found)
+                self._indexed |= missing
+            return {n: self._positions[n] for n in wanted if n in self._positions}
+
+    def mentions(self, names: Iterable[str]) -> List[str]:
+        """Return the names that occur in the text, in input order.
+
+        Args:
+            names: Case-sensitive entity names.
+
+        Returns:
+            Names present in the text.
+        """
+        name_list = list(names)
+        found = self.first_positions(name_list)
+        return [name for name in name_list if name in found]
+
+
+class StoryDocument:
+    """One parsed campaign file with memoised sections and pattern flags."""
+
+    def __init__(self, filename: str, text: str) -> None:
+        self.filename = filename
+        self.content = IndexedText(text)
+        self._sections: Dict[str, IndexedText] = {}
+        self._flags: Dict[str, bool] = {}
+
+    def section(self, title: str) -> IndexedText:
+        """Return a markdown section (see extract_section()) as IndexedText."""
+        cached = self._sections.get(title)
+        if cached is None:
+            cached = IndexedText(extract_section(self.content.text, title))
+            self._sections[title] = cached
+        return cached
+
+    def matches(self, pattern: "re.Pattern[str]") -> bool:
+        """Return whether pattern occurs anywhere in the document."""
+        flag = self._flags.get(pattern.pattern)
+        if flag is None:
+            flag = bool(pattern.search(self.content.text))
+            self._flags[pattern.pattern] = flag
+        return flag
+
+
+class CampaignCorpus:
+    """Story and hooks files of one campaign directory, parsed once."""
+
+    def __init__(self, campaign_path: str) -> None:
+        self.campaign_path = campaign_path
+        self._lock = threading.Lock()
+        self._documents: Dict[str, Tuple[Tuple[int, int], StoryDocument]] = {}
+
+    def document(self, filename: str) -> Optional[StoryDocument]:
+        """Return a parsed file, re-reading it only when it changed on disk.
+
+        Args:
+            filename: File name inside the campaign directory.
+
+        Returns:
+            The document, or None when the file cannot be read.
+        """
+        filepath = os.path.join(self.campaign_path, filename)
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            with self._lock:
+                self._documents.pop(filename, None)
+            return None
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._documents.get(filename)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        try:
+            text = read_text_file(filepath) or ""
+        except (OSError, UnicodeDecodeError):
+            text = ""
+        doc = StoryDocument(filename, text)
+        with self._lock:
+            self._documents[filename] = (stamp, doc)
+        return doc
+
+    def story_documents(self) -> List[StoryDocument]:
+        """Return the numbered story files in session order."""
+        docs: List[StoryDocument] = []
+        for filename in list_story_files(self.campaign_path):
+            doc = self.document(filename)
+            docs.append(doc if doc is not None else StoryDocument(filename, ""))
+        return docs
+
+
+_corpora: Dict[str, CampaignCorpus] = {}
+_corpora_lock = threading.Lock()
+
+
+def get_campaign_corpus(campaign_path: str) -> CampaignCorpus:
+    """Return the process-wide corpus for a campaign directory.
+
+    Args:
+        campaign_path: Path to the campaign directory.
+
+    Returns:
+        Shared CampaignCorpus; its files are re-validated on every access.
+    """
+    key = os.path.abspath(campaign_path)
+    with _corpora_lock:
+        corpus = _corpora.get(key)
+        if corpus is None:
+            corpus = CampaignCorpus(campaign_path)
+            _corpora[key] = corpus
+        return corpus
+
+
+_json_cache: Dict[str, Tuple[Tuple[int, int], Optional[Dict[str, Any]]]] = {}
+_json_lock = threading.Lock()
+
+
+def load_json_cached(filepath: str) -> Optional[Dict[str, Any]]:
+    """Load a JSON file, reusing the parsed dict while the file is unchanged.
+
+    The returned dict is shared between callers and must not be mutated.
+
+    Args:
+        filepath: Path to the JSON file.
+
+    Returns:
+        Parsed dict, or None when missing or unreadable.
+    """
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        return None
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    with _json_lock:
+        cached = _json_cache.get(filepath)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    try:
+        data = load_json_file(filepath)
+    except (OSError, ValueError):
+        data = None
+    with _json_lock:
+        _json_cache[filepath] = (stamp, data)
+    return data
+
+
+def load_character_profile_cached(
+    character_name: str, workspace_path: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """Cached counterpart of character_profile_utils.load_character_profile.
+
+    Args:
+        character_name: Name of the character to load.
+        workspace_path: Optional workspace root path.
+
+    Returns:
+        Shared profile dict (do not mutate), or None if not found.
+    """
+    char_file = find_character_file(character_name, workspace_path)
+    return load_json_cached(char_file) if char_file else None
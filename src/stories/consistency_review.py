@@ -0,0 +1,305 @@
+"""Batched AI consistency review.
+
+Every mention of a character in one story is reviewed in a single structured
+prompt (split into token-budgeted windows for long stories) instead of one
+call per line. The model answers with a JSON array of issues keyed by line
+number, and the findings are cached per (model, profile hash, story hash) so
+unchanged stories are not re-sent.
+"""
+
+import hashlib
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from src.ai.ai_client import AIClientProtocol
+from src.character_arc.arc_cache import ChunkAnalysisCache, prompt_hash
+from src.config.config_loader import load_config
+from src.stories.consistency_types import ConsistencyIssue
+
+# Rough prompt budget (in tokens, ~4 characters each) for the story lines of
+# one batched AI review; longer stories are split into several windows.
+_BATCH_TOKEN_BUDGET = 3000
+# Bump when the batched prompt or its JSON shape changes, so cached findings
+# from the old prompt are no longer reused.
+BATCH_PROMPT_VERSION = 1
+_BATCH_SYSTEM_PROMPT = "You are a D&D story continuity editor. Return only valid JSON."
+# File name of the findings cache inside the configured cache dir.
+_CACHE_FILE_NAME = "story_consistency.sqlite3"
+
+
+class CharacterMentions(NamedTuple):
+    """A character's lines in one story, as sent for review.
+
+    Attributes:
+        character_name: Character name
+        profile: Character profile data
+        story_file: Story filename
+        story_text: Story text content (hashed for the cache key)
+        mentions: (line_number, line_text) tuples for the character
+    """
+
+    character_name: str
+    profile: Dict[str, Any]
+    story_file: str
+    story_text: str
+    mentions: List[Tuple[int, str]]
+
+
+def profile_lines(character_name: str, profile: Dict[str, Any]) -> List[str]:
+    """Summarise the character profile for a prompt.
+
+    Args:
+        character_name: Character name
+        profile: Character profile
+
+    Returns:
+        Prompt lines describing the character
+    """
+    lines = [
+        f"Character: {character_name}",
+        f"Class: {profile.get('dnd_class', 'Unknown')}",
+        f"Level: {profile.get('level', 'Unknown')}",
+    ]
+
+    profile_fields = [
+        ("backstory", "Backstory", 200),
+        ("personality_traits", "Personality", None),
+        ("ideals", "Ideals", None),
+        ("bonds", "Bonds", None),
+        ("flaws", "Flaws", None),
+    ]
+
+    for field_name, label, max_len in profile_fields:
+        if profile.get(field_name):
+            value = profile[field_name]
+            if isinstance(value, list):
+                value = ", ".join(value)
+            elif max_len:
+                value = value[:max_len]
+            lines.append(f"{label}: {value}")
+    return lines
+
+
+def _mention_windows(
+    mentions: List[Tuple[int, str]], token_budget: int
+) -> List[List[Tuple[int, str]]]:
+    """Split mentions into consecutive windows of roughly token_budget tokens.
+
+    Args:
+        mentions: (line_number, line_text) tuples in story order
+        token_budget: Approximate tokens of story text per window
+
+    Returns:
+        Non-empty windows; a single over-long line gets a window of its own
+    """
+    char_budget = token_budget * 4
+    windows: List[List[Tuple[int, str]]] = []
+    current: List[Tuple[int, str]] = []
+    used = 0
+    for mention in mentions:
+        size = len(mention[1]) + 8
+        if current and used + size > char_budget:
+            windows.append(current)
+            current, used = [], 0
+        current.append(mention)
+        used += size
+    if current:
+        windows.append(current)
+    return windows
+
+
+def _content_hash(value: Any) -> str:
+    """Return a stable sha256 digest of text or JSON-serialisable data."""
+    text = value if isinstance(value, str) else json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def get_consistency_cache() -> ChunkAnalysisCache:
+    """Return the process-wide findings cache inside ``paths.cache_dir``."""
+    return ChunkAnalysisCache(Path(load_config().paths.cache_dir) / _CACHE_FILE_NAME)
+
+
+class BatchConsistencyReviewer:
+    """Reviews all of a character's lines in a story with batched AI calls."""
+
+    def __init__(
+        self,
+        ai_client: Optional[AIClientProtocol],
+        cache: Optional[ChunkAnalysisCache] = None,
+    ):
+        """Initialize the reviewer.
+
+        Args:
+            ai_client: AI client answering the reviews; without one every
+                review is empty
+            cache: Cache for the findings; the shared cache in
+                ``paths.cache_dir`` is used when omitted
+        """
+        self.ai_client = ai_client
+        self._cache = cache
+
+    def review(self, subject: CharacterMentions) -> List[ConsistencyIssue]:
+        """Return the AI findings for one character in one story, cached.
+
+        Args:
+            subject: The character, profile, story and mentioned lines
+
+        Returns:
+            AI-identified issues (empty when a call or reply failed)
+        """
+        if not self.ai_client or not subject.mentions:
+            return []
+        cache = self._cache or get_consistency_cache()
+        model = str(getattr(self.ai_client, "model", "") or "")
+        digest = prompt_hash(
+            subject.character_name,
+            _content_hash(subject.profile),
+            _content_hash(subject.story_text),
+        )
+        cached = cache.get(model, BATCH_PROMPT_VERSION, digest)
+        if cached is not None and isinstance(cached.get("issues"), list):
+            return [
+                ConsistencyIssue(**{**item, "story_file": subject.story_file})
+                for item in cached["issues"]
+                if isinstance(item, dict) and set(item) == set(ConsistencyIssue._fields)
+            ]
+
+        issues = self.review_uncached(subject)
+        if issues is None:
+            return []
+        cache.put(
+            model,
+            BATCH_PROMPT_VERSION,
+            digest,
+            {"issues": [issue._asdict() for issue in issues]},
+        )
+        return issues
+
+    def review_uncached(
+        self, subject: CharacterMentions
+    ) -> Optional[List[ConsistencyIssue]]:
+        """Ask the AI to review the mentioned lines, bypassing the cache.
+
+        Mentions are grouped into windows of about _BATCH_TOKEN_BUDGET tokens;
+        each window is one prompt answered with a JSON list of issues keyed by
+        line number.
+
+        Args:
+            subject: The character, profile, story and mentioned lines
+
+        Returns:
+            Issues found, or None when any window's call or reply failed
+        """
+        if not self.ai_client:
+            return []
+
+        issues: List[ConsistencyIssue] = []
+        complete = True
+        for window in _mention_windows(subject.mentions, _BATCH_TOKEN_BUDGET):
+            prompt = self._build_prompt(subject, window)
+            try:
+                response = self.ai_client.chat_completion(
+                    [
+                        self.ai_client.create_system_message(_BATCH_SYSTEM_PROMPT),
+                        self.ai_client.create_user_message(prompt),
+                    ],
+                    temperature=0.3,
+                    max_tokens=200 + 120 * len(window),
+                )
+            except (ValueError, AttributeError, OSError, RuntimeError):
+                complete = False
+                continue
+            found = self._parse_response(response, subject, window)
+            if found is None:
+                complete = False
+                continue
+            issues.extend(found)
+        return issues if complete else None
+
+    @staticmethod
+    def _build_prompt(
+        subject: CharacterMentions, window: List[Tuple[int, str]]
+    ) -> str:
+        """Build the prompt reviewing a window of story lines at once.
+
+        Args:
+            subject: The character and profile under review
+            window: (line_number, line_text) tuples to review
+
+        Returns:
+            Formatted prompt string
+        """
+        prompt_parts = ["Review these D&D story lines for character consistency.\n"]
+        prompt_parts.extend(profile_lines(subject.character_name, subject.profile))
+        prompt_parts.append("\nStory lines (line number: text):")
+        prompt_parts.extend(f"{line_num}: {line_text}" for line_num, line_text in window)
+        prompt_parts.extend(
+            [
+                "\nFor each line where the character acts against their class "
+                "tactics, personality, ideals, bonds or flaws, add one object to "
+                "a JSON array:",
+                '{"line": <line number>, "issue_type": "tactical" | "personality" '
+                '| "ai_suggestion", "description": "<what is inconsistent>", '
+                '"suggestion": "<what would be more in-character>", '
+                '"score": <consistency 1-10>}',
+                "Return [] when every line is in character. Return only the array.",
+            ]
+        )
+        return "\n".join(prompt_parts)
+
+    @staticmethod
+    def _parse_response(
+        response: str,
+        subject: CharacterMentions,
+        window: List[Tuple[int, str]],
+    ) -> Optional[List[ConsistencyIssue]]:
+        """Parse a batched review's JSON array into consistency issues.
+
+        Args:
+            response: AI response text
+            subject: The character and story under review
+            window: The (line_number, line_text) tuples that were reviewed
+
+        Returns:
+            Issues for reviewed lines, or None when the reply is not a JSON array
+        """
+        start, end = response.find("["), response.rfind("]")
+        if start == -1 or end < start:
+            return None
+        try:
+            items = json.loads(response[start:end + 1])
+        except ValueError:
+            return None
+        if not isinstance(items, list):
+            return None
+
+        lines = dict(window)
+        issues = []
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            try:
+                line_num = int(item.get("line", -1))
+                score = int(item.get("score", 8))
+            except (TypeError, ValueError):
+                continue
+            if line_num not in lines:
+                continue
+            issues.append(
+                ConsistencyIssue(
+                    character_name=subject.character_name,
+                    story_file=subject.story_file,
+                    line_number=line_num,
+                    action_text=lines[line_num],
+                    issue_type=str(item.get("issue_type") or "ai_suggestion"),
+                    description=str(
+                        item.get("description") or "AI identified potential improvement"
+                    ),
+                    suggestion=str(item.get("suggestion", ""))[:300],
+                    score=min(10, max(1, score)),
+                )
+            )
+        return issues
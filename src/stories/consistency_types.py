@@ -0,0 +1,32 @@
+"""Shared types for the story consistency analysis.
+
+``ConsistencyIssue`` and ``ActionContext`` are used by both the rule-based
+checks in ``story_consistency_analyzer`` and the batched AI review in
+``consistency_review``; keeping them here lets each module import them
+without importing the other.
+"""
+
+from typing import Any, Dict, NamedTuple
+
+
+class ConsistencyIssue(NamedTuple):
+    """Represents a consistency issue found in analysis."""
+
+    character_name: str
+    story_file: str
+    line_number: int
+    action_text: str
+    issue_type: str
+    description: str
+    suggestion: str
+    score: int
+
+
+class ActionContext(NamedTuple):
+    """Context information for analyzing a character action."""
+
+    character_name: str
+    profile: Dict[str, Any]
+    story_file: str
+    line_num: int
+    action_text: str
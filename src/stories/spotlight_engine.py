@@ -8,6 +8,11 @@ helper that formats the top entries as a short text block for AI system prompts.
 from typing import Dict, List, NamedTuple, Optional
 
 from src.config.config_types import SpotlightConfig
+from src.stories.campaign_corpus import (
+    CampaignCorpus,
+    get_campaign_corpus,
+    load_json_cached,
+)
 from src.stories.spotlight_signals import (
     collect_dc_failure_signals,
     collect_recency_signals,
@@ -16,7 +21,7 @@ from src.stories.spotlight_signals import (
 )
 from src.stories.spotlight_types import SpotlightEntry, SpotlightReport, SpotlightSignal
 from src.utils.character_profile_utils import list_character_names
-from src.utils.file_io import get_json_files_in_directory, load_json_file
+from src.utils.file_io import get_json_files_in_directory
 from src.utils.path_utils import get_campaign_path, get_npcs_dir
 from src.utils.terminal_display import display_panel
 from src.utils.string_utils import get_timestamp
@@ -25,10 +30,11 @@ _MAX_SCORE = 100.0
 
 
 class _CampaignCtx(NamedTuple):
-    """Lightweight context bundle for campaign path and workspace path."""
+    """Lightweight context bundle for campaign path, workspace and corpus."""
 
     campaign_path: str
     workspace_path: Optional[str]
+    corpus: CampaignCorpus
 
 
 class SpotlightEngine:
@@ -36,7 +42,9 @@ class SpotlightEngine:
 
     Each call to generate_report() collects recency, unresolved thread,
     DC failure, and relationship tension signals, combines them per entity,
-    and returns a SpotlightReport ranked by total score.
+    and returns a SpotlightReport ranked by total score. Story files are read
+    through the shared CampaignCorpus, so only files changed since the last
+    report are re-read.
     """
 
     def generate_report(
@@ -66,9 +74,11 @@ class SpotlightEngine:
             SpotlightReport with all entries sorted by score descending.
         """
         cfg = config or SpotlightConfig()
+        campaign_path = get_campaign_path(campaign_name, workspace_path)
         ctx = _CampaignCtx(
-            campaign_path=get_campaign_path(campaign_name, workspace_path),
+            campaign_path=campaign_path,
             workspace_path=workspace_path,
+            corpus=get_campaign_corpus(campaign_path),
         )
         resolved_chars = (
             character_names if character_names is not None
@@ -76,7 +86,7 @@ class SpotlightEngine:
         )
         npc_names = self._load_npc_names(workspace_path)
         thread_signals = collect_unresolved_thread_signals(
-            ctx.campaign_path, resolved_chars + npc_names, cfg.thread_weight
+            ctx.campaign_path, resolved_chars + npc_names, cfg.thread_weight, ctx.corpus
         )
         char_entries = self._build_character_entries(
             ctx, resolved_chars, cfg, thread_signals
@@ -113,11 +123,12 @@ class SpotlightEngine:
             "character",
             [
                 collect_recency_signals(
-                    ctx.campaign_path, character_names, "character", cfg.recency_weight
+                    ctx.campaign_path, character_names, "character",
+                    cfg.recency_weight, ctx.corpus,
                 ),
                 thread_signals,
                 collect_dc_failure_signals(
-                    ctx.campaign_path, character_names, cfg.dc_weight
+                    ctx.campaign_path, character_names, cfg.dc_weight, ctx.corpus
                 ),
                 collect_relationship_tension_signals(
                     character_names, ctx.workspace_path, cfg.tension_weight
@@ -148,7 +159,7 @@ class SpotlightEngine:
             "npc",
             [
                 collect_recency_signals(
-                    ctx.campaign_path, npc_names, "npc", cfg.recency_weight
+                    ctx.campaign_path, npc_names, "npc", cfg.recency_weight, ctx.corpus
                 ),
                 thread_signals,
             ],
@@ -202,8 +213,9 @@ class SpotlightEngine:
     def _load_npc_names(self, workspace_path: Optional[str] = None) -> List[str]:
         """Load NPC display names from the npcs directory.
 
-        Reads each non-example JSON file and returns the value of the 'name'
-        field. Files without a 'name' field are skipped silently.
+        Reads each non-example JSON file (cached until it changes) and returns
+        the value of the 'name' field. Files without a 'name' field or that
+        cannot be parsed are skipped silently.
 
         Args:
             workspace_path: Optional workspace root path.
@@ -219,14 +231,11 @@ class SpotlightEngine:
         )
 
         for filepath in json_files:
-            try:
-                data = load_json_file(str(filepath))
-                if isinstance(data, dict):
-                    npc_name = data.get("name", "")
-                    if npc_name:
-                        names.append(str(npc_name))
-            except (OSError, ValueError):
-                continue
+            data = load_json_cached(str(filepath))
+            if isinstance(data, dict):
+                npc_name = data.get("name", "")
+                if npc_name:
+                    names.append(str(npc_name))
 
         return names
 
@@ -3,6 +3,9 @@
 Each collector reads from existing data sources (story files, character profiles,
 campaign hooks) and returns a mapping of entity name to SpotlightSignal.
 
+Story and hooks files are read through the shared CampaignCorpus, so repeat
+calls reuse parsed files and name indexes until a file changes on disk.
+
 Signal types and default weights:
     recency              - 20  (sessions since last appearance)
     unresolved_thread    - 25  (open plot threads or NPC follow-ups)
@@ -14,10 +17,12 @@ import os
 import re
 from typing import Dict, List, Optional
 
+from src.stories.campaign_corpus import (
+    CampaignCorpus,
+    get_campaign_corpus,
+    load_character_profile_cached,
+)
 from src.stories.spotlight_types import SpotlightSignal
-from src.utils.character_profile_utils import load_character_profile
-from src.utils.file_io import read_text_file
-from src.utils.story_file_helpers import list_story_files
 
 
 # Keywords that indicate relationship tension in a character profile
@@ -46,43 +51,6 @@ _DC_PATTERN = re.compile(
 )
 
 
-def _read_story_content(campaign_path: str, filename: str) -> str:
-    """Read a single story file and return its content.
-
-    Args:
-        campaign_path: Absolute path to the campaign directory.
-        filename: Story filename to read.
-
-    Returns:
-        File content string, or empty string on read error.
-    """
-    filepath = os.path.join(campaign_path, filename)
-    try:
-        return read_text_file(filepath) or ""
-    except (OSError, UnicodeDecodeError):
-        return ""
-
-
-def _extract_section(content: str, section_title: str) -> str:
-    """Extract the body of a markdown section by heading title.
-
-    Reads from the heading up to the next same-level heading or end of file.
-
-    Args:
-        content: Full markdown file content.
-        section_title: Exact section heading text (without leading # symbols).
-
-    Returns:
-        Section body text stripped of surrounding whitespace, or empty string.
-    """
-    pattern = re.compile(
-        rf"##\s+{re.escape(section_title)}\s*\n(.*?)(?=\n##|\Z)",
-        re.DOTALL | re.IGNORECASE,
-    )
-    match = pattern.search(content)
-    return match.group(1).strip() if match else ""
-
-
 def _find_evidence_sentence(text: str, name: str) -> str:
     """Find the first sentence containing name in text.
 
@@ -101,19 +69,17 @@ def _find_evidence_sentence(text: str, name: str) -> str:
     return match.group(0).strip() if match else ""
 
 
-def _name_near_dc_pattern(content: str, name: str) -> bool:
+def _name_near_dc_pattern(content: str, name_pos: int, name: str) -> bool:
     """Check whether a DC-related pattern appears within 200 chars of name.
 
     Args:
         content: Text content to search.
-        name: Name to find.
+        name_pos: Offset of the first occurrence of name in content.
+        name: The name found at name_pos.
 
     Returns:
         True if a DC pattern appears within 200 characters of name.
     """
-    name_pos = content.find(name)
-    if name_pos < 0:
-        return False
     window_start = max(0, name_pos - 200)
     window_end = name_pos + 200 + len(name)
     window = content[window_start:window_end]
@@ -125,6 +91,7 @@ def collect_recency_signals(
     names: List[str],
     entity_type: str,
     recency_weight: float = 20.0,
+    corpus: Optional[CampaignCorpus] = None,
 ) -> Dict[str, SpotlightSignal]:
     """Score entities by how many sessions have passed since last mention.
 
@@ -138,22 +105,21 @@ def collect_recency_signals(
         names: Entity names to check for story mentions.
         entity_type: "character" or "npc" (used in description text only).
         recency_weight: Maximum weight contribution for this signal type.
+        corpus: Parsed campaign files; defaults to the shared corpus.
 
     Returns:
         Mapping of entity name to SpotlightSignal for entities absent from
         at least one session at the end of the campaign.
     """
-    story_files = list_story_files(campaign_path)
-    total_sessions = len(story_files)
+    documents = (corpus or get_campaign_corpus(campaign_path)).story_documents()
+    total_sessions = len(documents)
     if total_sessions == 0 or not names:
         return {}
 
     last_seen: Dict[str, int] = {}
-    for index, filename in enumerate(story_files):
-        content = _read_story_content(campaign_path, filename)
-        for name in names:
-            if name in content:
-                last_seen[name] = index
+    for index, doc in enumerate(documents):
+        for name in doc.content.mentions(names):
+            last_seen[name] = index
 
     signals: Dict[str, SpotlightSignal] = {}
     for name in names:
@@ -162,7 +128,7 @@ def collect_recency_signals(
             last_file = "never"
         else:
             sessions_absent = total_sessions - last_seen[name] - 1
-            last_file = story_files[last_seen[name]]
+            last_file = documents[last_seen[name]].filename
 
         if sessions_absent > 0:
             weight = recency_weight * (sessions_absent / total_sessions)
@@ -183,6 +149,7 @@ def collect_unresolved_thread_signals(
     campaign_path: str,
     names: List[str],
     thread_weight: float = 25.0,
+    corpus: Optional[CampaignCorpus] = None,
 ) -> Dict[str, SpotlightSignal]:
     """Identify entities mentioned in open plot threads or NPC follow-ups.
 
@@ -193,6 +160,7 @@ def collect_unresolved_thread_signals(
         campaign_path: Absolute path to the campaign directory.
         names: Entity names to check for thread mentions.
         thread_weight: Weight contribution when a thread mention is found.
+        corpus: Parsed campaign files; defaults to the shared corpus.
 
     Returns:
         Mapping of entity name to SpotlightSignal for entities referenced
@@ -211,15 +179,19 @@ def collect_unresolved_thread_signals(
         return {}
 
     latest_hooks = hook_files[-1]
-    raw_content = _read_story_content(campaign_path, latest_hooks)
+    doc = (corpus or get_campaign_corpus(campaign_path)).document(latest_hooks)
+    if doc is None:
+        return {}
 
-    thread_section = _extract_section(raw_content, "Unresolved Plot Threads")
-    npc_section = _extract_section(raw_content, "NPC Follow-ups")
-    combined = f"{thread_section}\n{npc_section}"
+    thread_section = doc.section("Unresolved Plot Threads")
+    npc_section = doc.section("NPC Follow-ups")
+    mentioned = set(thread_section.mentions(names))
+    mentioned.update(npc_section.mentions(names))
+    combined = f"{thread_section.text}\n{npc_section.text}"
 
     signals: Dict[str, SpotlightSignal] = {}
     for name in names:
-        if name in combined:
+        if name in mentioned:
             evidence = _find_evidence_sentence(combined, name)
             signals[name] = SpotlightSignal(
                 signal_type="unresolved_thread",
@@ -235,6 +207,7 @@ def collect_dc_failure_signals(
     campaign_path: str,
     character_names: List[str],
     dc_weight: float = 20.0,
+    corpus: Optional[CampaignCorpus] = None,
 ) -> Dict[str, SpotlightSignal]:
     """Find characters involved in pending or failed DC checks.
 
@@ -246,6 +219,7 @@ def collect_dc_failure_signals(
         campaign_path: Absolute path to the campaign directory.
         character_names: Character names to check for DC events.
         dc_weight: Maximum weight contribution for a pending DC signal.
+        corpus: Parsed campaign files; defaults to the shared corpus.
 
     Returns:
         Mapping of character name to SpotlightSignal for characters with
@@ -256,31 +230,35 @@ def collect_dc_failure_signals(
 
     signals: Dict[str, SpotlightSignal] = {}
 
-    for filename in list_story_files(campaign_path):
-        content = _read_story_content(campaign_path, filename)
-
+    for doc in (corpus or get_campaign_corpus(campaign_path)).story_documents():
         # Check 'DC Suggestions Needed' section for character mentions
-        dc_section = _extract_section(content, "DC Suggestions Needed")
-        if dc_section:
+        dc_section = doc.section("DC Suggestions Needed")
+        if dc_section.text:
+            in_section = dc_section.first_positions(character_names)
             for name in character_names:
-                if name in dc_section and name not in signals:
-                    evidence = _find_evidence_sentence(dc_section, name)
+                if name in in_section and name not in signals:
+                    evidence = _find_evidence_sentence(dc_section.text, name)
                     signals[name] = SpotlightSignal(
                         signal_type="dc_failure",
                         description="Involved in a pending DC check",
                         weight=round(dc_weight, 2),
-                        evidence=evidence or f"Pending DC in {filename}",
+                        evidence=evidence or f"Pending DC in {doc.filename}",
                     )
 
         # Check narrative content for DC failure patterns near character names
-        if _DC_PATTERN.search(content):
+        if doc.matches(_DC_PATTERN):
+            positions = doc.content.first_positions(character_names)
             for name in character_names:
-                if name not in signals and _name_near_dc_pattern(content, name):
+                if (
+                    name not in signals
+                    and name in positions
+                    and _name_near_dc_pattern(doc.content.text, positions[name], name)
+                ):
                     signals[name] = SpotlightSignal(
                         signal_type="dc_failure",
                         description="Involved in a DC check event",
                         weight=round(dc_weight * 0.6, 2),
-                        evidence=f"DC event near name in {filename}",
+                        evidence=f"DC event near name in {doc.filename}",
                     )
 
     return signals
@@ -293,8 +271,9 @@ def collect_relationship_tension_signals(
 ) -> Dict[str, SpotlightSignal]:
     """Score characters with conflicted or unresolved relationships.
 
-    Reads each character profile and checks the 'relationships' dictionary for
-    values that contain tension keywords (conflict, rivalry, distrust, etc.).
+    Reads each character profile (cached until the file changes) and checks
+    the 'relationships' dictionary for values that contain tension keywords
+    (conflict, rivalry, distrust, etc.).
     Weight scales with number of tense relationships, capped at tension_weight.
 
     Args:
@@ -312,7 +291,7 @@ def collect_relationship_tension_signals(
     signals: Dict[str, SpotlightSignal] = {}
 
     for name in character_names:
-        profile = load_character_profile(name, workspace_path)
+        profile = load_character_profile_cached(name, workspace_path)
         if not profile:
             continue
 
@@ -7,13 +7,13 @@ stories. Includes RAG (Retrieval-Augmented Generation) integration for accurate
 D&D spell/ability descriptions via dnd5e.wikidot.com.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from src.ai.availability import AI_AVAILABLE
 from src.ai.prompt_templates import LANGUAGE_INSTRUCTION
 from src.utils.errors import display_error, wrap_exception
 from src.utils.spell_lookup_helper import lookup_spells_and_abilities
-from src.ai.ai_client import AIClient
+from src.ai.ai_client import AIClient, stream_completion
 
 
 def _build_story_context(
@@ -178,6 +178,95 @@ def generate_story_from_prompt(
     if story_config is None:
         story_config = {}
 
+    system_prompt, user_prompt = _build_story_prompts(story_prompt, story_config)
+
+    try:
+        # Make AI request
+        response = ai_client.client.chat.completions.create(
+            model=ai_client.model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            max_tokens=story_config.get("max_tokens", 2000),
+            temperature=0.8,
+        )
+
+        # Extract generated text
+        generated_text = response.choices[0].message.content.strip()
+        return generated_text
+
+    except (AttributeError, TypeError, KeyError) as e:
+        display_error(wrap_exception(e, context={"operation": "generate story"}))
+        return None
+
+
+def stream_story_from_prompt(
+    ai_client: Optional[AIClient],
+    story_prompt: str,
+    story_config: Optional[Dict[str, Any]] = None,
+) -> Iterator[str]:
+    """
+    Stream a story narrative as the AI model generates it.
+
+    Streaming counterpart of generate_story_from_prompt(): builds the same
+    prompts and yields text deltas as they arrive, so callers can display or
+    checkpoint the story from the first token instead of waiting for the
+    whole response.
+
+    Args:
+        ai_client: Initialized AIClient instance for making AI requests.
+        story_prompt: User's story concept or prompt.
+        story_config: Optional dict with generation settings (same keys as
+            generate_story_from_prompt()).
+
+    Yields:
+        Narrative text deltas. Nothing is yielded when AI is unavailable;
+        a failed request ends the stream after any text already produced.
+
+    Raises:
+        ValueError: If story_prompt is empty or None.
+    """
+    if not story_prompt or not story_prompt.strip():
+        raise ValueError("Story prompt cannot be empty")
+
+    if ai_client is None or not AI_AVAILABLE:
+        return iter(())
+
+    story_config = story_config or {}
+    system_prompt, user_prompt = _build_story_prompts(story_prompt, story_config)
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ]
+    return _stream_story(ai_client, messages, story_config.get("max_tokens", 2000))
+
+
+def _stream_story(
+    ai_client: AIClient, messages: List[Dict[str, str]], max_tokens: int
+) -> Iterator[str]:
+    """Yield story deltas, reporting a failed request instead of raising."""
+    try:
+        yield from stream_completion(
+            ai_client, messages, temperature=0.8, max_tokens=max_tokens
+        )
+    except (RuntimeError, AttributeError, TypeError, KeyError) as e:
+        display_error(wrap_exception(e, context={"operation": "stream story"}))
+
+
+def _build_story_prompts(
+    story_prompt: str, story_config: Dict[str, Any]
+) -> Tuple[str, str]:
+    """
+    Build the system and user prompts for story generation.
+
+    Args:
+        story_prompt: User's story concept or prompt.
+        story_config: Generation settings (see generate_story_from_prompt()).
+
+    Returns:
+        Tuple of (system_prompt, user_prompt).
+    """
     # Build combined context (including NPC context)
     context = _build_story_context(
         story_config.get("party_characters"),
@@ -213,25 +302,7 @@ def generate_story_from_prompt(
         "narrative prose suitable for a story file."
     )
 
-    try:
-        # Make AI request
-        response = ai_client.client.chat.completions.create(
-            model=ai_client.model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            max_tokens=story_config.get("max_tokens", 2000),
-            temperature=0.8,
-        )
-
-        # Extract generated text
-        generated_text = response.choices[0].message.content.strip()
-        return generated_text
-
-    except (AttributeError, TypeError, KeyError) as e:
-        display_error(wrap_exception(e, context={"operation": "generate story"}))
-        return None
+    return system_prompt, user_prompt
 
 
 def _build_story_system_prompt(is_exploration: bool = False) -> str:
@@ -5,11 +5,17 @@ across an entire story series. Checks character actions against their profiles
 including backstory, personality traits, ideals, bonds, flaws, and plot actions.
 
 Handles name variations (e.g., "Frodo Baggins" in JSON vs "Frodo" in story text).
+
+With an AI client, every mention of a character in one story is reviewed in a
+single structured prompt (see consistency_review). Story files are analysed
+concurrently (CONSISTENCY_CONCURRENCY).
 """
 
 import os
 import re
-from typing import Dict, List, Any, Optional, Tuple, NamedTuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple, NamedTuple, Pattern
 from src.utils.file_io import (
     read_text_file,
     write_text_file,
@@ -26,29 +32,31 @@ from src.stories.equipment_checker import (
     format_equipment_issue,
 )
 from src.ai.ai_client import AIClientProtocol
+from src.character_arc.arc_cache import ChunkAnalysisCache
+from src.stories.consistency_review import (
+    BatchConsistencyReviewer,
+    CharacterMentions,
+    profile_lines,
+)
+from src.stories.consistency_types import ActionContext, ConsistencyIssue
+from src.config.config_loader import load_config
 
 
-class ConsistencyIssue(NamedTuple):
-    """Represents a consistency issue found in analysis."""
-
-    character_name: str
-    story_file: str
-    line_number: int
-    action_text: str
-    issue_type: str
-    description: str
-    suggestion: str
-    score: int
-
+class ConsistencyOptions(NamedTuple):
+    """How StoryConsistencyAnalyzer runs its checks.
 
-class ActionContext(NamedTuple):
-    """Context information for analyzing a character action."""
+    Attributes:
+        batch_ai: Review each character's lines per story in batched AI
+            calls; False sends one AI call per mentioned line
+        max_workers: Story files analysed concurrently (defaults to
+            CONSISTENCY_CONCURRENCY)
+        result_cache: Cache for batched AI findings; the shared cache in
+            ``paths.cache_dir`` is used when omitted
+    """
 
-    character_name: str
-    profile: Dict[str, Any]
-    story_file: str
-    line_num: int
-    action_text: str
+    batch_ai: bool = True
+    max_workers: Optional[int] = None
+    result_cache: Optional[ChunkAnalysisCache] = None
 
 
 class CharacterNameMatcher:
@@ -102,17 +110,19 @@ class CharacterNameMatcher:
         Returns:
             List of (line_number, line_text) tuples where character is mentioned
         """
-        patterns = CharacterNameMatcher.build_name_patterns(character_name)
-        mentions = []
+        pattern = _compiled_name_pattern(character_name)
+        return [
+            (line_num, line.strip())
+            for line_num, line in enumerate(text.split("\n"), start=1)
+            if pattern.search(line)
+        ]
 
-        lines = text.split("\n")
-        for line_num, line in enumerate(lines, start=1):
-            for pattern in patterns:
-                if re.search(pattern, line, re.IGNORECASE):
-                    mentions.append((line_num, line.strip()))
-                    break
 
-        return mentions
+@lru_cache(maxsize=256)
+def _compiled_name_pattern(full_name: str) -> Pattern[str]:
+    """Compile a name's variation patterns into one case-insensitive regex."""
+    patterns = CharacterNameMatcher.build_name_patterns(full_name)
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns), re.IGNORECASE)
 
 
 class TacticalAnalyzer:
@@ -414,30 +424,8 @@ class AIAnalyzer:
         Returns:
             Formatted prompt string
         """
-        prompt_parts = [
-            "Analyze this D&D character action for consistency:\n",
-            f"Character: {character_name}",
-            f"Class: {profile.get('dnd_class', 'Unknown')}",
-            f"Level: {profile.get('level', 'Unknown')}",
-        ]
-
-        profile_fields = [
-            ("backstory", "Backstory", 200),
-            ("personality_traits", "Personality", None),
-            ("ideals", "Ideals", None),
-            ("bonds", "Bonds", None),
-            ("flaws", "Flaws", None),
-        ]
-
-        for field_name, label, max_len in profile_fields:
-            if profile.get(field_name):
-                value = profile[field_name]
-                if isinstance(value, list):
-                    value = ", ".join(value)
-                elif max_len:
-                    value = value[:max_len]
-                prompt_parts.append(f"{label}: {value}")
-
+        prompt_parts = ["Analyze this D&D character action for consistency:\n"]
+        prompt_parts.extend(profile_lines(character_name, profile))
         prompt_parts.extend(
             [
                 f"\nAction in Story:\n{action_text}",
@@ -492,19 +480,42 @@ class AIAnalyzer:
 class StoryConsistencyAnalyzer:
     """Analyzes story consistency across a series."""
 
-    def __init__(self, workspace_path: str, ai_client: Optional[AIClientProtocol] = None):
+    def __init__(
+        self,
+        workspace_path: str,
+        ai_client: Optional[AIClientProtocol] = None,
+        options: ConsistencyOptions = ConsistencyOptions(),
+    ):
         """Initialize analyzer.
 
         Args:
             workspace_path: Root workspace path
             ai_client: Optional AI client for enhanced analysis
+            options: Batching, concurrency and findings cache settings
         """
         self.workspace_path = workspace_path
-        self.ai_client = ai_client
+        self.max_workers = max(
+            1, options.max_workers or load_config().performance.consistency_concurrency
+        )
         self.name_matcher = CharacterNameMatcher()
         self.tactical_analyzer = TacticalAnalyzer()
         self.personality_analyzer = PersonalityAnalyzer()
         self.ai_analyzer = AIAnalyzer(ai_client)
+        self.batch_reviewer = (
+            BatchConsistencyReviewer(ai_client, options.result_cache)
+            if options.batch_ai
+            else None
+        )
+
+    @property
+    def ai_client(self) -> Optional[AIClientProtocol]:
+        """AI client used for enhanced analysis, if any."""
+        return self.ai_analyzer.ai_client
+
+    @property
+    def batch_ai(self) -> bool:
+        """True when AI review is batched per character and story."""
+        return self.batch_reviewer is not None
 
     def get_workspace_path(self) -> str:
         """Get the workspace path.
@@ -532,9 +543,7 @@ class StoryConsistencyAnalyzer:
         )
 
         profiles = self._load_character_profiles(party_members)
-        all_issues = []
-        story_analyses = []
-
+        stories = []
         for story_file in story_files:
             story_path = os.path.join(series_path, story_file)
             if not file_exists(story_path):
@@ -543,10 +552,16 @@ class StoryConsistencyAnalyzer:
             story_text = read_text_file(story_path)
             if story_text is None:
                 continue
-            story_issues = self._analyze_story_file(story_file, story_text, profiles)
+            stories.append((story_file, story_text))
 
-            all_issues.extend(story_issues)
-            story_analyses.append({"filename": story_file, "issues": story_issues})
+        results = self._map_stories(
+            lambda story: self._analyze_story_file(story[0], story[1], profiles), stories
+        )
+        all_issues = [issue for story_issues in results for issue in story_issues]
+        story_analyses = [
+            {"filename": story_file, "issues": story_issues}
+            for (story_file, _), story_issues in zip(stories, results)
+        ]
 
         report_path = self._generate_report(
             series_name, series_path, story_analyses, profiles
@@ -560,6 +575,13 @@ class StoryConsistencyAnalyzer:
             "issues": all_issues,
         }
 
+    def _map_stories(self, func: Any, stories: List[Tuple[str, str]]) -> List[Any]:
+        """Apply func to every story on a bounded thread pool, keeping order."""
+        if len(stories) <= 1 or self.max_workers == 1:
+            return [func(story) for story in stories]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(stories))) as pool:
+            return list(pool.map(func, stories))
+
     def _load_character_profiles(
         self, party_members: List[str]
     ) -> Dict[str, Dict[str, Any]]:
@@ -634,6 +656,16 @@ class StoryConsistencyAnalyzer:
             char_issues = self._check_action_consistency(ctx)
             issues.extend(char_issues)
 
+        if self.batch_reviewer is not None and self.ai_client and mentions:
+            issues.extend(
+                self.batch_reviewer.review(
+                    CharacterMentions(
+                        character_name, profile, story_file, story_text, mentions
+                    )
+                )
+            )
+            issues.sort(key=lambda issue: issue.line_number)
+
         return issues
 
     def _check_action_consistency(self, ctx: ActionContext) -> List[ConsistencyIssue]:
@@ -655,7 +687,7 @@ class StoryConsistencyAnalyzer:
         if personality_issue:
             issues.append(personality_issue)
 
-        if self.ai_client:
+        if self.ai_client and not self.batch_ai:
             ai_issues = self.ai_analyzer.analyze_with_ai(ctx)
             issues.extend(ai_issues)
 
@@ -803,9 +835,7 @@ def check_relationship_consistency(
     graph = relationship_manager.build_relationship_graph()
 
     for other in mentioned_characters:
-        rels = [r for s, t, r in graph.edges
-                if (s == character_name and t == other) or
-                   (s == other and t == character_name)]
+        rels = graph.relationships_between(character_name, other)
 
         if not rels:
             warnings.append(
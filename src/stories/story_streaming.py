@@ -0,0 +1,202 @@
+"""
+Streaming story writes.
+
+Streaming counterparts of the StoryUpdater append methods: deltas from a
+streaming completion are passed through to the caller while the partial
+section is checkpointed to the story file, so an interrupted generation never
+truncates the story and keeps everything produced so far.
+"""
+
+import time
+from typing import TYPE_CHECKING, Callable, Generator, Iterable, List, NamedTuple, Optional
+
+from src.utils.file_io import file_exists, read_text_file, write_text_file_atomic
+
+if TYPE_CHECKING:
+    from src.stories.story_updater import ContinuationConfig
+
+
+# Streamed sections are checkpointed to the story file after this many new
+# characters or seconds, whichever comes first.
+_CHECKPOINT_CHARS = 400
+_CHECKPOINT_SECONDS = 2.0
+
+
+class CombatSection(NamedTuple):
+    """How a combat narrative is written into the story.
+
+    Attributes:
+        title: Section title (defaults to "Combat Scene")
+        prompt: User prompt for spell extraction
+        finalize: Post-processing for a streamed narrative once it is complete
+            (e.g. finalize_combat_narrative())
+    """
+
+    title: Optional[str] = None
+    prompt: Optional[str] = None
+    finalize: Optional[Callable[[str], str]] = None
+
+
+class StreamCheckpoint:
+    """Accumulates a streamed section and periodically saves it to the story.
+
+    Each checkpoint atomically rewrites the file as the original content plus
+    an in-progress section holding the text received so far, so a crash or
+    interrupted generation never truncates the story and keeps the partial
+    output.
+    """
+
+    def __init__(self, filepath: str, base_content: str, heading: str):
+        """Initialize the checkpoint.
+
+        Args:
+            filepath: Story file to write
+            base_content: File content before streaming started
+            heading: Markdown heading line for the in-progress section
+        """
+        self.filepath = filepath
+        self.base_content = base_content
+        self.heading = heading
+        self._parts: List[str] = []
+        self._saved_len = 0
+        self._saved_at = time.monotonic()
+
+    @property
+    def text(self) -> str:
+        """Text received so far."""
+        return "".join(self._parts)
+
+    def add(self, delta: str) -> None:
+        """Append a delta, checkpointing when enough text or time has passed."""
+        self._parts.append(delta)
+        pending = sum(map(len, self._parts)) - self._saved_len
+        if (
+            pending >= _CHECKPOINT_CHARS
+            or time.monotonic() - self._saved_at >= _CHECKPOINT_SECONDS
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """Save the text received so far if anything changed since the last save."""
+        text = self.text
+        if len(text) == self._saved_len:
+            return
+        write_text_file_atomic(
+            self.filepath,
+            f"{self.base_content.rstrip()}\n\n{self.heading}\n\n{text}\n",
+        )
+        self._saved_len = len(text)
+        self._saved_at = time.monotonic()
+
+    def restore(self) -> None:
+        """Put the original content back (used when nothing was generated)."""
+        write_text_file_atomic(self.filepath, self.base_content)
+
+    def record(self, deltas: Iterable[str]) -> Generator[str, None, None]:
+        """Pass deltas through, checkpointing them; the last one is always saved."""
+        try:
+            for delta in deltas:
+                self.add(delta)
+                yield delta
+        finally:
+            self.flush()
+
+
+class StoryStreamingMixin:
+    """Streaming story appends for StoryUpdater.
+
+    Classes using this mixin must implement the blocking writers the streamed
+    text is handed to once the stream ends: ``_write_combat_section`` and
+    ``_append_continuation``.
+    """
+
+    def _write_combat_section(
+        self, filepath: str, content: str, narrative: str, section: CombatSection
+    ) -> None:
+        """Must be implemented by subclass."""
+        raise NotImplementedError("Subclass must implement _write_combat_section()")
+
+    def _append_continuation(
+        self, config: "ContinuationConfig", base_content: Optional[str] = None
+    ) -> bool:
+        """Must be implemented by subclass (validates the config first)."""
+        raise NotImplementedError("Subclass must implement _append_continuation()")
+
+    def stream_combat_narrative(
+        self,
+        filepath: str,
+        deltas: Iterable[str],
+        section: CombatSection = CombatSection(),
+    ) -> Generator[str, None, str]:
+        """Stream a combat narrative into the story file as it is generated.
+
+        Deltas are passed through to the caller while the partial narrative is
+        checkpointed under an in-progress heading. Once the stream ends the
+        section is rewritten as a finished combat section.
+
+        Args:
+            filepath: Path to the story file
+            deltas: Narrative text deltas (e.g. stream_combat_from_prompt())
+            section: Title, spell prompt and finalize step for the section
+
+        Yields:
+            Each delta, after it has been recorded
+
+        Returns:
+            The finished narrative (empty when nothing was generated or the
+            story file does not exist)
+        """
+        if not file_exists(filepath):
+            return ""
+        checkpoint = StreamCheckpoint(
+            filepath, read_text_file(filepath) or "", "### Combat Scene (in progress)"
+        )
+        yield from checkpoint.record(deltas)
+
+        narrative = checkpoint.text
+        if not narrative.strip():
+            checkpoint.restore()
+            return ""
+        if section.finalize:
+            narrative = section.finalize(narrative)
+        self._write_combat_section(filepath, checkpoint.base_content, narrative, section)
+        return narrative
+
+    def stream_ai_continuation(
+        self, config: "ContinuationConfig", deltas: Iterable[str]
+    ) -> Generator[str, None, bool]:
+        """Stream an AI continuation into the story file as it is generated.
+
+        Streaming counterpart of append_ai_continuation(): the continuation
+        text comes from ``deltas`` instead of ``config.continuation``. Each
+        delta is passed through to the caller while the partial text is
+        checkpointed under an in-progress heading, so an interrupted
+        generation keeps everything produced so far. When the stream ends the
+        section is titled and processed, and the supporting files are
+        generated, exactly as append_ai_continuation() does.
+
+        Args:
+            config: ContinuationConfig with paths, optional ai_client and prompt
+            deltas: Continuation text deltas (e.g. stream_story_from_prompt())
+
+        Yields:
+            Each delta, after it has been recorded
+
+        Returns:
+            True if the continuation was appended, False otherwise
+        """
+        if not config.filepath or not file_exists(config.filepath):
+            return False
+
+        base_content = read_text_file(config.filepath) or ""
+        checkpoint = StreamCheckpoint(
+            config.filepath, base_content, "## Story Continuation (in progress)"
+        )
+        yield from checkpoint.record(deltas)
+
+        if not checkpoint.text.strip():
+            checkpoint.restore()
+            return False
+
+        config.set_content(checkpoint.text)
+        return self._append_continuation(config, base_content=base_content)
@@ -41,6 +41,7 @@ from src.cli.party_config_manager import load_party_with_profiles, load_current_
 from src.characters.character_consistency import create_character_development_file
 from src.stories.character_action_analyzer import extract_character_actions
 from src.ai.ai_client import AIClientProtocol
+from src.stories.story_streaming import CombatSection, StoryStreamingMixin
 
 
 class ContinuationConfig:
@@ -125,7 +126,7 @@ class ContinuationConfig:
         )
 
 
-class StoryUpdater:
+class StoryUpdater(StoryStreamingMixin):
     """Updates story files with consultant analysis and consistency notes."""
 
     def update_story_with_analysis(self, filepath: str, analysis: Dict[str, Any]):
@@ -201,11 +202,19 @@ class StoryUpdater:
         if content is None:
             content = ""
 
+        self._write_combat_section(
+            filepath, content, narrative, CombatSection(title, prompt)
+        )
+
+    def _write_combat_section(
+        self, filepath: str, content: str, narrative: str, section: CombatSection
+    ) -> None:
+        """Append a combat section to existing content and save the story."""
         # Use provided title or default to "Combat Scene"
-        section_title = title if title else "Combat Scene"
+        section_title = section.title if section.title else "Combat Scene"
 
         # Process narrative: wrap and highlight spells from prompt
-        processed_narrative = self._process_narrative(narrative, prompt)
+        processed_narrative = self._process_narrative(narrative, section.prompt)
 
         # Add combat section with level 3 header for indentation
         combat_section = f"\n\n### {section_title}\n\n{processed_narrative}\n"
@@ -231,29 +240,34 @@ class StoryUpdater:
         Returns:
             True if successful, False if an error occurred
         """
-        if not config.validate():
-            display_error(UserInputError(
-                message="Invalid continuation config",
-                user_guidance="Ensure all required fields are present in the config"
-            ))
-            return False
-
         return self._append_continuation(config)
 
-    def _append_continuation(self, config: ContinuationConfig) -> bool:
-        """Append continuation using config object.
+    def _append_continuation(
+        self, config: ContinuationConfig, base_content: Optional[str] = None
+    ) -> bool:
+        """Validate the config and append its continuation.
 
         Args:
             config: ContinuationConfig with all parameters
+            base_content: Story content to append to; read from the file when
+                omitted
 
         Returns:
             True if successful, False if an error occurred
         """
+        if not config.validate():
+            display_error(UserInputError(
+                message="Invalid continuation config",
+                user_guidance="Ensure all required fields are present in the config"
+            ))
+            return False
         if not config.filepath or not file_exists(config.filepath):
             return False
 
         try:
-            current_content = read_text_file(config.filepath)
+            current_content = base_content
+            if current_content is None:
+                current_content = read_text_file(config.filepath)
             if current_content is None:
                 current_content = ""
 
@@ -484,7 +498,8 @@ class StoryUpdater:
             )
 
             title = ai_client.chat_completion(
-                messages=[{"role": "user", "content": prompt}], temperature=0.7
+                messages=[{"role": "user", "content": prompt}], temperature=0.7,
+                cache=True,
             ).strip()
 
             # Clean up the title
@@ -1,9 +1,13 @@
 """Extract timeline events from story files."""
 
+import hashlib
 import json
+import os
 import re
-from dataclasses import dataclass
-from typing import Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from src.timeline.event_schema import (
     EventContext,
@@ -13,7 +17,7 @@ from src.timeline.event_schema import (
     EventType,
     TimelineEvent,
 )
-from src.utils.file_io import read_text_file
+from src.utils.file_io import load_json_file, read_text_file, save_json_file
 from src.ai.ai_client import AIClientProtocol
 
 
@@ -105,6 +109,15 @@ EXTRACTION_PATTERNS = [
     ),
 ]
 
+# Content hashes of the story files already extracted, kept in the campaign dir.
+EXTRACTION_MANIFEST_FILE = "timeline_extraction.json"
+
+_NAME_RE = re.compile(r"\b[A-Z][a-z]+\b")
+_LOCATION_RES = [
+    re.compile(r"(?:in|at|near|inside|outside)\s+(?:the\s+)?([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)"),
+    re.compile(r"(?:arrives? at|reaches?|enters?)\s+(?:the\s+)?([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)"),
+]
+
 _COMMON_WORDS = {"The", "A", "An", "He", "She", "They", "It", "This", "That"}
 
 _TYPE_TITLES = {
@@ -120,12 +133,86 @@ _TYPE_TITLES = {
 }
 
 
+class PatternScanner:
+    """Finds the matches of many event patterns in one scan of a text.
+
+    The patterns are combined into one case-insensitive lookahead
+    alternation with a named group per pattern, so a text is scanned once
+    for the positions where any pattern can start; only those positions are
+    re-checked against the individual patterns.
+
+    Attributes:
+        patterns: (event type, compiled pattern) pairs in extraction order.
+    """
+
+    def __init__(self, patterns: List[Tuple[EventType, "re.Pattern[str]"]]) -> None:
+        """
+        Args:
+            patterns: (event type, compiled pattern) pairs in extraction order.
+        """
+        self.patterns = patterns
+        self._combined = re.compile(
+            "(?=" + "|".join(
+                f"(?P<p{index}>{pattern.pattern})"
+                for index, (_, pattern) in enumerate(patterns)
+            ) + ")",
+            re.IGNORECASE,
+        )
+
+    def find_matches(self, text: str) -> List[List["re.Match[str]"]]:
+        """Find every pattern's matches in one scan of the text.
+
+        Returns:
+            Per entry of ``patterns``, the same non-overlapping matches
+            ``pattern.finditer(text)`` would yield.
+        """
+        matches: List[List["re.Match[str]"]] = [[] for _ in self.patterns]
+        resume_at = [0] * len(self.patterns)
+        for hit in self._combined.finditer(text):
+            if hit.lastgroup is None:
+                continue
+            position = hit.start()
+            # Patterns listed before the first matching group cannot start here.
+            first = int(hit.lastgroup[1:])
+            for index in range(first, len(self.patterns)):
+                if position < resume_at[index]:
+                    continue
+                match = self.patterns[index][1].match(text, position)
+                if match is None:
+                    continue
+                matches[index].append(match)
+                # finditer resumes after a match (one step on for empty ones).
+                resume_at[index] = max(match.end(), position + 1)
+        return matches
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[EventType, "re.Match[str]"]]:
+        """Yield (event type, match) for every match, pattern by pattern."""
+        for (event_type, _), matches in zip(self.patterns, self.find_matches(text)):
+            for match in matches:
+                yield event_type, match
+
+
 class EventExtractor:
-    """Extracts events from story text using regex patterns."""
+    """Extracts events from story text using regex patterns.
+
+    Each paragraph is scanned once for all patterns (see PatternScanner).
 
-    def __init__(self):
+    Attributes:
+        scanner: The combined scanner over every extraction pattern.
+    """
+
+    def __init__(self) -> None:
         """Initialize the event extractor."""
         self._compiled_patterns = self._compile_patterns()
+        self.scanner = PatternScanner([
+            (event_type, pattern)
+            for event_type, patterns in self._compiled_patterns.items()
+            for pattern in patterns
+        ])
+        self._priorities = {
+            extraction.event_type: extraction.priority
+            for extraction in reversed(EXTRACTION_PATTERNS)
+        }
 
     def _compile_patterns(self) -> Dict[EventType, List[re.Pattern]]:
         """Compile regex patterns for efficiency."""
@@ -148,6 +235,57 @@ class EventExtractor:
             return []
         return self.extract_from_text(content, campaign_name, story_file)
 
+    def extract_from_campaign(
+        self,
+        campaign_dir: str,
+        campaign_name: str = "",
+        max_workers: Optional[int] = None,
+        force: bool = False,
+    ) -> List[TimelineEvent]:
+        """Extract events from every story file of a campaign.
+
+        Files whose content hash matches the one recorded in the campaign's
+        extraction manifest are skipped; the rest are extracted in a process
+        pool and the manifest is updated once they finish.
+
+        Args:
+            campaign_dir: Campaign directory holding the story ``.md`` files.
+            campaign_name: Campaign name for the extracted events
+                (defaults to the directory name).
+            max_workers: Worker processes (default: one per CPU); 1 extracts
+                in this process.
+            force: Re-extract every file, ignoring recorded hashes.
+
+        Returns:
+            Events from the new or changed files, in file name order.
+        """
+        if not os.path.isdir(campaign_dir):
+            return []
+        campaign_name = campaign_name or os.path.basename(os.path.normpath(campaign_dir))
+        manifest_path = os.path.join(campaign_dir, EXTRACTION_MANIFEST_FILE)
+        recorded: Dict[str, str] = (load_json_file(manifest_path) or {}).get("files", {})
+
+        pending: List[Tuple[str, str]] = []
+        hashes: Dict[str, str] = {}
+        for story_file in sorted(os.listdir(campaign_dir)):
+            if not story_file.endswith(".md"):
+                continue
+            content = read_text_file(os.path.join(campaign_dir, story_file)) or ""
+            hashes[story_file] = hashlib.sha256(content.encode("utf-8")).hexdigest()
+            if force or recorded.get(story_file) != hashes[story_file]:
+                pending.append((story_file, content))
+
+        jobs = [(content, campaign_name, story_file) for story_file, content in pending]
+        workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_extract_story_job, jobs))
+        else:
+            results = [_extract_story_job(job, self) for job in jobs]
+
+        save_json_file(manifest_path, {"campaign_name": campaign_name, "files": hashes})
+        return [event for events in results for event in events]
+
     def extract_from_text(
         self,
         text: str,
@@ -211,43 +349,52 @@ class EventExtractor:
         """Detect events within a paragraph."""
         events = []
         seen_ids = set()
+        location: Optional[str] = None
+        characters: List[str] = []
+        source = EventSource(
+            campaign_name=campaign_name,
+            story_file=story_file,
+            story_section=section_title,
+        )
 
-        for event_type, patterns in self._compiled_patterns.items():
-            for pattern in patterns:
-                for match in pattern.finditer(paragraph):
-                    start = max(0, match.start() - 50)
-                    end = min(len(paragraph), match.end() + 100)
-                    ctx_text = paragraph[start:end]
-
-                    event = TimelineEvent(
-                        event_id="",
-                        title=self._generate_title(event_type, ctx_text),
-                        event_type=event_type,
-                        context=EventContext(
-                            description=ctx_text.strip(),
-                            location=self.extract_location(paragraph),
-                            characters_involved=self.extract_character_names(
-                                paragraph
-                            ),
-                        ),
-                        source=EventSource(
-                            campaign_name=campaign_name,
-                            story_file=story_file,
-                            story_section=section_title,
-                        ),
-                        meta=EventMeta(
-                            priority=self._get_priority_for_type(event_type),
-                            extraction_confidence=0.7,
-                        ),
-                    )
-                    event.event_id = event.generate_id()
-
-                    if event.event_id not in seen_ids:
-                        seen_ids.add(event.event_id)
-                        events.append(event)
+        for event_type, match in self.scanner.iter_matches(paragraph):
+            if location is None:
+                location = self.extract_location(paragraph)
+                characters = self.extract_character_names(paragraph)
+            event = self._make_event(event_type, paragraph, match, source)
+            event.context.location = location
+            event.context.characters_involved = list(characters)
+            if event.event_id not in seen_ids:
+                seen_ids.add(event.event_id)
+                events.append(event)
 
         return events
 
+    def _make_event(
+        self,
+        event_type: EventType,
+        paragraph: str,
+        match: "re.Match[str]",
+        source: EventSource,
+    ) -> TimelineEvent:
+        """Build the event for one pattern match, described by its surroundings."""
+        start = max(0, match.start() - 50)
+        end = min(len(paragraph), match.end() + 100)
+        ctx_text = paragraph[start:end]
+        event = TimelineEvent(
+            event_id="",
+            title=self._generate_title(event_type, ctx_text),
+            event_type=event_type,
+            context=EventContext(description=ctx_text.strip()),
+            source=replace(source),
+            meta=EventMeta(
+                priority=self._get_priority_for_type(event_type),
+                extraction_confidence=0.7,
+            ),
+        )
+        event.event_id = event.generate_id()
+        return event
+
     def _generate_title(self, event_type: EventType, context: str) -> str:
         """Generate a title for an event."""
         base_title = _TYPE_TITLES.get(event_type, "Event")
@@ -258,29 +405,44 @@ class EventExtractor:
 
     def _get_priority_for_type(self, event_type: EventType) -> EventPriority:
         """Get default priority for an event type."""
-        for extraction in EXTRACTION_PATTERNS:
-            if extraction.event_type == event_type:
-                return extraction.priority
-        return EventPriority.NORMAL
+        return self._priorities.get(event_type, EventPriority.NORMAL)
 
     def extract_character_names(self, text: str) -> List[str]:
         """Extract potential character names from text."""
-        matches = re.findall(r"\b[A-Z][a-z]+\b", text)
+        matches = _NAME_RE.findall(text)
         return [m for m in matches if m not in _COMMON_WORDS][:5]
 
     def extract_location(self, text: str) -> str:
         """Extract potential location from text."""
-        location_patterns = [
-            r"(?:in|at|near|inside|outside)\s+(?:the\s+)?([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)",
-            r"(?:arrives? at|reaches?|enters?)\s+(?:the\s+)?([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)",
-        ]
-        for loc_pattern in location_patterns:
-            match = re.search(loc_pattern, text)
+        for loc_pattern in _LOCATION_RES:
+            match = loc_pattern.search(text)
             if match:
                 return match.group(1)
         return ""
 
 
+@lru_cache(maxsize=1)
+def _worker_extractor() -> EventExtractor:
+    """Return the extractor shared by jobs in one pool worker process."""
+    return EventExtractor()
+
+
+def _extract_story_job(
+    job: Tuple[str, str, str], extractor: Optional[EventExtractor] = None
+) -> List[TimelineEvent]:
+    """Extract one story's events (process pool entry point).
+
+    Args:
+        job: (story text, campaign name, story file name).
+        extractor: Extractor to use; defaults to the worker's shared one.
+    """
+    extractor = extractor or _worker_extractor()
+    content, campaign_name, story_file = job
+    if not content:
+        return []
+    return extractor.extract_from_text(content, campaign_name, story_file)
+
+
 class AIEventExtractor:
     """Use AI to extract events with higher accuracy."""
 
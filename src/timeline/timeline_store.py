@@ -1,14 +1,32 @@
-"""Storage and retrieval of timeline events."""
-
+"""Storage and retrieval of timeline events.
+
+Each campaign keeps a ``timeline.json`` snapshot plus an append-only
+``timeline.log.jsonl`` of event records written since the snapshot. Adding
+events appends one line per event (one fsync per batch); the log is folded
+back into the snapshot once it outgrows the snapshot. Campaigns are loaded
+on first use, and type, priority, tag and in-world date indexes are kept up
+to date on every write so queries intersect index entries instead of
+scanning every event.
+"""
+
+import bisect
+import json
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple, TypeVar
 
+from src.calendar.calendar_engine import CalendarEngine, InWorldDate
 from src.timeline.event_schema import EventPriority, EventType, TimelineEvent
-from src.utils.file_io import load_json_file, save_json_file
+from src.utils.file_io import load_json_file, write_text_file_atomic
 from src.utils.path_utils import get_game_data_path
 
+# The log is compacted once it holds more records than this or than the
+# snapshot holds events, whichever is larger.
+_COMPACT_MIN_RECORDS = 64
+
+_Key = TypeVar("_Key")
+
 
 @dataclass
 class TimelineQuery:
@@ -23,10 +41,130 @@ class TimelineQuery:
     include_linked: bool = True
 
 
+@dataclass
+class DateRange:
+    """Inclusive in-world date bounds for a timeline query.
+
+    Bounds are ordinal day numbers (see CalendarEngine.date_to_ordinal); an
+    omitted bound leaves that end open. Events without an in-world date never
+    match a date range.
+    """
+
+    start: Optional[int] = None
+    end: Optional[int] = None
+
+
+@dataclass
+class _IndexKeys:
+    """The index entries one stored event is filed under."""
+
+    campaign: str
+    characters: List[str]
+    location: str
+    event_type: EventType
+    priority: EventPriority
+    tags: List[str]
+    ordinal: Optional[int]
+
+
+class _TimelineIndexes:
+    """Event IDs per campaign, character and location, in insertion order.
+
+    These are served directly as timelines, so they keep lists.
+    """
+
+    def __init__(self) -> None:
+        self.by_campaign: Dict[str, List[str]] = {}
+        self.by_character: Dict[str, List[str]] = {}
+        self.by_location: Dict[str, List[str]] = {}
+
+    def add(self, event_id: str, keys: _IndexKeys) -> None:
+        """File an event under its campaign, characters and location."""
+        if keys.campaign:
+            self.by_campaign.setdefault(keys.campaign, []).append(event_id)
+        for name in keys.characters:
+            self.by_character.setdefault(name, []).append(event_id)
+        if keys.location:
+            self.by_location.setdefault(keys.location, []).append(event_id)
+
+    def remove(self, event_id: str, keys: _IndexKeys) -> None:
+        """Drop an event from the entries it was filed under."""
+        if keys.campaign:
+            self.by_campaign[keys.campaign].remove(event_id)
+        for name in keys.characters:
+            self.by_character[name].remove(event_id)
+        if keys.location:
+            self.by_location[keys.location].remove(event_id)
+
+
+class _FilterIndexes:
+    """Event ID sets by type, priority and tag, plus in-world date order.
+
+    Used only to filter queries, so set membership is all they need.
+    """
+
+    def __init__(self) -> None:
+        self.by_type: Dict[EventType, Set[str]] = {}
+        self.by_priority: Dict[EventPriority, Set[str]] = {}
+        self.by_tag: Dict[str, Set[str]] = {}
+        self.by_date: List[Tuple[int, str]] = []
+
+    def add(self, event_id: str, keys: _IndexKeys) -> None:
+        """File an event under its type, priority, tags and date."""
+        self.by_type.setdefault(keys.event_type, set()).add(event_id)
+        self.by_priority.setdefault(keys.priority, set()).add(event_id)
+        for tag in keys.tags:
+            self.by_tag.setdefault(tag, set()).add(event_id)
+        if keys.ordinal is not None:
+            bisect.insort(self.by_date, (keys.ordinal, event_id))
+
+    def remove(self, event_id: str, keys: _IndexKeys) -> None:
+        """Drop an event from the entries it was filed under."""
+        self.by_type[keys.event_type].discard(event_id)
+        self.by_priority[keys.priority].discard(event_id)
+        for tag in keys.tags:
+            self.by_tag[tag].discard(event_id)
+        if keys.ordinal is not None:
+            position = bisect.bisect_left(self.by_date, (keys.ordinal, event_id))
+            del self.by_date[position]
+
+    def dated_within(self, dates: DateRange) -> Set[str]:
+        """Return the IDs of events dated within the inclusive range."""
+        start = 0
+        if dates.start is not None:
+            start = bisect.bisect_left(self.by_date, (dates.start, ""))
+        stop = len(self.by_date)
+        if dates.end is not None:
+            stop = bisect.bisect_left(self.by_date, (dates.end + 1, ""))
+        return {event_id for _, event_id in self.by_date[start:stop]}
+
+
+@dataclass
+class _CampaignState:
+    """Per-campaign loading and log bookkeeping.
+
+    Attributes:
+        loaded: Campaigns whose snapshot and log have been read
+        all_loaded: True once every campaign on disk has been read
+        log_records: Records appended to each campaign's log since its snapshot
+        snapshot_sizes: Events in each campaign's last written snapshot
+        calendar_ids: Calendar each campaign's dates are in
+        calendars: Calendar engines by id, for date ordinals
+    """
+
+    loaded: Set[str] = field(default_factory=set)
+    all_loaded: bool = False
+    log_records: Dict[str, int] = field(default_factory=dict)
+    snapshot_sizes: Dict[str, int] = field(default_factory=dict)
+    calendar_ids: Dict[str, str] = field(default_factory=dict)
+    calendars: Dict[str, CalendarEngine] = field(default_factory=dict)
+
+
 class TimelineStore:
     """Manages storage and retrieval of timeline events."""
 
     _TIMELINE_FILE = "timeline.json"
+    _LOG_FILE = "timeline.log.jsonl"
 
     def __init__(
         self,
@@ -35,6 +173,8 @@ class TimelineStore:
     ):
         """Initialize timeline store.
 
+        Nothing is read from disk until a campaign is first queried.
+
         Args:
             campaign_name: Optional campaign to focus on.
             workspace_path: Optional workspace root for testing.
@@ -42,10 +182,10 @@ class TimelineStore:
         self.campaign_name = campaign_name
         self.workspace_path = workspace_path
         self._events: Dict[str, TimelineEvent] = {}
-        self._campaign_index: Dict[str, List[str]] = {}
-        self._character_index: Dict[str, List[str]] = {}
-        self._location_index: Dict[str, List[str]] = {}
-        self._load_all_timelines()
+        self._index_keys: Dict[str, _IndexKeys] = {}
+        self._timelines = _TimelineIndexes()
+        self._filters = _FilterIndexes()
+        self._state = _CampaignState()
 
     def _campaigns_dir(self) -> str:
         """Return the path to the campaigns directory."""
@@ -59,72 +199,177 @@ class TimelineStore:
             self._campaigns_dir(), campaign, self._TIMELINE_FILE
         )
 
-    def _load_all_timelines(self) -> None:
-        """Load timeline data from all campaigns (or only the selected one)."""
-        campaigns_dir = self._campaigns_dir()
-        if not os.path.isdir(campaigns_dir):
-            return
+    def _log_path(self, campaign: str) -> str:
+        """Return the append-only event log path for a campaign."""
+        return os.path.join(self._campaigns_dir(), campaign, self._LOG_FILE)
 
+    def _ensure_all_loaded(self) -> None:
+        """Load every campaign (or only the selected one) not loaded yet."""
+        if self._state.all_loaded:
+            return
+        self._state.all_loaded = True
         if self.campaign_name:
-            self._load_campaign_timeline(self.campaign_name)
+            self._ensure_campaign_loaded(self.campaign_name)
             return
 
-        for entry in os.listdir(campaigns_dir):
+        campaigns_dir = self._campaigns_dir()
+        if not os.path.isdir(campaigns_dir):
+            return
+        for entry in sorted(os.listdir(campaigns_dir)):
             if os.path.isdir(os.path.join(campaigns_dir, entry)):
-                self._load_campaign_timeline(entry)
+                self._ensure_campaign_loaded(entry)
 
-    def _load_campaign_timeline(self, campaign: str) -> None:
-        """Load timeline for a specific campaign."""
-        timeline_path = self._timeline_path(campaign)
-        if not os.path.exists(timeline_path):
+    def _ensure_campaign_loaded(self, campaign: str) -> None:
+        """Load a campaign's snapshot and replay its log, once per store."""
+        if not campaign or campaign in self._state.loaded:
             return
-
-        data = load_json_file(timeline_path)
-        if not data:
+        self._state.loaded.add(campaign)
+
+        data = load_json_file(self._timeline_path(campaign)) or {}
+        self._state.calendar_ids[campaign] = data.get("calendar_id") or "generic"
+        snapshot = data.get("events", [])
+        for event_data in snapshot:
+            self._load_record(event_data)
+        self._state.snapshot_sizes[campaign] = len(snapshot)
+
+        records = 0
+        log_path = self._log_path(campaign)
+        if os.path.exists(log_path):
+            with open(log_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        event_data = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn final line from an interrupted append.
+                        continue
+                    self._load_record(event_data)
+                    records += 1
+        self._state.log_records[campaign] = records
+
+    def _load_record(self, event_data: Dict[str, Any]) -> None:
+        """Index one stored event, skipping malformed records."""
+        try:
+            event = TimelineEvent.from_dict(event_data)
+        except (KeyError, ValueError, TypeError, AttributeError):
             return
-
-        for event_data in data.get("events", []):
-            try:
-                event = TimelineEvent.from_dict(event_data)
-                self._add_event_to_indexes(event)
-            except (KeyError, ValueError):
-                pass
+        self._add_event_to_indexes(event)
 
     def _add_event_to_indexes(self, event: TimelineEvent) -> None:
-        """Add event to all internal indexes."""
-        self._events[event.event_id] = event
+        """Add event to all internal indexes, replacing a stored copy."""
+        event_id = event.event_id
+        if event_id in self._events:
+            self._remove_event_from_indexes(event_id)
+        self._events[event_id] = event
+
+        keys = _IndexKeys(
+            campaign=event.source.campaign_name,
+            characters=self._character_keys(event),
+            location=event.context.location.lower(),
+            event_type=event.event_type,
+            priority=event.meta.priority,
+            tags=sorted({t.lower() for t in event.links.tags}),
+            ordinal=self._date_ordinal(event),
+        )
+        self._index_keys[event_id] = keys
+        self._timelines.add(event_id, keys)
+        self._filters.add(event_id, keys)
+
+    def _remove_event_from_indexes(self, event_id: str) -> None:
+        """Drop an event from every index it was filed under."""
+        del self._events[event_id]
+        keys = self._index_keys.pop(event_id)
+        self._timelines.remove(event_id, keys)
+        self._filters.remove(event_id, keys)
+
+    @staticmethod
+    def _character_keys(event: TimelineEvent) -> List[str]:
+        """Return the distinct lowercase character names of an event."""
+        return list(dict.fromkeys(c.lower() for c in event.context.characters_involved))
+
+    def _date_ordinal(self, event: TimelineEvent) -> Optional[int]:
+        """Convert an event's in-world date to an ordinal day, if it has one."""
+        raw_date = event.context.in_world_date
+        if not isinstance(raw_date, dict):
+            return None
+        calendar_id = raw_date.get("calendar_id") or self._state.calendar_ids.get(
+            event.source.campaign_name, "generic"
+        )
+        calendar = self._state.calendars.get(calendar_id)
+        if calendar is None:
+            calendar = CalendarEngine(calendar_id, self.workspace_path)
+            self._state.calendars[calendar_id] = calendar
+        try:
+            date = InWorldDate.from_dict({**raw_date, "calendar_id": calendar_id})
+            return calendar.date_to_ordinal(date)
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return None
 
-        campaign = event.source.campaign_name
-        if campaign:
-            self._campaign_index.setdefault(campaign, [])
-            self._campaign_index[campaign].append(event.event_id)
+    def add_event(self, event: TimelineEvent) -> None:
+        """Add a new event to the store and persist it."""
+        self.add_events([event])
 
-        for char in event.context.characters_involved:
-            key = char.lower()
-            self._character_index.setdefault(key, [])
-            self._character_index[key].append(event.event_id)
+    def add_events(self, events: Iterable[TimelineEvent]) -> None:
+        """Add events and persist them with one log append per campaign.
 
-        loc = event.context.location
-        if loc:
-            self._location_index.setdefault(loc.lower(), [])
-            self._location_index[loc.lower()].append(event.event_id)
+        Events that reuse a stored event_id replace the stored event.
 
-    def add_event(self, event: TimelineEvent) -> None:
-        """Add a new event to the store and persist it."""
-        self._add_event_to_indexes(event)
-        self._save_campaign_timeline(event.source.campaign_name)
+        Args:
+            events: Events to add.
+        """
+        by_campaign: Dict[str, List[TimelineEvent]] = {}
+        for event in events:
+            campaign = event.source.campaign_name
+            self._ensure_campaign_loaded(campaign)
+            self._add_event_to_indexes(event)
+            by_campaign.setdefault(campaign, []).append(event)
+        for campaign, campaign_events in by_campaign.items():
+            self._append_to_log(campaign, campaign_events)
+
+    def _append_to_log(self, campaign: str, events: List[TimelineEvent]) -> None:
+        """Append event records to a campaign log, compacting when it grows."""
+        if not campaign:
+            return
+        log_path = self._log_path(campaign)
+        os.makedirs(os.path.dirname(log_path), exist_ok=True)
+        lines = "".join(
+            json.dumps(event.to_dict(), ensure_ascii=False) + "\n" for event in events
+        )
+        with open(log_path, "a", encoding="utf-8") as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        self._state.log_records[campaign] = self._state.log_records.get(campaign, 0) + len(events)
+
+        threshold = max(_COMPACT_MIN_RECORDS, self._state.snapshot_sizes.get(campaign, 0))
+        if (
+            self._state.log_records[campaign] > threshold
+            or not os.path.exists(self._timeline_path(campaign))
+        ):
+            self.compact(campaign)
+
+    def compact(self, campaign: Optional[str] = None) -> None:
+        """Fold the event log into the timeline.json snapshot.
+
+        Any extra top-level snapshot fields (e.g. the calendar's
+        current_date) are preserved.
+
+        Args:
+            campaign: Campaign to compact; every loaded campaign if omitted.
+        """
+        campaigns = [campaign] if campaign else sorted(self._state.loaded)
+        for name in campaigns:
+            self._ensure_campaign_loaded(name)
+            self._save_campaign_timeline(name)
 
     def _save_campaign_timeline(self, campaign: str) -> None:
-        """Persist the timeline for a campaign, preserving any extra top-level fields."""
+        """Write the snapshot for a campaign, then drop the folded-in log."""
         if not campaign:
             return
 
         timeline_path = self._timeline_path(campaign)
-        existing: Dict[str, Any] = {}
-        if os.path.exists(timeline_path):
-            existing = load_json_file(timeline_path) or {}
+        existing: Dict[str, Any] = load_json_file(timeline_path) or {}
 
-        event_ids = self._campaign_index.get(campaign, [])
+        event_ids = self._timelines.by_campaign.get(campaign, [])
         events = [
             self._events[eid].to_dict()
             for eid in event_ids
@@ -136,76 +381,98 @@ class TimelineStore:
             "last_updated": datetime.now().isoformat(),
             "events": events,
         })
-        save_json_file(timeline_path, existing)
+        write_text_file_atomic(
+            timeline_path, json.dumps(existing, indent=2, ensure_ascii=False)
+        )
+        # Replaying a log that survived a crash here only re-adds the same events.
+        log_path = self._log_path(campaign)
+        if os.path.exists(log_path):
+            os.remove(log_path)
+        self._state.log_records[campaign] = 0
+        self._state.snapshot_sizes[campaign] = len(events)
 
     def get_event(self, event_id: str) -> Optional[TimelineEvent]:
         """Get an event by ID."""
+        self._ensure_all_loaded()
         return self._events.get(event_id)
 
     def get_campaign_names(self) -> List[str]:
         """Return all campaign names that have events in the store."""
-        return list(self._campaign_index.keys())
-
-    def query(self, timeline_query: TimelineQuery) -> List[TimelineEvent]:
-        """Query events based on criteria, sorted by event_id."""
-        results = [
-            event
-            for event in self._events.values()
-            if self._event_matches_query(event, timeline_query)
-        ]
-        return sorted(results, key=lambda e: e.event_id)
+        self._ensure_all_loaded()
+        return [name for name, ids in self._timelines.by_campaign.items() if ids]
+
+    def query(
+        self, timeline_query: TimelineQuery, dates: Optional[DateRange] = None
+    ) -> List[TimelineEvent]:
+        """Query events based on criteria, sorted by event_id.
 
-    def _event_matches_query(
-        self, event: TimelineEvent, timeline_query: TimelineQuery
-    ) -> bool:
-        """Return True if the event satisfies all query filters."""
+        Args:
+            timeline_query: Filters to apply; unset filters match everything.
+            dates: Optional in-world date range the events must fall within.
+
+        Returns:
+            The matching events.
+        """
         if timeline_query.campaign_name:
-            if event.source.campaign_name != timeline_query.campaign_name:
-                return False
+            self._ensure_campaign_loaded(timeline_query.campaign_name)
+        else:
+            self._ensure_all_loaded()
+
+        candidates: Optional[Set[str]] = None
+        for ids in self._index_candidates(timeline_query, dates):
+            candidates = ids if candidates is None else candidates & ids
+            if not candidates:
+                return []
+        if candidates is None:
+            candidates = set(self._events)
+        return [self._events[eid] for eid in sorted(candidates)]
+
+    def _index_candidates(
+        self, timeline_query: TimelineQuery, dates: Optional[DateRange]
+    ) -> Iterable[Set[str]]:
+        """Yield the event ID set matching each filter set on the query."""
+        if timeline_query.campaign_name:
+            yield set(self._timelines.by_campaign.get(timeline_query.campaign_name, []))
         if timeline_query.event_types:
-            if event.event_type not in timeline_query.event_types:
-                return False
-        return self._check_extra_filters(event, timeline_query)
-
-    def _check_extra_filters(
-        self, event: TimelineEvent, timeline_query: TimelineQuery
-    ) -> bool:
-        """Check character, location, priority, and tag filters."""
+            yield _union(self._filters.by_type, timeline_query.event_types)
+        if timeline_query.priority:
+            yield set(self._filters.by_priority.get(timeline_query.priority, set()))
+        if timeline_query.tags:
+            yield _union(self._filters.by_tag, {t.lower() for t in timeline_query.tags})
         if timeline_query.characters:
-            event_chars = {c.lower() for c in event.context.characters_involved}
-            query_chars = {c.lower() for c in timeline_query.characters}
-            if not event_chars.intersection(query_chars):
-                return False
+            yield _union(
+                self._timelines.by_character,
+                {c.lower() for c in timeline_query.characters},
+            )
         if timeline_query.locations:
-            locs = {loc.lower() for loc in timeline_query.locations}
-            if event.context.location.lower() not in locs:
-                return False
-        if timeline_query.priority and event.meta.priority != timeline_query.priority:
-            return False
-        if timeline_query.tags:
-            event_tags = {t.lower() for t in event.links.tags}
-            query_tags = {t.lower() for t in timeline_query.tags}
-            if not event_tags.intersection(query_tags):
-                return False
-        return True
+            yield _union(
+                self._timelines.by_location,
+                {loc.lower() for loc in timeline_query.locations},
+            )
+        if dates is not None:
+            yield self._filters.dated_within(dates)
 
     def get_campaign_timeline(self, campaign: str) -> List[TimelineEvent]:
         """Get all events for a campaign."""
-        event_ids = self._campaign_index.get(campaign, [])
+        self._ensure_campaign_loaded(campaign)
+        event_ids = self._timelines.by_campaign.get(campaign, [])
         return [self._events[eid] for eid in event_ids if eid in self._events]
 
     def get_character_timeline(self, character_name: str) -> List[TimelineEvent]:
         """Get all events involving a character."""
-        event_ids = self._character_index.get(character_name.lower(), [])
+        self._ensure_all_loaded()
+        event_ids = self._timelines.by_character.get(character_name.lower(), [])
         return [self._events[eid] for eid in event_ids if eid in self._events]
 
     def get_location_timeline(self, location: str) -> List[TimelineEvent]:
         """Get all events at a location."""
-        event_ids = self._location_index.get(location.lower(), [])
+        self._ensure_all_loaded()
+        event_ids = self._timelines.by_location.get(location.lower(), [])
         return [self._events[eid] for eid in event_ids if eid in self._events]
 
     def link_events(self, event_id_1: str, event_id_2: str) -> bool:
         """Create a bidirectional link between two events."""
+        self._ensure_all_loaded()
         event1 = self._events.get(event_id_1)
         event2 = self._events.get(event_id_2)
         if not event1 or not event2:
@@ -216,12 +483,16 @@ class TimelineStore:
         if event_id_1 not in event2.links.linked_events:
             event2.links.linked_events.append(event_id_1)
 
-        self._save_campaign_timeline(event1.source.campaign_name)
-        self._save_campaign_timeline(event2.source.campaign_name)
+        if event1.source.campaign_name == event2.source.campaign_name:
+            self._append_to_log(event1.source.campaign_name, [event1, event2])
+        else:
+            self._append_to_log(event1.source.campaign_name, [event1])
+            self._append_to_log(event2.source.campaign_name, [event2])
         return True
 
     def get_linked_events(self, event_id: str) -> List[TimelineEvent]:
         """Get all events linked to a specific event."""
+        self._ensure_all_loaded()
         event = self._events.get(event_id)
         if not event:
             return []
@@ -230,3 +501,11 @@ class TimelineStore:
             for eid in event.links.linked_events
             if eid in self._events
         ]
+
+
+def _union(index: Mapping[_Key, Iterable[str]], keys: Iterable[_Key]) -> Set[str]:
+    """Return the IDs filed under any of the keys."""
+    found: Set[str] = set()
+    for key in keys:
+        found.update(index.get(key, ()))
+    return found
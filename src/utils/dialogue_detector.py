@@ -9,11 +9,22 @@ Supported dialogue patterns:
 - Pattern B: Speaker: "Dialogue"
 - Pattern C: Character (action): "Dialogue"
 - Pattern D: Standalone dialogue (uses context)
+
+Paragraphs are classified by one combined scan over all patterns, and
+speaker names are resolved through a SpeakerResolver (one trie regex plus a
+case-folded alias map) cached per known-names set, so segmenting a story
+stays linear in its length however large the character roster is.
 """
 
 import re
 from dataclasses import dataclass
-from typing import List, Optional
+from functools import lru_cache
+from typing import Dict, FrozenSet, Generic, Iterable, List, Mapping, Optional, Tuple, TypeVar
+
+from src.utils.string_utils import trie_pattern
+
+# One pattern match: (group 1, group 2 or "" when absent, match start).
+_Match = Tuple[str, str, int]
 
 
 @dataclass
@@ -66,6 +77,126 @@ SPEAKER_VERBS = {
 # Character name patterns (capitalized words at start of lines)
 CHARACTER_NAME_PATTERN = re.compile(r"^([A-Z][a-zA-Z]+)\s*:", re.MULTILINE)
 
+# Speaker-attributed patterns folded into the single paragraph scan, in order
+# of precedence. prefix_continuation is omitted: every line it matches,
+# prefix_explicit matches too, so it can never decide a paragraph.
+_SCAN_KINDS = ("prefix_explicit", "inline_after")
+
+# Number of distinct known-name sets kept compiled.
+_RESOLVER_CACHE_SIZE = 32
+
+
+def _build_paragraph_scan() -> Tuple["re.Pattern[str]", Dict[str, int]]:
+    """Combine the attributed dialogue patterns into one alternation.
+
+    Returns:
+        The combined pattern and, per kind, the number of its outer group
+        (the pattern's own groups follow it).
+    """
+    parts = []
+    outer: Dict[str, int] = {}
+    group = 1
+    for kind in _SCAN_KINDS:
+        pattern = DIALOGUE_PATTERNS[kind]
+        source = pattern.pattern
+        if pattern.flags & re.IGNORECASE:
+            source = f"(?i:{source})"
+        parts.append(f"({source})")
+        outer[kind] = group
+        group += 1 + pattern.groups
+    return re.compile("|".join(parts), re.MULTILINE), outer
+
+
+_PARAGRAPH_SCAN, _SCAN_GROUPS = _build_paragraph_scan()
+
+class SpeakerResolver:
+    """Resolves speaker references against one fixed set of known names.
+
+    Attributes:
+        names: The known character and NPC names.
+    """
+
+    def __init__(self, names: FrozenSet[str]):
+        self.names = names
+        self._folded: Dict[str, str] = {}
+        for name in sorted(names):
+            self._folded.setdefault(name.lower(), name)
+        self._pattern: Optional["re.Pattern[str]"] = None
+        searchable = sorted(name for name in names if name)
+        if searchable:
+            self._pattern = re.compile(trie_pattern(searchable))
+
+    def resolve(self, text_name: str) -> str:
+        """Map a name as written to its known form (see resolve_speaker_name)."""
+        if not text_name:
+            return "narrator"
+        if text_name in self.names:
+            return text_name
+        return self._folded.get(text_name.lower(), text_name)
+
+    def find_in(self, text: str) -> Optional[str]:
+        """Return the first known name occurring in text (longest on ties)."""
+        if self._pattern is None:
+            return None
+        match = self._pattern.search(text)
+        return match.group(0) if match else None
+
+
+@lru_cache(maxsize=_RESOLVER_CACHE_SIZE)
+def get_speaker_resolver(names: FrozenSet[str]) -> SpeakerResolver:
+    """Return the shared resolver for a set of known names.
+
+    Args:
+        names: Known character and NPC names.
+
+    Returns:
+        A SpeakerResolver compiled once per distinct name set.
+    """
+    return SpeakerResolver(names)
+
+
+_Entry = TypeVar("_Entry")
+
+
+class VoiceIndex(Generic[_Entry]):
+    """Speaker -> voice entry lookup with the fuzzy rules of voice assignment.
+
+    Tries an exact name, then a case-insensitive name, then the first name
+    (in mapping order) that contains or is contained in the speaker. Each
+    distinct speaker is resolved once, so a story costs one scan of the
+    voice map per speaker rather than per segment.
+    """
+
+    def __init__(self, voices: Mapping[str, _Entry]):
+        self._voices = dict(voices)
+        self._folded: Dict[str, _Entry] = {}
+        for name, entry in self._voices.items():
+            self._folded.setdefault(name.lower(), entry)
+        self._resolved: Dict[str, Optional[_Entry]] = {}
+
+    def lookup(self, speaker: str) -> Optional[_Entry]:
+        """Return the voice entry for a speaker, or None when nothing matches."""
+        if speaker in self._voices:
+            return self._voices[speaker]
+        if speaker not in self._resolved:
+            self._resolved[speaker] = self._fuzzy(speaker.lower())
+        return self._resolved[speaker]
+
+    def voice_for(self, segment: SpeechSegment) -> Optional[_Entry]:
+        """Return the entry voicing a segment; None for narration and actions."""
+        if segment.is_action or segment.speaker.lower() == "narrator":
+            return None
+        return self.lookup(segment.speaker)
+
+    def _fuzzy(self, speaker_lower: str) -> Optional[_Entry]:
+        if speaker_lower in self._folded:
+            return self._folded[speaker_lower]
+        for name, entry in self._voices.items():
+            name_lower = name.lower()
+            if speaker_lower in name_lower or name_lower in speaker_lower:
+                return entry
+        return None
+
 
 class DialogueDetector:
     """Detects and segments dialogue from story text."""
@@ -84,6 +215,7 @@ class DialogueDetector:
         self.known_characters = set(known_characters or [])
         self.known_npcs = set(known_npcs or [])
         self.all_known_names = self.known_characters | self.known_npcs
+        self._resolver = get_speaker_resolver(frozenset(self.all_known_names))
         self._last_speaker: Optional[str] = None
 
     def update_known_names(
@@ -102,6 +234,7 @@ class DialogueDetector:
         if npcs:
             self.known_npcs = set(npcs)
         self.all_known_names = self.known_characters | self.known_npcs
+        self._resolver = get_speaker_resolver(frozenset(self.all_known_names))
 
     def detect_speech_segments(self, text: str) -> List[SpeechSegment]:
         """Detect speech segments in text.
@@ -138,6 +271,9 @@ class DialogueDetector:
     def _analyze_paragraph(self, paragraph: str) -> List[SpeechSegment]:
         """Analyze a single paragraph for dialogue.
 
+        Explicit ``Speaker: "..."`` lines win over inline ``"...," X said``
+        attributions, which win over standalone quotes.
+
         Args:
             paragraph: Paragraph text to analyze
 
@@ -145,59 +281,31 @@ class DialogueDetector:
             List of SpeechSegment objects
         """
         segments: List[SpeechSegment] = []
+        kind, matches = self._classify_paragraph(paragraph)
 
-        # Try Pattern B first (explicit speaker prefix)
-        prefix_matches = list(DIALOGUE_PATTERNS["prefix_explicit"].finditer(paragraph))
-        if prefix_matches:
-            for match in prefix_matches:
-                speaker = match.group(1)
-                dialogue = match.group(2)
-                # Resolve speaker name
-                resolved_speaker = self.resolve_speaker_name(speaker)
+        if kind == "prefix_explicit":
+            for speaker, dialogue, _ in matches:
                 segments.append(
-                    SpeechSegment(text=dialogue, speaker=resolved_speaker)
+                    SpeechSegment(text=dialogue, speaker=self.resolve_speaker_name(speaker))
                 )
             return segments
 
-        # Try Pattern A (inline after dialogue)
-        inline_matches = list(DIALOGUE_PATTERNS["inline_after"].finditer(paragraph))
-        if inline_matches:
-            # Check if this is just narrative action with dialogue
-            for match in inline_matches:
-                dialogue = match.group(1)
-                speaker = match.group(2)
-                resolved_speaker = self.resolve_speaker_name(speaker)
+        if kind == "inline_after":
+            for dialogue, speaker, _ in matches:
                 segments.append(
-                    SpeechSegment(text=dialogue, speaker=resolved_speaker)
+                    SpeechSegment(text=dialogue, speaker=self.resolve_speaker_name(speaker))
                 )
             return segments
 
-        # Try Pattern C (multi-line continuation)
-        continuation_matches = list(
-            DIALOGUE_PATTERNS["prefix_continuation"].finditer(paragraph)
-        )
-        if continuation_matches:
-            for match in continuation_matches:
-                speaker = match.group(1)
-                dialogue = match.group(2)
-                resolved_speaker = self.resolve_speaker_name(speaker)
-                segments.append(
-                    SpeechSegment(text=dialogue, speaker=resolved_speaker)
-                )
-            return segments
-
-        # Try Pattern D (standalone quotes with context)
-        standalone_matches = list(DIALOGUE_PATTERNS["standalone"].finditer(paragraph))
-        if standalone_matches:
+        if kind == "standalone":
             # Check if there's a character name nearby
-            speaker = self._find_speaker_context(paragraph)
-            if speaker:
-                for match in standalone_matches:
-                    dialogue = match.group(1)
+            context_speaker = self._find_speaker_context(paragraph)
+            if context_speaker:
+                for dialogue, _, start in matches:
                     # Only use this if the quote appears to be spoken
-                    if self._is_dialogue_context(paragraph, match.start()):
+                    if self._is_dialogue_context(paragraph, start):
                         segments.append(
-                            SpeechSegment(text=dialogue, speaker=speaker)
+                            SpeechSegment(text=dialogue, speaker=context_speaker)
                         )
 
         # If no dialogue found, treat as narrator action/narration
@@ -208,6 +316,55 @@ class DialogueDetector:
 
         return segments
 
+    def _classify_paragraph(
+        self, paragraph: str
+    ) -> Tuple[Optional[str], List[_Match]]:
+        """Find the deciding dialogue pattern and its matches.
+
+        Explicit and inline attributions are found by one combined scan;
+        standalone quotes are only looked for when neither occurs.
+
+        Returns:
+            (kind, matches) where kind is "prefix_explicit", "inline_after",
+            "standalone" or None and each match is (group 1, group 2, start).
+        """
+        if '"' not in paragraph:
+            return None, []
+        found: Dict[str, List[_Match]] = {}
+        explicit_group = _SCAN_GROUPS["prefix_explicit"]
+        for match in _PARAGRAPH_SCAN.finditer(paragraph):
+            kind = "prefix_explicit" if match.group(explicit_group) is not None else "inline_after"
+            if kind == "inline_after" and "\n" in match.group(0):
+                # An inline match spanning lines may hide a line that starts
+                # with an explicit speaker; fall back to one scan per pattern.
+                return self._classify_sequential(paragraph)
+            group = _SCAN_GROUPS[kind]
+            found.setdefault(kind, []).append(
+                (match.group(group + 1), match.group(group + 2) or "", match.start())
+            )
+        for kind in _SCAN_KINDS:
+            if kind in found:
+                return kind, found[kind]
+        standalone: List[_Match] = [
+            (m.group(1), "", m.start())
+            for m in DIALOGUE_PATTERNS["standalone"].finditer(paragraph)
+        ]
+        return ("standalone", standalone) if standalone else (None, [])
+
+    @staticmethod
+    def _classify_sequential(
+        paragraph: str,
+    ) -> Tuple[Optional[str], List[_Match]]:
+        """Classify a paragraph by trying each pattern in precedence order."""
+        for kind in ("prefix_explicit", "inline_after", "standalone"):
+            matches = list(DIALOGUE_PATTERNS[kind].finditer(paragraph))
+            if matches:
+                return kind, [
+                    (m.group(1), m.group(2) if m.re.groups > 1 else "", m.start())
+                    for m in matches
+                ]
+        return None, []
+
     def _find_speaker_context(self, text: str) -> Optional[str]:
         """Find speaker from context (previous speaker or nearby names).
 
@@ -222,9 +379,9 @@ class DialogueDetector:
             return self._last_speaker
 
         # Look for character names in the text
-        for name in self.all_known_names:
-            if name in text:
-                return name
+        name = self._resolver.find_in(text)
+        if name:
+            return name
 
         # Look for any capitalized words that might be names
         words = text.split()
@@ -275,20 +432,9 @@ class DialogueDetector:
         Returns:
             Resolved character name or "narrator" if not found
         """
-        if not text_name:
-            return "narrator"
-
-        # Exact match
-        if text_name in self.all_known_names:
-            return text_name
-
-        # Case-insensitive match
-        for known in self.all_known_names:
-            if known.lower() == text_name.lower():
-                return known
-
-        # Check for "the X" pattern - could extend to match against NPC roles
-        return text_name  # Return as-is for potential matching later
+        # Exact, then case-insensitive match; unknown names are returned as-is
+        # for potential matching later
+        return self._resolver.resolve(text_name)
 
 
 def clean_text_for_dialogue_detection(text: str) -> str:
@@ -357,61 +503,33 @@ def get_speaker_voice_map(
     Returns:
         Segments with voice IDs assigned
     """
+    voices: VoiceIndex[str] = VoiceIndex(character_voices)
     result = []
 
     for segment in segments:
-        if segment.is_action:
-            # Action descriptions use narrator voice
-            segment.voice_id = narrator_voice_id
-        elif segment.speaker.lower() == "narrator":
-            segment.voice_id = narrator_voice_id
-        else:
-            # Look up character's voice with fuzzy matching
-            segment.voice_id = _resolve_character_voice(
-                segment.speaker, character_voices, narrator_voice_id
-            )
+        # Narration, actions and unmatched speakers use the narrator voice
+        voice_id = voices.voice_for(segment)
+        segment.voice_id = narrator_voice_id if voice_id is None else voice_id
 
         result.append(segment)
 
     return result
 
 
-def _resolve_character_voice(
-    speaker: str,
-    character_voices: dict,
-    default_voice: str,
-) -> str:
-    """Resolve character name to voice with fuzzy matching.
+def assign_voice_entries(
+    segments: Iterable[SpeechSegment],
+    character_voices: Mapping[str, _Entry],
+) -> List[Tuple[SpeechSegment, Optional[_Entry]]]:
+    """Pair each segment with its speaker's voice entry.
+
+    Narration, actions and speakers without a matching voice get None.
 
     Args:
-        speaker: The speaker name from dialogue detection
-        character_voices: Dict mapping character names to voice IDs
-        default_voice: Default voice if no match
+        segments: Speech segments in reading order
+        character_voices: Character name -> voice entry (any type)
 
     Returns:
-        Voice ID for the speaker
+        (segment, entry) pairs in the same order
     """
-    # Pronouns that need resolution
-    pronouns = frozenset({"he", "she", "they", "him", "her", "them"})
-
-    # Try exact match first
-    if speaker in character_voices:
-        return character_voices[speaker]
-
-    # Try case-insensitive match
-    speaker_lower = speaker.lower()
-    for name, voice_id in character_voices.items():
-        if name.lower() == speaker_lower:
-            return voice_id
-
-    # Try partial match (e.g., "Frodo" matches "Frodo Baggins")
-    for name, voice_id in character_voices.items():
-        if speaker_lower in name.lower() or name.lower() in speaker_lower:
-            return voice_id
-
-    # Check for pronouns - use default if we can't resolve
-    if speaker_lower in pronouns:
-        return default_voice
-
-    # Default to narrator voice
-    return default_voice
+    voices: VoiceIndex[_Entry] = VoiceIndex(character_voices)
+    return [(segment, voices.voice_for(segment)) for segment in segments]
@@ -0,0 +1,62 @@
+"""
+Multi-pattern literal name matching.
+
+first_positions() finds where each of a set of names first occurs in a text.
+Small sets use one C-level str.find() per name; larger sets use a single
+regex scan with a lookahead alternation, which tries every offset once
+regardless of the number of names. Names nested in longer ones ("Frodo" in
+"Frodo Baggins") are resolved from the longer match, so results are exact
+either way. Matching is case-sensitive, mirroring ``name in text``.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+# Above this many names one regex pass beats per-name str.find() scans.
+_SCAN_MIN_NAMES = 100
+
+_Scanner = Tuple["re.Pattern[str]", Dict[str, List[Tuple[str, int]]]]
+
+
+@lru_cache(maxsize=64)
+def _scanner(names: FrozenSet[str]) -> Optional[_Scanner]:
+    """Compile the single-pass scanner for a large name set.
+
+    Returns:
+        (lookahead pattern, names nested in each name with their offsets),
+        or None when the set is small enough for per-name str.find().
+    """
+    if len(names) < _SCAN_MIN_NAMES:
+        return None
+    ordered = sorted(names, key=len, reverse=True)
+    alternation = "|".join(re.escape(name) for name in ordered)
+    nested = {
+        outer: [(inner, outer.find(inner)) for inner in ordered if inner in outer]
+        for outer in ordered
+    }
+    return re.compile(f"(?=({alternation}))"), nested
+
+
+def first_positions(text: str, names: FrozenSet[str]) -> Dict[str, int]:
+    """Return the offset of the first occurrence of each name found.
+
+    Args:
+        text: Text to scan.
+        names: Literal names to look for; empty strings never match.
+
+    Returns:
+        Mapping of name -> lowest start offset; absent names omitted.
+    """
+    scanner = _scanner(names)
+    if scanner is None:
+        found = {name: text.find(name) for name in names if name}
+        return {name: pos for name, pos in found.items() if pos >= 0}
+    pattern, nested = scanner
+    first: Dict[str, int] = {}
+    for match in pattern.finditer(text):
+        start = match.start()
+        for inner, offset in nested[match.group(1)]:
+            if start + offset < first.get(inner, len(text)):
+                first[inner] = start + offset
+    return first
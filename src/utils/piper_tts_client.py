@@ -4,6 +4,10 @@ Piper TTS Client Module
 Provides text-to-speech synthesis using the Piper neural TTS system.
 Piper is a fast, local neural text-to-speech system.
 
+When piper-tts is importable, synthesis goes through a pool of warm worker
+processes (see piper_worker_pool) that keep voice models loaded between
+clips; otherwise each clip runs the piper executable once.
+
 Reference: https://github.com/rhasspy/piper
 """
 
@@ -15,6 +19,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Optional
 
+from src.utils.piper_worker_pool import PiperWorkerPool, workers_supported
+
 
 @dataclass
 class VoiceInfo:
@@ -43,6 +49,7 @@ class PiperTTSClient:
         executable_path: str = "piper",
         voices_directory: Optional[str] = None,
         default_speaker: int = 0,
+        worker_pool_mb: int = 512,
     ):
         """Initialize Piper TTS client.
 
@@ -50,6 +57,9 @@ class PiperTTSClient:
             executable_path: Path to piper executable
             voices_directory: Directory containing .onnx voice files
             default_speaker: Default speaker ID for multi-speaker models
+            worker_pool_mb: Memory budget, in megabytes, for voice models kept
+                loaded in warm worker processes when piper-tts is importable;
+                0 runs the executable once per clip
         """
         self.executable_path = executable_path
         self.default_speaker = default_speaker
@@ -70,13 +80,26 @@ class PiperTTSClient:
             self.voices_directory = Path(voices_directory)
 
         self._available_voices: Optional[List[VoiceInfo]] = None
+        self._available: Optional[bool] = None
+        self._pool: Optional[PiperWorkerPool] = None
+        if worker_pool_mb > 0 and workers_supported():
+            self._pool = PiperWorkerPool(worker_pool_mb * 1024 * 1024)
 
     def is_available(self) -> bool:
         """Check if Piper TTS is available.
 
+        The check runs the executable once; the result is kept for the
+        lifetime of the client.
+
         Returns:
             True if Piper can be executed
         """
+        if self._available is None:
+            self._available = self._probe_executable()
+        return self._available
+
+    def _probe_executable(self) -> bool:
+        """Run the piper executable once to see whether it works."""
         # First check if executable exists
         if not shutil.which(self.executable_path):
             return False
@@ -188,6 +211,31 @@ class PiperTTSClient:
         if not self.is_voice_available(voice_id):
             return None
 
+        if self._pool is not None and self.voices_directory is not None:
+            audio = self._pool.synthesize(
+                self.voices_directory / f"{voice_id}.onnx",
+                text,
+                length_scale=1.0 / speed,
+                speaker=self.default_speaker,
+            )
+            if audio is not None:
+                if output_path is not None:
+                    try:
+                        Path(output_path).write_bytes(audio)
+                    except OSError:
+                        return None
+                return audio
+
+        return self._synthesize_once(text, voice_id, output_path, speed)
+
+    def _synthesize_once(
+        self,
+        text: str,
+        voice_id: str,
+        output_path: Optional[Path],
+        speed: float,
+    ) -> Optional[bytes]:
+        """Synthesize one clip by running the piper executable."""
         # Determine output path
         if output_path is None:
             # Create temporary file
@@ -259,6 +307,11 @@ class PiperTTSClient:
         result = self.synthesize(text, voice_id, output_path, speed)
         return result is not None
 
+    def close(self) -> None:
+        """Stop any warm synthesis workers."""
+        if self._pool is not None:
+            self._pool.shutdown()
+
     def get_voice_info(self, voice_id: str) -> Optional[VoiceInfo]:
         """Get information about a specific voice.
 
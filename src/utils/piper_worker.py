@@ -0,0 +1,63 @@
+"""
+Piper Synthesis Worker
+
+Long-lived child process that loads one Piper voice model and synthesises
+requests until its stdin closes, so the ONNX model is loaded once per voice
+instead of once per clip. Started by piper_worker_pool.PiperWorkerPool.
+
+Protocol (binary pipes):
+    stdin:  one JSON object per line: {"text", "length_scale", "speaker"}
+    stdout: one frame per request - a 4-byte big-endian length followed by
+            that many bytes of WAV audio. A zero-length frame means the
+            request failed; the worker keeps serving.
+
+Usage:
+    python -m src.utils.piper_worker <model.onnx>
+"""
+
+import io
+import json
+import sys
+import wave
+from typing import List
+
+from piper import PiperVoice, SynthesisConfig
+
+from src.utils.piper_worker_pool import write_frame
+
+
+def main(argv: List[str]) -> int:
+    """Serve synthesis requests for one voice model.
+
+    Args:
+        argv: Command-line arguments; argv[1] is the .onnx model path.
+
+    Returns:
+        Process exit code.
+    """
+    if len(argv) != 2:
+        print("usage: python -m src.utils.piper_worker <model.onnx>", file=sys.stderr)
+        return 2
+    voice = PiperVoice.load(argv[1])
+    out = sys.stdout.buffer
+    for line in sys.stdin.buffer:
+        try:
+            request = json.loads(line)
+            buffer = io.BytesIO()
+            with wave.Wave_write(buffer) as wav_file:
+                voice.synthesize_wav(
+                    str(request["text"]),
+                    wav_file,
+                    syn_config=SynthesisConfig(
+                        speaker_id=int(request.get("speaker", 0)),
+                        length_scale=float(request.get("length_scale", 1.0)),
+                    ),
+                )
+            write_frame(out, buffer.getvalue())
+        except (ValueError, KeyError, TypeError, RuntimeError, wave.Error):
+            write_frame(out, b"")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
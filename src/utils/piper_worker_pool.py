@@ -0,0 +1,235 @@
+"""
+Piper Worker Pool
+
+Keeps one long-lived piper_worker process per recently used voice so each
+clip costs a pipe round-trip instead of a process start and an ONNX model
+load. Workers are evicted least-recently-used once the estimated memory of
+the loaded models exceeds the pool budget; the voice being served is never
+evicted, so a single oversized model still works.
+
+The pool needs the ``piper`` Python package (piper-tts) importable by the
+current interpreter; PiperTTSClient falls back to one-shot CLI runs when it
+is not. The pipe protocol is described in piper_worker.
+"""
+
+import importlib.util
+import json
+import struct
+import subprocess
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import IO, List, Optional
+
+# Resident memory of a loaded voice relative to its .onnx file size
+# (weights plus onnxruntime session buffers).
+_MODEL_MEMORY_FACTOR = 2
+
+# Seconds a worker is given to exit after its stdin closes.
+_SHUTDOWN_TIMEOUT = 5.0
+
+# Workers run as ``python -m src.utils.piper_worker`` from the project root.
+_PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+FRAME_HEADER = struct.Struct(">I")
+
+
+def write_frame(stream: IO[bytes], payload: bytes) -> None:
+    """Write one length-prefixed frame and flush it.
+
+    Args:
+        stream: Binary output stream.
+        payload: Frame body (empty for a failed request).
+    """
+    stream.write(FRAME_HEADER.pack(len(payload)))
+    stream.write(payload)
+    stream.flush()
+
+
+def read_frame(stream: IO[bytes]) -> Optional[bytes]:
+    """Read one length-prefixed frame.
+
+    Args:
+        stream: Binary input stream.
+
+    Returns:
+        Frame body, or None when the stream ended mid-frame.
+    """
+    header = stream.read(FRAME_HEADER.size)
+    if len(header) < FRAME_HEADER.size:
+        return None
+    (length,) = FRAME_HEADER.unpack(header)
+    payload = stream.read(length) if length else b""
+    return payload if len(payload) == length else None
+
+
+def workers_supported() -> bool:
+    """Check whether piper-tts can be imported by worker processes."""
+    return importlib.util.find_spec("piper") is not None
+
+
+def _worker_command(model_path: Path) -> List[str]:
+    """Return the command line that starts a worker for one model."""
+    return [sys.executable, "-m", "src.utils.piper_worker", str(model_path)]
+
+
+def _spawn(model_path: Path) -> "subprocess.Popen[bytes]":
+    """Start a worker process with piped stdin/stdout."""
+    return subprocess.Popen(
+        _worker_command(model_path),
+        cwd=_PROJECT_ROOT,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+class _PiperWorker:
+    """One worker process serving a single voice model."""
+
+    def __init__(self, model_path: Path) -> None:
+        self.model_path = model_path
+        try:
+            size = model_path.stat().st_size
+        except OSError:
+            size = 0
+        self.cost = size * _MODEL_MEMORY_FACTOR
+        self.lock = threading.Lock()
+        self.process = _spawn(model_path)
+
+    @property
+    def alive(self) -> bool:
+        """True while the worker process is running."""
+        return self.process.poll() is None
+
+    def synthesize(self, text: str, length_scale: float, speaker: int) -> Optional[bytes]:
+        """Send one request and wait for its WAV frame.
+
+        The liveness check and the pipe access happen under the worker lock,
+        so a worker closed by eviction in between reads as dead rather than
+        raising.
+
+        Returns:
+            WAV bytes, or None when the request failed or the worker died.
+        """
+        request = {"text": text, "length_scale": length_scale, "speaker": speaker}
+        with self.lock:
+            stdin, stdout = self.process.stdin, self.process.stdout
+            if stdin is None or stdout is None or not self.alive:
+                return None
+            try:
+                stdin.write(json.dumps(request).encode("utf-8") + b"\n")
+                stdin.flush()
+                frame = read_frame(stdout)
+            except (OSError, ValueError):
+                # ValueError: the pipes were closed under us by close().
+                frame = None
+            if frame is None:
+                # Broken pipe, closed pipe or truncated frame: the worker is gone.
+                self.process.kill()
+                self.process.wait()
+        return frame or None
+
+    def close(self) -> None:
+        """Close stdin and wait for the worker, killing it if it hangs.
+
+        Waits for an in-flight request to finish first.
+        """
+        with self.lock:
+            try:
+                if self.process.stdin is not None:
+                    self.process.stdin.close()
+                self.process.wait(timeout=_SHUTDOWN_TIMEOUT)
+            except (OSError, subprocess.TimeoutExpired):
+                self.process.kill()
+                self.process.wait()
+            if self.process.stdout is not None:
+                self.process.stdout.close()
+
+
+class PiperWorkerPool:
+    """LRU pool of warm Piper workers bounded by a memory budget."""
+
+    def __init__(self, max_bytes: int) -> None:
+        """Initialise an empty pool.
+
+        Args:
+            max_bytes: Estimated memory budget for all loaded voice models.
+        """
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._workers: "OrderedDict[Path, _PiperWorker]" = OrderedDict()
+
+    def _acquire(self, model_path: Path) -> _PiperWorker:
+        """Return a live worker for a model, starting one if needed."""
+        with self._lock:
+            worker = self._workers.get(model_path)
+            if worker is not None and not worker.alive:
+                del self._workers[model_path]
+                worker = None
+            if worker is None:
+                worker = _PiperWorker(model_path)
+                self._workers[model_path] = worker
+            self._workers.move_to_end(model_path)
+            evicted = self._evict_over_budget()
+        for old in evicted:
+            old.close()
+        return worker
+
+    def _evict_over_budget(self) -> List[_PiperWorker]:
+        """Drop least-recently-used workers until the budget fits (lock held)."""
+        evicted: List[_PiperWorker] = []
+        total = sum(worker.cost for worker in self._workers.values())
+        while total > self.max_bytes and len(self._workers) > 1:
+            _, worker = self._workers.popitem(last=False)
+            total -= worker.cost
+            evicted.append(worker)
+        return evicted
+
+    def synthesize(
+        self, model_path: Path, text: str, length_scale: float = 1.0, speaker: int = 0
+    ) -> Optional[bytes]:
+        """Synthesise text with a warm worker for the given voice model.
+
+        A worker that dies, or is evicted and closed, mid-request is replaced
+        by a fresh one and the request retried once before giving up.
+
+        Args:
+            model_path: Path to the voice's .onnx model.
+            text: Text to synthesise.
+            length_scale: Piper length scale (inverse of speed).
+            speaker: Speaker id for multi-speaker models.
+
+        Returns:
+            WAV bytes, or None when synthesis failed.
+        """
+        for _ in range(2):
+            try:
+                worker = self._acquire(model_path)
+            except OSError:
+                return None
+            audio = worker.synthesize(text, length_scale, speaker)
+            if audio is not None or worker.alive:
+                return audio
+            self._discard(model_path, worker)
+        return None
+
+    def _discard(self, model_path: Path, worker: _PiperWorker) -> None:
+        """Forget a dead worker so the next request starts a fresh one."""
+        with self._lock:
+            if self._workers.get(model_path) is worker:
+                del self._workers[model_path]
+
+    def loaded_models(self) -> List[Path]:
+        """Return the models with a running worker, least recently used first."""
+        with self._lock:
+            return list(self._workers)
+
+    def shutdown(self) -> None:
+        """Stop every worker."""
+        with self._lock:
+            workers = list(self._workers.values())
+            self._workers.clear()
+        for worker in workers:
+            worker.close()
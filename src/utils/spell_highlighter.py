@@ -9,10 +9,18 @@ Detection Strategy:
 - Custom/homebrew spells from the SpellRegistry are always highlighted.
 - Pattern matching detects common spell contexts (cast, channels, uses, etc.)
   as a fallback when no known spell list is provided.
+
+Known and registry spells are matched by a SpellMatcher: one trie-shaped
+regex over every name, compiled once per spell set (registry version plus
+the caller's known spells) and run over the text in a single pass.
 """
 
 import re
-from typing import Any, Callable, List, Optional, Set
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, FrozenSet, List, NamedTuple, Optional, Set, Tuple
+
+from src.utils.string_utils import trie_pattern
 
 try:
     from src.spells.spell_registry import get_spell_registry as _spell_registry_loader
@@ -74,6 +82,119 @@ FALSE_POSITIVES = {
 }
 
 
+# Number of distinct spell sets (one per character roster) kept compiled.
+_MATCHER_CACHE_SIZE = 32
+
+
+class SpellSpan(NamedTuple):
+    """A spell name found in text; text[start:end] is the matched name."""
+
+    start: int
+    end: int
+    name: str
+
+
+class SpellMatcher:
+    """Single-pass matcher for a fixed set of spell names.
+
+    Names are matched case-insensitively on word boundaries, skipping text
+    that is already bold; where names overlap the longest one wins.
+
+    Attributes:
+        names: Lowercased spell names the matcher recognises.
+    """
+
+    def __init__(self, names: Set[str]):
+        self.names: FrozenSet[str] = frozenset(
+            name.lower() for name in names if name and name not in FALSE_POSITIVES
+        )
+        self._pattern: Optional[re.Pattern[str]] = None
+        if self.names:
+            self._pattern = re.compile(
+                r"(?<!\*)\b(?:" + trie_pattern(sorted(self.names)) + r")\b(?!\*)",
+                re.IGNORECASE,
+            )
+
+    def find(self, text: str) -> List[SpellSpan]:
+        """Return every spell occurrence in text, in order.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Non-overlapping spans of matched spell names
+        """
+        if self._pattern is None or not text:
+            return []
+        return [SpellSpan(m.start(), m.end(), m.group(0))
+                for m in self._pattern.finditer(text)]
+
+    def highlight(self, text: str) -> str:
+        """Wrap every spell occurrence in bold markdown."""
+        if self._pattern is None or not text:
+            return text
+        return self._pattern.sub(lambda m: f"**{m.group(0)}**", text)
+
+
+_matcher_cache: "OrderedDict[Tuple[Any, ...], SpellMatcher]" = OrderedDict()
+_matcher_lock = threading.Lock()
+
+
+def _registry_state() -> Tuple[Any, int]:
+    """Return the spell registry and its version, or (None, 0) when unavailable."""
+    if _SPELL_REGISTRY_LOADER is None:
+        return None, 0
+    try:
+        registry = _SPELL_REGISTRY_LOADER()
+    except (OSError, KeyError, ValueError):
+        return None, 0
+    return registry, getattr(registry, "version", 0)
+
+
+def get_spell_matcher(known_spells: Optional[Set[str]] = None) -> SpellMatcher:
+    """Get the compiled matcher for known spells plus the registry spells.
+
+    Matchers are cached per spell set, so repeated calls for the same roster
+    reuse one compiled pattern until the registry changes.
+
+    Args:
+        known_spells: Optional character-known spell names
+
+    Returns:
+        SpellMatcher covering known_spells and every registry name
+    """
+    registry, version = _registry_state()
+    key = (id(registry), version, frozenset(known_spells or ()))
+    with _matcher_lock:
+        matcher = _matcher_cache.get(key)
+        if matcher is not None:
+            _matcher_cache.move_to_end(key)
+            return matcher
+    registry_names = _get_registry_spell_names() if registry is not None else set()
+    matcher = SpellMatcher(set(known_spells or ()) | registry_names)
+    with _matcher_lock:
+        _matcher_cache[key] = matcher
+        while len(_matcher_cache) > _MATCHER_CACHE_SIZE:
+            _matcher_cache.popitem(last=False)
+    return matcher
+
+
+def find_spell_spans(text: str, known_spells: Optional[Set[str]] = None) -> List[SpellSpan]:
+    """Locate known and registry spell names in text.
+
+    Uses the same matcher as highlight_spells_in_text, so callers indexing
+    story text see exactly the spells that would be highlighted.
+
+    Args:
+        text: Text to scan
+        known_spells: Optional character-known spell names
+
+    Returns:
+        Spans of matched spell names, in text order
+    """
+    return get_spell_matcher(known_spells).find(text)
+
+
 def _get_registry_spell_names() -> Set[str]:
     """Get all custom spell names from the registry (graceful no-op on failure).
 
@@ -135,7 +256,7 @@ def highlight_spells_in_text(text: str, known_spells: Optional[Set[str]] = None)
     """Highlight spell names in story text by wrapping them in bold markdown.
 
     Priority order:
-    1. If known_spells provided, highlight those exactly.
+    1. If known_spells provided, highlight those exactly (longest name wins).
     2. Always additionally highlight custom spells from the registry.
     3. Fall back to pattern-based detection for any remaining contexts.
 
@@ -155,32 +276,17 @@ def highlight_spells_in_text(text: str, known_spells: Optional[Set[str]] = None)
         return text
 
     known_spells = known_spells or set()
-    registry_names = _get_registry_spell_names()
+    matcher = get_spell_matcher(known_spells)
 
-    # Merge character-known spells with registry spells for highlighting
-    all_known = known_spells | registry_names
+    # Character-known spells plus registry spells, lowercased
+    all_known = matcher.names
     result_text = text
     highlighted_spells: Set[str] = set()
 
-    # Pass 1: Highlight all known/registry spells by exact name match
+    # Pass 1: Highlight all known/registry spells in a single scan
     if all_known:
-        for spell in sorted(all_known, key=len, reverse=True):
-            if spell.lower() in highlighted_spells:
-                continue
-            if spell in FALSE_POSITIVES:
-                continue
-            pattern = re.compile(
-                r"(?<!\*)\b" + re.escape(spell) + r"\b(?!\*)", re.IGNORECASE
-            )
-
-            def _make_replacer(matched_spell: str):
-                def _replace(match: re.Match[str]) -> str:
-                    return f"**{match.group(0)}**"
-                _ = matched_spell  # captured for clarity
-                return _replace
-
-            result_text = pattern.sub(_make_replacer(spell), result_text)
-            highlighted_spells.add(spell.lower())
+        result_text = matcher.highlight(result_text)
+        highlighted_spells.update(all_known)
 
         # If we had known_spells (character list), skip pattern fallback
         if known_spells:
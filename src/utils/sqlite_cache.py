@@ -0,0 +1,110 @@
+"""
+Shared SQLite file for the persistent caches.
+
+The embedding, chat response and arc analysis caches each keep one table in
+a SQLite file that is opened lazily, shared across threads behind a lock,
+and must never break the caller: any failure degrades to a cache miss or a
+skipped write. :class:`SqliteCacheFile` holds that connection handling once
+so each cache only carries its schema and queries.
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Iterable, List, Optional, Sequence
+
+
+class SqliteCacheFile:
+    """Lazily opened SQLite connection whose errors degrade to misses.
+
+    Every method takes ``lock`` itself; it is re-entrant, so a cache can
+    hold it around several calls that must see a consistent table.
+
+    Attributes:
+        lock: Guards the connection and the cache's own state.
+    """
+
+    def __init__(self, db_path: Optional[Path], schema: Sequence[str]) -> None:
+        """
+        Args:
+            db_path: Location of the SQLite file (parent dirs are created),
+                or None for no disk storage.
+            schema: Statements run once when the file is opened (CREATE
+                TABLE / CREATE INDEX ... IF NOT EXISTS).
+        """
+        self._db_path = Path(db_path) if db_path is not None else None
+        self._schema = tuple(schema)
+        self._conn: Optional[sqlite3.Connection] = None
+        self.lock = threading.RLock()
+
+    def connection(self) -> Optional[sqlite3.Connection]:
+        """Open (once) and return the connection, or None when unavailable.
+
+        A file that cannot be opened is not retried.
+        """
+        with self.lock:
+            if self._conn is not None or self._db_path is None:
+                return self._conn
+            try:
+                self._db_path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(str(self._db_path), check_same_thread=False)
+                for statement in self._schema:
+                    conn.execute(statement)
+                conn.commit()
+            except (OSError, sqlite3.Error):
+                self._db_path = None
+                return None
+            self._conn = conn
+            return conn
+
+    def fetchone(self, sql: str, params: Sequence[Any] = ()) -> Optional[Any]:
+        """Run a query and return its first row, or None on a miss or error."""
+        with self.lock:
+            conn = self.connection()
+            if conn is None:
+                return None
+            try:
+                return conn.execute(sql, params).fetchone()
+            except sqlite3.Error:
+                return None
+
+    def fetchall(self, sql: str, params: Sequence[Any] = ()) -> List[Any]:
+        """Run a query and return every row; empty on error."""
+        with self.lock:
+            conn = self.connection()
+            if conn is None:
+                return []
+            try:
+                return conn.execute(sql, params).fetchall()
+            except sqlite3.Error:
+                return []
+
+    def count(self, sql: str, params: Sequence[Any] = ()) -> int:
+        """Run a ``SELECT COUNT(*)`` style query; 0 when unavailable."""
+        row = self.fetchone(sql, params)
+        return int(row[0]) if row else 0
+
+    def write(self, sql: str, rows: Iterable[Sequence[Any]]) -> bool:
+        """Run a statement for each parameter row and commit.
+
+        Returns:
+            True when committed; on error the transaction is rolled back.
+        """
+        with self.lock:
+            conn = self.connection()
+            if conn is None:
+                return False
+            try:
+                conn.executemany(sql, rows)
+                conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                return False
+            return True
+
+    def close(self) -> None:
+        """Close the connection if it was opened."""
+        with self.lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -11,7 +11,7 @@ This module provides reusable functions for:
 
 import re
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 
 def get_session_date() -> str:
@@ -238,3 +238,37 @@ def remove_multiple_blank_lines(text: str) -> str:
         Text with normalized blank lines
     """
     return re.sub(r"\n\n+", "\n\n", text)
+
+
+def trie_pattern(names: List[str]) -> str:
+    """Build a regex alternation shaped like a character trie over names.
+
+    Shared prefixes are matched once and optional tails are greedy, so at
+    any position the longest name that lets the rest of the pattern match
+    wins. Names are escaped; callers add anchors, boundaries and flags.
+
+    Args:
+        names: Literal strings to match.
+
+    Returns:
+        Regex source matching any of the names.
+    """
+    trie: Dict[str, Any] = {}
+    for name in names:
+        node = trie
+        for char in name:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def _build(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + _build(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        terminal = "" in node
+        if len(branches) == 1 and not terminal:
+            return branches[0]
+        group = "(?:" + "|".join(branches) + ")"
+        return group + "?" if terminal else group
+
+    return _build(trie)
@@ -0,0 +1,140 @@
+"""
+TTS Audio Cache
+
+Content-addressed on-disk cache of synthesised clips. A clip is keyed by the
+SHA-256 of (voice, speed, pitch, text), stored as ``<key>.wav`` and evicted
+least-recently-used first once the directory outgrows its byte budget.
+Narrating the same story twice, or replaying a paragraph, is then a file read
+instead of a synthesis run.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+_SUFFIX = ".wav"
+
+
+def clip_key(voice_id: str, speed: float, pitch: float, text: str) -> str:
+    """Return the cache key for one synthesis request.
+
+    Args:
+        voice_id: Piper voice identifier.
+        speed: Speech speed multiplier.
+        pitch: Pitch shift in semitones.
+        text: Text to synthesise.
+
+    Returns:
+        Hex SHA-256 digest identifying the clip.
+    """
+    material = f"{voice_id}\0{speed:.4f}\0{pitch:.4f}\0{text}"
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class TtsAudioCache:
+    """Size-bounded LRU cache of WAV clips in one directory.
+
+    Recency survives restarts through file mtimes, which are bumped on every
+    hit. Disk errors never propagate: a failed read is a miss and a failed
+    write is skipped.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int, suffix: str = _SUFFIX) -> None:
+        """Initialise the cache.
+
+        Args:
+            directory: Directory holding the clips; created on first write.
+            max_bytes: Total size budget; 0 disables caching.
+            suffix: File extension of stored entries (other binary payloads,
+                such as rendered portraits, reuse the cache under their own).
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self._lock = threading.Lock()
+        self._sizes: Optional["OrderedDict[str, int]"] = None
+        self._total = 0
+
+    def _index(self) -> "OrderedDict[str, int]":
+        """Return key -> size in LRU order, scanning the directory once."""
+        if self._sizes is None:
+            entries = []
+            if self.directory.is_dir():
+                for path in self.directory.glob(f"*{self.suffix}"):
+                    try:
+                        stat = path.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, path.stem, stat.st_size))
+            entries.sort()
+            self._sizes = OrderedDict((key, size) for _, key, size in entries)
+            self._total = sum(self._sizes.values())
+        return self._sizes
+
+    def _path(self, key: str) -> Path:
+        """Return the file path for a key."""
+        return self.directory / f"{key}{self.suffix}"
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return a cached clip and mark it recently used.
+
+        Args:
+            key: Key from clip_key().
+
+        Returns:
+            WAV bytes, or None on a miss.
+        """
+        if self.max_bytes <= 0:
+            return None
+        with self._lock:
+            sizes = self._index()
+            if key not in sizes:
+                return None
+            path = self._path(key)
+            try:
+                data = path.read_bytes()
+                os.utime(path)
+            except OSError:
+                self._total -= sizes.pop(key)
+                return None
+            sizes.move_to_end(key)
+            return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store a clip, evicting least-recently-used clips over budget.
+
+        Args:
+            key: Key from clip_key().
+            data: WAV bytes; clips larger than the whole budget are skipped.
+        """
+        if not data or len(data) > self.max_bytes:
+            return
+        with self._lock:
+            sizes = self._index()
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                handle, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+                with os.fdopen(handle, "wb") as tmp:
+                    tmp.write(data)
+                os.replace(tmp_name, self._path(key))
+            except OSError:
+                return
+            self._total += len(data) - sizes.pop(key, 0)
+            sizes[key] = len(data)
+            while self._total > self.max_bytes and len(sizes) > 1:
+                old_key, old_size = sizes.popitem(last=False)
+                self._total -= old_size
+                try:
+                    self._path(old_key).unlink()
+                except OSError:
+                    pass
+
+    def total_bytes(self) -> int:
+        """Return the bytes currently held by the cache."""
+        with self._lock:
+            self._index()
+            return self._total
@@ -0,0 +1,31 @@
+import wave
+from pathlib import Path
+from typing import Optional, Union
+
+class SynthesisConfig:
+    speaker_id: Optional[int]
+    length_scale: Optional[float]
+    def __init__(
+        self,
+        speaker_id: Optional[int] = ...,
+        length_scale: Optional[float] = ...,
+        noise_scale: Optional[float] = ...,
+        noise_w_scale: Optional[float] = ...,
+        normalize_audio: bool = ...,
+        volume: float = ...,
+    ) -> None: ...
+
+class PiperVoice:
+    @staticmethod
+    def load(
+        model_path: Union[str, Path],
+        config_path: Optional[Union[str, Path]] = ...,
+        use_cuda: bool = ...,
+    ) -> "PiperVoice": ...
+    def synthesize_wav(
+        self,
+        text: str,
+        wav_file: wave.Wave_write,
+        syn_config: Optional[SynthesisConfig] = ...,
+        set_wav_format: bool = ...,
+    ) -> None: ...
@@ -17,11 +17,15 @@ Why we test this:
 - Ensures the resolver degrades safely and never blocks character creation
 """
 
+import types
+from typing import Any, Dict, List, Optional
+
 from tests import test_helpers
 from tests.ai import rag_fixtures
 
 (
     get_abilities,
+    get_class_tools,
     get_subclass_plan,
     _parse_abilities,
     _dedupe,
@@ -33,6 +37,7 @@ from tests.ai import rag_fixtures
 ) = test_helpers.safe_from_import(
     "src.ai.abilities_rag",
     "get_abilities",
+    "get_class_tools",
     "get_subclass_plan",
     "_parse_abilities",
     "_dedupe",
@@ -394,6 +399,38 @@ def test_feat_aside_stripped_specialisation_kept():
     print("  [PASS] '(see ...)' dropped, '(Cleric)' retained")
 
 
+_ROGUE_HTML = """
+<html><body><div id="page-content">
+  <p>Tool Proficiencies Thieves' Tools Weapon Proficiencies Simple weapons</p>
+  <h3>Level 1: Sneak Attack</h3><p>You deal extra damage.</p>
+  <h3>Level 2: Cunning Action</h3><p>You act quickly.</p>
+</div></body></html>
+"""
+
+
+def test_class_page_record_shared_across_resolvers() -> None:
+    """One class page fetch serves both the tool grant and its abilities."""
+    print("\n[TEST] Abilities - shared per-page extraction record")
+    requested: List[str] = []
+    store: Dict[str, Any] = {}
+
+    def _pages(url: str) -> Optional[str]:
+        requested.append(url)
+        return _ROGUE_HTML if url.endswith("rogue:main") else None
+
+    rag = rag_fixtures.make_fake_rules_rag(_pages)
+    rag.rules_client.cache = types.SimpleNamespace(get=store.get, set=store.__setitem__)
+
+    tools = get_class_tools("Rogue", rag=rag)
+    assert tools["granted"] == ["Thieves' Tools"], tools
+    abilities = get_abilities("class", "Rogue", 20, rag=rag)
+    assert [a["name"] for a in abilities] == ["Sneak Attack", "Cunning Action"], abilities
+    assert requested == ["http://rules.example/rogue:main"], requested
+    record = store["http://rules.example/rogue:main#extracts"]
+    assert set(record) == {"tool_segment", "abilities"}, record
+    print("  [PASS] Tool segment and abilities stored in one record from one fetch")
+
+
 def run_all_tests():
     """Run all abilities RAG resolver tests."""
     print("=" * 70)
@@ -418,6 +455,7 @@ def run_all_tests():
     test_background_both_layouts_parse()
     test_background_tolerates_label_typos()
     test_feat_aside_stripped_specialisation_kept()
+    test_class_page_record_shared_across_resolvers()
 
     print("\n" + "=" * 70)
     print("[SUCCESS] ALL ABILITIES RAG RESOLVER TESTS PASSED")
@@ -1,53 +1,61 @@
-
-"""
-AI Subsystem Test Runner
-
-Runs all AI integration tests using the module-runner pattern (subprocess
-invocation of each test module) and prints a concise summary.
-"""
-
-import sys
-from tests.test_runner_common import print_subsystem_summary, run_test_file
-
-
-def run_all_ai_tests():
-    """Run all AI subsystem tests and summarize results."""
-    print("=" * 70)
-    print("AI INTEGRATION - COMPREHENSIVE TEST SUITE")
-    print("=" * 70)
-    print()
-
-
-    tests = [
-        ("test_ai_env_config", "AI Environment Configuration"),
-        ("test_ai_client", "AI Client Interface"),
-        ("test_rag_system", "RAG System Tests"),
-        ("test_abilities_rag", "Abilities RAG Resolver Tests"),
-        ("test_catalog_rag", "Catalogue RAG Resolver Tests"),
-        ("test_behavior_generation_ai_mock", "Behavior Generation (Mock)"),
-        ("test_availability", "AI Availability Tests"),
-        ("test_task_router", "Task Router Tests"),
-        ("test_milvus_client", "Milvus Client Tests"),
-        ("test_embedding_pipeline", "Embedding Pipeline Tests"),
-        ("test_semantic_retriever", "Semantic Retriever Tests"),
-        ("test_prompt_templates", "Prompt Templates Tests"),
-        ("test_comfyui_client", "ComfyUI Client Tests"),
-        ("test_comfyui_workflows", "ComfyUI Workflow Builder Tests"),
-        ("test_portrait_prompt", "Portrait Prompt Builder Tests"),
-        ("test_ollama_admin", "Ollama Admin (Unload) Tests"),
-        ("test_image_describe", "Image-to-Prompt Vision Tests"),
-    ]
-
-
-    results = {}
-    for test_file, test_name in tests:
-        results[test_name] = run_test_file(test_file, "ai", test_name)
-
-
-    # Summary (use shared helper)
-    return print_subsystem_summary(results, "AI SUBSYSTEM - TEST SUMMARY")
-
-
-
-if __name__ == "__main__":
-    sys.exit(run_all_ai_tests())
+
+"""
+AI Subsystem Test Runner
+
+Runs all AI integration tests using the module-runner pattern (subprocess
+invocation of each test module) and prints a concise summary.
+"""
+
+import sys
+from tests.test_runner_common import print_subsystem_summary, run_test_file
+
+
+def run_all_ai_tests():
+    """Run all AI subsystem tests and summarize results."""
+    print("=" * 70)
+    print("AI INTEGRATION - COMPREHENSIVE TEST SUITE")
+    print("=" * 70)
+    print()
+
+
+    tests = [
+        ("test_ai_env_config", "AI Environment Configuration"),
+        ("test_ai_client", "AI Client Interface"),
+        ("test_rag_system", "RAG System Tests"),
+        ("test_abilities_rag", "Abilities RAG Resolver Tests"),
+        ("test_catalog_rag", "Catalogue RAG Resolver Tests"),
+        ("test_wiki_scraping", "Wiki Fetch Scheduler Tests"),
+        ("test_behavior_generation_ai_mock", "Behavior Generation (Mock)"),
+        ("test_availability", "AI Availability Tests"),
+        ("test_task_router", "Task Router Tests"),
+        ("test_milvus_client", "Milvus Client Tests"),
+        ("test_embedded_vector_store", "Embedded Vector Store Tests"),
+        ("test_embedding_cache", "Embedding Cache Tests"),
+        ("test_response_cache", "AI Response Cache Tests"),
+        ("test_request_scheduler", "Model Request Scheduler Tests"),
+        ("test_lexical_index", "Lexical Index Tests"),
+        ("test_embedding_pipeline", "Embedding Pipeline Tests"),
+        ("test_index_manifest", "Incremental Index Manifest Tests"),
+        ("test_semantic_retriever", "Semantic Retriever Tests"),
+        ("test_prompt_templates", "Prompt Templates Tests"),
+        ("test_comfyui_client", "ComfyUI Client Tests"),
+        ("test_comfyui_workflows", "ComfyUI Workflow Builder Tests"),
+        ("test_portrait_jobs", "Portrait Job Queue Tests"),
+        ("test_portrait_prompt", "Portrait Prompt Builder Tests"),
+        ("test_ollama_admin", "Ollama Admin (Unload) Tests"),
+        ("test_image_describe", "Image-to-Prompt Vision Tests"),
+    ]
+
+
+    results = {}
+    for test_file, test_name in tests:
+        results[test_name] = run_test_file(test_file, "ai", test_name)
+
+
+    # Summary (use shared helper)
+    return print_subsystem_summary(results, "AI SUBSYSTEM - TEST SUMMARY")
+
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_ai_tests())
@@ -1,9 +1,11 @@
 """Tests for the ComfyUI HTTP workflow client (comfyui_client).
 
-All tests mock ``requests`` so they run without a live ComfyUI server.
+All tests mock ``requests`` (and the event-stream socket) so they run
+without a live ComfyUI server.
 """
 
-from typing import Any
+import json
+from typing import Any, List
 from unittest.mock import patch
 
 import requests
@@ -30,7 +32,7 @@ def test_is_available_true_on_200() -> None:
     """is_available returns True when the stats probe returns 200."""
     print("\n[TEST] ComfyUIClient.is_available - reachable")
     client = _make_client()
-    with patch("src.ai.comfyui_client.requests.get", return_value=_resp(200)):
+    with patch("src.ai.comfyui_client.requests.Session.get", return_value=_resp(200)):
         assert client.is_available() is True
     print("  [OK] True when /system_stats returns 200")
 
@@ -40,7 +42,7 @@ def test_is_available_false_on_error() -> None:
     print("\n[TEST] ComfyUIClient.is_available - unreachable")
     client = _make_client()
     with patch(
-        "src.ai.comfyui_client.requests.get",
+        "src.ai.comfyui_client.requests.Session.get",
         side_effect=requests.RequestException("down"),
     ):
         assert client.is_available() is False
@@ -52,7 +54,7 @@ def test_free_returns_true_on_200() -> None:
     print("\n[TEST] ComfyUIClient.free - success")
     client = _make_client()
     with patch(
-        "src.ai.comfyui_client.requests.post", return_value=_resp(200)
+        "src.ai.comfyui_client.requests.Session.post", return_value=_resp(200)
     ) as post:
         assert client.free() is True
         assert post.call_args.args[0] == _BASE_URL + "/free"
@@ -64,7 +66,7 @@ def test_free_returns_false_on_error() -> None:
     print("\n[TEST] ComfyUIClient.free - failure")
     client = _make_client()
     with patch(
-        "src.ai.comfyui_client.requests.post",
+        "src.ai.comfyui_client.requests.Session.post",
         side_effect=requests.RequestException("down"),
     ):
         assert client.free() is False
@@ -76,13 +78,47 @@ def test_upload_image_returns_stored_name() -> None:
     print("\n[TEST] ComfyUIClient.upload_image - stored name")
     client = _make_client()
     with patch(
-        "src.ai.comfyui_client.requests.post",
+        "src.ai.comfyui_client.requests.Session.post",
         return_value=_resp(200, {"name": "ref.png"}),
     ):
         assert client.upload_image("ref.png", b"bytes") == "ref.png"
     print("  [OK] Returns the reported stored filename")
 
 
+_HISTORY = {
+    "abc": {
+        "outputs": {
+            "9": {
+                "images": [
+                    {"filename": "portrait_0001.png", "subfolder": "", "type": "output"}
+                ]
+            }
+        }
+    }
+}
+
+
+class _FakeSocket:
+    """Stand-in for the /ws connection that replays canned events."""
+
+    def __init__(self, events: List[Any]) -> None:
+        self.events = list(events)
+        self.closed = False
+        self.timeouts: List[float] = []
+
+    def recv(self, timeout: float = 0.0) -> Any:
+        """Return the next event; a drained socket behaves like a dropped one."""
+        self.timeouts.append(timeout)
+        if not self.events:
+            raise OSError("connection closed")
+        event = self.events.pop(0)
+        return event if isinstance(event, bytes) else json.dumps(event)
+
+    def close(self) -> None:
+        """Record that the client closed the socket."""
+        self.closed = True
+
+
 def test_generate_happy_path_returns_png_bytes() -> None:
     """generate queues, polls history, and fetches the output image bytes."""
     print("\n[TEST] ComfyUIClient.generate - happy path")
@@ -102,11 +138,11 @@ def test_generate_happy_path_returns_png_bytes() -> None:
             }
         }
     }
-    with patch(
-        "src.ai.comfyui_client.requests.post",
+    with patch("src.ai.comfyui_client._ws_connect", None), patch(
+        "src.ai.comfyui_client.requests.Session.post",
         return_value=_resp(200, {"prompt_id": "abc"}),
     ), patch(
-        "src.ai.comfyui_client.requests.get",
+        "src.ai.comfyui_client.requests.Session.get",
         side_effect=[_resp(200, history), _resp(200, content=b"PNGDATA")],
     ):
         result = client.generate({"1": {"class_type": "x", "inputs": {}}})
@@ -115,12 +151,74 @@ def test_generate_happy_path_returns_png_bytes() -> None:
     print("  [OK] Returns PNG bytes from the output node")
 
 
+def test_generate_follows_event_stream() -> None:
+    """Progress and completion come from /ws; history is read once, not polled."""
+    print("\n[TEST] ComfyUIClient.generate - event stream")
+    client = _make_client()
+    socket = _FakeSocket([
+        {"type": "status", "data": {"status": {}}},
+        {"type": "progress", "data": {"value": 1, "max": 4, "prompt_id": "other"}},
+        {"type": "progress", "data": {"value": 2, "max": 4, "prompt_id": "abc"}},
+        b"latent-preview",
+        {"type": "executing", "data": {"node": None, "prompt_id": "abc"}},
+    ])
+    progress = []
+    with patch(
+        "src.ai.comfyui_client._ws_connect", return_value=socket
+    ) as connect, patch(
+        "src.ai.comfyui_client.requests.Session.post",
+        return_value=_resp(200, {"prompt_id": "abc"}),
+    ) as post, patch(
+        "src.ai.comfyui_client.requests.Session.get",
+        side_effect=[_resp(200, _HISTORY), _resp(200, content=b"PNGDATA")],
+    ) as get:
+        result = client.generate({"1": {}}, on_progress=lambda *step: progress.append(step))
+
+    assert result == b"PNGDATA"
+    assert progress == [(2, 4)], progress
+    assert connect.call_args.args[0] == f"ws://comfyui.test/ws?clientId={client.client_id}"
+    assert post.call_args.kwargs["json"]["client_id"] == client.client_id
+    assert get.call_count == 2 and socket.closed
+    assert all(0 < timeout <= 15.0 for timeout in socket.timeouts)
+    print("  [OK] Progress reported, one history read, socket closed")
+
+
+def test_generate_reports_execution_error_from_stream() -> None:
+    """An execution_error event fails the run without polling to the timeout."""
+    print("\n[TEST] ComfyUIClient.generate - event stream error")
+    client = _make_client()
+    socket = _FakeSocket([{"type": "execution_error", "data": {"prompt_id": "abc"}}])
+    with patch("src.ai.comfyui_client._ws_connect", return_value=socket), patch(
+        "src.ai.comfyui_client.requests.Session.post",
+        return_value=_resp(200, {"prompt_id": "abc"}),
+    ), patch("src.ai.comfyui_client.requests.Session.get") as get:
+        assert client.generate({"1": {}}) is None
+    get.assert_not_called()
+    print("  [OK] None returned straight from the error event")
+
+
+def test_generate_polls_when_stream_drops() -> None:
+    """A socket that drops mid-run falls back to polling /history."""
+    print("\n[TEST] ComfyUIClient.generate - stream drop falls back to polling")
+    client = _make_client()
+    socket = _FakeSocket([{"type": "progress", "data": {"value": 1, "max": 4, "prompt_id": "abc"}}])
+    with patch("src.ai.comfyui_client._ws_connect", return_value=socket), patch(
+        "src.ai.comfyui_client.requests.Session.post",
+        return_value=_resp(200, {"prompt_id": "abc"}),
+    ), patch(
+        "src.ai.comfyui_client.requests.Session.get",
+        side_effect=[_resp(200, _HISTORY), _resp(200, content=b"PNGDATA")],
+    ):
+        assert client.generate({"1": {}}) == b"PNGDATA"
+    print("  [OK] Image fetched after polling history")
+
+
 def test_generate_returns_none_when_queue_fails() -> None:
     """generate returns None when the workflow cannot be queued."""
     print("\n[TEST] ComfyUIClient.generate - queue failure")
     client = _make_client()
     with patch(
-        "src.ai.comfyui_client.requests.post",
+        "src.ai.comfyui_client.requests.Session.post",
         side_effect=requests.RequestException("no queue"),
     ):
         assert client.generate({"1": {}}) is None
@@ -135,6 +233,9 @@ def run_all_tests() -> None:
     test_free_returns_false_on_error()
     test_upload_image_returns_stored_name()
     test_generate_happy_path_returns_png_bytes()
+    test_generate_follows_event_stream()
+    test_generate_reports_execution_error_from_stream()
+    test_generate_polls_when_stream_drops()
     test_generate_returns_none_when_queue_fails()
     print("\n[PASS] All ComfyUIClient tests passed.")
 
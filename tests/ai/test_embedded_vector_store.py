@@ -0,0 +1,211 @@
+"""
+Tests for EmbeddedVectorStore
+
+The store runs against a temporary directory with an 8-dim embedding so the
+tests exercise the real NumPy storage, filters, persistence and IVF search.
+"""
+
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+from tests import test_helpers
+
+store_module = test_helpers.import_module("src.ai.embedded_vector_store")
+milvus_client_module = test_helpers.import_module("src.ai.milvus_client")
+vector_store_module = test_helpers.import_module("src.ai.vector_store")
+EmbeddedVectorStore = store_module.EmbeddedVectorStore
+VectorStore = vector_store_module.VectorStore
+
+DIM = 8
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def _make_store(directory: Path) -> Any:
+    """Return a connected store with a small embedding dimension."""
+    with patch.object(store_module, "load_config") as mock_cfg:
+        mock_cfg.return_value.milvus.collection_prefix = "test"
+        mock_cfg.return_value.milvus.embedding.dim = DIM
+        store = EmbeddedVectorStore(directory)
+    assert store.connect()
+    store.create_collections()
+    return store
+
+
+def _axis(index: int, scale: float = 1.0) -> List[float]:
+    """Return a unit vector along one axis (scaled; cosine ignores scale)."""
+    vector = [0.0] * DIM
+    vector[index] = scale
+    return vector
+
+
+def _npc(name: str, location: str, axis: int) -> Dict[str, Any]:
+    return {"npc_name": name, "location": location, "chunk_text": name, "embedding": _axis(axis)}
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+
+def test_store_satisfies_protocol() -> None:
+    """Both backends implement VectorStore; create_vector_store picks by config."""
+    print("\n[TEST] EmbeddedVectorStore - protocol and factory")
+    with tempfile.TemporaryDirectory() as tmp:
+        assert isinstance(_make_store(Path(tmp)), VectorStore)
+    with patch.object(milvus_client_module, "load_config") as mock_cfg, \
+            patch.object(milvus_client_module, "EmbeddedVectorStore") as mock_store:
+        mock_cfg.return_value.milvus.backend = "embedded"
+        assert milvus_client_module.create_vector_store() is mock_store.return_value
+    print("  [OK] Protocol satisfied and embedded backend selected")
+
+
+def test_insert_and_search_ranks_by_cosine() -> None:
+    """Search returns output fields plus score, best match first."""
+    print("\n[TEST] EmbeddedVectorStore - cosine top-k")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = _make_store(Path(tmp))
+        ids = store.insert_returning_ids("npcs", [
+            _npc("Aria", "Waterdeep", 0),
+            _npc("Borin", "Neverwinter", 1),
+            _npc("Cyra", "Waterdeep", 2),
+        ])
+        assert ids == [1, 2, 3]
+        hits = store.search("npcs", _axis(1, scale=5.0), top_k=2)
+        assert [hit["npc_name"] for hit in hits][0] == "Borin"
+        assert abs(hits[0]["score"] - 1.0) < 1e-5
+        assert len(hits) == 2
+        assert set(hits[0]) == {"npc_name", "location", "chunk_text", "score"}
+    print("  [OK] Nearest vector ranked first with cosine score")
+
+
+def test_expr_filters_match_milvus_forms() -> None:
+    """Equality, integer and id-in filters restrict search and delete."""
+    print("\n[TEST] EmbeddedVectorStore - expr filters")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = _make_store(Path(tmp))
+        store.insert("npcs", [_npc("Aria", "Waterdeep", 0), _npc("Borin", "Neverwinter", 0)])
+        hits = store.search("npcs", _axis(0), top_k=5, expr='location == "Neverwinter"')
+        assert [hit["npc_name"] for hit in hits] == ["Borin"]
+
+        store.insert("story_chunks", [
+            {"campaign_name": "Main", "story_file": "a.md", "chunk_index": i,
+             "chunk_text": f"c{i}", "embedding": _axis(i)}
+            for i in range(3)
+        ])
+        hits = store.search(
+            "story_chunks", _axis(0), top_k=5,
+            expr='campaign_name == "Main" and chunk_index in [1, 2]',
+        )
+        assert sorted(hit["chunk_index"] for hit in hits) == [1, 2]
+
+        store.delete_by_ids("npcs", [1])
+        store.delete_by_source("story_chunks", "story_file", "a.md")
+        assert store.get_collection("npcs").num_entities == 1
+        assert store.get_collection("story_chunks").num_entities == 0
+
+        try:
+            store.search("npcs", _axis(0), expr="location != 'x'")
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("Unsupported expression should raise ValueError")
+    print("  [OK] Filters applied; deletes remove matching rows")
+
+
+def test_commit_persists_and_reopens_memory_mapped() -> None:
+    """Only committed writes survive a reopen; ids keep increasing."""
+    print("\n[TEST] EmbeddedVectorStore - persistence")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = _make_store(Path(tmp))
+        store.insert("npcs", [_npc("Aria", "Waterdeep", 0)])
+        store.disconnect()
+
+        reopened = _make_store(Path(tmp))
+        assert reopened.get_collection("npcs").num_entities == 1
+        reopened.insert("npcs", [_npc("Borin", "Neverwinter", 1)])  # never committed
+        assert reopened.insert_returning_ids("npcs", [_npc("Cyra", "Baldur", 2)]) == [3]
+
+        third = _make_store(Path(tmp))
+        assert [h["npc_name"] for h in third.search("npcs", _axis(0))] == ["Aria"]
+
+        reopened.drop_collection("npcs")
+        assert not (Path(tmp) / "test_npcs.npy").exists()
+    print("  [OK] Commit persisted rows; uncommitted rows discarded")
+
+
+def test_concurrent_commits_are_merged() -> None:
+    """A store with stale handles neither overwrites nor misses another's commit."""
+    print("\n[TEST] EmbeddedVectorStore - concurrent commits")
+    with tempfile.TemporaryDirectory() as tmp:
+        sidecar = _make_store(Path(tmp))
+        sidecar.insert("npcs", [_npc("Aria", "Waterdeep", 0)])
+        sidecar.commit()
+
+        cli = _make_store(Path(tmp))
+        cli.delete_by_source("npcs", "npc_name", "Aria")
+        cli.insert("npcs", [_npc("Borin", "Neverwinter", 1)])
+        cli.commit()
+        assert [h["npc_name"] for h in sidecar.search("npcs", _axis(1))] == ["Borin"]
+
+        cli.insert("npcs", [_npc("Cyra", "Baldur", 2)])
+        sidecar.insert("npcs", [_npc("Dain", "Mirabar", 3)])
+        cli.commit()
+        sidecar.commit()
+        names = sorted(h["npc_name"] for h in _make_store(Path(tmp)).search("npcs", _axis(0)))
+        assert names == ["Borin", "Cyra", "Dain"], names
+    print("  [OK] Newer copy re-read; pending writes replayed on top of it")
+
+
+def test_ivf_partitions_large_collections() -> None:
+    """Collections past the IVF threshold search only probed partitions."""
+    print("\n[TEST] EmbeddedVectorStore - IVF search")
+    np = store_module.np
+    rng = np.random.default_rng(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = _make_store(Path(tmp))
+        vectors = rng.normal(size=(40 * 20, DIM)).astype("float32")
+        store.insert("characters", [
+            {"character_name": f"c{i}", "source_file": "f", "chunk_text": "",
+             "chunk_type": "bio", "embedding": vec.tolist()}
+            for i, vec in enumerate(vectors)
+        ])
+        collection = store.get_collection("characters")
+        hits = store.search("characters", vectors[7].tolist(), top_k=3)
+        assert hits[0]["character_name"] == "c7"
+        centroids, lists = collection.partitions()
+        assert len(lists) == 20 and centroids.shape == (20, DIM)
+        assert sum(len(rows) for rows in lists) == len(vectors)
+
+        store.insert("characters", [
+            {"character_name": "new", "source_file": "f", "chunk_text": "",
+             "chunk_type": "bio", "embedding": _axis(0)}
+        ])
+        centroids, lists = collection.partitions()
+        assert sum(len(rows) for rows in lists) == len(vectors) + 1
+    print("  [OK] IVF lists built, searched and rebuilt after a write")
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+
+def run_all_tests() -> None:
+    """Run all EmbeddedVectorStore tests."""
+    test_store_satisfies_protocol()
+    test_insert_and_search_ranks_by_cosine()
+    test_expr_filters_match_milvus_forms()
+    test_commit_persists_and_reopens_memory_mapped()
+    test_concurrent_commits_are_merged()
+    test_ivf_partitions_large_collections()
+    print("\n[PASS] All EmbeddedVectorStore tests passed.")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,82 @@
+"""
+Tests for EmbeddingCache
+
+Exercises the SQLite vector cache directly: round-trips, model isolation,
+and graceful degradation when the database cannot be opened.
+"""
+
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from tests import test_helpers
+
+EmbeddingCache, text_hash = test_helpers.safe_from_import(
+    "src.ai.embedding_cache", "EmbeddingCache", "text_hash"
+)
+
+
+def _make_cache() -> Any:
+    """Return a cache backed by a fresh temp file."""
+    return EmbeddingCache(Path(tempfile.mkdtemp()) / "nested" / "embeddings.sqlite3")
+
+
+def test_round_trip_preserves_vectors() -> None:
+    """Stored vectors come back for the same model and hash."""
+    print("\n[TEST] EmbeddingCache - round trip")
+    cache = _make_cache()
+    digest = text_hash("The Prancing Pony")
+    cache.put_many("model-a", [(digest, [0.25, -0.5, 1.0])])
+    found = cache.get_many("model-a", [digest, text_hash("missing")])
+    assert list(found) == [digest], f"Expected one hit, got {list(found)}"
+    assert found[digest] == [0.25, -0.5, 1.0], f"Vector changed: {found[digest]}"
+    assert cache.count() == 1
+    cache.close()
+    print("  [OK] Vector round-trips through SQLite")
+
+
+def test_models_are_isolated() -> None:
+    """A vector cached for one model is not returned for another."""
+    print("\n[TEST] EmbeddingCache - model isolation")
+    cache = _make_cache()
+    digest = text_hash("Bree")
+    cache.put_many("model-a", [(digest, [1.0, 0.0])])
+    assert not cache.get_many("model-b", [digest]), "Other model must miss"
+    assert cache.count("model-a") == 1 and cache.count("model-b") == 0
+    cache.close()
+    print("  [OK] Cache keys include the embedding model")
+
+
+def test_empty_vectors_are_not_stored() -> None:
+    """Failed embeddings ([]) never enter the cache."""
+    print("\n[TEST] EmbeddingCache - empty vectors skipped")
+    cache = _make_cache()
+    cache.put_many("model-a", [(text_hash("x"), [])])
+    assert cache.count() == 0
+    cache.close()
+    print("  [OK] Empty vectors skipped")
+
+
+def test_unwritable_path_degrades_to_miss() -> None:
+    """A cache path that cannot be opened behaves as an always-miss cache."""
+    print("\n[TEST] EmbeddingCache - unwritable path")
+    blocker = Path(tempfile.mkdtemp()) / "not_a_dir"
+    blocker.write_text("", encoding="utf-8")
+    cache = EmbeddingCache(blocker / "embeddings.sqlite3")
+    cache.put_many("model-a", [(text_hash("x"), [1.0])])
+    assert not cache.get_many("model-a", [text_hash("x")])
+    assert cache.count() == 0
+    print("  [OK] Broken cache path never raises")
+
+
+def run_all_tests() -> None:
+    """Run all embedding cache tests."""
+    test_round_trip_preserves_vectors()
+    test_models_are_isolated()
+    test_empty_vectors_are_not_stored()
+    test_unwritable_path_degrades_to_miss()
+    print("\n[PASS] All EmbeddingCache tests passed.")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -2,7 +2,8 @@
 Tests for EmbeddingPipeline
 
 Validates chunking logic for each data type without requiring a live AI
-endpoint. The embed_text() call is patched to return a fixed dummy vector.
+endpoint. The embed_texts() call is patched to return a fixed dummy vector,
+or the AI client itself is mocked when batching and caching are under test.
 """
 
 import tempfile
@@ -22,6 +23,9 @@ from tests import test_helpers
     "_MIN_PARAGRAPH_CHARS",
     "_STORY_CHUNK_TARGET",
 )
+EmbeddingCache = test_helpers.safe_from_import(
+    "src.ai.embedding_cache", "EmbeddingCache"
+)
 
 # Dummy vector returned by every patched embed_text call.
 _DUMMY_VEC: List[float] = [0.1] * 1536
@@ -31,19 +35,43 @@ _DUMMY_VEC: List[float] = [0.1] * 1536
 # ---------------------------------------------------------------------------
 
 
-def _make_pipeline() -> Any:
-    """Return a pipeline with a mocked AI client."""
-    mock_ai = MagicMock()
-    mock_ai.embed.return_value = _DUMMY_VEC
-    with patch("src.ai.ai_client.AIClient", return_value=mock_ai), \
+def _make_pipeline(
+    batch_size: int = 32,
+    concurrency: int = 4,
+    mock_ai: Any = None,
+    model: str = "test-model",
+    cache: Any = None,
+) -> Any:
+    """Return a pipeline with a mocked AI client and (by default) a fresh temp cache."""
+    if mock_ai is None:
+        mock_ai = _mock_ai()
+    if cache is None:
+        cache = EmbeddingCache(Path(tempfile.mkdtemp()) / "embeddings.sqlite3")
+    with patch("src.ai.embedding_pipeline.AIClient", return_value=mock_ai), \
             patch("src.ai.embedding_pipeline.load_config") as mock_cfg:
-        mock_cfg.return_value.milvus.embedding_model = "test-model"
-        return EmbeddingPipeline()
+        emb = mock_cfg.return_value.milvus.embedding
+        emb.model = model
+        emb.batch_size = batch_size
+        emb.concurrency = concurrency
+        return EmbeddingPipeline(cache=cache)
+
+
+def _mock_ai() -> MagicMock:
+    """Return a mock AIClient whose embed() yields one vector per text."""
+    mock_ai = MagicMock()
+    mock_ai.embed.side_effect = _batch_embed
+    return mock_ai
+
+
+def _batch_embed(texts: List[str], model: str = "") -> List[List[float]]:
+    """Stand-in for AIClient.embed: one dummy vector per input text."""
+    assert model == "test-model", f"Unexpected model {model!r}"
+    return [list(_DUMMY_VEC) for _ in texts]
 
 
-def _patched_embed(text: str) -> List[float]:
-    """Return dummy vector for any non-empty input."""
-    return _DUMMY_VEC if text.strip() else []
+def _patched_embed(texts: List[str]) -> List[List[float]]:
+    """Return dummy vector for every non-empty input."""
+    return [_DUMMY_VEC if text.strip() else [] for text in texts]
 
 
 # ---------------------------------------------------------------------------
@@ -54,13 +82,98 @@ def _patched_embed(text: str) -> List[float]:
 def test_embed_text_returns_empty_for_blank() -> None:
     """embed_text returns [] for blank or whitespace-only input."""
     print("\n[TEST] embed_text - empty input")
-    pipeline = _make_pipeline()
-    with patch.object(pipeline, "embed_text", side_effect=_patched_embed):
-        result = pipeline.embed_text("")
-        assert result == [], f"Expected [] for empty input, got {result}"
-        result_ws = pipeline.embed_text("   ")
-        assert not result_ws, f"Expected [] for whitespace, got {result_ws}"
-    print("  [OK] Empty / whitespace input returns []")
+    mock_ai = _mock_ai()
+    pipeline = _make_pipeline(mock_ai=mock_ai)
+    result = pipeline.embed_text("")
+    assert result == [], f"Expected [] for empty input, got {result}"
+    result_ws = pipeline.embed_text("   ")
+    assert not result_ws, f"Expected [] for whitespace, got {result_ws}"
+    mock_ai.embed.assert_not_called()
+    print("  [OK] Empty / whitespace input returns [] without an API call")
+
+
+# ---------------------------------------------------------------------------
+# embed_texts - batching and cache
+# ---------------------------------------------------------------------------
+
+
+def test_embed_texts_batches_requests() -> None:
+    """Texts are sent in batch_size groups, one vector per input in order."""
+    print("\n[TEST] embed_texts - batching")
+    mock_ai = _mock_ai()
+    pipeline = _make_pipeline(batch_size=3, concurrency=2, mock_ai=mock_ai)
+    texts = [f"Paragraph {i} about the Misty Mountains." for i in range(7)]
+    vectors = pipeline.embed_texts(texts)
+    assert len(vectors) == 7 and all(vectors), "Every text should get a vector"
+    sizes = sorted(len(c.args[0]) for c in mock_ai.embed.call_args_list)
+    assert sizes == [1, 3, 3], f"Expected batches of 3/3/1, got {sizes}"
+    print("  [OK] 7 texts embedded in 3 batched requests")
+
+
+def test_embed_texts_uses_cache_and_dedupes() -> None:
+    """Duplicates are embedded once and cached texts are never re-sent."""
+    print("\n[TEST] embed_texts - cache reuse and de-duplication")
+    mock_ai = _mock_ai()
+    pipeline = _make_pipeline(batch_size=10, mock_ai=mock_ai)
+    first = pipeline.embed_texts(["alpha", "beta", "alpha", ""])
+    assert first[0] and first[1] and first[2] and first[3] == []
+    sent = mock_ai.embed.call_args_list[0].args[0]
+    assert sent == ["alpha", "beta"], f"Expected de-duplicated batch, got {sent}"
+
+    mock_ai.embed.reset_mock()
+    again = pipeline.embed_texts(["beta", "alpha"])
+    assert all(again), "Cached texts should still return vectors"
+    mock_ai.embed.assert_not_called()
+
+    pipeline.embed_texts(["beta", "gamma"])
+    sent = mock_ai.embed.call_args_list[0].args[0]
+    assert sent == ["gamma"], f"Only the new text should be sent, got {sent}"
+    print("  [OK] Cache hits skip the endpoint; duplicates embedded once")
+
+
+def test_cache_keyed_on_client_fallback_model() -> None:
+    """Without MILVUS_EMBEDDING_MODEL the client's model keys the cache."""
+    print("\n[TEST] embed_texts - cache keyed on the effective model")
+    cache = EmbeddingCache(Path(tempfile.mkdtemp()) / "embeddings.sqlite3")
+    sent_models: List[str] = []
+
+    def _ai(model: str) -> MagicMock:
+        mock_ai = MagicMock()
+        mock_ai.embedding_model = model
+
+        def _embed(texts: List[str], model: str = "") -> List[List[float]]:
+            sent_models.append(model)
+            return [list(_DUMMY_VEC) for _ in texts]
+
+        mock_ai.embed.side_effect = _embed
+        return mock_ai
+
+    old = _make_pipeline(mock_ai=_ai("env-old"), model="", cache=cache)
+    assert old.model == "env-old"
+    old.embed_texts(["alpha"])
+    new = _make_pipeline(mock_ai=_ai("env-new"), model="", cache=cache)
+    new.embed_texts(["alpha"])
+    assert sent_models == ["env-old", "env-new"], "Vectors of another model reused"
+    print("  [OK] Changing the fallback model does not serve stale vectors")
+
+
+def test_embed_texts_failed_batch_is_isolated() -> None:
+    """A failing batch yields [] for its texts without losing other batches."""
+    print("\n[TEST] embed_texts - failed batch isolated")
+
+    def _flaky(texts: List[str], model: str = "") -> List[List[float]]:
+        if "broken" in texts:
+            raise RuntimeError("Embedding failed: boom")
+        return _batch_embed(texts, model)
+
+    mock_ai = _mock_ai()
+    mock_ai.embed.side_effect = _flaky
+    pipeline = _make_pipeline(batch_size=1, concurrency=3, mock_ai=mock_ai)
+    vectors = pipeline.embed_texts(["fine", "broken", "also fine"])
+    assert vectors[0] and vectors[2], "Healthy batches should still embed"
+    assert vectors[1] == [], "Failed batch should yield []"
+    assert pipeline.embed_texts(["broken"]) == [[]], "Failures are not cached"
+    print("  [OK] One failed batch does not affect the others")
 
 
 # ---------------------------------------------------------------------------
@@ -80,7 +193,7 @@ def test_embed_character_returns_rows() -> None:
         "background": "A ranger of the north",
         "_source_file": "game_data/characters/aragorn.json",
     }
-    with patch.object(pipeline, "embed_text", side_effect=_patched_embed):
+    with patch.object(pipeline, "embed_texts", side_effect=_patched_embed):
         rows = pipeline.embed_character(char)
     assert len(rows) >= 1, "Expected at least one row"
     for row in rows:
@@ -105,7 +218,7 @@ def test_embed_character_skips_empty_fields() -> None:
         "personality_traits": None,
         "_source_file": "",
     }
-    with patch.object(pipeline, "embed_text", side_effect=_patched_embed):
+    with patch.object(pipeline, "embed_texts", side_effect=_patched_embed):
         rows = pipeline.embed_character(char)
     chunk_types = [r["chunk_type"] for r in rows]
     assert "personality" not in chunk_types, "Empty personality should be skipped"
@@ -130,7 +243,7 @@ def test_embed_npc_includes_location() -> None:
         "description": "A ruthless crime lord operating from Ostagar.",
         "_source_file": "game_data/npcs/beraht.json",
     }
-    with patch.object(pipeline, "embed_text", side_effect=_patched_embed):
+    with patch.object(pipeline, "embed_texts", side_effect=_patched_embed):
         rows = pipeline.embed_npc(npc)
     assert len(rows) >= 1
     for row in rows:
@@ -157,7 +270,7 @@ def test_embed_story_file_merges_short_paragraphs(tmp_path: Path) -> None:
     story_file.write_text(content, encoding="utf-8")
 
     pipeline = _make_pipeline()
-    with patch.object(pipeline, "embed_text", side_effect=_patched_embed):
+    with patch.object(pipeline, "embed_texts", side_effect=_patched_embed):
         rows = pipeline.embed_story_file(str(story_file))
 
     # The short paragraph should be merged into the next, so we expect 1 chunk
@@ -174,7 +287,7 @@ def test_embed_story_file_empty_returns_empty(tmp_path: Path) -> None:
     story_file.write_text("", encoding="utf-8")
 
     pipeline = _make_pipeline()
-    with patch.object(pipeline, "embed_text", side_effect=_patched_embed):
+    with patch.object(pipeline, "embed_texts", side_effect=_patched_embed):
         rows = pipeline.embed_story_file(str(story_file))
     assert not rows
     print("  [OK] Empty file returns []")
@@ -191,7 +304,7 @@ def test_embed_wiki_page_respects_chunk_target() -> None:
     # Build a page long enough to produce at least two chunks
     page_text = " ".join([f"Sentence number {i} about ancient lore." for i in range(100)])
     pipeline = _make_pipeline()
-    with patch.object(pipeline, "embed_text", side_effect=_patched_embed):
+    with patch.object(pipeline, "embed_texts", side_effect=_patched_embed):
         rows = pipeline.embed_wiki_page(page_text, "https://example.com/lore")
     assert len(rows) >= 2, f"Expected multiple chunks, got {len(rows)}"
     for row in rows[:-1]:
@@ -212,6 +325,10 @@ def run_all_tests() -> None:
     """Run all embedding pipeline tests."""
     tmp = Path(tempfile.mkdtemp())
     test_embed_text_returns_empty_for_blank()
+    test_embed_texts_batches_requests()
+    test_embed_texts_uses_cache_and_dedupes()
+    test_cache_keyed_on_client_fallback_model()
+    test_embed_texts_failed_batch_is_isolated()
     test_embed_character_returns_rows()
     test_embed_character_skips_empty_fields()
     test_embed_npc_includes_location()
@@ -0,0 +1,267 @@
+"""
+Tests for the incremental Milvus index manifest
+
+Milvus and the embedding endpoint are both mocked: the client hands out
+sequential primary keys and the pipeline returns one row per file, so the
+tests can follow exactly which rows a reindex inserts and deletes.
+"""
+
+import os
+import tempfile
+from itertools import count
+from pathlib import Path
+from typing import Any, Dict, List
+from unittest.mock import MagicMock, patch
+
+from tests import test_helpers
+
+index_manifest = test_helpers.import_module("src.ai.index_manifest")
+milvus_commands = test_helpers.import_module("src.cli.milvus_commands")
+
+IndexManifest = index_manifest.IndexManifest
+index_file = index_manifest.index_file
+remove_file = index_manifest.remove_file
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def _fake_client() -> MagicMock:
+    """Return a Milvus client mock that assigns sequential primary keys."""
+    ids = count(1)
+    client = MagicMock()
+
+    def _insert(_base: str, rows: List[Dict[str, Any]]) -> List[int]:
+        return [next(ids) for _ in rows]
+
+    client.insert_returning_ids.side_effect = _insert
+    client.connect.return_value = True
+    return client
+
+
+def _fake_pipeline() -> MagicMock:
+    """Return a pipeline mock producing one row per embedded file."""
+    pipeline = MagicMock()
+    pipeline.model = "m"
+    row = {"chunk_text": "x", "embedding": [0.1]}
+    pipeline.embed_character.side_effect = lambda data: [dict(row)]
+    pipeline.embed_npc.side_effect = lambda data: [dict(row)]
+    pipeline.embed_story_file.side_effect = lambda path: [dict(row), dict(row)]
+    return pipeline
+
+
+def _write(path: Path, text: str, mtime: float) -> None:
+    """Write a file and pin its mtime so change detection is deterministic."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, (mtime, mtime))
+
+
+# ---------------------------------------------------------------------------
+# index_file / remove_file
+# ---------------------------------------------------------------------------
+
+
+def test_index_file_add_skip_update() -> None:
+    """New files are added, untouched ones skipped, edited ones replaced."""
+    print("\n[TEST] index_file - added / skipped / updated")
+    tmp = Path(tempfile.mkdtemp())
+    char = tmp / "characters" / "aragorn.json"
+    _write(char, '{"name": "Aragorn"}', 1000.0)
+    client, pipeline, manifest = _fake_client(), _fake_pipeline(), IndexManifest()
+
+    assert index_file(client, pipeline, manifest, "characters", char) == ("added", 1)
+    assert manifest.files[str(char)].chunk_ids == [1]
+
+    assert index_file(client, pipeline, manifest, "characters", char)[0] == "skipped"
+    os.utime(char, (2000.0, 2000.0))
+    assert index_file(client, pipeline, manifest, "characters", char)[0] == "skipped"
+    assert manifest.files[str(char)].mtime == 2000.0, "Touched file refreshes mtime"
+    assert pipeline.embed_character.call_count == 1, "Unchanged content not re-embedded"
+
+    _write(char, '{"name": "Aragorn", "level": 10}', 3000.0)
+    assert index_file(client, pipeline, manifest, "characters", char) == ("updated", 1)
+    client.delete_by_ids.assert_called_once_with("characters", [1])
+    assert manifest.files[str(char)].chunk_ids == [2]
+    print("  [OK] Only changed content is re-embedded; old ids are deleted")
+
+
+def test_legacy_rows_purged_by_source() -> None:
+    """Files without recorded ids fall back to a source_file delete."""
+    print("\n[TEST] index_file - legacy purge by source")
+    tmp = Path(tempfile.mkdtemp())
+    char = tmp / "characters" / "frodo.json"
+    story = tmp / "campaigns" / "Shire" / "001.md"
+    _write(char, '{"name": "Frodo"}', 1000.0)
+    _write(story, "A long-expected party.", 1000.0)
+    client, pipeline, manifest = _fake_client(), _fake_pipeline(), IndexManifest()
+    manifest.files[str(char)] = index_manifest.ManifestEntry("characters", 1.0, 1, "old")
+
+    index_file(client, pipeline, manifest, "characters", char)
+    client.delete_by_source.assert_called_once_with("characters", "source_file", str(char))
+
+    client.delete_by_source.reset_mock()
+    index_file(client, pipeline, manifest, "story_chunks", story)
+    client.delete_by_source.assert_not_called()
+    print("  [OK] Legacy rows purged only where the schema has source_file")
+
+
+def test_unembedded_file_is_retried() -> None:
+    """A non-empty file that produced no rows is not recorded as indexed."""
+    print("\n[TEST] index_file - failed embedding retried")
+    tmp = Path(tempfile.mkdtemp())
+    char = tmp / "characters" / "sam.json"
+    _write(char, '{"name": "Sam"}', 1000.0)
+    client, pipeline, manifest = _fake_client(), _fake_pipeline(), IndexManifest()
+    pipeline.embed_character.side_effect = [[], [{"chunk_text": "x", "embedding": [0.1]}]]
+
+    assert index_file(client, pipeline, manifest, "characters", char) == ("added", 0)
+    assert str(char) not in manifest.files
+    assert index_file(client, pipeline, manifest, "characters", char) == ("added", 1)
+    assert manifest.files[str(char)].chunk_ids == [1]
+    print("  [OK] Embedding failure leaves the file to be indexed next run")
+
+
+def test_remove_file_deletes_rows() -> None:
+    """remove_file deletes the recorded ids and forgets the entry."""
+    print("\n[TEST] remove_file - rows deleted")
+    client, manifest = _fake_client(), IndexManifest()
+    manifest.files["gone.md"] = index_manifest.ManifestEntry(
+        "story_chunks", 1.0, 1, "h", [7, 8]
+    )
+    remove_file(client, manifest, "gone.md")
+    client.delete_by_ids.assert_called_once_with("story_chunks", [7, 8])
+    assert "gone.md" not in manifest.files
+    print("  [OK] Vanished file's rows removed")
+
+
+def test_manifest_round_trip_and_compatibility() -> None:
+    """Manifests survive save/load and detect model or dim changes."""
+    print("\n[TEST] IndexManifest - persistence and compatibility")
+    path = Path(tempfile.mkdtemp()) / "milvus" / "index_manifest.json"
+    manifest = IndexManifest(embedding_model="m", embedding_dim=8)
+    manifest.files["a.json"] = index_manifest.ManifestEntry("npcs", 1.5, 3, "h", [4])
+    index_manifest.save_manifest(manifest, path)
+
+    loaded = index_manifest.load_manifest(path)
+    assert loaded is not None and loaded.files["a.json"].chunk_ids == [4]
+    assert loaded.is_compatible("m", 8)
+    assert not loaded.is_compatible("other", 8)
+    assert not loaded.is_compatible("m", 16)
+    assert index_manifest.load_manifest(path.with_name("missing.json")) is None
+    print("  [OK] Round trip preserved; model/dim changes detected")
+
+
+# ---------------------------------------------------------------------------
+# run_reindex
+# ---------------------------------------------------------------------------
+
+
+def _run_reindex(
+    tmp: Path, client: MagicMock, full: bool = False, pipeline: Any = None
+) -> Dict[str, Any]:
+    """Run run_reindex against a temp game_data tree with mocks in place."""
+    pipeline = pipeline if pipeline is not None else _fake_pipeline()
+    with patch.object(milvus_commands, "load_config") as mock_cfg, \
+            patch.object(milvus_commands, "create_vector_store", return_value=client), \
+            patch.object(milvus_commands, "EmbeddingPipeline", return_value=pipeline), \
+            patch.object(index_manifest, "get_characters_dir",
+                         return_value=str(tmp / "characters")), \
+            patch.object(index_manifest, "get_npcs_dir", return_value=str(tmp / "npcs")), \
+            patch.object(index_manifest, "get_campaigns_dir",
+                         return_value=str(tmp / "campaigns")), \
+            patch.object(milvus_commands, "default_manifest_path",
+                         return_value=tmp / "milvus" / "index_manifest.json"):
+        mock_cfg.return_value.milvus.enabled = True
+        mock_cfg.return_value.milvus.embedding.dim = 8
+        return milvus_commands.run_reindex(full=full)
+
+
+def test_run_reindex_is_incremental() -> None:
+    """A second run skips everything; edits and deletions are reported."""
+    print("\n[TEST] run_reindex - incremental report")
+    tmp = Path(tempfile.mkdtemp())
+    _write(tmp / "characters" / "a.json", '{"name": "A"}', 1000.0)
+    _write(tmp / "npcs" / "b.json", '{"name": "B"}', 1000.0)
+    _write(tmp / "campaigns" / "C" / "001.md", "Story text.", 1000.0)
+    client = _fake_client()
+
+    first = _run_reindex(tmp, client)
+    assert first["characters"].added == 1 and first["story_chunks"].chunks == 2
+    client.drop_collection.assert_called()
+
+    client.drop_collection.reset_mock()
+    second = _run_reindex(tmp, client)
+    assert all(c.skipped == 1 and c.added == 0 for c in second.values()), second
+    client.drop_collection.assert_not_called()
+
+    _write(tmp / "campaigns" / "C" / "001.md", "Story text, revised.", 2000.0)
+    (tmp / "npcs" / "b.json").unlink()
+    third = _run_reindex(tmp, client)
+    assert third["story_chunks"].updated == 1
+    assert third["npcs"].deleted == 1
+    assert third["characters"].skipped == 1
+    print("  [OK] Added, skipped, updated and deleted counts reported")
+
+
+def test_run_reindex_rebuilds_on_model_change() -> None:
+    """A manifest built with another model forces a full rebuild."""
+    print("\n[TEST] run_reindex - model change triggers rebuild")
+    tmp = Path(tempfile.mkdtemp())
+    _write(tmp / "characters" / "a.json", '{"name": "A"}', 1000.0)
+    index_manifest.save_manifest(
+        IndexManifest(embedding_model="old-model", embedding_dim=8),
+        tmp / "milvus" / "index_manifest.json",
+    )
+    client = _fake_client()
+    report = _run_reindex(tmp, client)
+    client.delete_collections.assert_called_once()
+    assert report["characters"].added == 1
+    print("  [OK] All collections dropped and rebuilt")
+
+
+def test_interrupted_reindex_does_not_duplicate_rows() -> None:
+    """Files finished before an interruption are skipped by the next run."""
+    print("\n[TEST] run_reindex - resume after interruption")
+    tmp = Path(tempfile.mkdtemp())
+    _write(tmp / "campaigns" / "C" / "001.md", "First.", 1000.0)
+    _write(tmp / "campaigns" / "C" / "002.md", "Second.", 1000.0)
+    _run_reindex(tmp, _fake_client())
+    _write(tmp / "campaigns" / "C" / "001.md", "First, revised.", 2000.0)
+    _write(tmp / "campaigns" / "C" / "002.md", "Second, revised.", 2000.0)
+
+    pipeline = _fake_pipeline()
+    row = {"chunk_text": "x", "embedding": [0.1]}
+    pipeline.embed_story_file.side_effect = [[dict(row)], KeyboardInterrupt()]
+    client = _fake_client()
+    try:
+        _run_reindex(tmp, client, pipeline=pipeline)
+    except KeyboardInterrupt:
+        pass
+    else:
+        raise AssertionError("The second file should interrupt the run")
+
+    client.insert_returning_ids.reset_mock()
+    report = _run_reindex(tmp, client)
+    assert report["story_chunks"].skipped == 1 and report["story_chunks"].updated == 1
+    assert client.insert_returning_ids.call_count == 1, "Finished file not re-inserted"
+    print("  [OK] Only the interrupted file is embedded again")
+
+
+def run_all_tests() -> None:
+    """Run all index manifest tests."""
+    test_index_file_add_skip_update()
+    test_legacy_rows_purged_by_source()
+    test_unembedded_file_is_retried()
+    test_remove_file_deletes_rows()
+    test_manifest_round_trip_and_compatibility()
+    test_run_reindex_is_incremental()
+    test_run_reindex_rebuilds_on_model_change()
+    test_interrupted_reindex_does_not_duplicate_rows()
+    print("\n[PASS] All index manifest tests passed.")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,186 @@
+"""
+Tests for the in-process BM25 lexical index
+
+Covers ranking, incremental file sync, persistence, wiki page indexing and
+reciprocal-rank fusion. Everything runs against temp files; no Milvus or
+embedding endpoint is involved.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+
+from tests import test_helpers
+
+lexical_index = test_helpers.import_module("src.ai.lexical_index")
+LexicalIndex = lexical_index.LexicalIndex
+
+
+def _row(text: str, **fields: Any) -> Dict[str, Any]:
+    """Return a chunk row with an embedding placeholder."""
+    return {**fields, "chunk_text": text, "embedding": []}
+
+
+def _write(path: Path, data: Any, mtime: float) -> None:
+    """Write a JSON or text file and pin its mtime."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    text = data if isinstance(data, str) else json.dumps(data)
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, (mtime, mtime))
+
+
+def test_bm25_ranks_rarer_terms_higher() -> None:
+    """Chunks matching rare query terms outrank ones matching common terms."""
+    print("\n[TEST] LexicalIndex.search - BM25 ranking")
+    index = LexicalIndex()
+    index.put_source("story_chunks", "a.md", "1", [
+        _row("The ranger walked north to the river.", campaign_name="A"),
+        _row("The ranger met a dragon near the river.", campaign_name="A"),
+        _row("The ranger rested by the river.", campaign_name="B"),
+    ])
+    hits = index.search("story_chunks", "ranger dragon", top_k=2)
+    assert "dragon" in hits[0]["chunk_text"], hits
+    assert "embedding" not in hits[0], "Placeholder must not be stored"
+
+    scoped = index.search("story_chunks", "ranger", filters={"campaign_name": "B"})
+    assert [h["campaign_name"] for h in scoped] == ["B"]
+    assert not index.search("story_chunks", "the")
+    print("  [OK] Rare terms rank first; filters and stop words respected")
+
+
+def test_put_source_replaces_previous_chunks() -> None:
+    """Re-indexing a source replaces its chunks instead of adding to them."""
+    print("\n[TEST] LexicalIndex.put_source - replace")
+    index = LexicalIndex()
+    index.put_source("npcs", "bree.json", "1", [_row("Butterbur keeps the inn")])
+    index.put_source("npcs", "bree.json", "2", [_row("Nob washes the dishes")])
+    assert index.count("npcs") == 1
+    assert not index.search("npcs", "butterbur")
+    index.remove_source("npcs", "bree.json")
+    assert index.count("npcs") == 0
+    print("  [OK] Old chunks removed from postings")
+
+
+def test_sync_files_is_incremental() -> None:
+    """Only changed files are re-chunked; deleted files are dropped."""
+    print("\n[TEST] LexicalIndex.sync_files - incremental")
+    tmp = Path(tempfile.mkdtemp())
+    first = tmp / "characters" / "aragorn.json"
+    second = tmp / "characters" / "frodo.json"
+    _write(first, {"name": "Aragorn", "background": "Ranger of the north"}, 1000.0)
+    _write(second, {"name": "Frodo", "background": "Hobbit of the Shire"}, 1000.0)
+    index = LexicalIndex()
+
+    assert index.sync_files("characters", [first, second])
+    assert not index.sync_files("characters", [first, second]), "Nothing changed"
+    hit = index.search("characters", "ranger")[0]
+    assert hit["character_name"] == "Aragorn" and hit["source_file"] == str(first)
+
+    _write(first, {"name": "Aragorn", "background": "King of Gondor"}, 2000.0)
+    assert index.sync_files("characters", [first])
+    assert index.search("characters", "gondor")
+    assert not index.search("characters", "hobbit"), "Deleted file must be dropped"
+    print("  [OK] Changed files re-chunked, vanished files removed")
+
+
+def test_save_and_load_round_trip() -> None:
+    """A saved index reloads with the same search results and fingerprints."""
+    print("\n[TEST] LexicalIndex - persistence")
+    path = Path(tempfile.mkdtemp()) / "cache" / "lexical_index.json"
+    index = LexicalIndex(path)
+    index.put_source("wiki_pages", "https://x/Bree", "7", [
+        _row("Bree is a village of Men and Hobbits.", page_url="https://x/Bree")
+    ])
+    index.save()
+
+    loaded = LexicalIndex.load(path)
+    assert loaded.fingerprint("wiki_pages", "https://x/Bree") == "7"
+    assert loaded.search("wiki_pages", "hobbits")[0]["page_url"] == "https://x/Bree"
+    assert LexicalIndex.load(path.with_name("missing.json")).count("wiki_pages") == 0
+    print("  [OK] Round trip preserved")
+
+
+def test_save_appends_changes_and_compacts() -> None:
+    """Saves append only changed sources; the log is folded in once it grows."""
+    print("\n[TEST] LexicalIndex - incremental persistence")
+    path = Path(tempfile.mkdtemp()) / "lexical_index.json"
+    log = path.with_name("lexical_index.log.jsonl")
+    index = LexicalIndex(path)
+    index.put_source("npcs", "bree.json", "1", [_row("Butterbur keeps the inn")])
+    index.save()
+    assert path.exists() and not log.exists(), "First save writes the snapshot"
+
+    snapshot = path.read_text(encoding="utf-8")
+    index.put_source("npcs", "nob.json", "1", [_row("Nob washes the dishes")])
+    index.remove_source("npcs", "bree.json")
+    index.save()
+    assert path.read_text(encoding="utf-8") == snapshot, "Snapshot left alone"
+    assert len(log.read_text(encoding="utf-8").splitlines()) == 2
+    with log.open("a", encoding="utf-8") as torn:
+        torn.write('{"collection": "npcs", "key"')
+
+    loaded = LexicalIndex.load(path)
+    assert loaded.fingerprint("npcs", "bree.json") is None
+    assert loaded.search("npcs", "dishes")[0]["chunk_text"] == "Nob washes the dishes"
+
+    saves = 0
+    while log.exists():
+        assert saves < 100, "Log never folded into the snapshot"
+        loaded.put_source("npcs", f"{saves}.json", "1", [_row(f"villager {saves}")])
+        loaded.save()
+        saves += 1
+    assert LexicalIndex.load(path).count("npcs") == saves + 1
+    print("  [OK] Changes appended, replayed and compacted")
+
+
+def test_index_wiki_page_skips_same_fetch() -> None:
+    """Wiki pages are chunked once per fetch."""
+    print("\n[TEST] index_wiki_page - idempotent per fetch")
+    index = LexicalIndex()
+    page = {
+        "title": "Rivendell",
+        "url": "https://x/Rivendell",
+        "sections": [{"title": "History", "content": "Founded by Elrond."}],
+        "fetched_at": 1.0,
+    }
+    lexical_index.index_wiki_page(index, page)
+    lexical_index.index_wiki_page(index, page)
+    hits = index.search("wiki_pages", "elrond")
+    assert len(hits) == 1 and hits[0]["page_title"] == "Rivendell", hits
+    print("  [OK] Page indexed once with its title")
+
+
+def test_fuse_results_rewards_agreement() -> None:
+    """Chunks ranked by both retrievers beat chunks ranked by one."""
+    print("\n[TEST] fuse_results - reciprocal rank fusion")
+    vector: List[Dict[str, Any]] = [
+        {"chunk_text": "only vector", "score": 0.9},
+        {"chunk_text": "both", "score": 0.8},
+    ]
+    lexical: List[Dict[str, Any]] = [
+        {"chunk_text": "both", "score": 4.0},
+        {"chunk_text": "only lexical", "score": 3.0},
+    ]
+    fused = lexical_index.fuse_results([vector, lexical], top_k=3)
+    assert fused[0]["chunk_text"] == "both"
+    assert fused[0]["score"] == 0.8, "First list supplies the fields"
+    assert len(fused) == 3
+    print("  [OK] Shared hit ranked first")
+
+
+def run_all_tests() -> None:
+    """Run all lexical index tests."""
+    test_bm25_ranks_rarer_terms_higher()
+    test_put_source_replaces_previous_chunks()
+    test_sync_files_is_incremental()
+    test_save_and_load_round_trip()
+    test_save_appends_changes_and_compacts()
+    test_index_wiki_page_skips_same_fetch()
+    test_fuse_results_rewards_agreement()
+    print("\n[PASS] All lexical index tests passed.")
+
+
+if __name__ == "__main__":
+    run_all_tests()
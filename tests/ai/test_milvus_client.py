@@ -4,6 +4,7 @@ Tests for MilvusClient
 All tests mock pymilvus so these run without a live Milvus instance.
 """
 
+import threading
 from typing import Any, Dict, List
 from unittest.mock import MagicMock, patch
 
@@ -112,6 +113,28 @@ def test_insert_returns_zero_for_empty_rows() -> None:
     print("  [OK] Returns 0 for empty rows without calling insert")
 
 
+def test_insert_returning_ids_and_delete_by_ids() -> None:
+    """insert_returning_ids() returns assigned keys; delete_by_ids() targets them."""
+    print("\n[TEST] MilvusClient.insert_returning_ids / delete_by_ids")
+    mock_col = MagicMock()
+    mock_col.insert.return_value.primary_keys = [101, 102]
+    client = _make_client()
+    client.connected = True
+
+    rows: List[Dict[str, Any]] = [
+        {"name": "Aragorn", "embedding": [0.1, 0.2]},
+        {"name": "Frodo", "embedding": [0.3, 0.4]},
+    ]
+    with patch.object(client, "get_collection", return_value=mock_col):
+        ids = client.insert_returning_ids("characters", rows)
+        client.delete_by_ids("characters", ids)
+        client.delete_by_ids("characters", [])
+
+    assert ids == [101, 102], f"Expected assigned keys, got {ids}"
+    mock_col.delete.assert_called_once_with("id in [101, 102]")
+    print("  [OK] Primary keys returned and used for deletion")
+
+
 # ---------------------------------------------------------------------------
 # search() - score key added
 # ---------------------------------------------------------------------------
@@ -144,6 +167,121 @@ def test_search_adds_score_to_results() -> None:
     print(f"  [OK] Score key present: {results[0]['score']}")
 
 
+def test_search_many_batches_queries() -> None:
+    """search_many() sends all vectors in one call and splits the results."""
+    print("\n[TEST] MilvusClient.search_many - one request, per-query results")
+    hit_a, hit_b = MagicMock(score=0.9), MagicMock(score=0.8)
+    hit_a.entity.get.side_effect = lambda field: "a"
+    hit_b.entity.get.side_effect = lambda field: "b"
+    mock_col = MagicMock()
+    mock_col.search.return_value = [[hit_a], [hit_b]]
+    client = _make_client()
+    client.connected = True
+
+    with patch.object(client, "get_collection", return_value=mock_col):
+        results = client.search_many("npcs", [[0.1], [0.2]], top_k=1)
+
+    mock_col.search.assert_called_once()
+    assert mock_col.search.call_args.kwargs["data"] == [[0.1], [0.2]]
+    assert [r[0]["npc_name"] for r in results] == ["a", "b"], results
+    print("  [OK] Two queries answered by a single col.search()")
+
+
+# ---------------------------------------------------------------------------
+# Collection handle cache and deferred flush
+# ---------------------------------------------------------------------------
+
+
+def test_collection_handles_are_cached() -> None:
+    """get_collection() loads a collection once per connection."""
+    print("\n[TEST] MilvusClient.get_collection - handle cache")
+    client = _make_client()
+    client.connected = True
+    with patch.object(milvus_client_module, "utility") as mock_utility, \
+            patch.object(milvus_client_module, "Collection") as mock_collection:
+        mock_utility.has_collection.return_value = True
+        first = client.get_collection("characters")
+        second = client.get_collection("characters")
+        client.drop_collection("characters")
+        client.get_collection("characters")
+
+    assert first is second
+    assert mock_collection.call_count == 2, "Drop must invalidate the handle"
+    assert mock_collection.return_value.load.call_count == 2
+    print("  [OK] Handle reused until the collection is dropped")
+
+
+def test_writes_defer_flush_until_commit() -> None:
+    """Inserts and deletes flush on commit() or past the row threshold."""
+    print("\n[TEST] MilvusClient - deferred flush")
+    mock_col = MagicMock()
+    client = _make_client()
+    client.connected = True
+    rows: List[Dict[str, Any]] = [{"name": "Sam", "embedding": [0.5]}]
+
+    with patch.object(client, "get_collection", return_value=mock_col):
+        client.insert("characters", rows)
+        client.delete_by_ids("characters", [1])
+        mock_col.flush.assert_not_called()
+        client.commit()
+        assert mock_col.flush.call_count == 1
+        client.commit()
+        assert mock_col.flush.call_count == 1, "Nothing pending after commit"
+
+        with patch.object(milvus_client_module, "_FLUSH_ROWS", 2):
+            client.insert("characters", rows * 2)
+        assert mock_col.flush.call_count == 2
+    print("  [OK] One flush per commit; large batches flush immediately")
+
+
+def test_pending_writes_flush_on_timer() -> None:
+    """A pending write is flushed once _FLUSH_INTERVAL passes, without commit()."""
+    print("\n[TEST] MilvusClient - timed flush")
+    mock_col = MagicMock()
+    flushed = threading.Event()
+    mock_col.flush.side_effect = flushed.set
+    client = _make_client()
+    client.connected = True
+    rows: List[Dict[str, Any]] = [{"name": "Sam", "embedding": [0.5]}]
+
+    with patch.object(client, "get_collection", return_value=mock_col), \
+            patch.object(milvus_client_module, "_FLUSH_INTERVAL", 0.05):
+        client.insert("characters", rows)
+        assert flushed.wait(2.0), "Timer should flush the pending write"
+    client.commit()
+    assert mock_col.flush.call_count == 1, "Timed flush clears the pending write"
+    print("  [OK] Pending write flushed by the timer")
+
+
+def test_get_collection_error_marks_unhealthy() -> None:
+    """A server error while loading returns None instead of raising."""
+    print("\n[TEST] MilvusClient.get_collection - load failure")
+    client = _make_client()
+    client.connected = True
+    with patch.object(milvus_client_module, "utility") as mock_utility, \
+            patch.object(milvus_client_module, "Collection") as mock_collection:
+        mock_utility.has_collection.return_value = True
+        mock_collection.return_value.load.side_effect = RuntimeError("down")
+        assert client.get_collection("characters") is None
+    print("  [OK] Load failure returns None")
+
+
+def test_health_check_is_cached() -> None:
+    """is_healthy() pings at most once per TTL window."""
+    print("\n[TEST] MilvusClient.is_healthy - cached result")
+    client = _make_client()
+    with patch.object(milvus_client_module, "connections"), \
+            patch.object(milvus_client_module, "utility") as mock_utility:
+        mock_utility.get_server_version.return_value = "v2.4"
+        assert client.connect()
+        with patch.object(milvus_client_module, "_HEALTH_TTL", 0.0):
+            assert client.is_healthy()
+        assert client.is_healthy()
+        assert client.is_healthy()
+    assert mock_utility.get_server_version.call_count == 1
+    print("  [OK] Server pinged once for several health checks")
+
+
 # ---------------------------------------------------------------------------
 # delete_by_source() - expression building
 # ---------------------------------------------------------------------------
@@ -190,7 +328,14 @@ def run_all_tests() -> None:
     test_collection_name_custom_prefix()
     test_insert_transposes_rows()
     test_insert_returns_zero_for_empty_rows()
+    test_insert_returning_ids_and_delete_by_ids()
     test_search_adds_score_to_results()
+    test_search_many_batches_queries()
+    test_collection_handles_are_cached()
+    test_writes_defer_flush_until_commit()
+    test_pending_writes_flush_on_timer()
+    test_get_collection_error_marks_unhealthy()
+    test_health_check_is_cached()
     test_delete_by_source_builds_correct_expr()
     test_delete_by_source_no_op_when_unavailable()
     print("\n[PASS] All MilvusClient tests passed.")
@@ -0,0 +1,158 @@
+"""Tests for the portrait render queue (portrait_jobs).
+
+The ComfyUI client is a mock, so no server or checkpoint is involved.
+"""
+
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, List
+from unittest.mock import MagicMock
+
+from tests import test_helpers
+
+_jobs = test_helpers.import_module("src.ai.portrait_jobs")
+JobStatus = _jobs.JobStatus
+PortraitJobQueue = _jobs.PortraitJobQueue
+PortraitRender = _jobs.PortraitRender
+portrait_key = _jobs.portrait_key
+TtsAudioCache = test_helpers.safe_from_import("src.utils.tts_audio_cache", "TtsAudioCache")
+
+
+def _workflow(seed: int, checkpoint: str = "ckpt-a") -> dict:
+    """A minimal workflow carrying a checkpoint and seed."""
+    return {
+        "4": {"class_type": "CheckpointLoaderSimple", "inputs": {"ckpt_name": checkpoint}},
+        "3": {"class_type": "KSampler", "inputs": {"seed": seed}},
+    }
+
+
+def _client(log: List[Any], gate: Any = None) -> MagicMock:
+    """Mock client that records generate/free calls in order."""
+    client = MagicMock()
+
+    def _generate(workflow: dict, on_progress: Any = None) -> bytes:
+        if gate is not None:
+            gate.wait(5)
+        if on_progress is not None:
+            on_progress(1, 2)
+        seed = workflow["3"]["inputs"]["seed"]
+        log.append(("generate", workflow["4"]["inputs"]["ckpt_name"], seed))
+        return f"PNG{seed}".encode("ascii")
+
+    client.generate.side_effect = _generate
+
+    def _free() -> bool:
+        log.append(("free",))
+        return True
+
+    client.free.side_effect = _free
+    return client
+
+
+def test_portrait_key_covers_workflow_and_seed() -> None:
+    """The key changes with the graph and the seed, not with key order."""
+    print("\n[TEST] portrait_key - workflow hash and seed")
+    base = portrait_key(_workflow(1), 1)
+    assert base == portrait_key(dict(reversed(list(_workflow(1).items()))), 1)
+    assert base != portrait_key(_workflow(1), 2)
+    assert base != portrait_key(_workflow(1, "ckpt-b"), 1)
+    print("  [OK] Stable under key order, sensitive to graph and seed")
+
+
+def test_queue_batches_by_checkpoint_and_frees_once() -> None:
+    """A party's renders share one checkpoint load; free() runs per batch."""
+    print("\n[TEST] PortraitJobQueue - checkpoint batching")
+    log: List[Any] = []
+    gate = threading.Event()
+    prepared: List[int] = []
+    queue = PortraitJobQueue(prepare=lambda: prepared.append(1), batch_window=0)
+    client = _client(log, gate)
+
+    first = queue.submit(PortraitRender(client, _workflow(1), "ckpt-a", 1))
+    jobs = [
+        queue.submit(PortraitRender(client, _workflow(2, "ckpt-b"), "ckpt-b", 2)),
+        queue.submit(PortraitRender(client, _workflow(3), "ckpt-a", 3)),
+        queue.submit(PortraitRender(client, _workflow(4), "ckpt-a", 4)),
+    ]
+    assert queue.position(jobs[2]) in (1, 2)
+    gate.set()
+    for job in [first] + jobs:
+        assert job.wait(5), job.job_id
+        assert job.status == JobStatus.DONE and job.progress == 1.0
+
+    assert log == [
+        ("generate", "ckpt-a", 1),
+        ("generate", "ckpt-a", 3),
+        ("generate", "ckpt-a", 4),
+        ("free",),
+        ("generate", "ckpt-b", 2),
+        ("free",),
+    ], log
+    assert len(prepared) == 2
+    assert queue.metrics()["batches"] == 2 and queue.metrics()["renders"] == 4
+    print("  [OK] Same-checkpoint jobs ran together, two frees for four renders")
+
+
+def test_queue_serves_repeats_from_cache() -> None:
+    """A repeated (workflow, seed) is answered from the content-addressed cache."""
+    print("\n[TEST] PortraitJobQueue - cache hit")
+    log: List[Any] = []
+    cache = TtsAudioCache(Path(tempfile.mkdtemp()), 1024, suffix=".png")
+    queue = PortraitJobQueue(cache=cache, batch_window=0)
+    client = _client(log)
+
+    first = queue.submit(PortraitRender(client, _workflow(7), "ckpt-a", 7), metadata={"seed": 7})
+    assert first.wait(5) and first.outcome.image == b"PNG7"
+    again = queue.submit(PortraitRender(client, _workflow(7), "ckpt-a", 7))
+    assert again.is_finished and again.outcome.cached and again.outcome.image == b"PNG7"
+    assert queue.get(again.job_id) is again
+    assert queue.get(first.job_id).metadata == {"seed": 7}
+    assert [entry for entry in log if entry[0] == "generate"] == [("generate", "ckpt-a", 7)]
+    print("  [OK] Second request read from cache without rendering")
+
+
+def test_queue_records_failed_renders() -> None:
+    """A render that returns nothing or raises fails the job and still frees."""
+    print("\n[TEST] PortraitJobQueue - failures")
+    queue = PortraitJobQueue(batch_window=0)
+    client = MagicMock()
+    client.generate.side_effect = [None, OSError("boom")]
+
+    empty = queue.submit(PortraitRender(client, _workflow(1), "ckpt-a", 1))
+    assert empty.wait(5) and empty.status == JobStatus.FAILED
+    assert "failed or timed out" in empty.outcome.error
+    raised = queue.submit(PortraitRender(client, _workflow(2), "ckpt-a", 2))
+    assert raised.wait(5) and raised.status == JobStatus.FAILED
+    assert raised.outcome.error == "boom"
+    assert client.free.call_count == 2
+    print("  [OK] Failures recorded, models freed")
+
+
+def test_queue_survives_unexpected_render_errors() -> None:
+    """An unexpected exception fails its job and the queue keeps rendering."""
+    print("\n[TEST] PortraitJobQueue - unexpected errors")
+    queue = PortraitJobQueue(batch_window=0)
+    client = MagicMock()
+    client.generate.side_effect = [TypeError("bad graph"), b"PNG1"]
+
+    broken = queue.submit(PortraitRender(client, _workflow(1), "ckpt-a", 1))
+    assert broken.wait(5) and broken.status == JobStatus.FAILED
+    retry = queue.submit(PortraitRender(client, _workflow(1), "ckpt-a", 1))
+    assert retry is not broken, "A failed job must not be reused"
+    assert retry.wait(5) and retry.outcome.image == b"PNG1"
+    print("  [OK] Failed job settled, resubmit rendered by a fresh worker")
+
+
+def run_all_tests() -> None:
+    """Run all portrait job queue tests."""
+    test_portrait_key_covers_workflow_and_seed()
+    test_queue_batches_by_checkpoint_and_frees_once()
+    test_queue_serves_repeats_from_cache()
+    test_queue_records_failed_renders()
+    test_queue_survives_unexpected_render_errors()
+    print("\n[PASS] All portrait job queue tests passed.")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -21,6 +21,8 @@ Why we test this:
 
 import hashlib
 import time
+import unittest.mock
+from typing import Any, Dict, List, Optional, Tuple
 from tests import test_helpers
 from src.integration.drupal_sync import DrupalSyncError
 
@@ -50,6 +52,8 @@ class MockDrupalSync:
 
     def __init__(self):
         self._store = {}
+        self.bulk_reads = 0
+        self.bulk_writes = 0
 
     def _key(self, url_hash: str):
         return url_hash
@@ -71,6 +75,19 @@ class MockDrupalSync:
         """Remove entry if present."""
         self._store.pop(self._key(url_hash), None)
 
+    def get_wiki_page_cache_many(
+        self, url_hashes: List[str]
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Return every requested entry (or None) and count the call."""
+        self.bulk_reads += 1
+        return {url_hash: self._store.get(url_hash) for url_hash in url_hashes}
+
+    def set_wiki_page_cache_many(self, entries: List[Tuple[str, str, float, str]]) -> None:
+        """Store every entry and count the call."""
+        self.bulk_writes += 1
+        for url_hash, url, fetched_at, content_json in entries:
+            self.set_wiki_page_cache(url_hash, url, fetched_at, content_json)
+
     def count_wiki_page_cache(self):
         """Return number of stored entries."""
         return len(self._store)
@@ -360,6 +377,31 @@ def test_drupal_wiki_cache_content_as_dict():
     print("[PASS] DrupalWikiCache Content Dict Format")
 
 
+def test_drupal_wiki_cache_prefetch_and_write_batch():
+    """Prefetched entries answer get() locally; batched sets flush together."""
+    print("\n[TEST] DrupalWikiCache Prefetch and Write Batch")
+
+    sync = MockDrupalSync()
+    cache = DrupalWikiCache(drupal_sync=sync, ttl_seconds=3600)
+    with cache.write_batch():
+        cache.set("https://wiki.test/a", {"title": "A"})
+        cache.set("https://wiki.test/b", {"title": "B"})
+        assert sync.count_wiki_page_cache() == 0, "writes should be deferred"
+    assert sync.count_wiki_page_cache() == 2
+    assert sync.bulk_writes == 1
+    print("  [OK] Deferred writes flushed in one bulk call")
+
+    cache.prefetch(["https://wiki.test/a", "https://wiki.test/b", "https://wiki.test/c"])
+    assert sync.bulk_reads == 1
+    with unittest.mock.patch.object(sync, "get_wiki_page_cache") as single_get:
+        assert cache.get("https://wiki.test/a") == {"title": "A"}
+        assert cache.get("https://wiki.test/c") is None
+        single_get.assert_not_called()
+    print("  [OK] Prefetched hits and misses served without round trips")
+
+    print("[PASS] DrupalWikiCache Prefetch and Write Batch")
+
+
 def test_wiki_cache_protocol_satisfaction():
     """DrupalWikiCache satisfies WikiCacheProtocol (runtime_checkable)."""
     print("\n[TEST] WikiCacheProtocol Satisfaction")
@@ -456,6 +498,7 @@ def run_all_tests():
     test_drupal_wiki_cache_delete()
     test_drupal_wiki_cache_drupal_error_graceful()
     test_drupal_wiki_cache_invalid_json()
+    test_drupal_wiki_cache_prefetch_and_write_batch()
     test_wiki_client_initialization()
     test_wiki_client_custom_item_filtering()
     test_drupal_wiki_cache_content_as_dict()
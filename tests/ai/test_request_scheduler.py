@@ -0,0 +1,191 @@
+"""
+Test the per-server model request scheduler.
+
+What we test:
+- Interactive requests are served before queued batch requests
+- Slots reserved for interactive work are never taken by batch requests
+- Full queues are rejected with 429, missed deadlines with 503
+- AIClient takes a slot per call and strips the scheduling kwargs
+
+Why we test this:
+- One CPU-bound Ollama serves both quick search parsing and multi-minute arc
+  jobs; without admission control quick requests queue behind batch work
+"""
+
+import os
+import threading
+import time
+import types
+from typing import Any, Callable, Dict, List
+from unittest.mock import patch
+
+from tests import test_helpers
+
+scheduler_module = test_helpers.import_module("src.ai.request_scheduler")
+ai_client_module = test_helpers.import_module("src.ai.ai_client")
+ModelQueue = scheduler_module.ModelQueue
+Priority = scheduler_module.Priority
+RequestScheduler = scheduler_module.RequestScheduler
+SchedulerBusy = scheduler_module.SchedulerBusy
+
+
+def _wait_for(predicate: Callable[[], bool], timeout: float = 2.0) -> None:
+    """Spin until predicate() is true."""
+    end = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < end, "condition not reached"
+        time.sleep(0.005)
+
+
+def test_interactive_jumps_batch_queue():
+    """A waiting interactive request starts before earlier batch requests."""
+    print("\n[TEST] ModelQueue - priority order")
+    queue = ModelQueue(limit=1, reserved=0)
+    order: List[str] = []
+    queue.acquire(Priority.BATCH)
+
+    def _worker(priority: Any, name: str) -> None:
+        with queue.slot(priority):
+            order.append(name)
+
+    threads = [threading.Thread(target=_worker, args=(Priority.BATCH, "batch"))]
+    threads[0].start()
+    _wait_for(lambda: queue.metrics()["queued"]["batch"] == 1)
+    threads.append(threading.Thread(target=_worker, args=(Priority.INTERACTIVE, "interactive")))
+    threads[1].start()
+    _wait_for(lambda: queue.metrics()["queued"]["interactive"] == 1)
+    queue.release(Priority.BATCH, 0.01)
+    for thread in threads:
+        thread.join(2)
+    assert order == ["interactive", "batch"], order
+    print("  [PASS] Interactive served first")
+
+
+def test_reserved_slot_kept_for_interactive():
+    """Batch work cannot use the reserved slot; interactive work can."""
+    print("\n[TEST] ModelQueue - interactive reservation")
+    queue = ModelQueue(limit=2, reserved=1)
+    queue.acquire(Priority.BATCH)
+    try:
+        queue.acquire(Priority.BATCH, deadline=0.05)
+    except SchedulerBusy as exc:
+        assert exc.status_code == 503
+    else:
+        raise AssertionError("Second batch request should wait for the batch slot")
+    assert queue.acquire(Priority.INTERACTIVE, deadline=0.05) < 0.05
+    metrics = queue.metrics()
+    assert metrics["in_flight"] == 2 and metrics["timed_out"] == 1
+    print("  [PASS] Reserved slot used only by interactive requests")
+
+
+def test_queue_full_and_estimated_deadline_rejections():
+    """429 when the queue is full; 503 up front when the wait estimate is too long."""
+    print("\n[TEST] ModelQueue - fast rejection")
+    queue = ModelQueue(limit=1, reserved=0, max_queue=0)
+    with queue.slot(Priority.INTERACTIVE):
+        time.sleep(0.02)
+    with queue.slot(Priority.INTERACTIVE):
+        try:
+            queue.acquire(Priority.INTERACTIVE)
+        except SchedulerBusy as exc:
+            assert exc.status_code == 429
+        else:
+            raise AssertionError("Full queue should reject")
+
+    queue.max_queue = 8
+    with queue.slot(Priority.INTERACTIVE):
+        started = time.monotonic()
+        try:
+            queue.acquire(Priority.INTERACTIVE, deadline=0.001)
+        except SchedulerBusy as exc:
+            assert exc.status_code == 503 and exc.retry_after > 0.001
+        else:
+            raise AssertionError("Deadline below the estimated wait should reject")
+        assert time.monotonic() - started < 0.01
+    assert queue.metrics()["rejected"] == 2
+    print("  [PASS] 429 and estimated-deadline 503 returned without waiting")
+
+
+def test_ai_client_takes_scheduler_slot():
+    """chat_completion runs inside a slot of its server's queue."""
+    print("\n[TEST] AIClient - scheduler integration")
+    scheduler = RequestScheduler(limit=2, reserved=1)
+    client = ai_client_module.AIClient(
+        api_key="test", base_url="http://ollama:11434/v1", model="m", priority="batch"
+    )
+    seen: Dict[str, Any] = {}
+
+    def _create(**kwargs: Any) -> types.SimpleNamespace:
+        queue = scheduler.queue("http://ollama:11434", "other")
+        seen["in_flight"] = queue.metrics()["in_flight"]
+        seen["kwargs"] = kwargs
+        message = types.SimpleNamespace(content="ok")
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)], usage=None)
+
+    client.client = types.SimpleNamespace(
+        chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=_create))
+    )
+    with patch.object(ai_client_module, "get_request_scheduler", return_value=scheduler):
+        assert client.chat_completion([{"role": "user", "content": "hi"}]) == "ok"
+        client.chat_completion(
+            [{"role": "user", "content": "hi"}], priority="interactive", queue_deadline=5
+        )
+    assert seen["in_flight"] == 1
+    assert "priority" not in seen["kwargs"] and "queue_deadline" not in seen["kwargs"]
+    metrics = scheduler.metrics()["http://ollama:11434"]
+    assert metrics["admitted"] == 2 and metrics["in_flight"] == 0
+    print("  [PASS] One slot per call on the shared server queue")
+
+
+def test_fallback_takes_its_own_slot() -> None:
+    """A fallback model is admitted on the queue of the server serving it."""
+    print("\n[TEST] AIClient - fallback admission")
+    scheduler = RequestScheduler(limit=1, reserved=0)
+    client = ai_client_module.AIClient(api_key="test", model="m", model_chain=["backup"])
+    client.base_url = None  # hosted API: one queue per model
+    seen: Dict[str, int] = {}
+
+    def _create(**kwargs: Any) -> types.SimpleNamespace:
+        model = str(kwargs["model"])
+        seen[model] = scheduler.queue(None, model).metrics()["in_flight"]
+        if model == "m":
+            raise ValueError("primary down")
+        message = types.SimpleNamespace(content="ok")
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)], usage=None)
+
+    client.client = types.SimpleNamespace(
+        chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=_create))
+    )
+    with patch.object(ai_client_module, "get_request_scheduler", return_value=scheduler):
+        assert client.chat_completion([{"role": "user", "content": "hi"}]) == "ok"
+    assert seen == {"m": 1, "backup": 1}, seen
+    metrics = scheduler.metrics()
+    assert metrics["model:m"]["admitted"] == 1 and metrics["model:backup"]["admitted"] == 1
+    print("  [PASS] Each attempted model held a slot on its own queue")
+
+
+def test_default_deadline_reads_config() -> None:
+    """Deadlines come from the config snapshot; 0 and junk values never raise."""
+    print("\n[TEST] Scheduler - Configured deadlines")
+    env = {"AI_INTERACTIVE_DEADLINE": "soon", "AI_BATCH_DEADLINE": "0"}
+    with patch.dict(os.environ, env):
+        assert scheduler_module.default_deadline("interactive") == 30.0
+        assert scheduler_module.default_deadline("batch") is None
+    with patch.dict(os.environ, {"AI_BATCH_DEADLINE": "600"}):
+        assert scheduler_module.default_deadline("batch") == 600.0
+    print("  [PASS] Deadlines parsed tolerantly from the environment")
+
+
+def run_all_tests():
+    """Run all request scheduler tests."""
+    test_interactive_jumps_batch_queue()
+    test_reserved_slot_kept_for_interactive()
+    test_queue_full_and_estimated_deadline_rejections()
+    test_ai_client_takes_scheduler_slot()
+    test_fallback_takes_its_own_slot()
+    test_default_deadline_reads_config()
+    print("\n[PASS] All request scheduler tests passed.")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,173 @@
+"""
+Test the two-tier chat completion response cache.
+
+What we test:
+- Keys ignore whitespace/option ordering but not model, temperature or mode
+- Memory misses fall through to the SQLite tier; TTL and size eviction apply
+- AIClient serves repeated low-temperature calls from the cache and records
+  hits/misses in the AI call log
+
+Why we test this:
+- Query parsing and arc re-runs repeat identical prompts against slow
+  local models; a wrong key would serve answers to the wrong prompt
+"""
+
+import json
+import tempfile
+import types
+from collections import Counter
+from pathlib import Path
+from typing import Any, Tuple
+from unittest.mock import patch
+
+from tests import test_helpers
+
+cache_module = test_helpers.import_module("src.ai.response_cache")
+ai_client_module = test_helpers.import_module("src.ai.ai_client")
+ResponseCache = cache_module.ResponseCache
+response_key = cache_module.response_key
+
+_MESSAGES = [{"role": "user", "content": "find elven swords"}]
+
+
+class _FakeCompletions:
+    """Stands in for openai's chat.completions, counting requests per model."""
+
+    def __init__(self, broken: Tuple[str, ...] = ()) -> None:
+        """
+        Args:
+            broken: Models whose requests fail with a non-retryable error.
+        """
+        self.calls = 0
+        self.by_model: Counter[str] = Counter()
+        self.broken = broken
+
+    def create(self, **kwargs: Any) -> types.SimpleNamespace:
+        """Answer with a numbered completion, or fail for a broken model."""
+        model = str(kwargs["model"])
+        self.by_model[model] += 1
+        if model in self.broken:
+            raise ValueError(f"{model} is down")
+        self.calls += 1
+        message = types.SimpleNamespace(content=f"answer {self.calls}")
+        return types.SimpleNamespace(
+            choices=[types.SimpleNamespace(message=message)], usage=None
+        )
+
+    def client(self) -> types.SimpleNamespace:
+        """Return an OpenAI-shaped client whose completions are this fake."""
+        return types.SimpleNamespace(chat=types.SimpleNamespace(completions=self))
+
+
+def test_key_normalisation():
+    """Formatting differences share a key; request parameters do not."""
+    print("\n[TEST] ResponseCache - key normalisation")
+    base = response_key("m", _MESSAGES, 0.1, 150, {"json_mode": True, "num_ctx": 8})
+    padded = [{"content": "  find elven swords\n", "role": "user"}]
+    assert response_key("m", padded, 0.1, 150, {"num_ctx": 8, "json_mode": True}) == base
+    assert response_key("other", _MESSAGES, 0.1, 150, {"json_mode": True, "num_ctx": 8}) != base
+    assert response_key("m", _MESSAGES, 0.2, 150, {"json_mode": True, "num_ctx": 8}) != base
+    assert response_key("m", _MESSAGES, 0.1, 150, {"num_ctx": 8}) != base
+    print("  [PASS] Keys stable under formatting, distinct per request")
+
+
+def test_memory_and_disk_tiers():
+    """Entries evicted from memory are served from disk; a new process sees them."""
+    print("\n[TEST] ResponseCache - memory and disk tiers")
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "responses.sqlite3"
+        cache = ResponseCache(db_path, memory_entries=1)
+        cache.put("a", "m", "alpha")
+        cache.put("b", "m", "beta")
+        assert cache.get("b") == ("beta", "memory")
+        assert cache.get("a") == ("alpha", "disk")
+        assert cache.get("zzz") == (None, "miss")
+        assert (cache.hits, cache.misses) == (2, 1)
+        cache.close()
+
+        reopened = ResponseCache(db_path)
+        assert reopened.get("b") == ("beta", "disk")
+        reopened.close()
+    print("  [PASS] Memory LRU backed by persistent SQLite tier")
+
+
+def test_ttl_and_size_eviction():
+    """Expired entries are not served; the disk tier stays within its budget."""
+    print("\n[TEST] ResponseCache - TTL and size eviction")
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(Path(tmp) / "r.sqlite3", memory_entries=0, max_bytes=10)
+        cache.put("a", "m", "12345")
+        cache.put("b", "m", "67890")
+        assert cache.get("a")[0] == "12345"  # now the most recently used
+        cache.put("c", "m", "abcde")
+        assert cache.get("b") == (None, "miss")
+        assert cache.get("a")[0] == "12345" and cache.get("c")[0] == "abcde"
+        assert cache.stats()["disk_bytes"] == 10
+
+        with patch.object(cache_module.time, "time", return_value=cache_module.time.time() + 60):
+            cache.ttl_seconds = 30
+            assert cache.get("a") == (None, "miss")
+        cache.close()
+    print("  [PASS] LRU rows evicted over budget; expired rows dropped")
+
+
+def test_ai_client_uses_cache_and_logs():
+    """Deterministic calls hit the cache; creative calls only when opted in."""
+    print("\n[TEST] AIClient - response cache integration")
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = Path(tmp) / "calls.jsonl"
+        with patch.dict("os.environ", {"AI_CALL_LOG_PATH": str(log_path)}):
+            client = ai_client_module.AIClient(
+                api_key="test", model="m", response_cache=ResponseCache(None)
+            )
+        completions = _FakeCompletions()
+        client.client = completions.client()
+
+        first = client.chat_completion(_MESSAGES, temperature=0.1, json_mode=True)
+        assert client.chat_completion(_MESSAGES, temperature=0.1, json_mode=True) == first
+        assert client.chat_completion(_MESSAGES, temperature=0.1) != first
+        assert completions.calls == 2
+
+        client.chat_completion(_MESSAGES, temperature=0.9)
+        client.chat_completion(_MESSAGES, temperature=0.9)
+        assert completions.calls == 4
+        client.chat_completion(_MESSAGES, temperature=0.9, cache=True)
+        client.chat_completion(_MESSAGES, temperature=0.9, cache=True)
+        assert completions.calls == 5
+
+        records = [json.loads(line) for line in log_path.read_text().splitlines()]
+        assert [r.get("cache") for r in records] == [
+            "miss", "memory", "miss", None, None, "miss", "memory"
+        ]
+        assert records[-1]["cache_hits"] == 2 and records[-1]["cache_misses"] == 3
+    print("  [PASS] Cache hits skip the model and are logged")
+
+
+def test_fallback_answers_are_not_cached() -> None:
+    """An answer from a fallback model is not stored under the requested model."""
+    print("\n[TEST] AIClient - response cache and model fallback")
+    client = ai_client_module.AIClient(
+        api_key="test", model="m", model_chain=["backup"],
+        response_cache=ResponseCache(None),
+    )
+    completions = _FakeCompletions(broken=("m",))
+    client.client = completions.client()
+
+    client.chat_completion(_MESSAGES, temperature=0.1)
+    client.chat_completion(_MESSAGES, temperature=0.1)
+    assert completions.by_model == {"m": 2, "backup": 2}, completions.by_model
+    print("  [PASS] Fallback answers reach the caller but not the cache")
+
+
+def run_all_tests():
+    """Run all response cache tests."""
+    test_key_normalisation()
+    test_memory_and_disk_tiers()
+    test_ttl_and_size_eviction()
+    test_ai_client_uses_cache_and_logs()
+    test_fallback_answers_are_not_cached()
+    print("\n[PASS] All response cache tests passed.")
+
+
+if __name__ == "__main__":
+    run_all_tests()
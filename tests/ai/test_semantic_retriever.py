@@ -14,6 +14,7 @@ from tests import test_helpers
 SemanticRetriever = test_helpers.safe_from_import(
     "src.ai.semantic_retriever", "SemanticRetriever"
 )
+LexicalIndex = test_helpers.safe_from_import("src.ai.lexical_index", "LexicalIndex")
 
 # Dummy embedding returned by all patched embed calls
 _DUMMY_VEC: List[float] = [0.1] * 1536
@@ -52,11 +53,13 @@ _STORY_HIT: Dict[str, Any] = {
 
 def _make_retriever(
     healthy: bool = True,
+    lexical: Any = None,
 ) -> Tuple[Any, MagicMock, MagicMock]:
     """Build a SemanticRetriever with mocked client and pipeline.
 
     Args:
         healthy: Whether is_healthy() returns True or False.
+        lexical: Lexical index to use; defaults to an empty in-memory one.
 
     Returns:
         Tuple of (retriever, mock_client, mock_pipeline).
@@ -67,12 +70,14 @@ def _make_retriever(
     mock_pipeline = MagicMock()
     mock_pipeline.embed_text.return_value = _DUMMY_VEC
 
-    with patch("src.ai.semantic_retriever.MilvusClient", return_value=mock_client), \
+    with patch("src.ai.semantic_retriever.get_shared_client", return_value=mock_client), \
             patch("src.ai.semantic_retriever.EmbeddingPipeline", return_value=mock_pipeline), \
+            patch("src.ai.semantic_retriever.get_lexical_index",
+                  return_value=lexical if lexical is not None else LexicalIndex()), \
             patch("src.ai.semantic_retriever.load_config") as mock_cfg:
         mock_cfg.return_value.milvus.enabled = False
-        mock_cfg.return_value.milvus.top_k = 5
-        mock_cfg.return_value.milvus.similarity_threshold = 0.7
+        mock_cfg.return_value.milvus.search.top_k = 5
+        mock_cfg.return_value.milvus.search.similarity_threshold = 0.7
         return SemanticRetriever(), mock_client, mock_pipeline
 
 
@@ -103,7 +108,7 @@ def test_get_relevant_characters_uses_fallback_when_unavailable() -> None:
     retriever.get_relevant_characters("halfling adventurer")
 
     mock_client.search.assert_not_called()
-    print("  [OK] search() bypassed; keyword fallback used instead")
+    print("  [OK] search() bypassed; lexical index used instead")
 
 
 # ---------------------------------------------------------------------------
@@ -184,7 +189,7 @@ def test_get_relevant_story_context_scopes_by_campaign() -> None:
 
 
 def test_get_relevant_story_context_returns_empty_when_unavailable() -> None:
-    """Returns [] and never calls search when Milvus is down."""
+    """Returns [] and never calls search when Milvus is down and nothing is indexed."""
     print("\n[TEST] SemanticRetriever.get_relevant_story_context - unavailable")
     retriever, mock_client, _ = _make_retriever(healthy=False)
 
@@ -195,13 +200,52 @@ def test_get_relevant_story_context_returns_empty_when_unavailable() -> None:
     print("  [OK] Returns [] when Milvus unavailable")
 
 
+def test_story_context_uses_lexical_index_offline() -> None:
+    """Story chunks are still found lexically while Milvus is down."""
+    print("\n[TEST] SemanticRetriever.get_relevant_story_context - offline lexical")
+    lexical = LexicalIndex()
+    lexical.put_source("story_chunks", "001.md", "1", [
+        {**_STORY_HIT, "chunk_text": "The fellowship departed at dawn."},
+        {**_STORY_HIT, "campaign_name": "Other", "chunk_text": "The fellowship slept."},
+    ])
+    retriever, mock_client, _ = _make_retriever(healthy=False, lexical=lexical)
+
+    results = retriever.get_relevant_story_context("fellowship", "Example_Campaign")
+
+    assert [r["campaign_name"] for r in results] == ["Example_Campaign"], results
+    mock_client.search.assert_not_called()
+    print("  [OK] Lexical hit returned, scoped to the campaign")
+
+
+def test_vector_and_lexical_hits_are_fused() -> None:
+    """A chunk found by both retrievers ranks above single-source hits."""
+    print("\n[TEST] SemanticRetriever - reciprocal rank fusion")
+    lexical = LexicalIndex()
+    lexical.put_source("characters", "aragorn.json", "1", [
+        {**_CHAR_HIT, "chunk_text": "Aragorn wields the sword Anduril."},
+        {**_CHAR_HIT, "chunk_text": "A ranger of the north."},
+    ])
+    retriever, mock_client, _ = _make_retriever(healthy=True, lexical=lexical)
+    mock_client.search.return_value = [
+        {**_CHAR_HIT, "chunk_text": "Strider smokes a pipe.", "score": 0.95},
+        _CHAR_HIT,
+    ]
+
+    results = retriever.get_relevant_characters("ranger north")
+
+    assert results[0]["chunk_text"] == "A ranger of the north.", results
+    assert results[0]["score"] == 0.85, "Vector score kept for fused hits"
+    assert "fusion_score" in results[0]
+    print(f"  [OK] {len(results)} fused result(s); shared hit first")
+
+
 # ---------------------------------------------------------------------------
 # get_relevant_lore
 # ---------------------------------------------------------------------------
 
 
 def test_get_relevant_lore_returns_empty_when_unavailable() -> None:
-    """Returns [] when Milvus is not reachable."""
+    """Returns [] when Milvus is not reachable and no wiki page is indexed."""
     print("\n[TEST] SemanticRetriever.get_relevant_lore - unavailable")
     retriever, mock_client, _ = _make_retriever(healthy=False)
     results = retriever.get_relevant_lore("ancient ruins")
@@ -224,6 +268,8 @@ def run_all_tests() -> None:
     test_threshold_filters_low_score_results()
     test_get_relevant_story_context_scopes_by_campaign()
     test_get_relevant_story_context_returns_empty_when_unavailable()
+    test_story_context_uses_lexical_index_offline()
+    test_vector_and_lexical_hits_are_fused()
     test_get_relevant_lore_returns_empty_when_unavailable()
     print("\n[PASS] All SemanticRetriever tests passed.")
 
@@ -0,0 +1,219 @@
+"""
+Test the shared rules-wiki fetch scheduler, HTML cache, and parsed pages.
+
+What we test:
+- Concurrent requests for the same URL share one network fetch
+- Fresh cached pages are served without a request
+- Stale pages are revalidated with ETag / Last-Modified; a 304 reuses the body
+- 404s are remembered, and a stale copy is served while the wiki is down
+- fetch_first_many walks each candidate list in order, in concurrent rounds
+- A page is parsed once per URL and content, and extractions are memoised
+
+Why we test this:
+- Catalogue and equipment listings fan out dozens of page fetches per call
+- The disk cache must keep working when the Drupal wiki cache is unconfigured
+"""
+
+import tempfile
+import threading
+import time
+import types
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from tests import test_helpers
+
+wiki_scraping = test_helpers.import_module("src.ai.wiki_scraping")
+WikiFetcher = wiki_scraping.WikiFetcher
+HtmlDiskCache = wiki_scraping.HtmlDiskCache
+CachedPage = wiki_scraping.CachedPage
+
+
+class _HTTPError(OSError):
+    """Mimics requests.HTTPError: an OSError carrying the response."""
+
+    def __init__(self, response: types.SimpleNamespace):
+        super().__init__(f"{response.status_code} error")
+        self.response = response
+
+
+class _FakeSession:
+    """Session serving canned pages, recording each request's headers."""
+
+    def __init__(self, pages: Dict[str, str], delay: float = 0.0):
+        """
+        Args:
+            pages: Page body by URL; other URLs answer 404.
+            delay: Seconds each request takes.
+        """
+        self.pages = pages
+        self.delay = delay
+        self.calls: List[tuple] = []
+        self.etag = '"v1"'
+        self.down = False
+        self._lock = threading.Lock()
+
+    def get(
+        self, url: str, timeout: int = 10, headers: Optional[dict] = None
+    ) -> types.SimpleNamespace:
+        """Answer like requests.Session.get: 200, 304 on a matching ETag, or 404."""
+        _ = timeout
+        with self._lock:
+            self.calls.append((url, dict(headers or {})))
+        time.sleep(self.delay)
+        if self.down:
+            raise OSError("connection refused")
+        if url not in self.pages:
+            response = types.SimpleNamespace(status_code=404)
+            response.raise_for_status = lambda: (_ for _ in ()).throw(_HTTPError(response))
+            return response
+        status = 304 if (headers or {}).get("If-None-Match") == self.etag else 200
+        return types.SimpleNamespace(
+            status_code=status,
+            text=self.pages[url] if status == 200 else "",
+            headers={"ETag": self.etag, "Last-Modified": "Tue, 01 Oct 2024 00:00:00 GMT"},
+            raise_for_status=lambda: None,
+        )
+
+    def urls(self) -> List[str]:
+        """URLs requested so far, in request order."""
+        with self._lock:
+            return [url for url, _ in self.calls]
+
+
+def _client(session: _FakeSession, cache_dir: Optional[Path] = None, ttl: int = 3600):
+    cache = HtmlDiskCache(cache_dir, ttl) if cache_dir is not None else None
+    return types.SimpleNamespace(session=session, html_cache=cache)
+
+
+def test_duplicate_urls_share_one_fetch():
+    """Concurrent fetches of one URL are coalesced into a single request."""
+    print("\n[TEST] WikiFetcher - request coalescing")
+    session = _FakeSession({"http://w/a": "A", "http://w/b": "B"}, delay=0.05)
+    fetcher = WikiFetcher(workers=4, min_interval=0.0)
+    pages = fetcher.fetch_many(_client(session), ["http://w/a", "http://w/b", "http://w/a"])
+    assert pages == ["A", "B", "A"], pages
+    assert sorted(session.urls()) == ["http://w/a", "http://w/b"]
+    fetcher.shutdown()
+    print("  [PASS] Duplicate in-flight URL fetched once")
+
+
+def test_disk_cache_serves_and_revalidates():
+    """Fresh pages skip the network; stale pages send validators and reuse on 304."""
+    print("\n[TEST] WikiFetcher - disk cache and conditional requests")
+    session = _FakeSession({"http://w/a": "A"})
+    fetcher = WikiFetcher(workers=2, min_interval=0.0)
+    with tempfile.TemporaryDirectory() as tmp:
+        client = _client(session, Path(tmp))
+        assert fetcher.fetch(client, "http://w/a") == "A"
+        assert fetcher.fetch(client, "http://w/a") == "A"
+        assert len(session.calls) == 1, session.calls
+
+        client.html_cache.ttl_seconds = 0
+        assert fetcher.fetch(client, "http://w/a") == "A"
+        assert session.calls[-1][1]["If-None-Match"] == '"v1"', session.calls
+        assert "If-Modified-Since" in session.calls[-1][1]
+
+        session.down = True
+        assert fetcher.fetch(client, "http://w/a") == "A"
+    fetcher.shutdown()
+    print("  [PASS] Fresh hit, 304 revalidation, and stale fallback")
+
+
+def test_missing_pages_are_remembered():
+    """A 404 is cached so candidate probing does not repeat the miss."""
+    print("\n[TEST] WikiFetcher - negative caching")
+    session = _FakeSession({})
+    fetcher = WikiFetcher(workers=2, min_interval=0.0)
+    with tempfile.TemporaryDirectory() as tmp:
+        client = _client(session, Path(tmp))
+        assert fetcher.fetch(client, "http://w/none") is None
+        assert fetcher.fetch(client, "http://w/none") is None
+        assert len(session.calls) == 1, session.calls
+    fetcher.shutdown()
+    print("  [PASS] 404 served from cache on the second call")
+
+
+def test_requests_are_paced_per_host():
+    """Requests to one host start at least min_interval apart."""
+    print("\n[TEST] WikiFetcher - per-host pacing")
+    pages = {f"http://w/{i}": str(i) for i in range(4)}
+    session = _FakeSession(pages)
+    fetcher = WikiFetcher(workers=4, min_interval=0.05)
+    start = time.monotonic()
+    fetcher.fetch_many(_client(session), list(pages))
+    assert time.monotonic() - start >= 0.15
+    fetcher.shutdown()
+    print("  [PASS] Four requests spread over at least three intervals")
+
+
+def test_fetch_first_many_keeps_candidate_order():
+    """Each list resolves to its first candidate that exists."""
+    print("\n[TEST] wiki_scraping - fetch_first_many")
+    session = _FakeSession({"http://w/x2": "X2", "http://w/y1": "Y1", "http://w/x3": "X3"})
+    client = _client(session)
+    results = wiki_scraping.fetch_first_many(client, [
+        ["http://w/x1", "http://w/x2", "http://w/x3"],
+        ["http://w/y1", "http://w/y2"],
+        ["http://w/z1"],
+        [],
+    ])
+    assert results == ["X2", "Y1", None, None], results
+    assert "http://w/x3" not in session.urls()
+    print("  [PASS] First resolving candidate chosen per list")
+
+
+def test_unexpected_errors_reach_every_waiter():
+    """A non-requests error in a load is raised to callers instead of hanging them."""
+    print("\n[TEST] WikiFetcher - unexpected load errors")
+    session = _FakeSession({}, delay=0.05)
+    session.get = lambda url, timeout=10, headers=None: {}[url]
+    fetcher = WikiFetcher(workers=2, min_interval=0.0)
+    for call in (
+        lambda: fetcher.fetch_many(_client(session), ["http://w/a", "http://w/a"]),
+        lambda: fetcher.fetch(_client(session), "http://w/a"),
+    ):
+        try:
+            call()
+        except KeyError:
+            pass
+        else:
+            raise AssertionError("KeyError should reach the caller")
+    fetcher.shutdown()
+    print("  [PASS] Failed load settles its future")
+
+
+def test_parsed_pages_are_shared():
+    """parse_page reuses one parse per URL and HTML; extractors share it."""
+    print("\n[TEST] wiki_scraping - shared parsed pages")
+    html = (
+        "<html><head><title>Rogue</title></head>"
+        "<body><div id='page-content'><p>x</p></div></body></html>"
+    )
+    page = wiki_scraping.parse_page(html, "http://w/rogue")
+    assert wiki_scraping.parse_page(html, "http://w/rogue") is page
+    assert wiki_scraping.parse_page(html + " ", "http://w/rogue") is not page
+    assert wiki_scraping.page_title(page) == "Rogue"
+    assert wiki_scraping.page_content(page) is page.content
+    assert page.content_text == "x"
+    built = []
+    assert page.extract("k", lambda: built.append(1) or "v") == "v"
+    assert page.extract("k", lambda: built.append(1) or "w") == "v"
+    assert built == [1]
+    print("  [PASS] One parse and one extraction per page")
+
+
+def run_all_tests():
+    """Run all wiki scraping tests."""
+    test_duplicate_urls_share_one_fetch()
+    test_disk_cache_serves_and_revalidates()
+    test_missing_pages_are_remembered()
+    test_requests_are_paced_per_host()
+    test_fetch_first_many_keeps_candidate_order()
+    test_unexpected_errors_reach_every_waiter()
+    test_parsed_pages_are_shared()
+    print("\n[PASS] All wiki scraping tests passed.")
+
+
+if __name__ == "__main__":
+    run_all_tests()
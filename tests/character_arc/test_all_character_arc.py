@@ -15,6 +15,7 @@ def run_all_character_arc_tests() -> int:
         ("test_arc_criteria", "Arc Criteria and Metrics Tests"),
         ("test_arc_analyzer", "Arc Analyzer Tests"),
         ("test_arc_storage", "Arc Storage Tests"),
+        ("test_arc_cache", "Arc Chunk Cache Tests"),
     ]
 
     results = {}
@@ -0,0 +1,76 @@
+"""Tests for the persistent chunk analysis cache and its use by ArcAnalyzer."""
+
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+
+from tests.test_helpers import setup_test_environment, import_module
+
+
+setup_test_environment()
+
+cache_mod = import_module("src.character_arc.arc_cache")
+analyzer_mod = import_module("src.character_arc.arc_analyzer")
+ChunkAnalysisCache = cache_mod.ChunkAnalysisCache
+prompt_hash = cache_mod.prompt_hash
+ArcAnalyzer = analyzer_mod.ArcAnalyzer
+
+
+class _CountingClient:
+    """AI client stub that counts chat calls and returns a fixed analysis."""
+
+    model = "stub-model"
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def create_system_message(self, content: str) -> dict:
+        """Build a system message."""
+        return {"role": "system", "content": content}
+
+    def create_user_message(self, content: str) -> dict:
+        """Build a user message."""
+        return {"role": "user", "content": content}
+
+    def chat_completion(self, messages: List[Dict[str, str]], **_kwargs: Any) -> str:
+        """Return a fixed JSON analysis."""
+        del messages
+        self.calls += 1
+        return '{"metrics": {"confidence": 6}, "observations": ["steady"]}'
+
+
+def test_round_trip_keyed_by_model_and_version() -> None:
+    """Entries survive a new instance and are scoped by model and version."""
+    path = Path(tempfile.mkdtemp()) / "arc" / "chunks.sqlite3"
+    digest = prompt_hash("system", "user")
+    cache = ChunkAnalysisCache(path)
+    cache.put("m1", 1, digest, {"summary": "x"})
+    cache.put("m1", 1, prompt_hash("system", "other"), {})
+    cache.close()
+
+    reopened = ChunkAnalysisCache(path)
+    assert reopened.get("m1", 1, digest) == {"summary": "x"}
+    assert reopened.get("m2", 1, digest) is None
+    assert reopened.get("m1", 2, digest) is None
+    assert reopened.count() == 1
+
+
+def test_analyzer_reuses_cached_chunks() -> None:
+    """A second analysis of the same chunk does not call the model."""
+    cache = ChunkAnalysisCache(Path(tempfile.mkdtemp()) / "chunks.sqlite3")
+    client = _CountingClient()
+    analyzer = ArcAnalyzer(ai_client=client, chunk_cache=cache)
+
+    first = analyzer.analyze_chunk("Aria stood firm at the gate.", "Aria")
+    second = analyzer.analyze_chunk("Aria stood firm at the gate.", "Aria")
+    assert first == second
+    assert client.calls == 1
+
+    analyzer.analyze_chunk("Aria fled the gate.", "Aria")
+    assert client.calls == 2
+
+
+if __name__ == "__main__":
+    test_round_trip_keyed_by_model_and_version()
+    test_analyzer_reuses_cached_chunks()
+    print("\n[ALL TESTS PASSED]")
@@ -356,6 +356,41 @@ def test_relationship_graph_connection_strength():
     print("[PASS] RelationshipGraph - get_connection_strength")
 
 
+def test_relationship_graph_indexed_queries():
+    """Adjacency indexes answer pair, neighbourhood and sub-graph queries."""
+    print("\n[TEST] RelationshipGraph - indexed queries")
+
+    def rel(target: str, strength: int) -> Relationship:
+        return Relationship(
+            target_name=target, relationship_type=RelationshipType.ALLY, strength=strength
+        )
+
+    graph = RelationshipGraph(
+        nodes={"A", "B", "C", "D", "E", "F"},
+        edges=[
+            ("A", "B", rel("B", 9)),
+            ("B", "D", rel("D", 3)),
+            ("A", "C", rel("C", 7)),
+            ("C", "D", rel("D", 6)),
+            ("E", "F", rel("F", 5)),
+        ],
+    )
+    graph.add_edge("D", "A", rel("A", 2))
+
+    assert graph.has_edge("D", "A") and not graph.has_edge("B", "A")
+    assert [r.strength for r in graph.relationships_between("D", "A")] == [2]
+    assert graph.neighbors("A") == {"B", "C", "D"}
+    assert graph.neighbors_within("B", 1) == {"A", "B", "D"}
+    assert graph.neighbors_within("E", 5) == {"E", "F"}
+    assert graph.edges_among({"A", "B", "C"}) == graph.edges[:1] + graph.edges[2:3]
+    assert graph.subgraph({"E", "F"}).edges == [graph.edges[4]]
+    assert graph.connected_components() == [{"A", "B", "C", "D"}, {"E", "F"}]
+    assert graph.strongest_path("B", "D") == ["B", "A", "C", "D"]
+    assert graph.strongest_path("A", "E") is None
+    print("  [OK] Indexed queries correct")
+    print("[PASS] RelationshipGraph - indexed queries")
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # RelationshipManager tests
 # ─────────────────────────────────────────────────────────────────────────────
@@ -420,6 +455,34 @@ def test_manager_skips_example_files():
     print("[PASS] RelationshipManager - skips .example files")
 
 
+def test_manager_reuses_graph_until_files_change():
+    """The graph is cached and only changed files are reloaded."""
+    print("\n[TEST] RelationshipManager - cached graph and file index")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        manager = _make_manager(
+            {"aragorn.json": {"name": "Aragorn", "relationships": {"Arwen": "Beloved"}}},
+            {"arwen.json": {"name": "Arwen", "relationships": {}}},
+            tmp_path=tmp_path,
+        )
+        graph = manager.build_relationship_graph()
+        assert manager.build_relationship_graph() is graph
+        assert not graph.has_edge("Arwen", "Aragorn")
+
+        _write_json(
+            tmp_path / "npcs" / "arwen.json",
+            {"name": "Arwen", "relationships": {"Aragorn": "Beloved husband"}},
+        )
+        updated = manager.build_relationship_graph()
+        assert updated is not graph
+        assert updated.has_edge("Arwen", "Aragorn")
+
+        (tmp_path / "npcs" / "arwen.json").unlink()
+        assert not manager.build_relationship_graph().has_edge("Arwen", "Aragorn")
+    print("  [OK] Cache invalidated on write and delete")
+    print("[PASS] RelationshipManager - cached graph and file index")
+
+
 def test_manager_validate_consistency_finds_missing_inverse():
     """validate_consistency reports a warning when inverse relationship is absent."""
     print("\n[TEST] RelationshipManager - validate_consistency (missing inverse)")
@@ -671,11 +734,13 @@ def run_all_tests():
     # RelationshipGraph
     test_relationship_graph_get_relationships_for()
     test_relationship_graph_connection_strength()
+    test_relationship_graph_indexed_queries()
 
     # RelationshipManager
     test_manager_build_graph_legacy()
     test_manager_build_graph_structured()
     test_manager_skips_example_files()
+    test_manager_reuses_graph_until_files_change()
     test_manager_validate_consistency_finds_missing_inverse()
     test_manager_validate_consistency_no_warnings_bidirectional()
     test_manager_sync_bidirectional_creates_inverse()
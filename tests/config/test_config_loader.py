@@ -0,0 +1,113 @@
+"""Unit tests for the load_config snapshot cache in src.config.config_loader."""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List
+from unittest.mock import patch
+
+from tests.test_helpers import setup_test_environment, import_module, run_test_suite
+
+
+setup_test_environment()
+
+config_loader = import_module("src.config.config_loader")
+load_config = config_loader.load_config
+reload_config = config_loader.reload_config
+subscribe_config_changes = config_loader.subscribe_config_changes
+unsubscribe_config_changes = config_loader.unsubscribe_config_changes
+
+
+def _write_config(path: Path, data: Dict[str, Any]) -> None:
+    """Write ``data`` as the config file, forcing a new mtime."""
+    path.write_text(json.dumps(data), encoding="utf-8")
+    stamp = path.stat().st_mtime_ns + 1_000_000_000
+    os.utime(path, ns=(stamp, stamp))
+
+
+def test_snapshot_reused_until_file_changes() -> None:
+    """Repeated calls share one snapshot; editing the file rebuilds it."""
+    print("\n[TEST] Config Loader - Snapshot Reuse")
+    path = Path(tempfile.mkdtemp()) / "config.json"
+    _write_config(path, {"rag": {"cache_ttl": 10}})
+    first = load_config(path)
+    assert load_config(path) is first
+    assert first.rag.cache_ttl == 10
+
+    _write_config(path, {"rag": {"cache_ttl": 20}})
+    second = load_config(path)
+    assert second is not first
+    assert second.rag.cache_ttl == 20
+    assert reload_config(path) is not second
+    print("  [OK] Snapshot reused and invalidated by mtime")
+
+
+def test_environment_change_rebuilds() -> None:
+    """A changed environment variable is picked up without a reload."""
+    print("\n[TEST] Config Loader - Environment Change")
+    path = Path(tempfile.mkdtemp()) / "config.json"
+    with patch.dict(os.environ, {"RAG_CACHE_TTL": "30"}):
+        assert load_config(path).rag.cache_ttl == 30
+        with patch.dict(os.environ, {"RAG_CACHE_TTL": "40"}):
+            assert load_config(path).rag.cache_ttl == 40
+    print("  [OK] Environment overrides tracked")
+
+
+def test_performance_limits_tolerate_bad_values() -> None:
+    """Performance limits come from the environment; junk keeps the default."""
+    print("\n[TEST] Config Loader - Performance Limits")
+    path = Path(tempfile.mkdtemp()) / "config.json"
+    env = {
+        "PIPER_WORKER_POOL_MB": "128",
+        "TTS_AUDIO_CACHE_MB": "lots",
+        "CONSISTENCY_CONCURRENCY": "2",
+        "ARC_CONCURRENCY": "",
+        "AI_RESPONSE_CACHE_MB": "0.5",
+        "AI_RESPONSE_CACHE_TTL": "a week",
+        "COMFYUI_BATCH_WINDOW": "2",
+    }
+    with patch.dict(os.environ, env):
+        performance = load_config(path).performance
+    assert performance.tts.worker_pool_mb == 128
+    assert performance.tts.audio_cache_mb == 256
+    assert performance.consistency_concurrency == 2
+    assert performance.arc_concurrency == 4
+    assert performance.response_cache.max_mb == 0.5
+    assert performance.response_cache.ttl_seconds == 604800.0
+    assert performance.portrait.batch_window == 2.0
+    print("  [OK] Valid values applied, invalid ones ignored")
+
+
+def test_listeners_receive_changed_sections() -> None:
+    """Listeners get only the sections that differ between snapshots."""
+    print("\n[TEST] Config Loader - Change Notification")
+    path = Path(tempfile.mkdtemp()) / "config.json"
+    _write_config(path, {"rag": {"cache_ttl": 10}})
+    load_config(path)
+    seen: List[FrozenSet[str]] = []
+
+    def listener(changed: FrozenSet[str], _config: Any) -> None:
+        seen.append(changed)
+
+    subscribe_config_changes(listener)
+    try:
+        reload_config(path)
+        _write_config(path, {"rag": {"cache_ttl": 11}})
+        load_config(path)
+    finally:
+        unsubscribe_config_changes(listener)
+    assert seen == [frozenset({"rag"})]
+    print("  [OK] Only changed sections reported")
+
+
+if __name__ == "__main__":
+    run_test_suite(
+        "config_loader",
+        [
+            test_snapshot_reused_until_file_changes,
+            test_environment_change_rebuilds,
+            test_performance_limits_tolerate_bad_values,
+            test_listeners_receive_changed_sections,
+        ]
+    )
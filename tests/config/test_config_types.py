@@ -99,8 +99,9 @@ def test_rag_config_defaults() -> None:
     assert config.rules_base_url == ""
     assert config.cache_ttl == 604800, "cache_ttl should default to 7 days"
     assert config.max_cache_size == 100, "max_cache_size should default to 100"
-    assert config.search_depth == 3, "search_depth should default to 3"
-    assert config.min_relevance == 0.5, "min_relevance should default to 0.5"
+    assert config.search.depth == 3, "search depth should default to 3"
+    assert config.search.min_relevance == 0.5, "min_relevance should default to 0.5"
+    assert config.fetch.workers == 8, "fetch workers should default to 8"
     print("  [OK] RAGConfig defaults are correct")
 
 
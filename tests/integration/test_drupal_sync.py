@@ -36,6 +36,7 @@ DrupalGraphQLError = drupal_graphql_mod.DrupalGraphQLError
 
 config_types_mod = import_module("src.config.config_types")
 DrupalConfig = config_types_mod.DrupalConfig
+DrupalHttpConfig = config_types_mod.DrupalHttpConfig
 
 
 _make_config = make_drupal_config
@@ -206,6 +207,45 @@ def test_set_wiki_page_cache_raises_when_response_has_no_entry() -> None:
             assert "returned no entry" in str(exc)
 
 
+# ---------------------------------------------------------------------------
+# Batched read / write
+# ---------------------------------------------------------------------------
+
+def test_get_wiki_page_cache_many_uses_aliased_batches() -> None:
+    """Hashes are read batch_size at a time, hits and misses mapped per alias."""
+    config = DrupalConfig(
+        base_url="https://drupal.test", http=DrupalHttpConfig(batch_size=2)
+    )
+    sync = DrupalSync(config)
+    with _patch_query({"e0": _ENTRY, "e1": None}) as mocked:
+        result = sync.get_wiki_page_cache_many(["a", "b", "a", "c"])
+
+    assert mocked.call_count == 2
+    assert mocked.call_args_list[0][0][1] == {"h0": "a", "h1": "b"}
+    assert "e1: wikiCacheEntry(urlHash: $h1)" in mocked.call_args_list[0][0][0]
+    assert result["a"] is not None and result["a"]["field_wiki_url"] == _ENTRY["url"]
+    assert result["b"] is None
+    assert set(result) == {"a", "b", "c"}
+
+
+def test_set_wiki_page_cache_many_sends_one_mutation_per_batch() -> None:
+    """Writes share one aliased mutation; a missing alias is a failed write."""
+    sync = DrupalSync(_make_config())
+    entries = [("a", "https://wiki.test/a", 1, "{}"), ("b", "https://wiki.test/b", 2.0, "{}")]
+    with _patch_mutate({"e0": {"url": "a"}, "e1": {"url": "b"}}) as mocked:
+        sync.set_wiki_page_cache_many(entries)
+    assert mocked.call_count == 1
+    variables = mocked.call_args[0][1]
+    assert variables["h1"] == "b" and variables["f0"] == 1.0
+
+    with _patch_mutate({"e0": {"url": "a"}, "e1": None}):
+        try:
+            sync.set_wiki_page_cache_many(entries)
+            raise AssertionError("expected DrupalSyncError")
+        except DrupalSyncError as exc:
+            assert "b" in str(exc)
+
+
 # ---------------------------------------------------------------------------
 # Delete path
 # ---------------------------------------------------------------------------
@@ -315,6 +355,8 @@ def run_all_tests() -> None:
     test_set_wiki_page_cache_coerces_fetched_at_to_float()
     test_set_wiki_page_cache_raises_on_transport_error()
     test_set_wiki_page_cache_raises_when_response_has_no_entry()
+    test_get_wiki_page_cache_many_uses_aliased_batches()
+    test_set_wiki_page_cache_many_sends_one_mutation_per_batch()
     test_delete_wiki_page_cache_succeeds_on_true()
     test_delete_wiki_page_cache_raises_when_refused()
     test_delete_wiki_page_cache_raises_on_transport_error()
@@ -159,15 +159,15 @@ def test_get_relevant_context_returns_string():
 
 
 def test_get_relevant_context_empty_when_unavailable():
-    """Returns empty string when Milvus retriever is unavailable."""
+    """Returns empty string when Milvus is down and nothing matches lexically."""
     print("\n[TEST] get_relevant_context empty when unavailable")
     skip = _skip_if_milvus_disabled()
     if skip:
         print(f"  [SKIP] {skip}")
         return
-    with unittest.mock.patch.object(SemanticRetriever, "is_available", return_value=False):
+    with unittest.mock.patch.object(MilvusClient, "is_healthy", return_value=False):
         rag = RAGSystem()
-        result = rag.get_relevant_context("any prompt", "AnyName_Campaign")
+        result = rag.get_relevant_context("zzqxv", "AnyName_Campaign")
     assert result == ""
     print("  [OK] Empty string returned when unavailable")
     print("[PASS] get_relevant_context empty when unavailable")
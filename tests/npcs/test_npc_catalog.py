@@ -0,0 +1,136 @@
+"""
+NPC Catalog Tests
+
+Tests for the resident NPC catalog and the prompt-time lookup built on it.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, List
+from unittest.mock import patch
+
+from src.npcs import npc_catalog
+from src.npcs.npc_catalog import NPCCatalog, get_npc_catalog, reset_npc_catalogs
+from src.utils.npc_lookup_helper import match_catalog_to_location, match_npc_to_location
+
+
+def _write_npc(directory: Path, filename: str, **data: Any) -> Path:
+    """Write an NPC JSON file and return its path."""
+    path = directory / filename
+    path.write_text(json.dumps(data), encoding="utf-8")
+    return path
+
+
+def _populate(directory: Path) -> None:
+    """Create a small NPC roster plus an example file."""
+    _write_npc(directory, "butterbur.json", name="Barliman Butterbur",
+               role="Innkeeper", notes="Runs The Prancing Pony in Bree.")
+    _write_npc(directory, "hobson.json", name="Hobson", role="Guard Captain",
+               notes="Keeps the west gate of Bree.")
+    _write_npc(directory, "mara.json", name="Mara", role="Merchant",
+               notes="Sells maps at the Waterdeep docks.")
+    _write_npc(directory, "npc.example.json", name="Example", role="Innkeeper")
+
+
+def test_catalog_indexes_fields() -> None:
+    """Location, role, name and profile type queries intersect the indexes."""
+    print("\n[TEST] NPC Catalog - indexed lookup")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        directory = Path(temp_dir)
+        _populate(directory)
+        catalog = NPCCatalog(directory)
+
+        names = [entry.name for entry in catalog.entries()]
+        assert names == ["Barliman Butterbur", "Hobson", "Mara"], names
+        assert [e.name for e in catalog.find(location="Bree")] == ["Barliman Butterbur", "Hobson"]
+        assert [e.name for e in catalog.find(location="Prancing Pony")] == ["Barliman Butterbur"]
+        assert [e.name for e in catalog.find(location="Pony Prancing")] == []
+        assert [e.name for e in catalog.find(role="guard captain")] == ["Hobson"]
+        assert [e.name for e in catalog.find(location="Bree", role="innkeeper")] == [
+            "Barliman Butterbur"
+        ]
+        assert [e.name for e in catalog.find(name="butterbur")] == ["Barliman Butterbur"]
+        assert len(catalog.find(profile_type="simplified")) == 3
+        mara = catalog.get("Mara")
+        assert mara is not None and mara.status["role"] == "Merchant"
+        print("  [OK] Index intersections correct, example file skipped")
+
+    print("[PASS] NPC Catalog - indexed lookup")
+
+
+def test_catalog_reloads_only_changed_files() -> None:
+    """Unchanged files are not re-parsed; edits and deletions are picked up."""
+    print("\n[TEST] NPC Catalog - mtime invalidation")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        directory = Path(temp_dir)
+        _populate(directory)
+        catalog = NPCCatalog(directory)
+        catalog.entries()
+
+        loads: List[str] = []
+        real_load = npc_catalog.CatalogEntry.load
+
+        def _counting_load(path: Path) -> Any:
+            loads.append(path.name)
+            return real_load(path)
+
+        with patch.object(npc_catalog.CatalogEntry, "load", side_effect=_counting_load):
+            assert not catalog.refresh()
+            mara = _write_npc(directory, "mara.json", name="Mara", role="Blacksmith",
+                              notes="Moved her forge to Bree.")
+            os.utime(mara, ns=(1, 1))
+            assert [e.name for e in catalog.find(role="blacksmith")] == ["Mara"]
+            (directory / "hobson.json").unlink()
+            assert "Hobson" not in [e.name for e in catalog.find(location="Bree")]
+        assert loads == ["mara.json"], loads
+        print("  [OK] Only the modified file was reloaded")
+
+    print("[PASS] NPC Catalog - mtime invalidation")
+
+
+def test_catalog_lookup_matches_status_scan() -> None:
+    """Index-backed prompt matching agrees with the status-dict scan."""
+    print("\n[TEST] NPC Catalog - prompt matching")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        directory = Path(temp_dir)
+        _populate(directory)
+        reset_npc_catalogs()
+        catalog = get_npc_catalog(directory)
+        assert get_npc_catalog(directory) is catalog
+
+        keywords = ["tavern", "Bree", "castle"]
+        indexed = match_catalog_to_location(catalog, keywords)
+        scanned = match_npc_to_location([e.status for e in catalog.entries()], keywords)
+        assert indexed == scanned, (indexed, scanned)
+        assert [(npc["name"], npc["location"]) for npc in indexed] == [
+            ("Barliman Butterbur", "tavern"),
+            ("Hobson", "Bree"),
+        ]
+        reset_npc_catalogs()
+        print("  [OK] Same NPCs and keywords as the linear scan")
+
+    print("[PASS] NPC Catalog - prompt matching")
+
+
+def run_all_tests() -> None:
+    """Run all NPC catalog tests."""
+    print("=" * 70)
+    print("NPC CATALOG TESTS")
+    print("=" * 70)
+
+    test_catalog_indexes_fields()
+    test_catalog_reloads_only_changed_files()
+    test_catalog_lookup_matches_status_scan()
+
+    print("\n" + "=" * 70)
+    print("[SUCCESS] ALL NPC CATALOG TESTS PASSED")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -13,6 +13,7 @@ def run_all_sessions_tests() -> int:
 
     tests = [
         ("test_session_notes", "Session Notes and Manager Tests"),
+        ("test_session_rollup", "Session Notes Rollup Tests"),
     ]
 
     results = {}
@@ -0,0 +1,114 @@
+"""Tests for the materialised session notes rollup."""
+
+import os
+import tempfile
+from typing import Any, Dict, Tuple
+from unittest.mock import patch
+
+from tests import test_helpers
+
+SessionNotes = test_helpers.safe_from_import(
+    "src.sessions.session_notes",
+    "SessionNotes",
+)
+PlotStatus = test_helpers.safe_from_import(
+    "src.sessions.session_notes",
+    "PlotStatus",
+)
+SessionNotesManager = test_helpers.safe_from_import(
+    "src.sessions.session_notes_manager",
+    "SessionNotesManager",
+)
+rollup_module = test_helpers.import_module("src.sessions.session_rollup")
+
+
+def _manager() -> Tuple[Any, str]:
+    """Helper: create a SessionNotesManager backed by a temp directory."""
+    tmpdir = tempfile.mkdtemp()
+    os.makedirs(os.path.join(tmpdir, "game_data"))
+    return SessionNotesManager("Test_Campaign", workspace_path=tmpdir), tmpdir
+
+
+def _notes(session_id: str, date: str) -> Any:
+    """Helper: build notes with one event, thread and NPC."""
+    notes = SessionNotes(session_id, date, "Test_Campaign")
+    notes.add_event(f"Event {session_id}", "Something happened.")
+    notes.add_plot_thread(f"Thread {session_id}", "A new lead.", PlotStatus.ACTIVE)
+    notes.add_npc_introduction(f"NPC {session_id}", "Guide", "Bree", "Friendly")
+    return notes
+
+
+def _full_scan(manager: Any) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """Recompute threads and NPCs by parsing every notes file."""
+    threads: Dict[str, str] = {}
+    npcs: Dict[str, str] = {}
+    for notes in manager.get_all_session_notes():
+        for thread in notes.plot_threads:
+            if thread.status == PlotStatus.ACTIVE:
+                threads[thread.name] = thread.description
+            elif thread.status == PlotStatus.RESOLVED:
+                threads.pop(thread.name, None)
+        for npc in notes.npc_introductions:
+            npcs.setdefault(npc.name, notes.session_id)
+    return threads, npcs
+
+
+def test_rollup_matches_full_scan():
+    """Test rollup aggregates after out-of-order saves and on-disk edits."""
+    print("\n[TEST] SessionRollup matches a full scan")
+
+    manager, _tmp = _manager()
+    manager.save_session_notes(_notes("002", "2026-03-02"))
+    manager.save_session_notes(_notes("003", "2026-03-03"))
+    manager.save_session_notes(_notes("001", "2026-03-01"))
+
+    resolved = _notes("004", "2026-03-04")
+    resolved.add_plot_thread("Thread 001", "Solved.", PlotStatus.RESOLVED)
+    manager.save_session_notes(resolved)
+
+    other = SessionNotesManager("Test_Campaign", workspace_path=_tmp)
+    other.save_session_notes(_notes("005", "2026-03-05"))
+    os.remove(os.path.join(manager.notes_dir, "notes_2026-03-03_003.json"))
+
+    threads, npcs = _full_scan(manager)
+    assert {t["name"]: t["description"] for t in manager.get_active_plot_threads()} == threads
+    assert {n["name"]: n["introduced_session"] for n in manager.get_npc_introductions()} == npcs
+    assert [e["session_id"] for e in manager.get_campaign_timeline()] == [
+        "001", "002", "004", "005"
+    ]
+    assert [n.session_id for n in manager.get_recent_notes(2)] == ["004", "005"]
+    print("  [OK] Threads, NPCs, timeline and recent sessions agree")
+    print("[PASS] SessionRollup matches a full scan")
+
+
+def test_context_parses_only_changed_sessions():
+    """Test that prompt context never re-parses unchanged notes files."""
+    print("\n[TEST] SessionRollup incremental refresh")
+
+    manager, tmp = _manager()
+    for index in range(1, 6):
+        manager.save_session_notes(_notes(f"{index:03d}", f"2026-03-{index:02d}"))
+
+    fresh = SessionNotesManager("Test_Campaign", workspace_path=tmp)
+    with patch.object(
+        rollup_module.SessionNotes, "from_dict", wraps=SessionNotes.from_dict
+    ) as parsed:
+        context = fresh.get_context_for_story_generation()
+        assert parsed.call_count == 0
+        assert [e["session"] for e in context["recent_events"]] == ["003", "004", "005"]
+
+        edited = _notes("002", "2026-03-02")
+        edited.add_plot_thread("Thread 002", "Closed.", PlotStatus.RESOLVED)
+        SessionNotesManager("Test_Campaign", workspace_path=tmp).save_session_notes(edited)
+        context = fresh.get_context_for_story_generation()
+        assert parsed.call_count == 1
+    names = [t["name"] for t in context["active_plots"]]
+    assert "Thread 002" not in names and "Thread 005" in names
+    print("  [OK] Persisted rollup reused; one edited file re-parsed")
+    print("[PASS] SessionRollup incremental refresh")
+
+
+if __name__ == "__main__":
+    test_rollup_matches_full_scan()
+    test_context_parses_only_changed_sessions()
+    print("\n[ALL TESTS PASSED]")
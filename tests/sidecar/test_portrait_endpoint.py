@@ -1,11 +1,13 @@
-"""Unit tests for the ComfyUI portrait endpoint in src.sidecar.app.
+"""Unit tests for the ComfyUI portrait endpoints in src.sidecar.portrait_routes.
 
 All tests mock the ComfyUI client and config, so they run without a live
 ComfyUI instance and never load a Stable Diffusion checkpoint.
 """
 
 import base64
-from typing import Any
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator
 from unittest.mock import MagicMock, patch
 
 from fastapi.testclient import TestClient
@@ -16,6 +18,7 @@ setup_test_environment()
 
 _app_mod = import_module("src.sidecar.app")
 app = _app_mod.app
+PortraitJobQueue = import_module("src.ai.portrait_jobs").PortraitJobQueue
 
 _HTTP = TestClient(app)
 
@@ -54,6 +57,7 @@ def _config(
     """
     cfg = MagicMock()
     cfg.comfyui.enabled = enabled
+    cfg.comfyui.timeout = 30.0
     cfg.comfyui.assets.checkpoint = checkpoint
     cfg.comfyui.assets.supports_identity.return_value = identity
     cfg.comfyui.assets.ipadapter_model = _IPADAPTER_MODEL if identity else ""
@@ -73,16 +77,30 @@ def _client(
     return client
 
 
-def _post(cfg: MagicMock, client: Any, body: Any = None, reference: Any = b"REF") -> Any:
-    """POST to the portrait endpoint with config, client, and fetch patched.
+@contextmanager
+def _patched(
+    cfg: MagicMock, client: Any, reference: Any = b"REF", jobs: Any = None
+) -> Iterator[None]:
+    """Patch config, client, render queue, and reference fetch for a request.
 
     ``reference`` stands in for the bytes of an existing portrait; None
-    simulates a reference URL that cannot be fetched.
+    simulates a reference URL that cannot be fetched. Each use gets a fresh,
+    uncached render queue unless ``jobs`` is given, so no test is answered
+    from another test's render.
     """
+    queue = jobs if jobs is not None else PortraitJobQueue(batch_window=0)
+    with patch("src.sidecar.portrait_routes.load_config", return_value=cfg), patch(
+        "src.sidecar.portrait_routes._get_comfyui_client", return_value=client
+    ), patch("src.sidecar.portrait_routes._get_portrait_jobs", return_value=queue), patch(
+        "src.sidecar.portrait_routes.fetch_image_bytes", return_value=reference
+    ):
+        yield
+
+
+def _post(cfg: MagicMock, client: Any, body: Any = None, reference: Any = b"REF") -> Any:
+    """POST to the portrait endpoint with everything patched (see _patched)."""
     payload = body if body is not None else {"profile": _PROFILE}
-    with patch("src.sidecar.app.load_config", return_value=cfg), patch(
-        "src.sidecar.app._get_comfyui_client", return_value=client
-    ), patch("src.sidecar.app.fetch_image_bytes", return_value=reference):
+    with _patched(cfg, client, reference):
         return _HTTP.post(_ENDPOINT, json=payload)
 
 
@@ -293,6 +311,79 @@ def test_portrait_without_reference_stays_text_to_image() -> None:
     print("  [OK] Identity path not taken for a first render")
 
 
+# ---------------------------------------------------------------------------
+# queued jobs
+# ---------------------------------------------------------------------------
+
+
+def _get(jobs: Any, path: str) -> Any:
+    """GET a portrait job endpoint against a given render queue."""
+    with patch("src.sidecar.portrait_routes._get_portrait_jobs", return_value=jobs):
+        return _HTTP.get(path)
+
+
+def test_portrait_job_submit_status_and_result() -> None:
+    """A submitted job reports progress and its result matches /portrait."""
+    print("\n[TEST] portrait jobs - submit, poll, fetch result")
+    jobs = PortraitJobQueue(batch_window=0)
+    gate = threading.Event()
+    client = _client()
+
+    def _render(_workflow: Any, on_progress: Any = None) -> bytes:
+        gate.wait(5)
+        on_progress(3, 10)
+        return b"PNGDATA"
+
+    client.generate.side_effect = _render
+    with _patched(_config(), client, jobs=jobs):
+        resp = _HTTP.post(_ENDPOINT + "/jobs", json={"profile": _PROFILE, "seed": 99})
+    assert resp.status_code == 200, resp.text
+    job_id = resp.json()["job_id"]
+    assert resp.json()["status"] in ("queued", "running")
+
+    pending = _get(jobs, f"{_ENDPOINT}/jobs/{job_id}/result")
+    assert pending.status_code == 409, pending.status_code
+    gate.set()
+    assert jobs.get(job_id).wait(5)
+
+    status = _get(jobs, f"{_ENDPOINT}/jobs/{job_id}").json()
+    assert status["status"] == "done" and status["progress"] == 1.0
+    result = _get(jobs, f"{_ENDPOINT}/jobs/{job_id}/result")
+    assert result.status_code == 200, result.text
+    body = result.json()
+    assert base64.b64decode(body["image_base64"]) == b"PNGDATA"
+    assert body["seed"] == 99
+    assert body["alt"] == "Portrait of Aragorn, a Dunedain human Ranger"
+    client.free.assert_called_once()
+    print("  [OK] 409 while rendering, then the portrait payload")
+
+
+def test_portrait_wait_times_out_with_504() -> None:
+    """A render still running after the timeout answers 504 with the job id."""
+    print("\n[TEST] portrait - blocking wait times out")
+    jobs = PortraitJobQueue(batch_window=0)
+    gate = threading.Event()
+    client = _client()
+    client.generate.side_effect = lambda _workflow, on_progress=None: gate.wait(5) and b"PNG"
+    cfg = _config()
+    cfg.comfyui.timeout = 0.1
+    with _patched(cfg, client, jobs=jobs):
+        resp = _HTTP.post(_ENDPOINT, json={"profile": _PROFILE})
+    gate.set()
+    assert resp.status_code == 504, resp.status_code
+    assert "/character/portrait/jobs/" in resp.json()["detail"]
+    print("  [OK] 504 instead of blocking the worker thread")
+
+
+def test_portrait_job_unknown_id_returns_404() -> None:
+    """Polling an unknown job answers 404."""
+    print("\n[TEST] portrait jobs - unknown id")
+    jobs = PortraitJobQueue(batch_window=0)
+    assert _get(jobs, f"{_ENDPOINT}/jobs/nope").status_code == 404
+    assert _get(jobs, f"{_ENDPOINT}/jobs/nope/result").status_code == 404
+    print("  [OK] 404 for status and result")
+
+
 # ---------------------------------------------------------------------------
 # request validation
 # ---------------------------------------------------------------------------
@@ -325,6 +416,9 @@ def run_all_tests() -> None:
     test_portrait_falls_back_when_reference_cannot_be_fetched()
     test_portrait_falls_back_when_reference_upload_fails()
     test_portrait_without_reference_stays_text_to_image()
+    test_portrait_job_submit_status_and_result()
+    test_portrait_wait_times_out_with_504()
+    test_portrait_job_unknown_id_returns_404()
     test_portrait_empty_profile_rejected()
     print("\n[PASS] All portrait endpoint tests passed.")
 
@@ -11,6 +11,7 @@ setup_test_environment()
 _app_mod = import_module("src.sidecar.app")
 _parser_mod = import_module("src.sidecar.query_parser")
 _models_mod = import_module("src.sidecar.models")
+_scheduler_mod = import_module("src.ai.request_scheduler")
 
 app = _app_mod.app
 parse_query = _parser_mod.parse_query
@@ -187,6 +188,19 @@ def test_health_endpoint_returns_ok() -> None:
     body = response.json()
     assert body["status"] == "ok"
     assert "ai_configured" in body
+    assert isinstance(body["model_queues"], dict)
+
+
+def test_parse_query_endpoint_reports_queue_rejection() -> None:
+    """A request rejected by the model queue is a 503 with Retry-After."""
+    reset_client_cache()
+    mock = _mock_client("{}")
+    mock.chat_completion.side_effect = _scheduler_mod.SchedulerBusy("busy", 503, 12.4)
+    with patch(_PATCH_TARGET, return_value=mock):
+        response = _HTTP.post("/search/parse-query", json={"q": "fireball"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "12"
+    assert response.json()["error"] == "ModelBusy"
 
 
 def test_parse_query_endpoint_success() -> None:
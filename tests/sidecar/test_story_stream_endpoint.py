@@ -0,0 +1,109 @@
+"""Unit tests for the streamed ``/story/narrate/stream`` endpoint.
+
+The story client is mocked with a fake streaming client, so the tests check
+the SSE framing and fallbacks without a model server.
+"""
+
+import json
+from typing import Any, Dict, Iterator, List, Optional
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from tests.test_helpers import setup_test_environment, import_module
+
+setup_test_environment()
+
+_app_mod = import_module("src.sidecar.app")
+_story_mod = import_module("src.sidecar.story_routes")
+
+_HTTP = TestClient(_app_mod.app)
+_ENDPOINT = "/story/narrate/stream"
+
+
+class _StreamingClient:
+    """Fake AI client streaming fixed deltas, optionally failing midway."""
+
+    def __init__(self, deltas: List[str], fail: bool = False):
+        self.deltas = deltas
+        self.fail = fail
+
+    def create_system_message(self, content: str) -> Dict[str, str]:
+        """Build a system message."""
+        return {"role": "system", "content": content}
+
+    def create_user_message(self, content: str) -> Dict[str, str]:
+        """Build a user message."""
+        return {"role": "user", "content": content}
+
+    def chat_completion_stream(
+        self, messages: List[Dict[str, str]], temperature: Any = None, max_tokens: Any = None
+    ) -> Iterator[str]:
+        """Yield the canned deltas."""
+        del messages, temperature, max_tokens
+        yield from self.deltas
+        if self.fail:
+            raise RuntimeError("model went away")
+
+
+def _post(client: Optional[_StreamingClient], body: Dict[str, Any]) -> Any:
+    """POST to the endpoint with the story client patched."""
+    with patch.object(_story_mod, "_get_story_client", return_value=client):
+        return _HTTP.post(_ENDPOINT, json=body)
+
+
+def _events(resp: Any) -> List[tuple]:
+    """Parse an SSE body into (event, data) pairs."""
+    events = []
+    for block in resp.text.split("\n\n"):
+        if not block.strip():
+            continue
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_narrative_streams_delta_events() -> None:
+    """Deltas arrive as SSE events in order, followed by a done summary."""
+    print("\n[TEST] story/narrate/stream - narrative deltas")
+    resp = _post(_StreamingClient(["The fire ", "crackles."]), {
+        "prompt": "The party enters the inn",
+        "characters_present": ["Aragorn"],
+    })
+    assert resp.status_code == 200, resp.text
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    events = _events(resp)
+    assert events[:2] == [("delta", {"text": "The fire "}), ("delta", {"text": "crackles."})]
+    name, summary = events[-1]
+    assert name == "done" and summary["chars"] == len("The fire crackles.")
+    assert summary["time_to_first_token_ms"] is not None
+    print("  [OK] delta events then done summary")
+
+
+def test_combat_failure_reports_partial_output() -> None:
+    """Combat mode relays text produced before a mid-stream failure."""
+    print("\n[TEST] story/narrate/stream - combat mode")
+    resp = _post(_StreamingClient(["Steel rings"], fail=True), {
+        "prompt": "Goblins ambush the party",
+        "mode": "combat",
+    })
+    assert resp.status_code == 200, resp.text
+    events = _events(resp)
+    assert events[0] == ("delta", {"text": "Steel rings"})
+    assert events[-1][0] == "done" and events[-1][1]["chars"] == len("Steel rings")
+    print("  [OK] partial combat text streamed before done")
+
+
+def test_rejects_empty_prompt_and_missing_client() -> None:
+    """Empty prompts are 400; an unconfigured AI client is 503."""
+    print("\n[TEST] story/narrate/stream - errors")
+    assert _post(_StreamingClient([]), {"prompt": "  "}).status_code == 400
+    assert _post(None, {"prompt": "The party rests"}).status_code == 503
+    assert _post(_StreamingClient([]), {"prompt": "x", "mode": "poem"}).status_code == 422
+    print("  [OK] 400, 503 and 422 returned")
+
+
+if __name__ == "__main__":
+    test_narrative_streams_delta_events()
+    test_combat_failure_reports_partial_output()
+    test_rejects_empty_prompt_and_missing_client()
@@ -0,0 +1,116 @@
+"""Unit tests for the streamed ``/tts/render`` endpoint in src.sidecar.tts_routes.
+
+Piper is mocked to return the segment text as its "audio", so the tests can
+check ordering and failure reporting without piper-tts installed.
+"""
+
+import base64
+import json
+from typing import Any, Callable, Dict, List, Optional
+
+from tests.sidecar import tts_fixtures
+
+_ENDPOINT = "/tts/render"
+
+_STORY = (
+    "The fire crackled warmly in the common room.\n\n"
+    '"Evenin\'," Aragorn said. "We need horses by dawn."\n\n'
+    "Frodo: \"I will go with you.\"\n"
+)
+
+
+def _echo_synthesize(text: str, _voice: str, speed: float = 1.0) -> Optional[bytes]:
+    """Fake synthesis: the clip is the text itself; Frodo's line fails."""
+    del speed
+    return None if "go with" in text else text.encode("utf-8")
+
+
+def _render(
+    available: bool = True,
+    body: Optional[Dict[str, Any]] = None,
+    synthesize: Callable[..., Optional[bytes]] = _echo_synthesize,
+) -> Any:
+    """POST to /tts/render with a mocked Piper client and a temp cache."""
+    payload = body if body is not None else {
+        "text": _STORY,
+        "character_voices": {"Aragorn": "en_US-ryan-low", "Frodo": "en_US-amy-medium"},
+        "known_characters": ["Aragorn", "Frodo"],
+    }
+    piper = tts_fixtures.mock_piper(available, synthesize)
+    return tts_fixtures.post_tts(_ENDPOINT, piper, tts_fixtures.temp_cache(), payload)
+
+
+def _lines(resp: Any) -> List[Dict[str, Any]]:
+    """Parse an NDJSON response body."""
+    return [json.loads(line) for line in resp.text.splitlines() if line]
+
+
+def test_render_streams_segments_in_story_order() -> None:
+    """Segments arrive in order with audio, followed by a summary line."""
+    print("\n[TEST] tts/render - segments streamed in story order")
+    resp = _render()
+    assert resp.status_code == 200, resp.text
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    lines = _lines(resp)
+    segments, summary = lines[:-1], lines[-1]
+    assert [seg["index"] for seg in segments] == list(range(len(segments)))
+    assert summary["done"] is True and summary["segments"] == len(segments)
+    for seg in segments:
+        if seg["audio"] is not None:
+            assert base64.b64decode(seg["audio"]).decode("utf-8") == seg["text"]
+    voices = {seg["speaker"]: seg["voice_id"] for seg in segments}
+    assert voices.get("Frodo") == "en_US-amy-medium"
+    assert summary["time_to_first_audio_ms"] is not None
+    print("  [OK] ordered audio lines plus summary")
+
+
+def test_render_reports_failed_segments() -> None:
+    """A segment that fails synthesis is reported without ending the stream."""
+    print("\n[TEST] tts/render - failed segment reported")
+    lines = _lines(_render())
+    failed = [line for line in lines[:-1] if line["audio"] is None]
+    assert [line["speaker"] for line in failed] == ["Frodo"]
+    assert lines[-1]["failed"] == len(failed)
+    print("  [OK] failure carried in-line")
+
+
+def test_render_survives_raising_segment() -> None:
+    """A segment whose synthesis raises gets an error line; the rest still stream."""
+    print("\n[TEST] tts/render - raising segment reported")
+
+    def _raise_for_frodo(text: str, voice: str, speed: float = 1.0) -> Optional[bytes]:
+        if "go with" in text:
+            raise OSError("worker pipe closed")
+        return _echo_synthesize(text, voice, speed)
+
+    resp = _render(synthesize=_raise_for_frodo)
+    assert resp.status_code == 200, resp.text
+    lines = _lines(resp)
+    errors = [line for line in lines[:-1] if "error" in line]
+    assert [(line["speaker"], line["error"]) for line in errors] == [
+        ("Frodo", "worker pipe closed")
+    ]
+    assert errors[0]["audio"] is None
+    assert lines[-1]["done"] is True and lines[-1]["failed"] == 1
+    print("  [OK] error carried in-line, stream completed")
+
+
+def test_render_errors() -> None:
+    """Empty text is 400; missing Piper is 503."""
+    print("\n[TEST] tts/render - error statuses")
+    assert _render(body={"text": "  "}).status_code == 400
+    assert _render(available=False).status_code == 503
+    print("  [OK] 400 and 503")
+
+
+def run_all_tests() -> None:
+    """Run all /tts/render endpoint tests."""
+    test_render_streams_segments_in_story_order()
+    test_render_reports_failed_segments()
+    test_render_survives_raising_segment()
+    test_render_errors()
+    print("\n[PASS] All tts/render endpoint tests passed.")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,62 @@
+"""Unit tests for the ``/tts/speak`` endpoint in src.sidecar.tts_routes.
+
+Piper is mocked and the audio cache points at a temp directory, so the tests
+run without piper-tts, voice models or sox installed.
+"""
+
+from typing import Any, Tuple
+from unittest.mock import MagicMock
+
+from tests.sidecar import tts_fixtures
+
+_ENDPOINT = "/tts/speak"
+
+
+def _speak(piper: MagicMock, cache: Any, body: dict) -> Tuple[Any, MagicMock]:
+    """POST to /tts/speak with a mocked Piper client and cache."""
+    return tts_fixtures.post_tts(_ENDPOINT, piper, cache, body), piper
+
+
+def test_speak_unavailable_returns_503() -> None:
+    """Missing Piper yields 503 before any synthesis."""
+    print("\n[TEST] tts/speak - Piper unavailable returns 503")
+    piper = tts_fixtures.mock_piper(available=False)
+    resp, _ = _speak(piper, tts_fixtures.temp_cache(), {"text": "Hi"})
+    assert resp.status_code == 503, resp.status_code
+    piper.synthesize.assert_not_called()
+    print("  [OK] 503 without synthesis")
+
+
+def test_speak_repeated_clip_served_from_cache() -> None:
+    """The second identical request is answered without synthesising."""
+    print("\n[TEST] tts/speak - repeated clip served from cache")
+    cache, piper = tts_fixtures.temp_cache(), tts_fixtures.mock_piper()
+    body = {"text": "You shall not pass!", "voice_id": "en_GB-alan-medium"}
+    first, _ = _speak(piper, cache, body)
+    second, _ = _speak(piper, cache, body)
+    assert first.status_code == second.status_code == 200
+    assert second.content == first.content == b"RIFF-clip"
+    assert piper.synthesize.call_count == 1
+    print("  [OK] one synthesis for two requests")
+
+
+def test_speak_settings_change_misses_cache() -> None:
+    """A different speed is a different clip."""
+    print("\n[TEST] tts/speak - speed change misses cache")
+    cache, piper = tts_fixtures.temp_cache(), tts_fixtures.mock_piper()
+    _speak(piper, cache, {"text": "Fly, you fools!", "speed": 1.0})
+    _speak(piper, cache, {"text": "Fly, you fools!", "speed": 1.2})
+    assert piper.synthesize.call_count == 2
+    print("  [OK] distinct settings synthesised separately")
+
+
+def run_all_tests() -> None:
+    """Run all /tts/speak endpoint tests."""
+    test_speak_unavailable_returns_503()
+    test_speak_repeated_clip_served_from_cache()
+    test_speak_settings_change_misses_cache()
+    print("\n[PASS] All tts/speak endpoint tests passed.")
+
+
+if __name__ == "__main__":
+    run_all_tests()
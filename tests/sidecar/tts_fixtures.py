@@ -0,0 +1,70 @@
+"""
+Shared fixtures for the ``/tts`` endpoint tests.
+
+The speak and render endpoint tests drive the same app with the same mocked
+Piper client and a throwaway audio cache, so they would otherwise each carry
+an identical setup. Like tests/ai/rag_fixtures.py, it lives beside the tests
+that need it rather than in tests/test_helpers.py.
+"""
+
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+from unittest.mock import MagicMock, patch
+
+from fastapi.testclient import TestClient
+
+from tests.test_helpers import setup_test_environment, import_module
+
+setup_test_environment()
+
+_app_mod = import_module("src.sidecar.app")
+_tts_mod = import_module("src.sidecar.tts_routes")
+_cache_mod = import_module("src.utils.tts_audio_cache")
+
+HTTP = TestClient(_app_mod.app)
+
+
+def mock_piper(
+    available: bool = True, synthesize: Optional[Callable[..., Optional[bytes]]] = None
+) -> MagicMock:
+    """Return a Piper client mock.
+
+    Args:
+        available: What ``is_available()`` reports.
+        synthesize: Stand-in for ``synthesize``; by default every clip is
+            ``b"RIFF-clip"``.
+
+    Returns:
+        The mock client.
+    """
+    piper = MagicMock()
+    piper.is_available.return_value = available
+    piper.is_voice_available.return_value = True
+    if synthesize is None:
+        piper.synthesize.return_value = b"RIFF-clip"
+    else:
+        piper.synthesize.side_effect = synthesize
+    return piper
+
+
+def temp_cache() -> Any:
+    """Return an audio cache in a fresh temp directory."""
+    return _cache_mod.TtsAudioCache(Path(tempfile.mkdtemp()), 1024 * 1024)
+
+
+def post_tts(endpoint: str, piper: MagicMock, cache: Any, body: Dict[str, Any]) -> Any:
+    """POST to a ``/tts`` endpoint with the given Piper client and cache patched in.
+
+    Args:
+        endpoint: The route, e.g. ``/tts/speak``.
+        piper: Piper client the routes should use.
+        cache: Audio cache the routes should use.
+        body: JSON request body.
+
+    Returns:
+        The TestClient response.
+    """
+    with patch.object(_tts_mod, "_get_piper", return_value=piper), \
+            patch.object(_tts_mod, "_get_audio_cache", return_value=cache):
+        return HTTP.post(endpoint, json=body)
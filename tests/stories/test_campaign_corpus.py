@@ -0,0 +1,96 @@
+"""Tests for campaign_corpus.py CampaignCorpus and cached JSON loading.
+
+Uses temporary campaign directories. All tests work offline without an AI
+connection.
+"""
+
+import json
+import os
+import tempfile
+
+from src.stories.campaign_corpus import (
+    CampaignCorpus,
+    get_campaign_corpus,
+    load_json_cached,
+)
+
+
+def _write(path: str, text: str, mtime: float) -> None:
+    """Write a file and pin its mtime so change detection is deterministic."""
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write(text)
+    os.utime(path, (mtime, mtime))
+
+
+def test_documents_are_reused_until_file_changes():
+    """An unchanged file is parsed once; an edited file is re-read."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "001_start.md")
+        _write(path, "Aragorn arrives.\n", 1000.0)
+        corpus = CampaignCorpus(tmp)
+
+        first = corpus.story_documents()[0]
+        assert corpus.story_documents()[0] is first, "Unchanged file must be reused"
+
+        _write(path, "Legolas arrives instead.\n", 2000.0)
+        second = corpus.story_documents()[0]
+
+    assert second is not first
+    assert "Legolas" in second.content.text
+
+
+def test_name_index_and_sections():
+    """Name offsets are indexed per document and per section."""
+    with tempfile.TemporaryDirectory() as tmp:
+        _write(
+            os.path.join(tmp, "001_start.md"),
+            "Frodo rests.\n\n## DC Suggestions Needed\nSam must roll Stealth.\n",
+            1000.0,
+        )
+        doc = CampaignCorpus(tmp).story_documents()[0]
+
+        positions = doc.content.first_positions(["Frodo", "Sam", "Gandalf"])
+        section = doc.section("DC Suggestions Needed")
+
+    assert positions == {"Frodo": 0, "Sam": positions["Sam"]}
+    assert "Gandalf" not in positions
+    assert section.text.startswith("Sam must roll")
+    assert set(section.first_positions(["Frodo", "Sam"])) == {"Sam"}
+    assert doc.section("DC Suggestions Needed") is section
+
+
+def test_missing_files_are_dropped():
+    """Deleted story files disappear from the corpus."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "001_start.md")
+        _write(path, "Text.\n", 1000.0)
+        corpus = get_campaign_corpus(tmp)
+        assert len(corpus.story_documents()) == 1
+        assert get_campaign_corpus(tmp) is corpus
+        os.remove(path)
+        assert not corpus.story_documents()
+        assert corpus.document("001_start.md") is None
+
+
+def test_load_json_cached_tracks_changes():
+    """Cached JSON is returned while unchanged and reloaded after edits."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "npc.json")
+        _write(path, json.dumps({"name": "Butterbur"}), 1000.0)
+        first = load_json_cached(path)
+        assert load_json_cached(path) is first
+
+        _write(path, json.dumps({"name": "Nob"}), 2000.0)
+        second = load_json_cached(path)
+        missing = load_json_cached(os.path.join(tmp, "absent.json"))
+
+    assert second == {"name": "Nob"}
+    assert missing is None
+
+
+if __name__ == "__main__":
+    test_documents_are_reused_until_file_changes()
+    test_name_index_and_sections()
+    test_missing_files_are_dropped()
+    test_load_json_cached_tracks_changes()
+    print("\nAll campaign_corpus tests passed.")
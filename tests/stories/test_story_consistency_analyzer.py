@@ -7,12 +7,18 @@ using the real Example_Campaign data.
 import json
 import os
 import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict
+from unittest.mock import MagicMock
 
 from tests import test_helpers
+from src.character_arc.arc_cache import ChunkAnalysisCache
 from src.stories.story_consistency_analyzer import (
     StoryConsistencyAnalyzer,
     CharacterNameMatcher,
     ActionContext,
+    ConsistencyOptions,
 )
 
 
@@ -270,6 +276,86 @@ def test_name_matching_edge_cases():
     print("[PASS] Name Matching Edge Cases")
 
 
+def _batch_ai_client(reply: str) -> MagicMock:
+    """Return a mock AI client answering every batched review with reply."""
+    client = MagicMock()
+    client.model = "test-model"
+    client.chat_completion.return_value = reply
+    client.create_system_message.side_effect = lambda text: {"role": "system", "content": text}
+    client.create_user_message.side_effect = lambda text: {"role": "user", "content": text}
+    return client
+
+
+def _series_workspace(tmp: str, profile: Dict[str, Any], stories: Dict[str, str]) -> None:
+    """Lay out a workspace with one character (Frodo) and a "Series" of stories."""
+    characters = Path(tmp) / "game_data" / "characters"
+    characters.mkdir(parents=True)
+    (characters / "frodo.json").write_text(json.dumps(profile), encoding="utf-8")
+    series = Path(tmp) / "game_data" / "campaigns" / "Series"
+    series.mkdir(parents=True)
+    for name, text in stories.items():
+        (series / name).write_text(text, encoding="utf-8")
+
+
+def test_batched_ai_review_one_call_per_story():
+    """All of a character's lines in a story go to the AI in one call."""
+    profile = {"dnd_class": "Wizard", "level": 5, "flaws": ["Arrogant"]}
+    story = "\n".join([
+        "Frodo walked into the tavern.",
+        "The innkeeper nodded.",
+        "Frodo charges the ogre with a sword swing.",
+        "Frodo sat down.",
+    ])
+    reply = json.dumps([
+        {"line": 3, "issue_type": "tactical", "description": "Melee wizard",
+         "suggestion": "Cast a spell", "score": 4},
+        {"line": 2, "description": "Not a Frodo line"},
+    ])
+    ai_client = _batch_ai_client(reply)
+    with tempfile.TemporaryDirectory() as tmp:
+        # The copy has the same profile and text, so it is answered from the cache.
+        _series_workspace(tmp, profile, {"s1.md": story, "copy.md": story})
+        cache = ChunkAnalysisCache(Path(tmp) / "findings.sqlite3")
+        analyzer = StoryConsistencyAnalyzer(
+            tmp,
+            ai_client=ai_client,
+            options=ConsistencyOptions(max_workers=1, result_cache=cache),
+        )
+        results = analyzer.analyze_series("Series", ["s1.md", "copy.md"], ["Frodo"])
+
+        assert ai_client.chat_completion.call_count == 1
+        prompt = ai_client.chat_completion.call_args[0][0][-1]["content"]
+        assert "1: Frodo walked into the tavern." in prompt
+        assert "3: Frodo charges the ogre with a sword swing." in prompt
+        ai_issues = [issue for issue in results["issues"] if issue.issue_type == "tactical"]
+        assert [(issue.story_file, issue.line_number) for issue in ai_issues] == [
+            ("s1.md", 3),
+            ("copy.md", 3),
+        ], results["issues"]
+        assert ai_issues[0].score == 4
+        cache.close()
+
+    print("[PASS] Batched AI Review")
+
+
+def test_unparseable_batch_reply_is_not_cached():
+    """A reply without a JSON array yields no AI issues and is retried later."""
+    ai_client = _batch_ai_client("I think everything is fine.")
+    with tempfile.TemporaryDirectory() as tmp:
+        _series_workspace(tmp, {"dnd_class": "Rogue"}, {"s.md": "Frodo waves."})
+        cache = ChunkAnalysisCache(Path(tmp) / "findings.sqlite3")
+        analyzer = StoryConsistencyAnalyzer(
+            tmp, ai_client=ai_client, options=ConsistencyOptions(result_cache=cache)
+        )
+        analyzer.analyze_series("Series", ["s.md"], ["Frodo"])
+        analyzer.analyze_series("Series", ["s.md"], ["Frodo"])
+        assert ai_client.chat_completion.call_count == 2
+        assert cache.count() == 0
+        cache.close()
+
+    print("[PASS] Unparseable Batch Reply")
+
+
 def run_all_tests():
     """Run all story consistency analyzer tests."""
     test_functions = [
@@ -281,6 +367,8 @@ def run_all_tests():
         test_report_generation,
         test_series_analysis_integration,
         test_name_matching_edge_cases,
+        test_batched_ai_review_one_call_per_story,
+        test_unparseable_batch_reply_is_not_cached,
     ]
 
     return test_helpers.run_test_suite(
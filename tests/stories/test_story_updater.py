@@ -1,300 +1,407 @@
-"""
-Story Updater Tests
-
-Tests for story file updating with analysis and combat narratives.
-"""
-
-import os
-import tempfile
-
-from src.stories.story_updater import StoryUpdater
-
-
-def test_story_updater_initialization():
-    """Test StoryUpdater initialization."""
-    print("\n[TEST] StoryUpdater Initialization")
-
-    updater = StoryUpdater()
-    assert updater is not None, "Updater should be created"
-    print("  [OK] StoryUpdater initialized correctly")
-
-    print("[PASS] StoryUpdater Initialization")
-
-
-def test_update_story_with_analysis():
-    """Test updating story file with analysis results."""
-    print("\n[TEST] Update Story with Analysis")
-
-    with tempfile.NamedTemporaryFile(
-        mode="w", suffix=".md", delete=False, encoding="utf-8"
-    ) as f:
-        f.write("# Test Story\n\nSome story content here.\n")
-        temp_path = f.name
-
-    try:
-        updater = StoryUpdater()
-        analysis = {
-            "dc_suggestions": {
-                "stealth check": {
-                    "Theron": {
-                        "suggested_dc": 15,
-                        "reasoning": "moderate difficulty",
-                        "alternative_approaches": ["diplomacy"],
-                    }
-                }
-            },
-            "consultant_analyses": {"Theron": {"suggestions": ["Use Shield spell"]}},
-        }
-
-        updater.update_story_with_analysis(temp_path, analysis)
-
-        # Read updated content
-        with open(temp_path, "r", encoding="utf-8") as f:
-            content = f.read()
-
-        assert "Character Consultant Notes" in content
-        assert "Consistency Analysis" in content
-        assert "Theron" in content
-        assert "DC 15" in content
-        print("  [OK] Story updated with analysis sections")
-    finally:
-        os.unlink(temp_path)
-
-    print("[PASS] Update Story with Analysis")
-
-
-def test_update_story_nonexistent_file():
-    """Test updating non-existent file (should handle gracefully)."""
-    print("\n[TEST] Update Story - Non-existent File")
-
-    updater = StoryUpdater()
-    analysis = {"character_reactions": []}
-
-    # Should not raise error for non-existent file
-    updater.update_story_with_analysis("/nonexistent/file.md", analysis)
-    print("  [OK] Non-existent file handled gracefully")
-
-    print("[PASS] Update Story - Non-existent File")
-
-
-def test_append_combat_narrative():
-    """Test appending combat narrative to story file."""
-    print("\n[TEST] Append Combat Narrative")
-
-    with tempfile.NamedTemporaryFile(
-        mode="w", suffix=".md", delete=False, encoding="utf-8"
-    ) as f:
-        f.write("# Test Story\n\nPrevious story content.\n")
-        temp_path = f.name
-
-    try:
-        updater = StoryUpdater()
-        narrative = (
-            "Theron swings his sword at the goblin, striking true. "
-            "The creature falls with a cry."
-        )
-
-        updater.append_combat_narrative(temp_path, narrative)
-
-        # Read updated content
-        with open(temp_path, "r", encoding="utf-8") as f:
-            content = f.read()
-
-        assert "### Combat Scene" in content, "Should have combat section"
-        # Check for key phrases (narrative gets wrapped and spells highlighted)
-        assert "Theron" in content, "Should contain character name"
-        assert "goblin" in content, "Should contain creature"
-        assert "Previous story content" in content, "Should preserve original"
-        print("  [OK] Combat narrative appended correctly")
-    finally:
-        os.unlink(temp_path)
-
-    print("[PASS] Append Combat Narrative")
-
-
-def test_append_combat_narrative_nonexistent():
-    """Test appending combat to non-existent file."""
-    print("\n[TEST] Append Combat - Non-existent File")
-
-    updater = StoryUpdater()
-    narrative = "Some combat narrative."
-
-    # Should not raise error for non-existent file
-    updater.append_combat_narrative("/nonexistent/file.md", narrative)
-    print("  [OK] Non-existent file handled gracefully")
-
-    print("[PASS] Append Combat - Non-existent File")
-
-
-def test_update_existing_sections():
-    """Test updating file that already has sections."""
-    print("\n[TEST] Update Existing Sections")
-
-    with tempfile.NamedTemporaryFile(
-        mode="w", suffix=".md", delete=False, encoding="utf-8"
-    ) as f:
-        f.write(
-            """# Test Story
-
-Story content here.
-
-## Character Consultant Notes
-
-Old notes here.
-
-## Consistency Analysis
-
-Old consistency data.
-"""
-        )
-        temp_path = f.name
-
-    try:
-        updater = StoryUpdater()
-        analysis = {
-            "consultant_analyses": {
-                "Kael": {"suggestions": ["Save spell slot for boss fight"]}
-            }
-        }
-
-        updater.update_story_with_analysis(temp_path, analysis)
-
-        # Read updated content
-        with open(temp_path, "r", encoding="utf-8") as f:
-            content = f.read()
-
-        assert "Kael" in content, "Should have new character"
-        assert "Old notes" not in content or content.index("Kael") > 0
-        print("  [OK] Existing sections updated correctly")
-    finally:
-        os.unlink(temp_path)
-
-    print("[PASS] Update Existing Sections")
-
-
-def test_multiple_combat_appends():
-    """Test appending multiple combat narratives."""
-    print("\n[TEST] Multiple Combat Appends")
-
-    with tempfile.NamedTemporaryFile(
-        mode="w", suffix=".md", delete=False, encoding="utf-8"
-    ) as f:
-        f.write("# Test Story\n\nInitial content.\n")
-        temp_path = f.name
-
-    try:
-        updater = StoryUpdater()
-
-        narrative1 = "First combat encounter."
-        narrative2 = "Second combat encounter."
-
-        updater.append_combat_narrative(temp_path, narrative1)
-        updater.append_combat_narrative(temp_path, narrative2)
-
-        # Read final content
-        with open(temp_path, "r", encoding="utf-8") as f:
-            content = f.read()
-
-        assert narrative1 in content, "Should have first narrative"
-        assert narrative2 in content, "Should have second narrative"
-        assert content.count("Combat Scene") == 2, "Should have 2 sections"
-        print("  [OK] Multiple combat narratives appended")
-    finally:
-        os.unlink(temp_path)
-
-    print("[PASS] Multiple Combat Appends")
-
-
-def test_story_hooks_filename_format():
-    """Test that story hooks filename uses dynamic date format (new feature)."""
-    print("\n[TEST] Story Hooks - Dynamic Filename Format")
-
-    with tempfile.TemporaryDirectory() as _temp_dir:
-        updater = StoryUpdater()
-
-        # The filename should include current date dynamically
-        # This is verified implicitly through the integration test
-        # For this unit test, we just verify the updater can be created
-        assert updater is not None, "StoryUpdater should be created"
-        print("  [OK] StoryUpdater ready for hooks generation")
-
-    print("[PASS] Story Hooks - Dynamic Filename Format")
-
-
-def test_story_hooks_with_structured_dict():
-    """Test that story hooks can accept structured dict from AI (new feature)."""
-    print("\n[TEST] Story Hooks - Structured Dict Support")
-
-    # Verify that StoryUpdater can handle structured dict for hooks
-    updater = StoryUpdater()
-
-    # Structured dict simulating AI generation
-    _hooks_dict = {
-        "unresolved_threads": ["Mystery thread"],
-        "next_session_ideas": ["Session idea"],
-        "npc_follow_ups": ["NPC follow-up"],
-        "character_specific_hooks": ["Character hook"],
-    }
-
-    # The updater should accept this without error
-    # This is tested through integration
-    assert updater is not None, "Updater should handle structured dict"
-    print("  [OK] Structured dict format supported")
-
-    print("[PASS] Story Hooks - Structured Dict Support")
-
-
-def test_story_hooks_three_tier_fallback():
-    """Test that fallback strategy works (AI -> extraction -> generic)."""
-    print("\n[TEST] Story Hooks - Three-Tier Fallback Strategy")
-
-    with tempfile.TemporaryDirectory() as _temp_dir:
-        updater = StoryUpdater()
-
-        # Create a test story file
-        story_content = """
-# The Mysterious Tavern
-
-## Scene 1: Arrival
-
-The party enters the tavern through the heavy wooden doors.
-
-Kael notices suspicious figures in the corner.
-The mysterious stranger warns them about the coming storm.
-
-## Scene 2: Investigation
-
-They investigate the sealed door in the basement.
-"""
-
-        assert updater is not None, "StoryUpdater should be created"
-        assert "The Mysterious Tavern" in story_content
-        print("  [OK] Three-tier fallback strategy implemented")
-
-    print("[PASS] Story Hooks - Three-Tier Fallback Strategy")
-
-
-def run_all_tests():
-    """Run all story updater tests."""
-    print("=" * 70)
-    print("STORY UPDATER TESTS")
-    print("=" * 70)
-
-    test_story_updater_initialization()
-    test_update_story_with_analysis()
-    test_update_story_nonexistent_file()
-    test_append_combat_narrative()
-    test_append_combat_narrative_nonexistent()
-    test_update_existing_sections()
-    test_multiple_combat_appends()
-    test_story_hooks_filename_format()
-    test_story_hooks_with_structured_dict()
-    test_story_hooks_three_tier_fallback()
-
-    print("\n" + "=" * 70)
-    print("[SUCCESS] ALL STORY UPDATER TESTS PASSED")
-    print("=" * 70)
-
-
-if __name__ == "__main__":
-    run_all_tests()
+"""
+Story Updater Tests
+
+Tests for story file updating with analysis and combat narratives.
+"""
+
+import os
+import tempfile
+from unittest.mock import patch
+
+from src.stories import story_streaming
+from src.stories.story_streaming import CombatSection
+from src.stories.story_updater import ContinuationConfig, StoryUpdater
+
+
+def test_story_updater_initialization():
+    """Test StoryUpdater initialization."""
+    print("\n[TEST] StoryUpdater Initialization")
+
+    updater = StoryUpdater()
+    assert updater is not None, "Updater should be created"
+    print("  [OK] StoryUpdater initialized correctly")
+
+    print("[PASS] StoryUpdater Initialization")
+
+
+def test_update_story_with_analysis():
+    """Test updating story file with analysis results."""
+    print("\n[TEST] Update Story with Analysis")
+
+    with tempfile.NamedTemporaryFile(
+        mode="w", suffix=".md", delete=False, encoding="utf-8"
+    ) as f:
+        f.write("# Test Story\n\nSome story content here.\n")
+        temp_path = f.name
+
+    try:
+        updater = StoryUpdater()
+        analysis = {
+            "dc_suggestions": {
+                "stealth check": {
+                    "Theron": {
+                        "suggested_dc": 15,
+                        "reasoning": "moderate difficulty",
+                        "alternative_approaches": ["diplomacy"],
+                    }
+                }
+            },
+            "consultant_analyses": {"Theron": {"suggestions": ["Use Shield spell"]}},
+        }
+
+        updater.update_story_with_analysis(temp_path, analysis)
+
+        # Read updated content
+        with open(temp_path, "r", encoding="utf-8") as f:
+            content = f.read()
+
+        assert "Character Consultant Notes" in content
+        assert "Consistency Analysis" in content
+        assert "Theron" in content
+        assert "DC 15" in content
+        print("  [OK] Story updated with analysis sections")
+    finally:
+        os.unlink(temp_path)
+
+    print("[PASS] Update Story with Analysis")
+
+
+def test_update_story_nonexistent_file():
+    """Test updating non-existent file (should handle gracefully)."""
+    print("\n[TEST] Update Story - Non-existent File")
+
+    updater = StoryUpdater()
+    analysis = {"character_reactions": []}
+
+    # Should not raise error for non-existent file
+    updater.update_story_with_analysis("/nonexistent/file.md", analysis)
+    print("  [OK] Non-existent file handled gracefully")
+
+    print("[PASS] Update Story - Non-existent File")
+
+
+def test_append_combat_narrative():
+    """Test appending combat narrative to story file."""
+    print("\n[TEST] Append Combat Narrative")
+
+    with tempfile.NamedTemporaryFile(
+        mode="w", suffix=".md", delete=False, encoding="utf-8"
+    ) as f:
+        f.write("# Test Story\n\nPrevious story content.\n")
+        temp_path = f.name
+
+    try:
+        updater = StoryUpdater()
+        narrative = (
+            "Theron swings his sword at the goblin, striking true. "
+            "The creature falls with a cry."
+        )
+
+        updater.append_combat_narrative(temp_path, narrative)
+
+        # Read updated content
+        with open(temp_path, "r", encoding="utf-8") as f:
+            content = f.read()
+
+        assert "### Combat Scene" in content, "Should have combat section"
+        # Check for key phrases (narrative gets wrapped and spells highlighted)
+        assert "Theron" in content, "Should contain character name"
+        assert "goblin" in content, "Should contain creature"
+        assert "Previous story content" in content, "Should preserve original"
+        print("  [OK] Combat narrative appended correctly")
+    finally:
+        os.unlink(temp_path)
+
+    print("[PASS] Append Combat Narrative")
+
+
+def test_append_combat_narrative_nonexistent():
+    """Test appending combat to non-existent file."""
+    print("\n[TEST] Append Combat - Non-existent File")
+
+    updater = StoryUpdater()
+    narrative = "Some combat narrative."
+
+    # Should not raise error for non-existent file
+    updater.append_combat_narrative("/nonexistent/file.md", narrative)
+    print("  [OK] Non-existent file handled gracefully")
+
+    print("[PASS] Append Combat - Non-existent File")
+
+
+def test_update_existing_sections():
+    """Test updating file that already has sections."""
+    print("\n[TEST] Update Existing Sections")
+
+    with tempfile.NamedTemporaryFile(
+        mode="w", suffix=".md", delete=False, encoding="utf-8"
+    ) as f:
+        f.write(
+            """# Test Story
+
+Story content here.
+
+## Character Consultant Notes
+
+Old notes here.
+
+## Consistency Analysis
+
+Old consistency data.
+"""
+        )
+        temp_path = f.name
+
+    try:
+        updater = StoryUpdater()
+        analysis = {
+            "consultant_analyses": {
+                "Kael": {"suggestions": ["Save spell slot for boss fight"]}
+            }
+        }
+
+        updater.update_story_with_analysis(temp_path, analysis)
+
+        # Read updated content
+        with open(temp_path, "r", encoding="utf-8") as f:
+            content = f.read()
+
+        assert "Kael" in content, "Should have new character"
+        assert "Old notes" not in content or content.index("Kael") > 0
+        print("  [OK] Existing sections updated correctly")
+    finally:
+        os.unlink(temp_path)
+
+    print("[PASS] Update Existing Sections")
+
+
+def test_multiple_combat_appends():
+    """Test appending multiple combat narratives."""
+    print("\n[TEST] Multiple Combat Appends")
+
+    with tempfile.NamedTemporaryFile(
+        mode="w", suffix=".md", delete=False, encoding="utf-8"
+    ) as f:
+        f.write("# Test Story\n\nInitial content.\n")
+        temp_path = f.name
+
+    try:
+        updater = StoryUpdater()
+
+        narrative1 = "First combat encounter."
+        narrative2 = "Second combat encounter."
+
+        updater.append_combat_narrative(temp_path, narrative1)
+        updater.append_combat_narrative(temp_path, narrative2)
+
+        # Read final content
+        with open(temp_path, "r", encoding="utf-8") as f:
+            content = f.read()
+
+        assert narrative1 in content, "Should have first narrative"
+        assert narrative2 in content, "Should have second narrative"
+        assert content.count("Combat Scene") == 2, "Should have 2 sections"
+        print("  [OK] Multiple combat narratives appended")
+    finally:
+        os.unlink(temp_path)
+
+    print("[PASS] Multiple Combat Appends")
+
+
+def test_story_hooks_filename_format():
+    """Test that story hooks filename uses dynamic date format (new feature)."""
+    print("\n[TEST] Story Hooks - Dynamic Filename Format")
+
+    with tempfile.TemporaryDirectory() as _temp_dir:
+        updater = StoryUpdater()
+
+        # The filename should include current date dynamically
+        # This is verified implicitly through the integration test
+        # For this unit test, we just verify the updater can be created
+        assert updater is not None, "StoryUpdater should be created"
+        print("  [OK] StoryUpdater ready for hooks generation")
+
+    print("[PASS] Story Hooks - Dynamic Filename Format")
+
+
+def test_story_hooks_with_structured_dict():
+    """Test that story hooks can accept structured dict from AI (new feature)."""
+    print("\n[TEST] Story Hooks - Structured Dict Support")
+
+    # Verify that StoryUpdater can handle structured dict for hooks
+    updater = StoryUpdater()
+
+    # Structured dict simulating AI generation
+    _hooks_dict = {
+        "unresolved_threads": ["Mystery thread"],
+        "next_session_ideas": ["Session idea"],
+        "npc_follow_ups": ["NPC follow-up"],
+        "character_specific_hooks": ["Character hook"],
+    }
+
+    # The updater should accept this without error
+    # This is tested through integration
+    assert updater is not None, "Updater should handle structured dict"
+    print("  [OK] Structured dict format supported")
+
+    print("[PASS] Story Hooks - Structured Dict Support")
+
+
+def test_story_hooks_three_tier_fallback():
+    """Test that fallback strategy works (AI -> extraction -> generic)."""
+    print("\n[TEST] Story Hooks - Three-Tier Fallback Strategy")
+
+    with tempfile.TemporaryDirectory() as _temp_dir:
+        updater = StoryUpdater()
+
+        # Create a test story file
+        story_content = """
+# The Mysterious Tavern
+
+## Scene 1: Arrival
+
+The party enters the tavern through the heavy wooden doors.
+
+Kael notices suspicious figures in the corner.
+The mysterious stranger warns them about the coming storm.
+
+## Scene 2: Investigation
+
+They investigate the sealed door in the basement.
+"""
+
+        assert updater is not None, "StoryUpdater should be created"
+        assert "The Mysterious Tavern" in story_content
+        print("  [OK] Three-tier fallback strategy implemented")
+
+    print("[PASS] Story Hooks - Three-Tier Fallback Strategy")
+
+
+def test_stream_ai_continuation_checkpoints_and_finishes():
+    """Streamed text is checkpointed mid-stream, then written as a titled section."""
+    print("\n[TEST] Stream AI Continuation - checkpoints")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        story_path = os.path.join(temp_dir, "001_story.md")
+        with open(story_path, "w", encoding="utf-8") as f:
+            f.write("# Test Story\n\nThe party rests.\n")
+
+        updater = StoryUpdater()
+        config = ContinuationConfig().set_paths(story_path, temp_dir, temp_dir)
+        seen = []
+
+        def _deltas():
+            yield "The tavern door "
+            with open(story_path, encoding="utf-8") as f:
+                seen.append(f.read())
+            yield "creaks open."
+
+        with patch.object(story_streaming, "_CHECKPOINT_CHARS", 1), \
+                patch.object(updater, "_generate_supporting_files") as supporting:
+            stream = updater.stream_ai_continuation(config, _deltas())
+            deltas = list(stream)
+
+        assert deltas == ["The tavern door ", "creaks open."]
+        assert "## Story Continuation (in progress)" in seen[0]
+        assert "The tavern door" in seen[0] and "The party rests." in seen[0]
+        with open(story_path, encoding="utf-8") as f:
+            content = f.read()
+        assert "(in progress)" not in content
+        assert "The tavern door creaks open." in content
+        assert "The party rests." in content
+        supporting.assert_called_once()
+        assert not [name for name in os.listdir(temp_dir) if name.endswith(".tmp")]
+        print("  [OK] Partial text saved while streaming; final section written")
+
+    print("[PASS] Stream AI Continuation - checkpoints")
+
+
+def test_stream_interrupted_keeps_partial_text():
+    """An interrupted stream leaves the partial section; an empty one restores the file."""
+    print("\n[TEST] Stream AI Continuation - interruption")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        story_path = os.path.join(temp_dir, "001_story.md")
+        original = "# Test Story\n\nThe party rests.\n"
+        with open(story_path, "w", encoding="utf-8") as f:
+            f.write(original)
+
+        def _failing():
+            yield "Goblins burst in"
+            raise ConnectionError("model went away")
+
+        updater = StoryUpdater()
+        config = ContinuationConfig().set_paths(story_path, temp_dir, temp_dir)
+        try:
+            list(updater.stream_ai_continuation(config, _failing()))
+        except ConnectionError:
+            pass
+        else:
+            raise AssertionError("Stream error should propagate")
+        with open(story_path, encoding="utf-8") as f:
+            content = f.read()
+        assert content.startswith("# Test Story")
+        assert content.endswith("## Story Continuation (in progress)\n\nGoblins burst in\n")
+
+        with open(story_path, "w", encoding="utf-8") as f:
+            f.write(original)
+        assert not list(updater.stream_combat_narrative(story_path, iter(())))
+        with open(story_path, encoding="utf-8") as f:
+            assert f.read() == original
+        print("  [OK] Partial text kept after a failure; empty stream changes nothing")
+
+    print("[PASS] Stream AI Continuation - interruption")
+
+
+def test_stream_combat_narrative_applies_title_and_finalize():
+    """Streamed combat prose is finalized and saved under its title."""
+    print("\n[TEST] Stream Combat Narrative")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        story_path = os.path.join(temp_dir, "001_story.md")
+        with open(story_path, "w", encoding="utf-8") as f:
+            f.write("# Test Story\n")
+
+        updater = StoryUpdater()
+        stream = updater.stream_combat_narrative(
+            story_path,
+            iter(["Steel ", "rings."]),
+            CombatSection(title="Ambush at the Ford", finalize=str.upper),
+        )
+        assert list(stream) == ["Steel ", "rings."]
+        with open(story_path, encoding="utf-8") as f:
+            content = f.read()
+        assert "### Ambush at the Ford\n\nSTEEL RINGS." in content
+        assert "(in progress)" not in content
+        print("  [OK] Finalized narrative appended under the combat title")
+
+    print("[PASS] Stream Combat Narrative")
+
+
+def run_all_tests():
+    """Run all story updater tests."""
+    print("=" * 70)
+    print("STORY UPDATER TESTS")
+    print("=" * 70)
+
+    test_story_updater_initialization()
+    test_update_story_with_analysis()
+    test_update_story_nonexistent_file()
+    test_append_combat_narrative()
+    test_append_combat_narrative_nonexistent()
+    test_update_existing_sections()
+    test_multiple_combat_appends()
+    test_story_hooks_filename_format()
+    test_story_hooks_with_structured_dict()
+    test_story_hooks_three_tier_fallback()
+    test_stream_ai_continuation_checkpoints_and_finishes()
+    test_stream_interrupted_keeps_partial_text()
+    test_stream_combat_narrative_applies_title_and_finalize()
+
+    print("\n" + "=" * 70)
+    print("[SUCCESS] ALL STORY UPDATER TESTS PASSED")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    run_all_tests()
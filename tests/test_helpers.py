@@ -613,7 +613,7 @@ class FakeAIClient:
     structured response for testing.
     """
 
-    def chat_completion(self, *args: Any, **kwargs: Any):
+    def chat_completion(self, *args: Any, **kwargs: Any) -> str:
         """Return a canned narrative; accepts arbitrary args/kwargs.
 
         When `messages` is provided in kwargs, a short preview is appended
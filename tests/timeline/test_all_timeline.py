@@ -23,6 +23,9 @@ from tests.timeline.test_event_extractor import (
     test_extract_from_file_missing_returns_empty,
     test_ai_extractor_parse_valid_json,
     test_ai_extractor_parse_invalid_json,
+    test_single_scan_matches_per_pattern_finditer,
+    test_paragraph_context_extracted_once,
+    test_extract_from_campaign_skips_unchanged_files,
 )
 from tests.timeline.test_timeline_store import (
     test_store_add_and_get_event,
@@ -38,6 +41,10 @@ from tests.timeline.test_timeline_store import (
     test_store_persistence_to_disk,
     test_store_reload_from_disk,
     test_store_get_campaign_names,
+    test_store_add_events_appends_with_one_fsync,
+    test_store_compacts_log_into_snapshot,
+    test_store_loads_campaigns_lazily,
+    test_store_query_uses_tag_and_date_indexes,
 )
 
 ALL_TESTS = [
@@ -60,6 +67,9 @@ ALL_TESTS = [
     test_extract_from_file_missing_returns_empty,
     test_ai_extractor_parse_valid_json,
     test_ai_extractor_parse_invalid_json,
+    test_single_scan_matches_per_pattern_finditer,
+    test_paragraph_context_extracted_once,
+    test_extract_from_campaign_skips_unchanged_files,
     # Store tests
     test_store_add_and_get_event,
     test_store_get_event_missing_returns_none,
@@ -74,6 +84,10 @@ ALL_TESTS = [
     test_store_persistence_to_disk,
     test_store_reload_from_disk,
     test_store_get_campaign_names,
+    test_store_add_events_appends_with_one_fsync,
+    test_store_compacts_log_into_snapshot,
+    test_store_loads_campaigns_lazily,
+    test_store_query_uses_tag_and_date_indexes,
 ]
 
 
@@ -1,5 +1,8 @@
 """Tests for EventExtractor (pattern-based, no AI required)."""
+import os
+import tempfile
 from typing import Dict, List
+from unittest.mock import patch
 
 from tests import test_helpers
 from tests.timeline.timeline_test_helpers import EventType
@@ -155,6 +158,77 @@ def test_ai_extractor_parse_invalid_json():
     print("[PASS] AIEventExtractor.parse_ai_response - invalid JSON")
 
 
+def test_single_scan_matches_per_pattern_finditer():
+    """Test that the combined scan finds what each pattern's finditer finds."""
+    print("\n[TEST] EventExtractor - combined pattern scan")
+
+    extractor = EventExtractor()
+    paragraph = (
+        "Theron falls in battle and is killed. The party finds a hidden door, "
+        "reveals that the secret was a betrayal, then suddenly arrives at Neverwinter. "
+        "They meet a dwarf named Brom and accept the quest; the quest begins."
+    )
+    found = extractor.scanner.find_matches(paragraph)
+    for (_, pattern), matches in zip(extractor.scanner.patterns, found):
+        expected = [(m.start(), m.end()) for m in pattern.finditer(paragraph)]
+        assert [(m.start(), m.end()) for m in matches] == expected, pattern.pattern
+
+    types = {e.event_type for e in extractor.extract_from_text(paragraph)}
+    assert {EventType.COMBAT, EventType.CHARACTER_DEATH, EventType.PLOT_TWIST} <= types
+    print("  [OK] Overlapping matches from different patterns all reported")
+    print("[PASS] EventExtractor - combined pattern scan")
+
+
+def test_paragraph_context_extracted_once():
+    """Test that location and names are computed once per paragraph."""
+    print("\n[TEST] EventExtractor - per-paragraph context")
+
+    extractor = EventExtractor()
+    text = "Elara attacks and slays the ogre in Phandalin. The battle ends."
+    with patch.object(
+        extractor, "extract_location", wraps=extractor.extract_location
+    ) as location:
+        events = extractor.extract_from_text(text)
+    assert len(events) >= 2
+    assert location.call_count == 1
+    assert all(e.context.location == "Phandalin" for e in events)
+    print(f"  [OK] {len(events)} events share one location lookup")
+    print("[PASS] EventExtractor - per-paragraph context")
+
+
+def test_extract_from_campaign_skips_unchanged_files():
+    """Test pooled campaign extraction and content-hash skipping."""
+    print("\n[TEST] EventExtractor.extract_from_campaign")
+
+    extractor = EventExtractor()
+    with tempfile.TemporaryDirectory() as campaign_dir:
+        stories = {
+            "001_arrival.md": "The party arrives at Waterdeep.",
+            "002_ambush.md": "Goblins ambush the caravan. Elara slays the leader.",
+            "notes.txt": "The battle is not a story file.",
+        }
+        for name, text in stories.items():
+            with open(os.path.join(campaign_dir, name), "w", encoding="utf-8") as f:
+                f.write(text)
+
+        events = extractor.extract_from_campaign(campaign_dir, "Camp", max_workers=2)
+        expected = [
+            e.to_dict()
+            for name in ("001_arrival.md", "002_ambush.md")
+            for e in extractor.extract_from_text(stories[name], "Camp", name)
+        ]
+        assert [e.to_dict() for e in events] == expected
+        assert extractor.extract_from_campaign(campaign_dir, "Camp") == []
+
+        with open(os.path.join(campaign_dir, "002_ambush.md"), "a", encoding="utf-8") as f:
+            f.write("\n\nA hidden passage is discovered.")
+        changed = extractor.extract_from_campaign(campaign_dir, "Camp", max_workers=1)
+        assert changed and {e.source.story_file for e in changed} == {"002_ambush.md"}
+        assert len(extractor.extract_from_campaign(campaign_dir, "Camp", force=True)) > len(changed)
+    print("  [OK] Only new or changed story files were extracted")
+    print("[PASS] EventExtractor.extract_from_campaign")
+
+
 if __name__ == "__main__":
     test_extract_combat_event()
     test_extract_no_events_from_neutral_text()
@@ -165,4 +239,7 @@ if __name__ == "__main__":
     test_extract_from_file_missing_returns_empty()
     test_ai_extractor_parse_valid_json()
     test_ai_extractor_parse_invalid_json()
+    test_single_scan_matches_per_pattern_finditer()
+    test_paragraph_context_extracted_once()
+    test_extract_from_campaign_skips_unchanged_files()
     print("\n[ALL TESTS PASSED]")
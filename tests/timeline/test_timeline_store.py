@@ -1,7 +1,10 @@
 """Tests for TimelineStore - event persistence and retrieval."""
 
+import json
 import os
 import tempfile
+from typing import Any, List, Optional
+from unittest.mock import patch
 
 from tests import test_helpers
 from tests.timeline.timeline_test_helpers import (
@@ -18,6 +21,11 @@ TimelineQuery = test_helpers.safe_from_import(
     "src.timeline.timeline_store",
     "TimelineQuery",
 )
+DateRange = test_helpers.safe_from_import(
+    "src.timeline.timeline_store",
+    "DateRange",
+)
+timeline_store_module = test_helpers.import_module("src.timeline.timeline_store")
 
 
 def _make_store(campaign_name: str = "Test_Campaign"):
@@ -238,6 +246,123 @@ def test_store_get_campaign_names():
     print("[PASS] TimelineStore get_campaign_names")
 
 
+def _campaign_file(tmp_dir: str, campaign: str, name: str) -> str:
+    """Return the path of a file in a campaign directory."""
+    return os.path.join(tmp_dir, "game_data", "campaigns", campaign, name)
+
+
+def test_store_add_events_appends_with_one_fsync():
+    """Test that a bulk insert is one log append and survives a reload."""
+    print("\n[TEST] TimelineStore add_events bulk append")
+
+    store, tmp_dir = _make_store("BulkCamp")
+    store.add_event(make_event("evt_000", campaign_name="BulkCamp"))
+    events = [
+        make_event(f"evt_{i:03d}", campaign_name="BulkCamp") for i in range(1, 41)
+    ]
+    with patch.object(timeline_store_module.os, "fsync") as fsync:
+        store.add_events(events)
+    assert fsync.call_count == 1
+
+    log_path = _campaign_file(tmp_dir, "BulkCamp", "timeline.log.jsonl")
+    with open(log_path, encoding="utf-8") as f:
+        assert len(f.readlines()) == 40
+    with open(_campaign_file(tmp_dir, "BulkCamp", "timeline.json"), encoding="utf-8") as f:
+        assert len(json.load(f)["events"]) == 1
+
+    reloaded = TimelineStore(campaign_name="BulkCamp", workspace_path=tmp_dir)
+    assert len(reloaded.get_campaign_timeline("BulkCamp")) == 41
+    print("  [OK] 40 events appended with one fsync and replayed on reload")
+    print("[PASS] TimelineStore add_events bulk append")
+
+
+def test_store_compacts_log_into_snapshot():
+    """Test that compaction folds the log into timeline.json, keeping extra keys."""
+    print("\n[TEST] TimelineStore compaction")
+
+    store, tmp_dir = _make_store("CompactCamp")
+    store.add_event(make_event("evt_000", campaign_name="CompactCamp"))
+    timeline_path = _campaign_file(tmp_dir, "CompactCamp", "timeline.json")
+    with open(timeline_path, encoding="utf-8") as f:
+        data = json.load(f)
+    data["current_date"] = {"year": 1492, "month": "Hammer", "day": 1}
+    with open(timeline_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+    store.add_events([
+        make_event(f"evt_{i:03d}", campaign_name="CompactCamp") for i in range(1, 80)
+    ])
+    log_path = _campaign_file(tmp_dir, "CompactCamp", "timeline.log.jsonl")
+    assert not os.path.exists(log_path)
+    with open(timeline_path, encoding="utf-8") as f:
+        data = json.load(f)
+    assert len(data["events"]) == 80
+    assert data["current_date"]["year"] == 1492
+
+    store.link_events("evt_001", "evt_002")
+    store.compact()
+    assert not os.path.exists(log_path)
+    reloaded = TimelineStore(workspace_path=tmp_dir)
+    assert "evt_002" in reloaded.get_event("evt_001").links.linked_events
+    print("  [OK] Log folded into snapshot, calendar keys preserved")
+    print("[PASS] TimelineStore compaction")
+
+
+def test_store_loads_campaigns_lazily():
+    """Test that campaigns are read only when first needed."""
+    print("\n[TEST] TimelineStore lazy loading")
+
+    store, tmp_dir = _make_store()
+    store.add_event(make_event("evt_a", campaign_name="Alpha"))
+    store.add_event(make_event("evt_b", campaign_name="Beta"))
+
+    load_json_file = timeline_store_module.load_json_file
+    with patch.object(
+        timeline_store_module, "load_json_file", wraps=load_json_file
+    ) as load:
+        lazy = TimelineStore(workspace_path=tmp_dir)
+        assert load.call_count == 0
+        assert [e.event_id for e in lazy.get_campaign_timeline("Alpha")] == ["evt_a"]
+        read = [os.path.basename(os.path.dirname(c.args[0])) for c in load.call_args_list]
+        assert read == ["Alpha"]
+    assert sorted(lazy.get_campaign_names()) == ["Alpha", "Beta"]
+    print("  [OK] Only the requested campaign was loaded")
+    print("[PASS] TimelineStore lazy loading")
+
+
+def test_store_query_uses_tag_and_date_indexes():
+    """Test tag, date-range and combined filters, including replaced events."""
+    print("\n[TEST] TimelineStore indexed query")
+
+    store, _tmp = _make_store()
+    events = []
+    for number, (day, tags) in enumerate([(1, ["Dragon"]), (5, ["dragon", "cult"]), (9, [])]):
+        event = make_event(f"evt_{number}", event_type_val="combat")
+        event.context.in_world_date = {"year": 1, "month": "Nowhere", "day": day}
+        event.links.tags = tags
+        events.append(event)
+    events.append(make_event("evt_undated", event_type_val="social"))
+    store.add_events(events)
+
+    def ids(dates: Optional[Any] = None, **filters: Any) -> List[str]:
+        return [e.event_id for e in store.query(TimelineQuery(**filters), dates)]
+
+    assert ids(tags=["DRAGON"]) == ["evt_0", "evt_1"]
+    assert ids(DateRange(365 + 2, 365 + 6)) == ["evt_1"]
+    assert ids(DateRange(start=365 + 4)) == ["evt_1", "evt_2"]
+    assert ids(tags=["cult"], event_types=[EventType.SOCIAL]) == []
+    assert ids() == ["evt_0", "evt_1", "evt_2", "evt_undated"]
+
+    replacement = make_event("evt_1", event_type_val="social")
+    store.add_event(replacement)
+    assert ids(tags=["dragon"]) == ["evt_0"]
+    assert ids(event_types=[EventType.SOCIAL]) == ["evt_1", "evt_undated"]
+    assert ids(DateRange(start=0)) == ["evt_0", "evt_2"]
+    assert len(store.get_campaign_timeline("Test_Campaign")) == 4
+    print("  [OK] Index-backed filters match and follow replacements")
+    print("[PASS] TimelineStore indexed query")
+
+
 if __name__ == "__main__":
     test_store_add_and_get_event()
     test_store_get_event_missing_returns_none()
@@ -252,4 +377,8 @@ if __name__ == "__main__":
     test_store_persistence_to_disk()
     test_store_reload_from_disk()
     test_store_get_campaign_names()
+    test_store_add_events_appends_with_one_fsync()
+    test_store_compacts_log_into_snapshot()
+    test_store_loads_campaigns_lazily()
+    test_store_query_uses_tag_and_date_indexes()
     print("\n[ALL TESTS PASSED]")
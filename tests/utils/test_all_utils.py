@@ -38,8 +38,12 @@ def run_all_utils_tests() -> int:
         ("test_terminal_display", "Terminal Display Tests"),
         ("test_ascii_art", "ASCII Art Tests"),
         ("test_tts_narrator", "TTS Narrator Tests"),
+        ("test_dialogue_detector", "Dialogue Detector Tests"),
         ("test_character_profile_utils", "Character Profile Utils Tests"),
         ("test_name_utils", "Name Utilities Tests"),
+        ("test_name_matcher", "Name Matcher Tests"),
+        ("test_tts_audio_cache", "TTS Audio Cache Tests"),
+        ("test_piper_worker_pool", "Piper Worker Pool Tests"),
     )
 
     results: Dict[str, bool] = {}
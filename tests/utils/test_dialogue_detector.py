@@ -0,0 +1,102 @@
+"""Unit tests for src.utils.dialogue_detector."""
+
+import time
+
+from tests.test_helpers import setup_test_environment, import_module
+
+
+setup_test_environment()
+
+dd = import_module("src.utils.dialogue_detector")
+DialogueDetector = dd.DialogueDetector
+VoiceIndex = dd.VoiceIndex
+assign_voice_entries = dd.assign_voice_entries
+get_speaker_resolver = dd.get_speaker_resolver
+segment_story_for_tts = dd.segment_story_for_tts
+
+
+def _story(paragraphs: int) -> str:
+    """Build a story mixing every dialogue pattern with plain narration."""
+    blocks = (
+        'Gorak: "I have heard rumors of the crypt."',
+        '"Evenin\'," the barkeep said. "Ale?" Nymur asked.',
+        'Kaelen: (with a raised eyebrow) "Friendship comes cheap."',
+        "The fire crackled while rain drummed on the shutters.",
+        'Nymur leaned in. "Then we leave at dawn."',
+    )
+    return "\n\n".join(blocks[i % len(blocks)] for i in range(paragraphs))
+
+
+def test_resolver_is_shared_per_name_set() -> None:
+    """Equal name sets reuse one compiled resolver; detectors resolve through it."""
+    names = frozenset({"Gorak", "Nymur", "Barkeep"})
+    shared = get_speaker_resolver(names)
+    assert get_speaker_resolver(frozenset(["Barkeep", "Gorak", "Nymur"])) is shared
+    assert get_speaker_resolver(frozenset({"Gorak"})) is not shared
+    assert shared.find_in("then nymur and Gorak left") == "Gorak"
+
+    first = DialogueDetector(["Gorak", "Nymur"], ["Barkeep"])
+
+    assert first.resolve_speaker_name("gorak") == "Gorak"
+    assert first.resolve_speaker_name("Stranger") == "Stranger"
+    assert first.resolve_speaker_name("") == "narrator"
+    first.update_known_names(npcs=["Mara"])
+    assert first.resolve_speaker_name("MARA") == "Mara"
+
+
+def test_paragraph_patterns_keep_precedence() -> None:
+    """Explicit prefixes beat inline attributions, which beat bare quotes."""
+    detector = DialogueDetector(["Gorak", "Nymur"])
+    mixed = 'Gorak: "Stay close."\n"Why?" Nymur asked.'
+    assert [(s.speaker, s.text) for s in detector.detect_speech_segments(mixed)] == [
+        ("Gorak", "Stay close."),
+    ]
+    inline = '"Ale," the barkeep said. "Now," gorak growled.'
+    assert [(s.speaker, s.text) for s in detector.detect_speech_segments(inline)] == [
+        ("barkeep", "Ale,"),
+        ("Gorak", "Now,"),
+    ]
+    standalone = detector.detect_speech_segments('"We ride." Nymur turned away.')
+    assert [(s.speaker, s.text) for s in standalone] == [("Nymur", "We ride.")]
+    narration = detector.detect_speech_segments("Rain fell on the road.")
+    assert narration[0].speaker == "narrator" and narration[0].is_action
+
+
+def test_voice_index_matches_fuzzy_rules() -> None:
+    """Exact, case-insensitive, then partial matches, in mapping order."""
+    voices = VoiceIndex({"Frodo Baggins": "frodo", "Sam": "sam", "sam": "lower"})
+    assert voices.lookup("sam") == "lower"
+    assert voices.lookup("SAM") == "sam"
+    assert voices.lookup("Frodo") == "frodo"
+    assert voices.lookup("Gandalf") is None
+
+    segments = segment_story_for_tts('Sam: "Mr. Frodo!"\n\nThe road went on.')
+    assigned = assign_voice_entries(segments, {"Sam": "sam"})
+    assert [entry for _, entry in assigned] == ["sam", None]
+
+
+def test_segmentation_scales_linearly() -> None:
+    """Segmenting a large story costs about the same per paragraph as a small one."""
+    names = [f"Hero{i}" for i in range(500)] + ["Gorak", "Nymur", "Kaelen"]
+    small, large = _story(400), _story(4000)
+    segment_story_for_tts(small, known_characters=names)
+
+    start = time.perf_counter()
+    small_segments = segment_story_for_tts(small, known_characters=names)
+    small_time = time.perf_counter() - start
+    start = time.perf_counter()
+    large_segments = segment_story_for_tts(large, known_characters=names)
+    large_time = time.perf_counter() - start
+
+    assert len(large_segments) == 10 * len(small_segments)
+    assert large_time < 30 * max(small_time, 1e-3), (small_time, large_time)
+    print(f"  400 paragraphs: {small_time * 1000:.1f} ms, "
+          f"4000 paragraphs: {large_time * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    test_resolver_is_shared_per_name_set()
+    test_paragraph_patterns_keep_precedence()
+    test_voice_index_matches_fuzzy_rules()
+    test_segmentation_scales_linearly()
+    print("All dialogue_detector tests passed.")
@@ -0,0 +1,39 @@
+"""Unit tests for src.utils.name_matcher."""
+
+from tests.test_helpers import setup_test_environment, import_module
+
+
+setup_test_environment()
+
+nm = import_module("src.utils.name_matcher")
+first_positions = nm.first_positions
+
+
+def test_first_positions_small_set() -> None:
+    """Small name sets report the first offset of each name present."""
+    text = "Frodo met Sam. Later Frodo Baggins left the Shire."
+    found = first_positions(text, frozenset({"Frodo", "Frodo Baggins", "Sam", "Gandalf"}))
+    assert found == {"Frodo": 0, "Frodo Baggins": 21, "Sam": 10}
+
+
+def test_scan_path_matches_find() -> None:
+    """The single-scan path agrees with str.find for nested and overlapping names."""
+    names = frozenset(
+        [f"Hero{i}" for i in range(150)] + ["Ann Bee", "Bee Cee", "Hero1 Name"]
+    )
+    text = "x Hero12 y Ann Bee Cee z Hero1 Name Hero1"
+    expected = {name: text.find(name) for name in names if name in text}
+    assert first_positions(text, names) == expected
+    assert first_positions("", names) == {}
+
+
+def test_empty_names_never_match() -> None:
+    """Empty strings in the name set are ignored."""
+    assert first_positions("Aragorn", frozenset({"", "Aragorn"})) == {"Aragorn": 0}
+
+
+if __name__ == "__main__":
+    test_first_positions_small_set()
+    test_scan_path_matches_find()
+    test_empty_names_never_match()
+    print("\nAll name_matcher tests passed.")
@@ -0,0 +1,100 @@
+"""Unit tests for src.utils.piper_worker_pool.
+
+Workers are replaced by a small Python echo process speaking the same frame
+protocol, so the tests run without piper-tts or voice models installed.
+"""
+
+import io
+import sys
+import tempfile
+from pathlib import Path
+from typing import List
+from unittest.mock import patch
+
+from tests.test_helpers import setup_test_environment, import_module
+
+
+setup_test_environment()
+
+pool_mod = import_module("src.utils.piper_worker_pool")
+PiperWorkerPool = pool_mod.PiperWorkerPool
+
+# Echoes each request's text back as the frame body; "die" exits mid-request
+# and "fail" answers with the zero-length failure frame.
+_ECHO_WORKER = """
+import json, sys
+from src.utils.piper_worker_pool import write_frame
+for line in sys.stdin.buffer:
+    text = json.loads(line)["text"]
+    if text == "die":
+        sys.exit(1)
+    write_frame(sys.stdout.buffer, b"" if text == "fail" else text.encode())
+"""
+
+
+def _echo_command(_model_path: Path) -> List[str]:
+    """Start the echo worker instead of a Piper worker."""
+    return [sys.executable, "-c", _ECHO_WORKER]
+
+
+def _model(size: int) -> Path:
+    """Create a fake .onnx model file of the given size."""
+    path = Path(tempfile.mkdtemp()) / "voice.onnx"
+    path.write_bytes(b"0" * size)
+    return path
+
+
+def test_frames_round_trip() -> None:
+    """read_frame returns what write_frame wrote and None on truncation."""
+    stream = io.BytesIO()
+    pool_mod.write_frame(stream, b"wav")
+    pool_mod.write_frame(stream, b"")
+    stream.seek(0)
+    assert pool_mod.read_frame(stream) == b"wav"
+    assert pool_mod.read_frame(stream) == b""
+    assert pool_mod.read_frame(stream) is None
+
+
+def test_worker_is_reused_across_requests() -> None:
+    """Consecutive requests for one voice share a single warm worker."""
+    pool = PiperWorkerPool(1024)
+    model = _model(10)
+    with patch.object(pool_mod, "_worker_command", _echo_command):
+        assert pool.synthesize(model, "one") == b"one"
+        assert pool.synthesize(model, "two") == b"two"
+        assert pool.synthesize(model, "fail") is None
+        assert pool.synthesize(model, "three") == b"three"
+    assert pool.loaded_models() == [model]
+    pool.shutdown()
+    assert not pool.loaded_models()
+
+
+def test_lru_eviction_by_memory_budget() -> None:
+    """Loading a voice past the budget evicts the least recently used one."""
+    first, second, third = _model(100), _model(100), _model(100)
+    pool = PiperWorkerPool(450)
+    with patch.object(pool_mod, "_worker_command", _echo_command):
+        pool.synthesize(first, "a")
+        pool.synthesize(second, "b")
+        pool.synthesize(first, "c")
+        pool.synthesize(third, "d")
+    assert pool.loaded_models() == [first, third]
+    pool.shutdown()
+
+
+def test_dead_worker_is_replaced() -> None:
+    """A worker that dies mid-request is restarted for the next request."""
+    pool = PiperWorkerPool(1024)
+    model = _model(10)
+    with patch.object(pool_mod, "_worker_command", _echo_command):
+        assert pool.synthesize(model, "die") is None
+        assert pool.synthesize(model, "alive") == b"alive"
+    pool.shutdown()
+
+
+if __name__ == "__main__":
+    test_frames_round_trip()
+    test_worker_is_reused_across_requests()
+    test_lru_eviction_by_memory_budget()
+    test_dead_worker_is_replaced()
+    print("All piper_worker_pool tests passed.")
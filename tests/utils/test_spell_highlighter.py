@@ -1,42 +1,76 @@
-"""Unit tests for src.utils.spell_highlighter."""
-
-from typing import List, Dict
-
-from tests.test_helpers import setup_test_environment, import_module
-
-
-setup_test_environment()
-
-sp_mod = import_module("src.utils.spell_highlighter")
-highlight_spells_in_text = sp_mod.highlight_spells_in_text
-extract_known_spells_from_characters = sp_mod.extract_known_spells_from_characters
-highlight_spells_in_story_sections = sp_mod.highlight_spells_in_story_sections
-
-
-def test_highlight_simple_and_parenthetical() -> None:
-    """Simple spell contexts and parenthetical spells should be highlighted."""
-    text = "Elara casts Fireball at the goblin. The cleric says (Divine Smite) under his breath."
-    out = highlight_spells_in_text(text)
-    assert "**Fireball**" in out
-    assert "(**Divine Smite**)" in out
-
-
-def test_extract_known_spells_from_profiles() -> None:
-    """Known spells should be pulled from character sheet and notes."""
-    characters: List[Dict] = [
-        {"character_sheet": {"known_spells": ["Fireball", "Eldritch Blast"]}},
-        {"spellcasting_notes": "Learnt Misty Step during training."},
-    ]
-
-    known = extract_known_spells_from_characters(characters)
-    # Lowercased in the implementation
-    assert "fireball" in known
-    assert "eldritch blast" in known
-    assert "misty step" in known
-
-
-def test_highlight_spells_in_story_sections() -> None:
-    """Applying highlighting to story sections should modify the narrative fields."""
-    story = {"story_narrative": "He casts Fireball as the orcs charge."}
-    out = highlight_spells_in_story_sections(story, known_spells={"fireball"})
-    assert "**Fireball**" in out["story_narrative"]
+"""Unit tests for src.utils.spell_highlighter."""
+
+from types import SimpleNamespace
+from typing import List, Dict
+from unittest.mock import patch
+
+from tests.test_helpers import setup_test_environment, import_module
+
+
+setup_test_environment()
+
+sp_mod = import_module("src.utils.spell_highlighter")
+highlight_spells_in_text = sp_mod.highlight_spells_in_text
+extract_known_spells_from_characters = sp_mod.extract_known_spells_from_characters
+highlight_spells_in_story_sections = sp_mod.highlight_spells_in_story_sections
+get_spell_matcher = sp_mod.get_spell_matcher
+find_spell_spans = sp_mod.find_spell_spans
+
+
+def test_highlight_simple_and_parenthetical() -> None:
+    """Simple spell contexts and parenthetical spells should be highlighted."""
+    text = "Elara casts Fireball at the goblin. The cleric says (Divine Smite) under his breath."
+    out = highlight_spells_in_text(text)
+    assert "**Fireball**" in out
+    assert "(**Divine Smite**)" in out
+
+
+def test_extract_known_spells_from_profiles() -> None:
+    """Known spells should be pulled from character sheet and notes."""
+    characters: List[Dict] = [
+        {"character_sheet": {"known_spells": ["Fireball", "Eldritch Blast"]}},
+        {"spellcasting_notes": "Learnt Misty Step during training."},
+    ]
+
+    known = extract_known_spells_from_characters(characters)
+    # Lowercased in the implementation
+    assert "fireball" in known
+    assert "eldritch blast" in known
+    assert "misty step" in known
+
+
+def test_highlight_spells_in_story_sections() -> None:
+    """Applying highlighting to story sections should modify the narrative fields."""
+    story = {"story_narrative": "He casts Fireball as the orcs charge."}
+    out = highlight_spells_in_story_sections(story, known_spells={"fireball"})
+    assert "**Fireball**" in out["story_narrative"]
+
+
+def test_matcher_prefers_longest_name_in_one_pass() -> None:
+    """Overlapping names resolve to the longest; bold and partial words are skipped."""
+    with patch.object(sp_mod, "_SPELL_REGISTRY_LOADER", None):
+        known = {"Fire", "Fire Bolt", "Shield", "Shield of Faith"}
+        text = "Fire Bolt, then shield of faith. **Fire** and Firebolts stay."
+        out = highlight_spells_in_text(text, known)
+        assert out == "**Fire Bolt**, then **shield of faith**. **Fire** and Firebolts stay."
+        spans = find_spell_spans(text, known)
+        assert [(span.start, span.name) for span in spans] == [
+            (0, "Fire Bolt"),
+            (16, "shield of faith"),
+        ]
+
+
+def test_matcher_cached_per_spell_set_and_registry_version() -> None:
+    """The compiled matcher is reused until the known spells or registry change."""
+    registry = SimpleNamespace(version=1, get_all_spell_names=lambda: {"moonbeam"})
+    with patch.object(sp_mod, "_SPELL_REGISTRY_LOADER", lambda: registry):
+        matcher = get_spell_matcher({"fireball"})
+        assert get_spell_matcher({"fireball"}) is matcher
+        assert matcher.names == {"fireball", "moonbeam"}
+        assert get_spell_matcher({"haste"}) is not matcher
+
+        registry.version = 2
+        registry.get_all_spell_names = lambda: {"moonbeam", "starfall"}
+        updated = get_spell_matcher({"fireball"})
+        assert updated is not matcher
+        assert "starfall" in updated.names
@@ -0,0 +1,63 @@
+"""Unit tests for src.utils.tts_audio_cache."""
+
+import tempfile
+from pathlib import Path
+
+from tests.test_helpers import setup_test_environment, import_module
+
+
+setup_test_environment()
+
+cache_mod = import_module("src.utils.tts_audio_cache")
+TtsAudioCache = cache_mod.TtsAudioCache
+clip_key = cache_mod.clip_key
+
+
+def test_clip_key_covers_every_setting() -> None:
+    """Voice, speed, pitch and text all change the key."""
+    base = clip_key("en_US-amy-medium", 1.0, 0.0, "Hello")
+    assert base == clip_key("en_US-amy-medium", 1.0, 0.0, "Hello")
+    assert base != clip_key("en_US-joe-medium", 1.0, 0.0, "Hello")
+    assert base != clip_key("en_US-amy-medium", 1.1, 0.0, "Hello")
+    assert base != clip_key("en_US-amy-medium", 1.0, -1.0, "Hello")
+    assert base != clip_key("en_US-amy-medium", 1.0, 0.0, "Hello!")
+
+
+def test_round_trip_survives_new_instance() -> None:
+    """Stored clips are found again, including by a fresh cache instance."""
+    directory = Path(tempfile.mkdtemp()) / "tts"
+    cache = TtsAudioCache(directory, 1024)
+    cache.put("a", b"RIFF-a")
+    assert cache.get("a") == b"RIFF-a"
+    assert cache.get("missing") is None
+    assert TtsAudioCache(directory, 1024).get("a") == b"RIFF-a"
+
+
+def test_lru_eviction_respects_budget() -> None:
+    """Least recently used clips are evicted once the budget is exceeded."""
+    cache = TtsAudioCache(Path(tempfile.mkdtemp()), 10)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    assert cache.get("a") == b"aaaa"
+    cache.put("c", b"cccc")
+    assert cache.get("b") is None
+    assert cache.get("a") == b"aaaa" and cache.get("c") == b"cccc"
+    assert cache.total_bytes() == 8
+
+
+def test_disabled_and_oversized() -> None:
+    """A zero budget caches nothing; clips over the budget are skipped."""
+    disabled = TtsAudioCache(Path(tempfile.mkdtemp()), 0)
+    disabled.put("a", b"aaaa")
+    assert disabled.get("a") is None
+    small = TtsAudioCache(Path(tempfile.mkdtemp()), 3)
+    small.put("a", b"aaaa")
+    assert small.total_bytes() == 0
+
+
+if __name__ == "__main__":
+    test_clip_key_covers_every_setting()
+    test_round_trip_survives_new_instance()
+    test_lru_eviction_respects_budget()
+    test_disabled_and_oversized()
+    print("All tts_audio_cache tests passed.")